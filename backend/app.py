@@ -11,8 +11,19 @@ from routes.auth_routes import auth_bp
 from routes.superadmin import superadmin_bp
 from routes.admin import admin_bp  #  Importar desde routes.admin (usa el __init__.py)
 from routes.curso_routes import curso_bp
-from database.db import init_db
+from database.db import init_db, get_db, get_pool_stats
+from database.consultas import estadisticas as estadisticas_consultas
+from database.elegibilidad import init_elegibilidad
+from database.oferta import init_oferta
 from extensions import mail
+from comandos import registrar_comandos
+from utils.cache import init_cache, estadisticas as estadisticas_cache
+from utils.coalescencia import init_coalescencia, estadisticas as estadisticas_coalescencia
+from utils.security import init_security
+from utils.tokens import init_tokens, proteger_blueprint, observabilidad
+from utils.metricas import init_metricas, respuesta_metrics
+from utils.logs import init_logs, estadisticas as estadisticas_logs
+from utils.correo import init_correo, estadisticas as estadisticas_correo, resumen_bandeja
 from routes.docentes import docentes_bp  #  importa el módulo docentes
 # Determina qué configuración usar leyendo la variable FLASK_CONFIG de tu .env
 config_name = os.getenv('FLASK_CONFIG', 'default')
@@ -27,8 +38,25 @@ app.config.from_object(config_by_name[config_name])
 CORS(app)
 
 # Inicializa las extensiones con la aplicación
+init_logs(app)
 mail.init_app(app)
 init_db(app)
+init_metricas(app)
+init_cache(app)
+init_coalescencia(app)
+init_elegibilidad(app)
+init_oferta(app)
+init_security(app)
+init_tokens(app)
+init_correo(app)
+registrar_comandos(app)
+
+# Token de sesión obligatorio (utils/tokens.py); /auth es el que los emite
+proteger_blueprint(superadmin_bp, "SuperAdmin")
+proteger_blueprint(admin_bp, "Admin", "SuperAdmin")
+proteger_blueprint(docentes_bp, "Docente")
+proteger_blueprint(alumno_bp, "Alumno")
+proteger_blueprint(curso_bp)  # catálogo: cualquier rol con sesión
 
 # Registra los Blueprints (los diferentes módulos de tu API)
 app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -43,6 +71,56 @@ app.register_blueprint(alumno_bp, url_prefix="/alumno")
 def home():
     return {"mensaje": "API Flask SUM_UNFV_3.0 corriendo 🚀"}
 
+# Estadísticas internas: token de SuperAdmin (u OBSERVABILIDAD_LOCAL)
+@app.route("/metrics")
+@observabilidad
+def metrics():
+    # Requests, latencia, consultas y tiempo de BD por endpoint (Prometheus)
+    return respuesta_metrics()
+
+@app.route("/db/pool")
+@observabilidad
+def estado_pool():
+    # Checkouts, tiempo de espera y conexiones en uso del pool de PostgreSQL
+    return get_pool_stats()
+
+@app.route("/db/consultas")
+@observabilidad
+def estado_consultas():
+    # Llamadas y tiempo acumulado por consulta preparada (database/consultas.py)
+    return estadisticas_consultas()
+
+@app.route("/cache/stats")
+@observabilidad
+def estado_cache():
+    # Hits / misses / invalidaciones por región de la caché de catálogos
+    return estadisticas_cache()
+
+@app.route("/coalescencia/stats")
+@observabilidad
+def estado_coalescencia():
+    # Solicitudes, seguidores y tasa de coalescencia por endpoint
+    return estadisticas_coalescencia()
+
+@app.route("/logs/stats")
+@observabilidad
+def estado_logs():
+    # Registros en cola y descartados por cola llena
+    return estadisticas_logs()
+
+@app.route("/correo/stats")
+@observabilidad
+def estado_correo():
+    # Mensajes/segundo y fallos recientes de los trabajadores de correo,
+    # más los correos por estado en la bandeja de salida
+    datos = estadisticas_correo()
+    cur = get_db().cursor()
+    try:
+        datos["bandeja"] = resumen_bandeja(cur)
+    finally:
+        cur.close()
+    return datos
+
 if __name__ == "__main__":
     print("\n🔍 Rutas registradas en Flask:")
     for rule in app.url_map.iter_rules():
@@ -0,0 +1,138 @@
+# ============================================
+# bench_coalescencia.py
+# ============================================
+# N solicitudes simultáneas e idénticas al catálogo de cursos (la consulta
+# de curso_routes.listar_cursos), en oleadas:
+#   - sin coalescer: cada hilo toma una conexión y hace su consulta
+#   - coalescidas:   utils/coalescencia.Coalescedor, una consulta por
+#                    oleada y los demás hilos reciben su resultado
+# Reporta consultas hechas, tasa de coalescencia y latencia. Cada hilo usa
+# su propia sesión, así que se crea el esquema bench_coalescencia y se
+# borra al terminar.
+#
+#   python -m benchmarks.bench_coalescencia [--solicitudes 200] [--oleadas 5]
+import argparse
+import statistics
+import threading
+import time
+
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+from benchmarks.comun import conectar, imprimir_tabla, parametros_conexion
+from utils.coalescencia import Coalescedor
+
+ESQUEMA = "bench_coalescencia"
+SQL_CURSOS = """
+    SELECT c.curso_id, c.codigo, c.nombre, c.creditos, c.ciclo,
+           c.horas_teoricas, c.horas_practicas, c.tipo, c.estado, c.fecha_creacion
+    FROM curso c
+    ORDER BY c.nombre ASC
+"""
+
+
+def crear_esquema(cur, n_cursos):
+    cur.execute(f"""
+        DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE;
+        CREATE SCHEMA {ESQUEMA};
+        SET search_path = {ESQUEMA};
+        CREATE TABLE curso (
+            curso_id INT PRIMARY KEY, codigo TEXT, nombre TEXT, creditos INT, ciclo TEXT,
+            horas_teoricas INT, horas_practicas INT, tipo TEXT, estado BOOLEAN,
+            fecha_creacion TIMESTAMP
+        );
+        INSERT INTO curso
+            SELECT i, 'C' || i, 'Curso ' || md5(i::text), 3 + i %% 3,
+                   (ARRAY['I','II','III','IV','V','VI','VII','VIII','IX','X'])[1 + i %% 10],
+                   2, 2, 'OBLIGATORIO', TRUE, NOW()
+            FROM generate_series(1, %(n)s) i;
+        ANALYZE;
+    """, {"n": n_cursos})
+
+
+def oleada(n, pool, conexiones, coalescedor=None):
+    """n hilos piden lo mismo a la vez; devuelve (consultas, latencias ms)."""
+    arranque = threading.Barrier(n)
+    cupo_conexiones = threading.Semaphore(conexiones)
+    consultas = [0]
+    consultas_lock = threading.Lock()
+    tiempos = [0.0] * n
+
+    def consultar():
+        with cupo_conexiones:
+            conn = pool.getconn()
+            try:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+                cur.execute(SQL_CURSOS)
+                filas = cur.fetchall()
+                cur.close()
+                conn.rollback()
+            finally:
+                pool.putconn(conn)
+        with consultas_lock:
+            consultas[0] += 1
+        return filas
+
+    def correr(i):
+        arranque.wait()
+        inicio = time.perf_counter()
+        if coalescedor is None:
+            consultar()
+        else:
+            coalescedor.ejecutar("/curso/", consultar)
+        tiempos[i] = (time.perf_counter() - inicio) * 1000
+
+    hilos = [threading.Thread(target=correr, args=(i,)) for i in range(n)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return consultas[0], tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solicitudes", type=int, default=200)
+    parser.add_argument("--oleadas", type=int, default=5)
+    parser.add_argument("--cursos", type=int, default=3000)
+    parser.add_argument("--conexiones", type=int, default=20)
+    args = parser.parse_args()
+
+    admin = conectar()
+    cur = admin.cursor()
+    crear_esquema(cur, args.cursos)
+    admin.commit()
+
+    pool = ThreadedConnectionPool(
+        1, args.conexiones, **parametros_conexion(), options=f"-c search_path={ESQUEMA}"
+    )
+    try:
+        coalescedor = Coalescedor("listar_cursos")
+        filas = []
+        for nombre, c in (("sin coalescer", None), ("coalescidas", coalescedor)):
+            consultas, tiempos = 0, []
+            for _ in range(args.oleadas):
+                hechas, t = oleada(args.solicitudes, pool, args.conexiones, c)
+                consultas += hechas
+                tiempos += t
+            tiempos.sort()
+            filas.append([
+                nombre, args.solicitudes * args.oleadas, consultas,
+                f"{statistics.median(tiempos):.1f}",
+                f"{tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]:.1f}",
+            ])
+        print(f"\n{args.oleadas} oleadas de {args.solicitudes} GET idénticos, "
+              f"{args.conexiones} conexiones, {args.cursos} cursos")
+        imprimir_tabla(["modo", "solicitudes", "consultas", "ms mediana", "ms p95"], filas)
+        print(f"coalescencia: {coalescedor.stats()}")
+    finally:
+        pool.closeall()
+        admin.rollback()
+        cur.execute(f"DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE")
+        admin.commit()
+        cur.close()
+        admin.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# ============================================
+# bench_conflictos.py
+# ============================================
+# Validación de cruces de un semestre completo (2000 asignaciones):
+#   - sondas: las consultas de antes por asignación (aula, docente y curso
+#     en la sección con el mismo bloque_id), una tras otra
+#   - motor:  database/conflictos.py, una consulta + índice de intervalos
+# y la validación de una asignación nueva (crear-asignacion) con cada
+# forma. Los bloques se solapan (de 2 horas, empiezan cada hora), así que
+# también se cuenta lo que las sondas por bloque_id no ven. Sobre tablas TEMP.
+#
+#   python -m benchmarks.bench_conflictos [--asignaciones 2000]
+import argparse
+import random
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database import conflictos
+
+SONDAS = (
+    "SELECT 1 FROM asignaciones WHERE bloque_id=%s AND aula_id=%s AND asignacion_id != %s",
+    "SELECT 1 FROM asignaciones WHERE bloque_id=%s AND docente_id=%s AND asignacion_id != %s",
+    "SELECT 1 FROM asignaciones WHERE bloque_id=%s AND seccion_id=%s AND curso_id=%s AND asignacion_id != %s",
+)
+
+
+def crear_esquema(cur, n):
+    cur.execute("""
+        CREATE TEMP TABLE curso (curso_id INT PRIMARY KEY, ciclo TEXT);
+        CREATE TEMP TABLE bloque_horario (bloque_id INT PRIMARY KEY, dia TEXT, hora_inicio TIME, hora_fin TIME);
+        CREATE TEMP TABLE asignaciones (
+            asignacion_id INT PRIMARY KEY, curso_id INT, seccion_id INT,
+            docente_id INT, bloque_id INT, aula_id INT
+        );
+        CREATE INDEX ON asignaciones (bloque_id, aula_id);
+        CREATE INDEX ON asignaciones (bloque_id, docente_id);
+        CREATE INDEX ON asignaciones (curso_id, seccion_id);
+
+        INSERT INTO curso
+            SELECT i, (ARRAY['I','II','III','IV','V','VI','VII','VIII','IX','X'])[1 + i %% 10]
+            FROM generate_series(1, 400) i;
+        -- 6 días x bloques de 2 h que empiezan cada hora de 07:00 a 20:00
+        INSERT INTO bloque_horario
+            SELECT d * 14 + h + 1,
+                   (ARRAY['Lunes','Martes','Miércoles','Jueves','Viernes','Sábado'])[d + 1],
+                   TIME '07:00' + h * INTERVAL '1 hour',
+                   TIME '09:00' + h * INTERVAL '1 hour'
+            FROM generate_series(0, 5) d, generate_series(0, 13) h;
+        INSERT INTO asignaciones
+            SELECT i, 1 + (i * 7) %% 400, 1 + (i * 3) %% 40, 1 + (i * 11) %% 300,
+                   1 + (i * 13) %% 84, 1 + (i * 17) %% 60
+            FROM generate_series(1, %(n)s) i;
+        ANALYZE;
+    """, {"n": n})
+
+
+def sondas_una(cur, a):
+    """Las consultas de antes para una asignación: ¿alguna choca?"""
+    params = (
+        (a["bloque_id"], a["aula_id"], a["asignacion_id"]),
+        (a["bloque_id"], a["docente_id"], a["asignacion_id"]),
+        (a["bloque_id"], a["seccion_id"], a["curso_id"], a["asignacion_id"]),
+    )
+    encontrados = 0
+    for sql, p in zip(SONDAS, params):
+        cur.execute(sql, p)
+        if cur.fetchone():
+            encontrados += 1
+    return encontrados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--asignaciones", type=int, default=2000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = conectar()
+    cur = conn.cursor()
+    crear_esquema(cur, args.asignaciones)
+    conn.commit()
+
+    horario = conflictos.cargar_horario(cur)
+
+    def con_sondas():
+        return sum(1 for a in horario if sondas_una(cur, a))
+
+    def con_motor():
+        return conflictos.validar_horario(conflictos.cargar_horario(cur))
+
+    con_choque_sondas = con_sondas()
+    cruces = con_motor()
+    con_choque_motor = len({c["asignacion_id"] for c in cruces} | {c["con"] for c in cruces})
+
+    nueva = {
+        "asignacion_id": -1, "curso_id": 1, "seccion_id": 1,
+        "docente_id": 1, "aula_id": 1, "bloque_id": 1,
+    }
+
+    def una_sondas():
+        a = dict(nueva, bloque_id=random.randint(1, 84), aula_id=random.randint(1, 60))
+        sondas_una(cur, a)
+
+    def una_motor():
+        a = dict(nueva, bloque_id=random.randint(1, 84), aula_id=random.randint(1, 60))
+        conflictos.conflictos_propuestas(cur, [a])
+
+    filas = []
+    for nombre, funcion, repeticiones in (
+        (f"semestre con sondas ({len(horario) * len(SONDAS)} consultas)", con_sondas, args.repeticiones),
+        ("semestre con motor (1 consulta)", con_motor, args.repeticiones),
+        ("una asignación con sondas", una_sondas, 200),
+        ("una asignación con motor", una_motor, 200),
+    ):
+        mediana, p95 = cronometrar(funcion, repeticiones=repeticiones, calentamiento=1)
+        filas.append([nombre, f"{mediana:.2f}", f"{p95:.2f}"])
+    imprimir_tabla(["caso", "ms mediana", "ms p95"], filas)
+
+    print(f"\nasignaciones con algún choque: sondas por bloque_id={con_choque_sondas}, "
+          f"motor por horas={con_choque_motor} ({len(cruces)} pares)")
+
+    conn.rollback()
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
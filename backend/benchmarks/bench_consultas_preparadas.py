@@ -0,0 +1,95 @@
+# ============================================
+# bench_consultas_preparadas.py
+# ============================================
+# Listado de asignaciones para matrícula (join de 7 tablas) ejecutado:
+#   - como texto: cur.execute(sql) en cada llamada (parse + plan cada vez)
+#   - preparado:  consultas.ejecutar() sobre una PooledConnection
+# más las estadisticas() del registro al final. Sobre tablas TEMP.
+#
+#   python -m benchmarks.bench_consultas_preparadas [--asignaciones 3000]
+import argparse
+import random
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database import consultas
+from database.pool import PooledConnection
+from database.oferta import ASIGNACIONES_POR_CICLO
+
+CICLOS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+
+
+def crear_esquema(cur, n):
+    cur.execute("""
+        CREATE TEMP TABLE curso (curso_id INT PRIMARY KEY, nombre TEXT, codigo TEXT, ciclo TEXT);
+        CREATE TEMP TABLE secciones (seccion_id INT PRIMARY KEY, codigo TEXT, periodo TEXT);
+        CREATE TEMP TABLE persona (persona_id INT PRIMARY KEY, nombres TEXT, apellidos TEXT);
+        CREATE TEMP TABLE docente (docente_id INT PRIMARY KEY, persona_id INT);
+        CREATE TEMP TABLE bloque_horario (bloque_id INT PRIMARY KEY, dia TEXT, hora_inicio TIME, hora_fin TIME);
+        CREATE TEMP TABLE aula (aula_id INT PRIMARY KEY, nombre_aula TEXT, capacidad INT);
+        CREATE TEMP TABLE asignaciones (
+            asignacion_id INT PRIMARY KEY, curso_id INT, seccion_id INT,
+            docente_id INT, bloque_id INT, aula_id INT
+        );
+        CREATE INDEX ON curso (ciclo);
+
+        INSERT INTO curso
+            SELECT i, 'Curso ' || i, 'C' || i, (ARRAY['I','II','III','IV','V','VI','VII','VIII','IX','X'])[1 + i %% 10]
+            FROM generate_series(1, 400) i;
+        INSERT INTO secciones SELECT i, 'S' || i, '2025-I' FROM generate_series(1, 40) i;
+        INSERT INTO persona SELECT i, 'Nombre' || i, 'Apellido' || i FROM generate_series(1, 300) i;
+        INSERT INTO docente SELECT i, i FROM generate_series(1, 300) i;
+        INSERT INTO bloque_horario
+            SELECT i, (ARRAY['Lunes','Martes','Miércoles','Jueves','Viernes'])[1 + i %% 5],
+                   TIME '07:00' + (i %% 7) * INTERVAL '2 hours',
+                   TIME '09:00' + (i %% 7) * INTERVAL '2 hours'
+            FROM generate_series(1, 35) i;
+        INSERT INTO aula SELECT i, 'Aula ' || i, 40 FROM generate_series(1, 60) i;
+        INSERT INTO asignaciones
+            SELECT i, 1 + i %% 400, 1 + i %% 40, 1 + i %% 300, 1 + i %% 35, 1 + i %% 60
+            FROM generate_series(1, %(n)s) i;
+        ANALYZE;
+    """, {"n": n})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--asignaciones", type=int, default=3000)
+    parser.add_argument("--repeticiones", type=int, default=300)
+    args = parser.parse_args()
+
+    conn = conectar(connection_factory=PooledConnection)
+    cur = conn.cursor()
+    crear_esquema(cur, args.asignaciones)
+    conn.commit()
+
+    sql_texto = consultas._consultas[ASIGNACIONES_POR_CICLO].sql
+
+    def parametros():
+        i = random.randrange(len(CICLOS) - 1)
+        return ([CICLOS[i], CICLOS[i + 1]],)
+
+    def como_texto():
+        cur.execute(sql_texto, parametros())
+        cur.fetchall()
+
+    def preparada():
+        consultas.ejecutar(cur, ASIGNACIONES_POR_CICLO, parametros())
+        cur.fetchall()
+
+    texto = cronometrar(como_texto, repeticiones=args.repeticiones, calentamiento=10)
+    consultas.reiniciar_estadisticas()
+    prep = cronometrar(preparada, repeticiones=args.repeticiones, calentamiento=10)
+
+    imprimir_tabla(["ejecución", "ms mediana", "ms p95"], [
+        ["texto (parse + plan)", f"{texto[0]:.3f}", f"{texto[1]:.3f}"],
+        ["preparada (EXECUTE)", f"{prep[0]:.3f}", f"{prep[1]:.3f}"],
+    ])
+    print(consultas.estadisticas())
+
+    conn.rollback()
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# ============================================
+# bench_cupos_concurrencia.py
+# ============================================
+# Prueba de carga de la matrícula con cupos (database/cupos.py): N
+# solicitudes simultáneas a la misma sección popular, más un grupo de
+# alumnos que a la vez pide otra sección del mismo curso (carrera de
+# duplicados). Después libera cupos en paralelo para probar la promoción
+# desde la lista de espera. Al final verifica que:
+#   - ninguna sección tiene más matrículas ACTIVA que su capacidad
+#   - la sección popular queda llena (todos los alumnos cumplen)
+#   - ningún alumno quedó dos veces en el mismo curso
+#   - cupo_asignacion coincide con las matrículas reales
+#
+# Como cada hilo necesita su propia sesión, aquí no sirven tablas TEMP: se
+# crea el esquema bench_cupos (con la migración 005 instalada) y se borra
+# al terminar.
+#
+#   python -m benchmarks.bench_cupos_concurrencia [--solicitudes 500] [--capacidad 40]
+import argparse
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+
+from psycopg2.pool import ThreadedConnectionPool
+
+from benchmarks.comun import conectar, imprimir_tabla, parametros_conexion
+from database import cupos
+
+ESQUEMA = "bench_cupos"
+MIGRACION_CUPOS = os.path.join(
+    os.path.dirname(__file__), "..", "database", "migraciones", "005_cupo_asignacion.sql"
+)
+POPULAR, ALTERNATIVA = 1, 2  # dos secciones del mismo curso
+
+
+def crear_esquema(cur, n_estudiantes, capacidad):
+    cur.execute(f"""
+        DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE;
+        CREATE SCHEMA {ESQUEMA};
+        SET search_path = {ESQUEMA};
+
+        CREATE TABLE estudiante (estudiante_id INT PRIMARY KEY);
+        CREATE TABLE curso (curso_id INT PRIMARY KEY, codigo TEXT, nombre TEXT, ciclo TEXT, creditos INT);
+        CREATE TABLE bloque_horario (bloque_id INT PRIMARY KEY, dia TEXT, hora_inicio TIME, hora_fin TIME);
+        CREATE TABLE asignaciones (
+            asignacion_id INT PRIMARY KEY, curso_id INT, bloque_id INT, cantidad_estudiantes INT
+        );
+        CREATE TABLE matriculas (
+            matricula_id SERIAL PRIMARY KEY, estudiante_id INT, asignacion_id INT,
+            fecha_matricula TIMESTAMP, estado TEXT
+        );
+        CREATE TABLE calificaciones (estudiante_id INT, asignacion_id INT, nota_final NUMERIC);
+        CREATE TABLE prerrequisito (id_curso INT, id_curso_requerido INT);
+        CREATE INDEX ON matriculas (estudiante_id);
+        CREATE INDEX ON matriculas (asignacion_id);
+
+        INSERT INTO estudiante SELECT i FROM generate_series(1, %(n)s) i;
+        INSERT INTO curso VALUES (1, 'CP-1', 'Curso popular', 'I', 4);
+        INSERT INTO bloque_horario VALUES
+            (1, 'Lunes', '08:00', '10:00'),
+            (2, 'Martes', '08:00', '10:00');
+        INSERT INTO asignaciones VALUES
+            ({POPULAR}, 1, 1, %(cap)s),
+            ({ALTERNATIVA}, 1, 2, %(cap)s);
+    """, {"n": n_estudiantes, "cap": capacidad})
+    with open(MIGRACION_CUPOS, encoding="utf-8") as f:
+        cur.execute(f.read())
+
+
+def en_paralelo(tareas, funcion, pool, conexiones):
+    """Lanza todas las tareas a la vez; como mucho `conexiones` usan la BD al mismo tiempo."""
+    arranque = threading.Barrier(len(tareas))
+    cupo_conexiones = threading.Semaphore(conexiones)
+    resultados = [None] * len(tareas)
+    tiempos = [0.0] * len(tareas)
+
+    def correr(i, tarea):
+        arranque.wait()
+        inicio = time.perf_counter()
+        with cupo_conexiones:
+            conn = pool.getconn()
+            try:
+                cur = conn.cursor()
+                try:
+                    resultados[i] = funcion(conn, cur, *tarea)
+                finally:
+                    cur.close()
+                    conn.rollback()
+            finally:
+                pool.putconn(conn)
+        tiempos[i] = (time.perf_counter() - inicio) * 1000
+
+    hilos = [threading.Thread(target=correr, args=(i, t)) for i, t in enumerate(tareas)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return resultados, tiempos, time.perf_counter() - inicio
+
+
+def matricular(conn, cur, estudiante_id, asignacion_id):
+    return cupos.matricular_con_cupo(conn, cur, estudiante_id, asignacion_id)["estado"]
+
+
+def desmatricular(conn, cur, matricula_id):
+    # Lo mismo que DELETE /alumno/desmatricular/<id>
+    cur.execute(
+        "DELETE FROM matriculas WHERE matricula_id = %s RETURNING estudiante_id, asignacion_id",
+        (matricula_id,)
+    )
+    row = cur.fetchone()
+    promovidos = cupos.promover_espera(cur, row[1]) if row else []
+    conn.commit()
+    return len(promovidos)
+
+
+def comprobar(cur, capacidad):
+    errores = []
+    cur.execute("""
+        SELECT asignacion_id, COUNT(*) FROM matriculas
+        WHERE estado = 'ACTIVA' GROUP BY asignacion_id ORDER BY 1
+    """)
+    por_seccion = dict(cur.fetchall())
+    for asignacion_id in (POPULAR, ALTERNATIVA):
+        ocupados = por_seccion.get(asignacion_id, 0)
+        if ocupados > capacidad:
+            errores.append(f"sobreasignación en {asignacion_id}: {ocupados} > {capacidad}")
+    # La popular tiene muchos más postulantes que cupos: debe quedar llena
+    if por_seccion.get(POPULAR, 0) < capacidad:
+        errores.append(f"cupos sin usar en {POPULAR}: {por_seccion.get(POPULAR, 0)} < {capacidad}")
+
+    cur.execute("""
+        SELECT estudiante_id FROM matriculas GROUP BY estudiante_id HAVING COUNT(*) > 1
+    """)
+    duplicados = cur.fetchall()
+    if duplicados:
+        errores.append(f"{len(duplicados)} alumnos matriculados dos veces en el curso")
+
+    diferencias = cupos.verificar(cur)
+    if diferencias:
+        errores.append(f"contadores distintos de la realidad: {diferencias}")
+    return por_seccion, errores
+
+
+def resumen_tiempos(tiempos):
+    tiempos = sorted(tiempos)
+    p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+    return f"{statistics.median(tiempos):.1f}", f"{p95:.1f}", f"{tiempos[-1]:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solicitudes", type=int, default=500)
+    parser.add_argument("--capacidad", type=int, default=40)
+    parser.add_argument("--conexiones", type=int, default=80)
+    parser.add_argument("--liberar", type=int, default=10)
+    args = parser.parse_args()
+
+    # Cuatro de cada cinco solicitudes son de alumnos distintos a la sección
+    # popular; la quinta es uno de esos mismos alumnos pidiendo la otra sección
+    n_alumnos = args.solicitudes - args.solicitudes // 5
+    tareas = [(e, POPULAR) for e in range(1, n_alumnos + 1)]
+    tareas += [(e, ALTERNATIVA) for e in range(1, n_alumnos + 1, 4)][:args.solicitudes - n_alumnos]
+
+    admin = conectar()
+    cur = admin.cursor()
+    crear_esquema(cur, n_alumnos, args.capacidad)
+    admin.commit()
+
+    pool = ThreadedConnectionPool(
+        1, args.conexiones, **parametros_conexion(), options=f"-c search_path={ESQUEMA}"
+    )
+    try:
+        estados, tiempos, total = en_paralelo(tareas, matricular, pool, args.conexiones)
+        por_seccion, errores = comprobar(cur, args.capacidad)
+        conteo = Counter(estados)
+
+        print(f"\n{len(tareas)} solicitudes simultáneas, {args.conexiones} conexiones, "
+              f"capacidad {args.capacidad} por sección ({total:.2f} s)")
+        imprimir_tabla(["resultado", "solicitudes"], sorted(conteo.items()))
+        imprimir_tabla(["ms mediana", "ms p95", "ms máx"], [resumen_tiempos(tiempos)])
+        print(f"matrículas ACTIVA por sección: {por_seccion}")
+
+        # Liberar cupos en paralelo: cada uno debe pasar a alguien de la lista
+        cur.execute("""
+            SELECT matricula_id FROM matriculas WHERE asignacion_id = %s ORDER BY random() LIMIT %s
+        """, (POPULAR, args.liberar))
+        liberar = [(r[0],) for r in cur.fetchall()]
+        admin.commit()
+        promovidos, _, _ = en_paralelo(liberar, desmatricular, pool, args.conexiones)
+        print(f"\n{len(liberar)} cupos liberados en paralelo, {sum(promovidos)} promovidos desde la lista de espera")
+
+        por_seccion, errores_promocion = comprobar(cur, args.capacidad)
+        errores += errores_promocion
+        print(f"matrículas ACTIVA por sección: {por_seccion}")
+
+        if errores:
+            for e in errores:
+                print(f"❌ {e}")
+            raise SystemExit(1)
+        print("✅ sin sobreasignación, sin duplicados y contadores consistentes")
+    finally:
+        pool.closeall()
+        admin.rollback()
+        cur.execute(f"DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE")
+        admin.commit()
+        cur.close()
+        admin.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# ============================================
+# bench_elegibilidad.py
+# ============================================
+# "¿Puede matricularse en X?" para toda la oferta de un alumno:
+#   - antes: las validaciones de matricular_alumno (asignación, duplicado,
+#     choques, prerrequisitos, aprobados) repetidas por cada asignación
+#   - motor: perfil + prerrequisitos cargados una vez y evaluar() en memoria
+# y la matrícula individual: validaciones + INSERT contra el INSERT validado
+# de database/elegibilidad.py. Sobre tablas TEMP.
+#
+#   python -m benchmarks.bench_elegibilidad [--asignaciones 600]
+import argparse
+import random
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database import curriculo, elegibilidad
+
+ESTUDIANTE = 1
+
+
+def crear_esquema(cur, n):
+    cur.execute("""
+        CREATE TEMP TABLE curso (curso_id INT PRIMARY KEY, codigo TEXT, nombre TEXT, ciclo TEXT, creditos INT);
+        CREATE TEMP TABLE bloque_horario (bloque_id INT PRIMARY KEY, dia TEXT, hora_inicio TIME, hora_fin TIME);
+        CREATE TEMP TABLE asignaciones (asignacion_id INT PRIMARY KEY, curso_id INT, bloque_id INT);
+        CREATE TEMP TABLE matriculas (
+            matricula_id SERIAL PRIMARY KEY, estudiante_id INT, asignacion_id INT,
+            fecha_matricula TIMESTAMP, estado TEXT
+        );
+        CREATE TEMP TABLE calificaciones (estudiante_id INT, asignacion_id INT, nota_final NUMERIC);
+        CREATE TEMP TABLE prerrequisito (id_curso INT, id_curso_requerido INT);
+        CREATE INDEX ON matriculas (estudiante_id);
+        CREATE INDEX ON calificaciones (estudiante_id);
+        CREATE INDEX ON prerrequisito (id_curso);
+
+        INSERT INTO curso
+            SELECT i, 'C-' || i, 'Curso ' || i,
+                   (ARRAY['I','II','III','IV','V','VI','VII','VIII','IX','X'])[1 + i %% 10], 4
+            FROM generate_series(1, 400) i;
+        INSERT INTO bloque_horario
+            SELECT i, (ARRAY['Lunes','Martes','Miércoles','Jueves','Viernes'])[1 + i %% 5],
+                   TIME '07:00' + (i %% 7) * INTERVAL '2 hours',
+                   TIME '09:00' + (i %% 7) * INTERVAL '2 hours'
+            FROM generate_series(1, 35) i;
+        INSERT INTO asignaciones
+            SELECT i, 1 + i %% 400, 1 + i %% 35 FROM generate_series(1, %(n)s) i;
+        -- cada curso pide el del ciclo anterior (salto de 10 en la numeración)
+        INSERT INTO prerrequisito SELECT i, i - 10 FROM generate_series(11, 400) i;
+
+        -- historial del alumno: 60 cursos aprobados y 6 matrículas activas
+        INSERT INTO calificaciones
+            SELECT %(est)s, i, 11 + i %% 9 FROM generate_series(1, 60) i;
+        INSERT INTO matriculas (estudiante_id, asignacion_id, fecha_matricula, estado)
+            SELECT %(est)s, i, NOW(), 'ACTIVA' FROM generate_series(61, 66) i;
+        ANALYZE;
+    """, {"n": n, "est": ESTUDIANTE})
+
+
+def validar_como_antes(cur, asignacion_id):
+    """Las consultas que hacía matricular_alumno antes del INSERT."""
+    cur.execute("""
+        SELECT a.curso_id, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
+        FROM asignaciones a
+        JOIN curso c ON a.curso_id = c.curso_id
+        JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+        WHERE a.asignacion_id = %s
+    """, (asignacion_id,))
+    curso_id, ciclo, dia, inicio, fin = cur.fetchone()
+
+    cur.execute("""
+        SELECT 1 FROM matriculas m JOIN asignaciones a ON m.asignacion_id = a.asignacion_id
+        WHERE m.estudiante_id = %s AND a.curso_id = %s
+    """, (ESTUDIANTE, curso_id))
+    if cur.fetchone():
+        return False
+
+    cur.execute("""
+        SELECT c.nombre, bh.dia, bh.hora_inicio, bh.hora_fin
+        FROM matriculas m
+        JOIN asignaciones a ON m.asignacion_id = a.asignacion_id
+        JOIN curso c ON a.curso_id = c.curso_id
+        JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+        WHERE m.estudiante_id = %s AND m.estado = 'ACTIVA' AND c.ciclo = %s
+    """, (ESTUDIANTE, ciclo))
+    for _, d, i, f in cur.fetchall():
+        if d == dia and inicio < f and fin > i:
+            return False
+
+    cur.execute("SELECT id_curso_requerido FROM prerrequisito WHERE id_curso = %s", (curso_id,))
+    prereqs = [r[0] for r in cur.fetchall()]
+    if prereqs:
+        cur.execute("""
+            SELECT a.curso_id FROM calificaciones cal
+            JOIN asignaciones a ON cal.asignacion_id = a.asignacion_id
+            WHERE cal.estudiante_id = %s AND cal.nota_final >= 11
+        """, (ESTUDIANTE,))
+        aprobados = {r[0] for r in cur.fetchall()}
+        if any(p not in aprobados for p in prereqs):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--asignaciones", type=int, default=600)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = conectar()
+    cur = conn.cursor()
+    crear_esquema(cur, args.asignaciones)
+    conn.commit()
+
+    oferta = elegibilidad.oferta_para_evaluar(cur, ciclos=["I", "II"])
+    ids = [a["asignacion_id"] for a in oferta]
+
+    def oferta_antes():
+        return [validar_como_antes(cur, i) for i in ids]
+
+    def oferta_motor():
+        perfil = elegibilidad.cargar_perfil(conn, ESTUDIANTE)
+        prereqs = curriculo.cargar_curriculo(conn)
+        return [elegibilidad.evaluar(perfil, prereqs, a)["elegible"] for a in oferta]
+
+    assert oferta_antes() == oferta_motor(), "el motor no coincide con las validaciones de antes"
+
+    def matricula_antes():
+        cur.execute("SAVEPOINT bench")
+        asignacion_id = random.choice(ids)
+        if validar_como_antes(cur, asignacion_id):
+            cur.execute("""
+                INSERT INTO matriculas (estudiante_id, asignacion_id, fecha_matricula, estado)
+                VALUES (%s, %s, NOW(), 'ACTIVA')
+            """, (ESTUDIANTE, asignacion_id))
+        cur.execute("ROLLBACK TO SAVEPOINT bench")
+
+    def matricula_motor():
+        cur.execute("SAVEPOINT bench")
+        elegibilidad.matricular(cur, ESTUDIANTE, random.choice(ids))
+        cur.execute("ROLLBACK TO SAVEPOINT bench")
+
+    filas = []
+    for nombre, funcion in (
+        (f"oferta antes ({len(ids)} asignaciones)", oferta_antes),
+        ("oferta motor (perfil + evaluar)", oferta_motor),
+        ("matrícula antes (5 consultas + INSERT)", matricula_antes),
+        ("matrícula INSERT validado", matricula_motor),
+    ):
+        mediana, p95 = cronometrar(funcion, repeticiones=args.repeticiones)
+        filas.append([nombre, f"{mediana:.2f}", f"{p95:.2f}"])
+    imprimir_tabla(["caso", "ms mediana", "ms p95"], filas)
+
+    conn.rollback()
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================================
+# bench_exportacion.py
+# ============================================
+# Pico de memoria (tracemalloc) al exportar N filas:
+#   - fetchall + json.dumps de la lista completa (respuesta anterior)
+#   - cursor con nombre + NDJSON por bloques (utils/streaming.py)
+# El pico del modo NDJSON debería quedar plano aunque crezca N.
+#
+#   python -m benchmarks.bench_exportacion [--filas 10000 100000 500000]
+import argparse
+import json
+import time
+import tracemalloc
+
+from psycopg2.extras import RealDictCursor
+
+from benchmarks.comun import conectar, imprimir_tabla
+
+SQL = """
+    SELECT
+        g AS estudiante_id,
+        'U' || lpad(g::text, 8, '0') AS codigo_universitario,
+        'Nombre ' || g AS nombres,
+        'Apellido ' || g AS apellidos,
+        'ACTIVO' AS estado
+    FROM generate_series(1, %s) g
+    ORDER BY g
+"""
+
+
+def exportar_lista(conn, n):
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute(SQL, (n,))
+    cuerpo = json.dumps({"alumnos": cur.fetchall()}, default=str)
+    cur.close()
+    return len(cuerpo)
+
+
+def exportar_ndjson(conn, n, itersize=500, por_bloque=200):
+    cur = conn.cursor(name="bench_export", cursor_factory=RealDictCursor)
+    cur.itersize = itersize
+    cur.execute(SQL, (n,))
+    total, bloque = 0, []
+    for fila in cur:
+        bloque.append(json.dumps(fila, default=str))
+        if len(bloque) >= por_bloque:
+            total += len("\n".join(bloque)) + 1  # el bloque se "envía" y se descarta
+            bloque = []
+    if bloque:
+        total += len("\n".join(bloque)) + 1
+    cur.close()
+    return total
+
+
+def medir(funcion, conn, n):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    bytes_salida = funcion(conn, n)
+    ms = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    conn.rollback()
+    return ms, pico / 1024 / 1024, bytes_salida / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, nargs="+", default=[10000, 100000, 500000])
+    args = parser.parse_args()
+
+    conn = conectar()
+    filas = []
+    for n in args.filas:
+        for nombre, funcion in (("fetchall+jsonify", exportar_lista), ("ndjson stream", exportar_ndjson)):
+            ms, pico_mb, salida_mb = medir(funcion, conn, n)
+            filas.append([n, nombre, f"{ms:.0f}", f"{pico_mb:.1f}", f"{salida_mb:.1f}"])
+    conn.close()
+
+    imprimir_tabla(["filas", "modo", "ms", "pico MB", "salida MB"], filas)
+
+
+if __name__ == "__main__":
+    main()
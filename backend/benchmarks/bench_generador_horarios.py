@@ -0,0 +1,150 @@
+# ============================================
+# bench_generador_horarios.py
+# ============================================
+# Generador de horarios (database/generador_horarios.py) sobre un semestre
+# sintético: 500 cursos (1 o 2 bloques) x 60 bloques activos x 150 aulas,
+# con docentes de disponibilidad parcial y bloques que se solapan (6 días,
+# bloques de 2 h que empiezan cada hora). Luego cambia una restricción
+# (un aula fuera de servicio y un docente que pierde un día) y re-resuelve
+# en forma incremental. Verifica con database/conflictos.py que no haya
+# cruces, además de capacidad, disponibilidad y la regla de dos bloques.
+# No usa la BD: es el mismo trabajo que hace la ruta después de cargar.
+#
+#   python -m benchmarks.bench_generador_horarios [--cursos 500] [--tiempo 50]
+import argparse
+import random
+import time
+from datetime import time as hora
+
+from benchmarks.comun import imprimir_tabla
+from database import conflictos
+from database.generador_horarios import Generador
+
+DIAS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado")
+CICLOS = ("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X")
+
+
+def datos_sinteticos(n_cursos, n_aulas, n_docentes, semilla=7):
+    azar = random.Random(semilla)
+    bloques = [{
+        "bloque_id": d * 10 + h + 1, "dia": dia,
+        "hora_inicio": hora(7 + h), "hora_fin": hora(9 + h),
+    } for d, dia in enumerate(DIAS) for h in range(10)]
+    aulas = [{"aula_id": i + 1, "capacidad": azar.choice((25, 30, 35, 40, 45, 50, 60, 80, 120))}
+             for i in range(n_aulas)]
+
+    # Un tercio de los docentes solo puede cuatro de los seis días
+    disponibilidad = {}
+    for docente_id in range(1, n_docentes + 1):
+        if docente_id % 3 == 0:
+            dias = set(azar.sample(DIAS, 4))
+            disponibilidad[docente_id] = {b["bloque_id"] for b in bloques if b["dia"] in dias}
+
+    oferta = [{
+        "curso_id": i + 1,
+        "seccion_id": 1 + i % 5,
+        "ciclo": CICLOS[(i // 5) % len(CICLOS)],
+        "docente_id": 1 + azar.randrange(n_docentes),
+        "cantidad_estudiantes": azar.randint(15, 110),
+        "bloques": 2 if azar.random() < 0.6 else 1,
+    } for i in range(n_cursos)]
+    return oferta, bloques, aulas, disponibilidad
+
+
+def comprobar(resultado, oferta, bloques, aulas, disponibilidad):
+    """Errores del resultado (lista vacía si todo cumple)."""
+    por_bloque = {b["bloque_id"]: b for b in bloques}
+    capacidad = {a["aula_id"]: a["capacidad"] for a in aulas}
+    errores = []
+    filas = []
+    por_item = {}
+    for i, a in enumerate(resultado["asignadas"]):
+        b = por_bloque[a["bloque_id"]]
+        filas.append(dict(a, asignacion_id=i + 1, ciclo=oferta[a["item"]]["ciclo"],
+                          dia=b["dia"], hora_inicio=b["hora_inicio"], hora_fin=b["hora_fin"]))
+        if capacidad[a["aula_id"]] < a["cantidad_estudiantes"]:
+            errores.append(f"capacidad: sesión {a['sesion']}")
+        permitidos = disponibilidad.get(a["docente_id"])
+        if permitidos is not None and a["bloque_id"] not in permitidos:
+            errores.append(f"disponibilidad: sesión {a['sesion']}")
+        por_item.setdefault(a["item"], []).append(a["bloque_id"])
+    for item, ids in por_item.items():
+        if len(ids) != len(set(ids)):
+            errores.append(f"dos bloques iguales: curso {item}")
+    cruces = conflictos.validar_horario(filas)
+    if cruces:
+        errores.append(f"{len(cruces)} cruces")
+    return errores
+
+
+def fila_tabla(caso, resultado):
+    e = resultado["estadisticas"]
+    return [caso, e["sesiones"], e["asignadas"], e["sin_asignar"], e["movidas"],
+            e["iteraciones_reparacion"], f"{e['segundos']:.2f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cursos", type=int, default=500)
+    parser.add_argument("--aulas", type=int, default=150)
+    parser.add_argument("--docentes", type=int, default=200)
+    parser.add_argument("--tiempo", type=float, default=50.0)
+    args = parser.parse_args()
+
+    oferta, bloques, aulas, disponibilidad = datos_sinteticos(args.cursos, args.aulas, args.docentes)
+
+    inicio = time.perf_counter()
+    generador = Generador(oferta, bloques, aulas, disponibilidad, semilla=1)
+    resultado = generador.resolver(tiempo_max=args.tiempo)
+    total = time.perf_counter() - inicio
+    errores = comprobar(resultado, oferta, bloques, aulas, disponibilidad)
+    filas = [fila_tabla("desde cero", resultado)]
+
+    # Cambia una restricción: el aula más usada deja de estar operativa y un
+    # docente con clases ya no puede el día de su primera sesión
+    uso = {}
+    for a in resultado["asignadas"]:
+        uso[a["aula_id"]] = uso.get(a["aula_id"], 0) + 1
+    fuera = max(uso, key=uso.get)
+    aulas_2 = [a for a in aulas if a["aula_id"] != fuera]
+    primera = resultado["asignadas"][0]
+    dia = next(b["dia"] for b in bloques if b["bloque_id"] == primera["bloque_id"])
+    disponibilidad_2 = dict(disponibilidad)
+    disponibilidad_2[primera["docente_id"]] = {
+        b["bloque_id"] for b in bloques
+        if b["dia"] != dia and b["bloque_id"] in disponibilidad.get(primera["docente_id"], {b["bloque_id"]})
+    }
+    previo = {a["sesion"]: (a["bloque_id"], a["aula_id"]) for a in resultado["asignadas"]}
+    afectadas = sum(1 for a in resultado["asignadas"]
+                    if a["aula_id"] == fuera or a["docente_id"] == primera["docente_id"])
+
+    inicio_2 = time.perf_counter()
+    incremental = Generador(oferta, bloques, aulas_2, disponibilidad_2, semilla=1).resolver(
+        tiempo_max=args.tiempo, previo=previo
+    )
+    total_2 = time.perf_counter() - inicio_2
+    errores += comprobar(incremental, oferta, bloques, aulas_2, disponibilidad_2)
+    filas.append(fila_tabla("incremental", incremental))
+
+    print(f"\n{args.cursos} cursos x {len(bloques)} bloques x {args.aulas} aulas, "
+          f"{args.docentes} docentes, tiempo máximo {args.tiempo:.0f} s")
+    imprimir_tabla(["caso", "sesiones", "asignadas", "sin asignar", "movidas", "reparación", "s búsqueda"], filas)
+    print(f"\ntotal desde cero (con preparación): {total:.2f} s; "
+          f"incremental: {total_2:.2f} s tocando {afectadas} sesiones afectadas")
+    motivos = {}
+    for s in incremental["sin_asignar"]:
+        motivos[s["motivo"]] = motivos.get(s["motivo"], 0) + 1
+    if motivos:
+        print(f"sin asignar por motivo: {motivos}")
+
+    if total >= 60:
+        errores.append(f"desde cero tardó {total:.1f} s (>= 60 s)")
+    if errores:
+        for e in errores:
+            print(f"❌ {e}")
+        raise SystemExit(1)
+    print("✅ sin cruces; capacidad, disponibilidad y regla de dos bloques respetadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# ============================================
+# bench_hash.py
+# ============================================
+# Logins por segundo por núcleo para cada política de hash de
+# utils/security.py (bcrypt con distintos costos y argon2id si argon2-cffi
+# está instalado), más el throughput con el pool de verificación y con la
+# caché de logins correctos. No usa la base de datos.
+#
+#   python -m benchmarks.bench_hash [--verificaciones 20] [--hilos 4]
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.comun import cronometrar, imprimir_tabla
+from utils import security
+
+CONTRASENA = "Clave-Temporal-2025"
+
+POLITICAS = [
+    ("bcrypt costo 10", {"esquema": "bcrypt", "bcrypt_rounds": 10}),
+    ("bcrypt costo 11", {"esquema": "bcrypt", "bcrypt_rounds": 11}),
+    ("bcrypt costo 12", {"esquema": "bcrypt", "bcrypt_rounds": 12}),
+    ("argon2id t=2 m=19MiB", {"esquema": "argon2id", "argon2_time_cost": 2, "argon2_memory_cost": 19456}),
+    ("argon2id t=3 m=64MiB", {"esquema": "argon2id", "argon2_time_cost": 3, "argon2_memory_cost": 65536}),
+]
+
+
+def logins_concurrentes(hashed, total, clientes):
+    """Simula `clientes` requests concurrentes haciendo `total` logins."""
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as pool:
+        list(pool.map(lambda _: security.verificar_login(CONTRASENA, hashed), range(total)))
+    return total / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verificaciones", type=int, default=20)
+    parser.add_argument("--hilos", type=int, default=4, help="HASH_HILOS del pool")
+    parser.add_argument("--clientes", type=int, default=16)
+    args = parser.parse_args()
+
+    filas = []
+    for nombre, politica in POLITICAS:
+        security.configurar(hilos=args.hilos, cache_ttl=0, **politica)
+        if politica["esquema"] == "argon2id" and security._argon2 is None:
+            filas.append([nombre, "-", "-", "-", "-", "argon2-cffi no instalado"])
+            continue
+
+        hashed = security.hash_password(CONTRASENA)
+        mediana, p95 = cronometrar(
+            lambda: security.verify_password(CONTRASENA, hashed),
+            repeticiones=args.verificaciones, calentamiento=1
+        )
+        en_pool = logins_concurrentes(hashed, args.verificaciones * 2, args.clientes)
+
+        security.configurar(hilos=args.hilos, cache_ttl=300, **politica)
+        security.verificar_login(CONTRASENA, hashed)  # primer login: llena la caché
+        con_cache = logins_concurrentes(hashed, 2000, args.clientes)
+
+        filas.append([
+            nombre, f"{mediana:.1f}", f"{p95:.1f}", f"{1000 / mediana:.1f}",
+            f"{en_pool:.1f}", f"{con_cache:.0f}"
+        ])
+
+    print(f"pool de verificación: {args.hilos} hilos, {args.clientes} clientes concurrentes")
+    imprimir_tabla(
+        ["política", "ms mediana", "ms p95", "logins/s por núcleo",
+         f"logins/s pool ({args.hilos} hilos)", "logins/s con caché"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# ============================================
+# bench_importacion_alumnos.py
+# ============================================
+# Tiempo por fase de la importación masiva (routes/admin/importacion_alumnos.py)
+# para un archivo sintético de N alumnos, sobre tablas TEMP:
+#   lectura CSV → validación → duplicados (= ANY) → bcrypt en hilos → INSERT por lotes
+#   (incluye encolar los correos de credenciales)
+# Objetivo: 10.000 filas en menos de un minuto.
+#
+#   python -m benchmarks.bench_importacion_alumnos [--filas 10000] [--hilos 8] [--rounds 8]
+import argparse
+import time
+
+from benchmarks.comun import conectar, imprimir_tabla
+from routes.admin.importacion_alumnos import (
+    buscar_existentes, descartar_existentes, hashear_contrasenas,
+    insertar_lote, leer_csv, validar_filas
+)
+
+ENCABEZADO = ("correo_institucional,correo_personal,nombres,apellido_paterno,"
+              "apellido_materno,dni,telefono,codigo_universitario,ciclo_ingreso")
+
+
+def crear_esquema(cur):
+    cur.execute("""
+        CREATE TEMP TABLE usuario (
+            usuario_id SERIAL PRIMARY KEY, correo TEXT UNIQUE, contrasena TEXT, estado TEXT
+        );
+        CREATE TEMP TABLE usuario_rol (usuario_id INT, rol_id INT);
+        CREATE TEMP TABLE persona (
+            persona_id SERIAL PRIMARY KEY, usuario_id INT, nombres TEXT,
+            apellidos TEXT, dni TEXT UNIQUE, telefono TEXT
+        );
+        CREATE TEMP TABLE estudiante (
+            estudiante_id SERIAL PRIMARY KEY, codigo_universitario TEXT UNIQUE,
+            escuela_id INT, persona_id INT, ciclo_actual TEXT
+        );
+        CREATE TEMP TABLE correo_saliente (
+            correo_id BIGSERIAL PRIMARY KEY, destinatario TEXT, asunto TEXT,
+            html TEXT, cabeceras JSONB
+        );
+    """)
+
+
+def generar_csv(n):
+    lineas = [ENCABEZADO]
+    for i in range(n):
+        lineas.append(
+            f"a{i}@alumnounfv.edu.pe,p{i}@gmail.com,Nombre{i},Paterno{i},Materno{i},"
+            f"{10000000 + i},{900000000 + i},2025{i:06d},I"
+        )
+    return "\n".join(lineas).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--lote", type=int, default=500)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=8)
+    args = parser.parse_args()
+
+    conn = conectar()
+    cur = conn.cursor()
+    crear_esquema(cur)
+    conn.commit()
+
+    contenido = generar_csv(args.filas)
+    tiempos = []
+
+    def fase(nombre, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append([nombre, f"{(time.perf_counter() - inicio) * 1000:.0f}"])
+        return resultado
+
+    filas = fase("lectura csv", lambda: leer_csv(contenido))
+    validas, errores = fase("validación", lambda: validar_filas(filas, {1}))
+    validas = fase("duplicados en BD", lambda: descartar_existentes(
+        validas, buscar_existentes(cur, validas), errores))
+    fase(f"bcrypt ({args.hilos} hilos, rounds={args.rounds})",
+         lambda: hashear_contrasenas(validas, args.hilos, args.rounds))
+
+    def insertar_todo():
+        for i in range(0, len(validas), args.lote):
+            insertar_lote(cur, validas[i:i + args.lote], 1)
+            conn.commit()
+
+    fase(f"insert (lotes de {args.lote})", insertar_todo)
+
+    total_ms = sum(float(t[1]) for t in tiempos)
+    tiempos.append(["TOTAL", f"{total_ms:.0f}"])
+    cur.close()
+    conn.close()
+
+    print(f"{args.filas} filas, {len(errores)} con errores")
+    imprimir_tabla(["fase", "ms"], tiempos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# ============================================
+# bench_informe_asistencia.py
+# ============================================
+# Compara el informe de asistencia anterior (una consulta por estudiante)
+# con construir_informe() (matriz completa en una sola consulta) para
+# secciones de 30, 100 y 500 estudiantes.
+#
+#   python -m benchmarks.bench_informe_asistencia [--sesiones 32]
+import argparse
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database.asistencia_resumen import reconstruir
+from routes.docentes.informe_asistencia import (
+    construir_informe, obtener_curso, obtener_sesiones
+)
+
+ESTADOS = ['Presente', 'Presente', 'Presente', 'Ausente', 'Tardanza']
+
+
+def crear_esquema(cur):
+    cur.execute("""
+        CREATE TEMP TABLE curso (curso_id INT PRIMARY KEY, nombre TEXT);
+        CREATE TEMP TABLE secciones (seccion_id INT PRIMARY KEY, codigo TEXT);
+        CREATE TEMP TABLE asignaciones (
+            asignacion_id INT PRIMARY KEY, curso_id INT, seccion_id INT, docente_id INT
+        );
+        CREATE TEMP TABLE persona (persona_id INT PRIMARY KEY, nombres TEXT, apellidos TEXT);
+        CREATE TEMP TABLE estudiante (
+            estudiante_id INT PRIMARY KEY, persona_id INT, codigo_universitario TEXT
+        );
+        CREATE TEMP TABLE matriculas (
+            matricula_id INT PRIMARY KEY, estudiante_id INT, asignacion_id INT, estado TEXT
+        );
+        CREATE INDEX ON matriculas (asignacion_id);
+        CREATE TEMP TABLE sesion_clase (
+            sesion_id INT PRIMARY KEY, curso_id INT, seccion_id INT,
+            fecha DATE, hora_inicio TIME, hora_fin TIME
+        );
+        CREATE TEMP TABLE asistencia (
+            asistencia_id SERIAL PRIMARY KEY, sesion_id INT, matricula_id INT, estado TEXT
+        );
+        CREATE INDEX ON asistencia (matricula_id);
+        CREATE TEMP TABLE asistencia_resumen (
+            matricula_id INT PRIMARY KEY,
+            presentes INT NOT NULL DEFAULT 0, ausentes INT NOT NULL DEFAULT 0,
+            tardanzas INT NOT NULL DEFAULT 0, total INT NOT NULL DEFAULT 0,
+            actualizado TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def poblar(cur, asignacion_id, n_estudiantes, n_sesiones):
+    """Una asignación propia por tamaño de sección (ids separados por bloques)."""
+    base = asignacion_id * 100000
+    cur.execute("INSERT INTO curso VALUES (%s, %s)", (asignacion_id, f"Curso {asignacion_id}"))
+    cur.execute("INSERT INTO secciones VALUES (%s, 'A')", (asignacion_id,))
+    cur.execute("INSERT INTO asignaciones VALUES (%s, %s, %s, 1)",
+                (asignacion_id, asignacion_id, asignacion_id))
+
+    for i in range(n_sesiones):
+        cur.execute(
+            "INSERT INTO sesion_clase VALUES (%s, %s, %s, DATE '2025-03-01' + %s, '08:00', '10:00')",
+            (base + i, asignacion_id, asignacion_id, i * 7)
+        )
+
+    for i in range(n_estudiantes):
+        pid = base + i
+        cur.execute("INSERT INTO persona VALUES (%s, %s, %s)", (pid, f"Nombre{i}", f"Apellido{i:04d}"))
+        cur.execute("INSERT INTO estudiante VALUES (%s, %s, %s)", (pid, pid, f"20{pid}"))
+        cur.execute("INSERT INTO matriculas VALUES (%s, %s, %s, 'ACTIVA')", (pid, pid, asignacion_id))
+
+    cur.execute("""
+        INSERT INTO asistencia (sesion_id, matricula_id, estado)
+        SELECT s.sesion_id, m.matricula_id, (%s::text[])[1 + floor(random() * 5)::int]
+        FROM sesion_clase s
+        JOIN asignaciones a ON a.curso_id = s.curso_id AND a.seccion_id = s.seccion_id
+        JOIN matriculas m ON m.asignacion_id = a.asignacion_id
+        WHERE a.asignacion_id = %s
+    """, (ESTADOS, asignacion_id))
+    reconstruir(cur)
+    cur.execute("ANALYZE")
+
+
+def informe_por_estudiante(cur, asignacion_id):
+    """Implementación anterior: una consulta de asistencias por estudiante."""
+    curso_info = obtener_curso(cur, asignacion_id)
+    sesiones = obtener_sesiones(cur, asignacion_id)
+    cur.execute("""
+        SELECT e.estudiante_id, p.nombres, p.apellidos, e.codigo_universitario, m.matricula_id
+        FROM matriculas m
+        JOIN estudiante e ON m.estudiante_id = e.estudiante_id
+        JOIN persona p ON e.persona_id = p.persona_id
+        WHERE m.asignacion_id = %s AND m.estado = 'ACTIVA'
+        ORDER BY p.apellidos, p.nombres
+    """, (asignacion_id,))
+
+    estudiantes = []
+    for row in cur.fetchall():
+        cur.execute("""
+            SELECT a.sesion_id, a.estado, sc.fecha
+            FROM asistencia a
+            JOIN sesion_clase sc ON a.sesion_id = sc.sesion_id
+            WHERE a.matricula_id = %s
+            ORDER BY sc.fecha ASC
+        """, (row[4],))
+        asistencias, total, presentes, ausentes, tardanzas = {}, 0, 0, 0, 0
+        for sesion_id, estado, _ in cur.fetchall():
+            asistencias[sesion_id] = estado
+            total += 1
+            presentes += estado == 'Presente'
+            ausentes += estado == 'Ausente'
+            tardanzas += estado == 'Tardanza'
+        estudiantes.append({
+            'estudiante_id': row[0], 'nombres': row[1], 'apellidos': row[2],
+            'codigo_universitario': row[3], 'matricula_id': row[4],
+            'asistencias': asistencias, 'total_sesiones': total,
+            'presentes': presentes, 'ausentes': ausentes, 'tardanzas': tardanzas,
+            'porcentaje': round((presentes / total * 100), 2) if total > 0 else 0
+        })
+
+    return {
+        'curso': {'nombre': curso_info[0], 'seccion': curso_info[1]},
+        'sesiones': sesiones,
+        'estudiantes': estudiantes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sesiones", type=int, default=32)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = conectar()
+    cur = conn.cursor()
+    crear_esquema(cur)
+
+    filas = []
+    for asignacion_id, n in enumerate((30, 100, 500), start=1):
+        poblar(cur, asignacion_id, n, args.sesiones)
+
+        anterior = informe_por_estudiante(cur, asignacion_id)
+        nuevo = construir_informe(cur, asignacion_id)
+        assert anterior == nuevo, f"Los informes difieren para {n} estudiantes"
+
+        t_loop, p95_loop = cronometrar(lambda: informe_por_estudiante(cur, asignacion_id), args.repeticiones)
+        t_matriz, p95_matriz = cronometrar(lambda: construir_informe(cur, asignacion_id), args.repeticiones)
+        filas.append((
+            n, args.sesiones,
+            f"{t_loop:.1f}", f"{p95_loop:.1f}",
+            f"{t_matriz:.1f}", f"{p95_matriz:.1f}",
+            f"{t_loop / t_matriz:.1f}x"
+        ))
+
+    conn.rollback()
+    conn.close()
+
+    imprimir_tabla(
+        ["estudiantes", "sesiones", "loop_ms", "loop_p95", "matriz_ms", "matriz_p95", "mejora"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
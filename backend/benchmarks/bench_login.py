@@ -0,0 +1,109 @@
+# ============================================
+# bench_login.py
+# ============================================
+# Tiempo de BD del login (sin bcrypt) para alumno y docente:
+#   - anterior: usuario+rol, luego perfil, luego estado (hasta 3 consultas)
+#   - nuevo:    consultar_login(), una sola sentencia preparada
+# Sobre tablas TEMP con N usuarios.
+#
+#   python -m benchmarks.bench_login [--usuarios 50000]
+import argparse
+import random
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database.pool import PooledConnection
+from routes.auth_routes import consultar_login
+
+
+def crear_esquema(cur, n):
+    cur.execute("""
+        CREATE TEMP TABLE usuario (usuario_id INT PRIMARY KEY, correo TEXT UNIQUE, contrasena TEXT, estado TEXT);
+        CREATE TEMP TABLE rol (rol_id INT PRIMARY KEY, nombre_rol TEXT);
+        CREATE TEMP TABLE usuario_rol (usuario_id INT, rol_id INT);
+        CREATE INDEX ON usuario_rol (usuario_id);
+        CREATE TEMP TABLE persona (persona_id INT PRIMARY KEY, usuario_id INT, nombres TEXT, apellidos TEXT);
+        CREATE INDEX ON persona (usuario_id);
+        CREATE TEMP TABLE estudiante (estudiante_id INT PRIMARY KEY, persona_id INT, escuela_id INT);
+        CREATE INDEX ON estudiante (persona_id);
+        CREATE TEMP TABLE docente (docente_id INT PRIMARY KEY, persona_id INT, estado BOOLEAN, escuela_id INT);
+        CREATE INDEX ON docente (persona_id);
+        CREATE TEMP TABLE administrador (persona_id INT PRIMARY KEY, escuela_id INT);
+
+        INSERT INTO rol VALUES (1, 'Alumno'), (2, 'Docente');
+        INSERT INTO usuario SELECT i, 'u' || i || '@unfv.edu.pe', '$2b$12$x', 'ACTIVO' FROM generate_series(1, %(n)s) i;
+        INSERT INTO usuario_rol SELECT i, CASE WHEN i %% 10 = 0 THEN 2 ELSE 1 END FROM generate_series(1, %(n)s) i;
+        INSERT INTO persona SELECT i, i, 'Nombre' || i, 'Apellido' || i FROM generate_series(1, %(n)s) i;
+        INSERT INTO estudiante SELECT i, i, 1 FROM generate_series(1, %(n)s) i WHERE i %% 10 <> 0;
+        INSERT INTO docente SELECT i, i, TRUE, 1 FROM generate_series(1, %(n)s) i WHERE i %% 10 = 0;
+        ANALYZE;
+    """, {"n": n})
+
+
+def login_anterior(cur, correo, rol):
+    cur.execute("""
+        SELECT u.usuario_id, u.contrasena, r.nombre_rol
+        FROM usuario u
+        JOIN usuario_rol ur ON u.usuario_id = ur.usuario_id
+        JOIN rol r ON ur.rol_id = r.rol_id
+        WHERE u.correo = %s
+    """, (correo,))
+    user_id, _, _ = cur.fetchone()
+    if rol == "Alumno":
+        cur.execute("""
+            SELECT e.estudiante_id, p.nombres, p.apellidos
+            FROM estudiante e JOIN persona p ON e.persona_id = p.persona_id
+            WHERE p.usuario_id = %s
+        """, (user_id,))
+        estudiante_id = cur.fetchone()[0]
+        cur.execute("""
+            SELECT u.estado
+            FROM usuario u
+            JOIN persona p ON u.usuario_id = p.usuario_id
+            JOIN estudiante e ON p.persona_id = e.persona_id
+            WHERE e.estudiante_id = %s
+        """, (estudiante_id,))
+        cur.fetchone()
+    else:
+        cur.execute("""
+            SELECT d.docente_id, p.nombres, p.apellidos, d.estado
+            FROM docente d JOIN persona p ON d.persona_id = p.persona_id
+            WHERE p.usuario_id = %s
+        """, (user_id,))
+        cur.fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--usuarios", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=500)
+    args = parser.parse_args()
+
+    conn = conectar(connection_factory=PooledConnection)
+    cur = conn.cursor()
+    crear_esquema(cur, args.usuarios)
+    conn.commit()
+
+    alumnos = [i for i in range(1, args.usuarios + 1) if i % 10]
+    docentes = [i for i in range(10, args.usuarios + 1, 10)]
+
+    filas = []
+    for rol, ids in (("Alumno", alumnos), ("Docente", docentes)):
+        def anterior():
+            login_anterior(cur, f"u{random.choice(ids)}@unfv.edu.pe", rol)
+
+        def nuevo():
+            consultar_login(cur, f"u{random.choice(ids)}@unfv.edu.pe", rol)
+
+        ant = cronometrar(anterior, repeticiones=args.repeticiones, calentamiento=20)
+        nue = cronometrar(nuevo, repeticiones=args.repeticiones, calentamiento=20)
+        filas.append([rol, "anterior (2-3 consultas)", f"{ant[0]:.3f}", f"{ant[1]:.3f}"])
+        filas.append([rol, "nuevo (1 preparada)", f"{nue[0]:.3f}", f"{nue[1]:.3f}"])
+        conn.rollback()
+
+    cur.close()
+    conn.close()
+    imprimir_tabla(["rol", "login", "ms mediana", "ms p95"], filas)
+
+
+if __name__ == "__main__":
+    main()
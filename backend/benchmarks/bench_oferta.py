@@ -0,0 +1,78 @@
+# ============================================
+# bench_oferta.py
+# ============================================
+# Listado de asignaciones disponibles para matrícula, por alumno:
+#   - antes:      el JOIN de 8 tablas por cada solicitud (preparado)
+#   - instantánea: database/oferta.py, la oferta del ciclo en caché más los
+#                 cupos superpuestos (región de TTL corto)
+# y cuánto cuesta reconstruir tras una invalidación (p. ej. al editar un
+# aula). Usa el esquema de bench_consultas_preparadas más cupo_asignacion,
+# sobre tablas TEMP.
+#
+#   python -m benchmarks.bench_oferta [--asignaciones 3000]
+import argparse
+import random
+
+from benchmarks.bench_consultas_preparadas import CICLOS, crear_esquema
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database import consultas, oferta
+from database.pool import PooledConnection
+from utils.cache import invalidar, region
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--asignaciones", type=int, default=3000)
+    parser.add_argument("--repeticiones", type=int, default=500)
+    args = parser.parse_args()
+
+    conn = conectar(connection_factory=PooledConnection)
+    cur = conn.cursor()
+    crear_esquema(cur, args.asignaciones)
+    cur.execute("""
+        CREATE TEMP TABLE cupo_asignacion (asignacion_id INT PRIMARY KEY, capacidad INT, ocupados INT);
+        INSERT INTO cupo_asignacion SELECT asignacion_id, 40, asignacion_id %% 41 FROM asignaciones;
+    """)
+    conn.commit()
+
+    def ciclos():
+        i = random.randrange(len(CICLOS) - 1)
+        return [CICLOS[i], CICLOS[i + 1]]
+
+    def antes():
+        consultas.ejecutar(cur, oferta.ASIGNACIONES_POR_CICLO, (ciclos(),))
+        cur.fetchall()
+
+    def instantanea():
+        oferta.oferta_para_ciclos(conn, ciclos())
+
+    def reconstruir():
+        invalidar("aulas")  # descarta la oferta de todos los ciclos
+        oferta.oferta_para_ciclos(conn, ciclos())
+
+    # Mismo contenido (sin los cupos agregados) que la consulta de antes
+    muestra = ["III", "IV"]
+    consultas.ejecutar(cur, oferta.ASIGNACIONES_POR_CICLO, (muestra,))
+    campos = [d[0] for d in cur.description]
+    esperado = sorted(tuple(f) for f in cur.fetchall())
+    obtenido = sorted(tuple(f[k] for k in campos) for f in oferta.oferta_para_ciclos(conn, muestra))
+    assert obtenido == esperado, "la instantánea no coincide con la consulta"
+
+    filas = []
+    for nombre, funcion in (
+        ("JOIN por solicitud", antes),
+        ("instantánea + cupos", instantanea),
+        ("reconstrucción tras invalidar", reconstruir),
+    ):
+        mediana, p95 = cronometrar(funcion, repeticiones=args.repeticiones, calentamiento=10)
+        filas.append([nombre, f"{mediana:.3f}", f"{p95:.3f}"])
+    imprimir_tabla(["listado por alumno", "ms mediana", "ms p95"], filas)
+    print(region("oferta").stats())
+
+    conn.rollback()
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# ============================================
+# bench_registro_asistencia.py
+# ============================================
+# Mide el guardado de una sesión de asistencia para una sección de 100
+# estudiantes con distinto volumen de historial:
+#   - anterior: un INSERT por estudiante + GROUP BY sobre todo el historial
+#   - nuevo:    INSERT multi-fila + contadores en asistencia_resumen
+#               (mantenidos por los triggers de la migración 002, que se
+#               instalan sobre las tablas TEMP y se deshacen al final)
+#
+#   python -m benchmarks.bench_registro_asistencia [--estudiantes 100]
+import argparse
+import os
+
+from benchmarks.comun import conectar, cronometrar, imprimir_tabla
+from database.asistencia_resumen import insertar_asistencias, matriculas_bajo_umbral
+
+ESTADOS = ['Presente', 'Presente', 'Presente', 'Ausente', 'Tardanza']
+MIGRACION_TRIGGERS = os.path.join(
+    os.path.dirname(__file__), "..", "database", "migraciones",
+    "002_asistencia_resumen_triggers.sql"
+)
+
+
+def crear_esquema(cur):
+    cur.execute("""
+        CREATE TEMP TABLE persona (persona_id INT PRIMARY KEY, nombres TEXT, apellidos TEXT);
+        CREATE TEMP TABLE estudiante (estudiante_id INT PRIMARY KEY, persona_id INT);
+        CREATE TEMP TABLE matriculas (
+            matricula_id INT PRIMARY KEY, estudiante_id INT, asignacion_id INT, estado TEXT
+        );
+        CREATE INDEX ON matriculas (asignacion_id);
+        CREATE TEMP TABLE asistencia (
+            asistencia_id SERIAL PRIMARY KEY, sesion_id INT, matricula_id INT,
+            estado TEXT, fecha_registro TIMESTAMP
+        );
+        CREATE INDEX ON asistencia (matricula_id);
+        CREATE TEMP TABLE asistencia_resumen (
+            matricula_id INT PRIMARY KEY,
+            presentes INT NOT NULL DEFAULT 0, ausentes INT NOT NULL DEFAULT 0,
+            tardanzas INT NOT NULL DEFAULT 0, total INT NOT NULL DEFAULT 0,
+            actualizado TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def poblar(cur, n_estudiantes, n_sesiones):
+    cur.execute("""
+        INSERT INTO persona SELECT i, 'Nombre' || i, 'Apellido' || i FROM generate_series(1, %s) i;
+        INSERT INTO estudiante SELECT i, i FROM generate_series(1, %s) i;
+        INSERT INTO matriculas SELECT i, i, 1, 'ACTIVA' FROM generate_series(1, %s) i;
+        INSERT INTO asistencia (sesion_id, matricula_id, estado, fecha_registro)
+        SELECT s, m, (%s::text[])[1 + floor(random() * 5)::int], NOW()
+        FROM generate_series(1, %s) s, generate_series(1, %s) m;
+        INSERT INTO asistencia_resumen (matricula_id, presentes, ausentes, tardanzas, total)
+        SELECT matricula_id,
+               COUNT(*) FILTER (WHERE estado = 'Presente'),
+               COUNT(*) FILTER (WHERE estado = 'Ausente'),
+               COUNT(*) FILTER (WHERE estado = 'Tardanza'),
+               COUNT(*)
+        FROM asistencia GROUP BY matricula_id;
+        ANALYZE;
+    """, (n_estudiantes, n_estudiantes, n_estudiantes, ESTADOS, n_sesiones, n_estudiantes))
+    with open(MIGRACION_TRIGGERS, encoding="utf-8") as f:
+        cur.execute(f.read())
+
+
+def registro_anterior(cur, sesion_id, asistencias):
+    for a in asistencias:
+        cur.execute("""
+            INSERT INTO asistencia (sesion_id, matricula_id, estado, fecha_registro)
+            VALUES (%s, %s, %s, NOW())
+        """, (sesion_id, a['matricula_id'], a['estado']))
+    cur.execute("""
+        SELECT m.matricula_id, p.nombres, p.apellidos,
+               COUNT(*) FILTER (WHERE a.estado = 'Presente'),
+               COUNT(*),
+               ROUND((COUNT(*) FILTER (WHERE a.estado = 'Presente')::numeric /
+                      NULLIF(COUNT(*), 0) * 100), 2) AS porcentaje
+        FROM matriculas m
+        JOIN estudiante e ON m.estudiante_id = e.estudiante_id
+        JOIN persona p ON e.persona_id = p.persona_id
+        LEFT JOIN asistencia a ON m.matricula_id = a.matricula_id
+        WHERE m.asignacion_id = 1
+        GROUP BY m.matricula_id, p.nombres, p.apellidos
+        HAVING ROUND((COUNT(*) FILTER (WHERE a.estado = 'Presente')::numeric /
+                      NULLIF(COUNT(*), 0) * 100), 2) < 70
+        ORDER BY porcentaje ASC
+    """)
+    return cur.fetchall()
+
+
+def registro_nuevo(cur, sesion_id, asistencias):
+    insertar_asistencias(cur, sesion_id, asistencias)
+    return matriculas_bajo_umbral(cur, 1)
+
+
+def en_savepoint(cur, funcion, *args):
+    """Ejecuta `funcion` y deshace sus cambios para no inflar el historial."""
+    cur.execute("SAVEPOINT bench")
+    funcion(cur, *args)
+    cur.execute("ROLLBACK TO SAVEPOINT bench")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--estudiantes", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = conectar()
+    cur = conn.cursor()
+    crear_esquema(cur)
+
+    asistencias = [
+        {'matricula_id': i, 'estado': ESTADOS[i % len(ESTADOS)]}
+        for i in range(1, args.estudiantes + 1)
+    ]
+
+    filas = []
+    sesiones_previas = 0
+    for n_sesiones in (10, 100, 1000):
+        poblar_hasta = n_sesiones - sesiones_previas
+        if sesiones_previas == 0:
+            poblar(cur, args.estudiantes, poblar_hasta)
+        else:
+            cur.execute("""
+                INSERT INTO asistencia (sesion_id, matricula_id, estado, fecha_registro)
+                SELECT s, m, (%s::text[])[1 + floor(random() * 5)::int], NOW()
+                FROM generate_series(%s, %s) s, generate_series(1, %s) m;
+                ANALYZE;
+            """, (ESTADOS, sesiones_previas + 1, n_sesiones, args.estudiantes))
+        sesiones_previas = n_sesiones
+        sesion_id = n_sesiones + 1
+
+        t_ant, p95_ant = cronometrar(
+            lambda: en_savepoint(cur, registro_anterior, sesion_id, asistencias), args.repeticiones)
+        t_nuevo, p95_nuevo = cronometrar(
+            lambda: en_savepoint(cur, registro_nuevo, sesion_id, asistencias), args.repeticiones)
+        filas.append((
+            args.estudiantes, n_sesiones,
+            f"{t_ant:.1f}", f"{p95_ant:.1f}",
+            f"{t_nuevo:.1f}", f"{p95_nuevo:.1f}"
+        ))
+
+    conn.rollback()
+    conn.close()
+
+    imprimir_tabla(
+        ["estudiantes", "sesiones_previas", "anterior_ms", "anterior_p95", "nuevo_ms", "nuevo_p95"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
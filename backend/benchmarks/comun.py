@@ -0,0 +1,53 @@
+# ============================================
+# comun.py – utilidades compartidas por los benchmarks
+# ============================================
+# Los benchmarks se ejecutan desde la carpeta backend/, por ejemplo:
+#   python -m benchmarks.bench_informe_asistencia
+# Usan las mismas variables DB_* del .env. Los datos sintéticos se crean en
+# tablas TEMP (que tapan a las reales solo dentro de esa sesión), así que no
+# se toca ningún dato real.
+import os
+import statistics
+import time
+
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def parametros_conexion():
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "database": os.getenv("DB_NAME", "NEWXOTRA"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASS", "valentina10"),
+        "connect_timeout": 5,
+    }
+
+
+def conectar(**kwargs):
+    return psycopg2.connect(**parametros_conexion(), **kwargs)
+
+
+def cronometrar(funcion, repeticiones=20, calentamiento=2):
+    """Ejecuta `funcion` varias veces y devuelve (mediana_ms, p95_ms)."""
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+    return statistics.median(tiempos), p95
+
+
+def imprimir_tabla(encabezados, filas):
+    anchos = [max(len(str(x)) for x in col) for col in zip(encabezados, *filas)]
+    linea = "  ".join(str(h).ljust(a) for h, a in zip(encabezados, anchos))
+    print(linea)
+    print("-" * len(linea))
+    for fila in filas:
+        print("  ".join(str(v).ljust(a) for v, a in zip(fila, anchos)))
@@ -0,0 +1,112 @@
+# ============================================
+# comandos.py – Comandos de mantenimiento (flask CLI)
+# ============================================
+#   flask --app app reconstruir-asistencia
+#   flask --app app verificar-asistencia
+#   flask --app app verificar-cupos [--reparar]
+#   flask --app app procesar-correos
+import time
+
+import click
+from flask import current_app
+
+from database.db import get_db
+from database import asistencia_resumen, cupos
+from utils import correo
+
+
+def registrar_comandos(app):
+
+    @app.cli.command("reconstruir-asistencia")
+    def reconstruir_asistencia():
+        """Recalcula asistencia_resumen desde la tabla asistencia."""
+        conn = get_db()
+        cur = conn.cursor()
+        try:
+            actualizadas, eliminadas = asistencia_resumen.reconstruir(cur)
+            conn.commit()
+            click.echo(f"✅ asistencia_resumen reconstruida: {actualizadas} matrículas, "
+                       f"{eliminadas} filas huérfanas eliminadas")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    @app.cli.command("verificar-asistencia")
+    @click.option("--reparar", is_flag=True, help="Reconstruye el resumen si hay diferencias.")
+    def verificar_asistencia(reparar):
+        """Compara asistencia_resumen con un conteo directo de asistencia."""
+        conn = get_db()
+        cur = conn.cursor()
+        try:
+            diferencias = asistencia_resumen.verificar(cur)
+            if not diferencias:
+                click.echo("✅ asistencia_resumen es consistente")
+                return
+
+            click.echo(f"⚠️ {len(diferencias)} matrículas con contadores distintos:")
+            for d in diferencias[:50]:
+                click.echo(f"   matricula_id={d['matricula_id']} resumen={d['resumen']} real={d['real']}")
+
+            if reparar:
+                asistencia_resumen.reconstruir(cur)
+                conn.commit()
+                click.echo("✅ asistencia_resumen reconstruida")
+            else:
+                raise SystemExit(1)
+        finally:
+            conn.rollback()
+            cur.close()
+
+    @app.cli.command("verificar-cupos")
+    @click.option("--reparar", is_flag=True, help="Recalcula los contadores si hay diferencias.")
+    def verificar_cupos(reparar):
+        """Compara cupo_asignacion con las matrículas ACTIVA de cada asignación."""
+        conn = get_db()
+        cur = conn.cursor()
+        try:
+            diferencias = cupos.verificar(cur)
+            if not diferencias:
+                click.echo("✅ cupo_asignacion es consistente")
+                return
+
+            click.echo(f"⚠️ {len(diferencias)} asignaciones con contadores distintos:")
+            for d in diferencias[:50]:
+                click.echo(f"   asignacion_id={d['asignacion_id']} contador={d['contador']} "
+                           f"real={d['real']} capacidad={d['capacidad']}")
+
+            if reparar:
+                cupos.reconstruir(cur)
+                conn.commit()
+                click.echo("✅ cupo_asignacion recalculada")
+            else:
+                raise SystemExit(1)
+        finally:
+            conn.rollback()
+            cur.close()
+
+    @app.cli.command("procesar-correos")
+    @click.option("--una-vez", is_flag=True, help="Vacía la bandeja y termina.")
+    def procesar_correos(una_vez):
+        """Envía los correos pendientes de correo_saliente (usar con MAIL_HILOS=0)."""
+        config = current_app.config
+        backend = correo.crear_backend(config)
+        total_enviados = total_fallidos = 0
+        try:
+            while True:
+                enviados, fallidos = correo.procesar_lote(get_db(), backend, config)
+                total_enviados += enviados
+                total_fallidos += fallidos
+                if enviados or fallidos:
+                    click.echo(f"📧 enviados={total_enviados} fallidos={total_fallidos}")
+                    continue
+                if una_vez:
+                    break
+                backend.cerrar()
+                time.sleep(config.get("MAIL_INTERVALO", 5))
+        finally:
+            backend.cerrar()
+        stats = correo.estadisticas()
+        click.echo(f"✅ Bandeja procesada: {total_enviados} enviados, {total_fallidos} con error "
+                   f"({stats['mensajes_por_segundo']} msg/s)")
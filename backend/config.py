@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 # Carga las variables del archivo .env
@@ -16,14 +17,78 @@ class Config:
     TESTING = False
 
     # --- Configuración de Flask-Mail ---
-    MAIL_SERVER = "smtp.gmail.com"
-    MAIL_PORT = 587
-    MAIL_USE_TLS = True
-    MAIL_USE_SSL = False
+    MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
+    MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
+    MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "true").lower() in ("1", "true", "si")
+    MAIL_USE_SSL = os.getenv("MAIL_USE_SSL", "false").lower() in ("1", "true", "si")
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_USERNAME") # ✅ usa solo el correo, no tupla
 
+    # --- Bandeja de salida de correos (utils/correo.py) ---
+    MAIL_BACKEND = os.getenv("MAIL_BACKEND", "smtp")  # smtp | consola | memoria
+    MAIL_HILOS = int(os.getenv("MAIL_HILOS", 1))  # trabajadores en el proceso web (0 = solo CLI)
+    MAIL_LOTE = int(os.getenv("MAIL_LOTE", 20))  # correos reclamados por vuelta
+    MAIL_INTERVALO = float(os.getenv("MAIL_INTERVALO", 5))  # segundos entre revisiones
+    MAIL_MAX_INTENTOS = int(os.getenv("MAIL_MAX_INTENTOS", 5))
+    MAIL_REINTENTO_BASE = float(os.getenv("MAIL_REINTENTO_BASE", 30))  # segundos, se duplica por intento
+    MAIL_LIMITE_POR_MINUTO = int(os.getenv("MAIL_LIMITE_POR_MINUTO", 60))  # todos los hilos del proceso (0 = sin límite)
+    MAIL_MAX_POR_CONEXION = int(os.getenv("MAIL_MAX_POR_CONEXION", 100))  # mensajes antes de reconectar
+
+    # --- Pool de conexiones PostgreSQL ---
+    DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 2))
+    DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # segundos esperando una conexión libre
+    DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", 30))  # ping si estuvo ociosa más que esto
+
+    # --- Logs (utils/logs.py) ---
+    LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO")
+    LOG_FORMATO = os.getenv("LOG_FORMATO", "json")  # json | texto
+    LOG_MUESTREO = float(os.getenv("LOG_MUESTREO", 1.0))  # fracción de requests con logs DEBUG/INFO
+    LOG_COLA_MAX = int(os.getenv("LOG_COLA_MAX", 10000))  # registros en espera antes de descartar
+
+    # --- Métricas por ruta (utils/metricas.py, /metrics) ---
+    METRICAS_ACTIVAS = os.getenv("METRICAS_ACTIVAS", "true").lower() in ("1", "true", "si")
+    METRICAS_UMBRAL_CONSULTAS = int(os.getenv("METRICAS_UMBRAL_CONSULTAS", 20))  # más consultas = posible N+1
+
+    # --- Caché de catálogos (escuelas, ubigeo, aulas, bloques, ...) ---
+    CACHE_TTL = float(os.getenv("CACHE_TTL", 300))  # segundos
+    ELEGIBILIDAD_TTL = float(os.getenv("ELEGIBILIDAD_TTL", 120))  # perfil de matrícula por alumno (segundos)
+    OFERTA_CUPOS_TTL = float(os.getenv("OFERTA_CUPOS_TTL", 2))  # cupos mostrados en la oferta de matrícula (segundos)
+
+    # --- Generador de horarios (database/generador_horarios.py) ---
+    GENERADOR_TIEMPO_MAX = float(os.getenv("GENERADOR_TIEMPO_MAX", 30))  # segundos de búsqueda como máximo
+
+    # --- Coalescencia de GET idénticos (utils/coalescencia.py) ---
+    COALESCENCIA_ACTIVA = os.getenv("COALESCENCIA_ACTIVA", "true").lower() in ("1", "true", "si")
+    COALESCENCIA_ESPERA_MAX = float(os.getenv("COALESCENCIA_ESPERA_MAX", 10))  # segundos esperando al líder
+    COALESCENCIA_DESACTIVAR = os.getenv("COALESCENCIA_DESACTIVAR", "")  # nombres separados por coma
+
+    # --- Contraseñas (utils/security.py) ---
+    PASSWORD_ESQUEMA = os.getenv("PASSWORD_ESQUEMA", "bcrypt")  # bcrypt | argon2id (requiere argon2-cffi)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+    HASH_HILOS = int(os.getenv("HASH_HILOS", 0))  # hilos para verificar (0 = mitad de los núcleos)
+    HASH_COLA_MAX = int(os.getenv("HASH_COLA_MAX", 64))  # logins esperando antes de responder 503
+    LOGIN_CACHE_TTL = float(os.getenv("LOGIN_CACHE_TTL", 300))  # segundos (0 = sin caché)
+
+    # --- Tokens de sesión JWT (utils/tokens.py) ---
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")  # obligatoria: init_tokens falla sin ella
+    # Apagado hasta que el frontend envíe "Authorization: Bearer" (ver .env.example)
+    JWT_EXIGIR = os.getenv("JWT_EXIGIR", "false").lower() in ("1", "true", "si")
+    # /metrics y /*/stats piden token de SuperAdmin; true = también desde loopback sin token
+    OBSERVABILIDAD_LOCAL = os.getenv("OBSERVABILIDAD_LOCAL", "false").lower() in ("1", "true", "si")
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTOS", 15)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv("JWT_REFRESH_DIAS", 7)))
+    JWT_TOKEN_LOCATION = ["headers"]
+
+    # --- Importación masiva de alumnos (CSV / XLSX) ---
+    IMPORTACION_LOTE = int(os.getenv("IMPORTACION_LOTE", 500))  # filas por transacción
+    IMPORTACION_HILOS = int(os.getenv("IMPORTACION_HILOS", 8))  # hilos para bcrypt
+    IMPORTACION_BCRYPT_ROUNDS = int(os.getenv("IMPORTACION_BCRYPT_ROUNDS", 8))  # solo contraseñas temporales
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
@@ -0,0 +1,117 @@
+from psycopg2.extras import execute_values
+
+# Contadores por matrícula en la tabla asistencia_resumen
+# (ver database/migraciones/001_asistencia_resumen.sql). Los triggers de
+# 002_asistencia_resumen_triggers.sql los mantienen al día ante cualquier
+# INSERT / UPDATE / DELETE sobre asistencia.
+UMBRAL_ASISTENCIA = 70
+
+
+def insertar_asistencias(cur, sesion_id, asistencias):
+    """Inserta todas las asistencias de la sesión en un solo INSERT multi-fila."""
+    execute_values(cur, """
+        INSERT INTO asistencia (sesion_id, matricula_id, estado, fecha_registro)
+        VALUES %s
+    """, [
+        (sesion_id, a['matricula_id'], a['estado'])
+        for a in asistencias
+    ], template="(%s, %s, %s, NOW())", page_size=1000)
+    return len(asistencias)
+
+
+def matriculas_bajo_umbral(cur, asignacion_id, umbral=UMBRAL_ASISTENCIA):
+    """
+    Matrículas de la asignación con menos de `umbral` % de asistencia,
+    leídas de los contadores (no depende de cuántas sesiones haya).
+    """
+    cur.execute("""
+        SELECT
+            m.matricula_id,
+            p.nombres,
+            p.apellidos,
+            COALESCE(r.presentes, 0) AS presentes,
+            COALESCE(r.total, 0) AS total_sesiones,
+            COALESCE(ROUND(r.presentes::numeric / NULLIF(r.total, 0) * 100, 2), 0) AS porcentaje
+        FROM matriculas m
+        JOIN estudiante e ON m.estudiante_id = e.estudiante_id
+        JOIN persona p ON e.persona_id = p.persona_id
+        LEFT JOIN asistencia_resumen r ON r.matricula_id = m.matricula_id
+        WHERE m.asignacion_id = %s
+        AND COALESCE(ROUND(r.presentes::numeric / NULLIF(r.total, 0) * 100, 2), 0) < %s
+        ORDER BY porcentaje ASC
+    """, (asignacion_id, umbral))
+
+    return [{
+        'matricula_id': row[0],
+        'nombre': row[1],
+        'apellido': row[2],
+        'presentes': row[3],
+        'total_sesiones': row[4],
+        'porcentaje': float(row[5])
+    } for row in cur.fetchall()]
+
+
+# --------------------------
+# 🔹 Mantenimiento
+# --------------------------
+SQL_CONTEO_REAL = """
+    SELECT
+        matricula_id,
+        COUNT(*) FILTER (WHERE estado = 'Presente') AS presentes,
+        COUNT(*) FILTER (WHERE estado = 'Ausente') AS ausentes,
+        COUNT(*) FILTER (WHERE estado = 'Tardanza') AS tardanzas,
+        COUNT(*) AS total
+    FROM asistencia
+    GROUP BY matricula_id
+"""
+
+
+def reconstruir(cur):
+    """Recalcula todos los contadores desde la tabla asistencia."""
+    cur.execute("LOCK TABLE asistencia IN SHARE MODE")
+    cur.execute(f"""
+        INSERT INTO asistencia_resumen AS r (matricula_id, presentes, ausentes, tardanzas, total)
+        {SQL_CONTEO_REAL}
+        ON CONFLICT (matricula_id) DO UPDATE SET
+            presentes   = EXCLUDED.presentes,
+            ausentes    = EXCLUDED.ausentes,
+            tardanzas   = EXCLUDED.tardanzas,
+            total       = EXCLUDED.total,
+            actualizado = NOW()
+    """)
+    actualizadas = cur.rowcount
+    cur.execute("""
+        DELETE FROM asistencia_resumen r
+        WHERE NOT EXISTS (SELECT 1 FROM asistencia a WHERE a.matricula_id = r.matricula_id)
+    """)
+    return actualizadas, cur.rowcount
+
+
+def verificar(cur):
+    """
+    Compara los contadores con un conteo directo sobre asistencia.
+    Devuelve las matrículas que no coinciden (lista vacía = consistente).
+    """
+    cur.execute(f"""
+        SELECT
+            COALESCE(r.matricula_id, c.matricula_id),
+            r.presentes, r.ausentes, r.tardanzas, r.total,
+            COALESCE(c.presentes, 0), COALESCE(c.ausentes, 0),
+            COALESCE(c.tardanzas, 0), COALESCE(c.total, 0)
+        FROM asistencia_resumen r
+        FULL OUTER JOIN ({SQL_CONTEO_REAL}) c ON c.matricula_id = r.matricula_id
+        WHERE (r.presentes, r.ausentes, r.tardanzas, r.total)
+              IS DISTINCT FROM
+              (COALESCE(c.presentes, 0), COALESCE(c.ausentes, 0),
+               COALESCE(c.tardanzas, 0), COALESCE(c.total, 0))
+        ORDER BY 1
+    """)
+    return [{
+        'matricula_id': row[0],
+        'resumen': None if row[4] is None else {
+            'presentes': row[1], 'ausentes': row[2], 'tardanzas': row[3], 'total': row[4]
+        },
+        'real': {
+            'presentes': row[5], 'ausentes': row[6], 'tardanzas': row[7], 'total': row[8]
+        }
+    } for row in cur.fetchall()]
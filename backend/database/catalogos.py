@@ -0,0 +1,141 @@
+from psycopg2.extras import RealDictCursor
+
+from database.db import get_db
+from utils.cache import cacheado
+
+# ============================================
+# Catálogos (datos que casi nunca cambian)
+# ============================================
+# Todas las consultas pasan por la caché de utils/cache.py. Las listas
+# devueltas se comparten entre requests: no se deben modificar.
+# Regiones e invalidación:
+#   "escuelas", "ubigeo"  -> sin rutas de escritura, solo TTL
+#   "aulas"     -> superadmin/aulas.py
+#   "bloques"   -> superadmin/bloques_horarios.py
+#   "secciones" -> superadmin/secciones.py
+#   "cursos"    -> curso_routes.py
+
+
+def _consultar(sql, params=()):
+    cur = get_db().cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(sql, params)
+        return [dict(fila) for fila in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+# --------------------------
+# 🔹 Escuelas y ubigeo
+# --------------------------
+@cacheado("escuelas")
+def escuelas():
+    return _consultar("""
+        SELECT escuela_id, nombre_escuela, facultad
+        FROM escuela
+        ORDER BY nombre_escuela ASC
+    """)
+
+
+@cacheado("ubigeo")
+def departamentos():
+    return _consultar("""
+        SELECT departamento_id, nombre_departamento
+        FROM departamento_geo
+        ORDER BY nombre_departamento ASC
+    """)
+
+
+@cacheado("ubigeo")
+def provincias(departamento_id):
+    return _consultar("""
+        SELECT provincia_id, nombre_provincia
+        FROM provincia
+        WHERE departamento_id = %s
+        ORDER BY nombre_provincia ASC
+    """, (departamento_id,))
+
+
+@cacheado("ubigeo")
+def distritos(provincia_id=None):
+    if provincia_id is None:
+        return _consultar("""
+            SELECT distrito_id, nombre_distrito
+            FROM distrito
+            ORDER BY nombre_distrito ASC
+        """)
+    return _consultar("""
+        SELECT distrito_id, nombre_distrito
+        FROM distrito
+        WHERE provincia_id = %s
+        ORDER BY nombre_distrito ASC
+    """, (provincia_id,))
+
+
+# --------------------------
+# 🔹 Infraestructura
+# --------------------------
+@cacheado("aulas")
+def pabellones():
+    return _consultar("SELECT pabellon_id, nombre_pabellon FROM pabellon ORDER BY nombre_pabellon ASC")
+
+
+@cacheado("aulas")
+def tipos_aula():
+    return _consultar("SELECT tipo_aula_id, nombre_tipo FROM tipo_aula_cat ORDER BY nombre_tipo ASC")
+
+
+@cacheado("aulas")
+def aulas_operativas():
+    return _consultar("""
+        SELECT
+            a.aula_id,
+            a.nombre_aula AS nombre,
+            a.capacidad,
+            p.nombre_pabellon AS pabellon,
+            ta.nombre_tipo AS tipo_aula
+        FROM aula a
+        JOIN pabellon p ON a.pabellon_id = p.pabellon_id
+        JOIN tipo_aula_cat ta ON a.tipo_aula_id = ta.tipo_aula_id
+        WHERE UPPER(a.estado) = 'OPERATIVO'
+        ORDER BY p.nombre_pabellon, a.nombre_aula
+    """)
+
+
+@cacheado("bloques")
+def bloques_activos():
+    return _consultar("""
+        SELECT
+            bloque_id,
+            codigo_bloque,
+            dia,
+            TO_CHAR(hora_inicio, 'HH24:MI') AS hora_inicio,
+            TO_CHAR(hora_fin, 'HH24:MI') AS hora_fin,
+            CONCAT(dia, ' ', TO_CHAR(hora_inicio, 'HH24:MI'), '-', TO_CHAR(hora_fin, 'HH24:MI')) AS descripcion
+        FROM bloque_horario
+        WHERE UPPER(estado) = 'ACTIVO'
+        ORDER BY dia, hora_inicio
+    """)
+
+
+# --------------------------
+# 🔹 Académico
+# --------------------------
+@cacheado("secciones")
+def secciones_activas():
+    return _consultar("""
+        SELECT seccion_id, codigo, ciclo_academico, periodo
+        FROM secciones
+        WHERE UPPER(estado) = 'ACTIVO'
+        ORDER BY periodo DESC, codigo ASC
+    """)
+
+
+@cacheado("cursos")
+def cursos_activos():
+    return _consultar("""
+        SELECT curso_id, codigo, nombre, creditos, ciclo, tipo
+        FROM curso
+        WHERE estado = TRUE
+        ORDER BY nombre ASC
+    """)
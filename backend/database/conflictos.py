@@ -0,0 +1,219 @@
+from bisect import bisect_left
+
+# ============================================
+# Detección de cruces de horario (aula, docente, sección)
+# ============================================
+# Antes crear/editar asignación preguntaba "¿hay otra asignación con el
+# mismo bloque_id y la misma aula/docente/curso?" con varias consultas
+# sueltas: dos bloques distintos con horas que se cruzan (Lunes 08:00-10:00
+# y Lunes 09:00-11:00) pasaban sin aviso.
+#
+# Aquí cada recurso tiene un índice de intervalos por día:
+#   ("aula", aula_id, dia), ("docente", docente_id, dia),
+#   ("seccion", (ciclo, seccion_id), dia)
+# La sección se agrupa con el ciclo del curso: son los alumnos de ese ciclo
+# y sección los que no pueden estar en dos clases a la vez.
+#
+# Cada lista se ordena por hora de inicio y guarda el mayor fin acumulado,
+# así la búsqueda de solapes es un bisect más el recorrido de los que
+# realmente se cruzan (intervalos semiabiertos: 08-10 y 10-12 no chocan).
+#
+# Se usa de dos formas:
+#   - conflictos_propuestas(): crear/editar, con una consulta que trae solo
+#     lo que comparte día y recurso con lo propuesto.
+#   - validar_horario(): todo un horario (el actual o uno propuesto) en una
+#     pasada; la ruta /admin/validar-horario lo expone.
+
+class IndiceIntervalos:
+    """Intervalos [inicio, fin) por clave, con búsqueda de solapes."""
+
+    def __init__(self):
+        self._pendientes = {}  # clave -> [(inicio, fin, id)] sin ordenar
+        self._listas = {}      # clave -> (inicios, fin_max_acumulado, items)
+
+    def agregar(self, clave, inicio, fin, ident):
+        self._pendientes.setdefault(clave, []).append((inicio, fin, ident))
+        self._listas.pop(clave, None)
+
+    def _lista(self, clave):
+        lista = self._listas.get(clave)
+        if lista is None:
+            items = sorted(self._pendientes.get(clave, ()), key=lambda i: (i[0], i[1]))
+            fin_max = []
+            mayor = None
+            for _, fin, _ in items:
+                mayor = fin if mayor is None or fin > mayor else mayor
+                fin_max.append(mayor)
+            lista = ([i[0] for i in items], fin_max, items)
+            self._listas[clave] = lista
+        return lista
+
+    def solapes(self, clave, inicio, fin):
+        """ids cuyos intervalos en `clave` se cruzan con [inicio, fin)."""
+        inicios, fin_max, items = self._lista(clave)
+        # Solo pueden cruzarse los que empiezan antes de `fin`; se recorren
+        # hacia atrás mientras alguno anterior termine después de `inicio`
+        j = bisect_left(inicios, fin) - 1
+        encontrados = []
+        while j >= 0 and fin_max[j] > inicio:
+            if items[j][1] > inicio:
+                encontrados.append(items[j][2])
+            j -= 1
+        return encontrados
+
+
+def _claves(fila):
+    dia = fila["dia"]
+    return (
+        ("aula", ("aula", fila["aula_id"], dia)),
+        ("docente", ("docente", fila["docente_id"], dia)),
+        ("seccion", ("seccion", (fila["ciclo"], fila["seccion_id"]), dia)),
+    )
+
+
+class IndiceHorario:
+    """Índice por aula, docente y sección de un conjunto de asignaciones."""
+
+    def __init__(self, filas=()):
+        self.indice = IndiceIntervalos()
+        self.filas = {}
+        for fila in filas:
+            self.agregar(fila)
+
+    def agregar(self, fila):
+        ident = fila["asignacion_id"]
+        self.filas[ident] = fila
+        for _, clave in _claves(fila):
+            if clave[1] is not None and (clave[0] != "seccion" or clave[1][1] is not None):
+                self.indice.agregar(clave, fila["hora_inicio"], fila["hora_fin"], ident)
+
+    def conflictos(self, fila, excluir=()):
+        """Cruces de `fila` con lo indexado (sin contarse a sí misma ni a `excluir`)."""
+        propio = fila.get("asignacion_id")
+        resultado = []
+        for recurso, clave in _claves(fila):
+            for otro in self.indice.solapes(clave, fila["hora_inicio"], fila["hora_fin"]):
+                if otro == propio or otro in excluir:
+                    continue
+                existente = self.filas[otro]
+                resultado.append({
+                    "recurso": recurso,
+                    "asignacion_id": propio,
+                    "con": otro,
+                    "mismo_curso": existente["curso_id"] == fila["curso_id"],
+                    "dia": fila["dia"],
+                    "hora_inicio": existente["hora_inicio"],
+                    "hora_fin": existente["hora_fin"],
+                })
+        return resultado
+
+
+def validar_horario(filas):
+    """Todos los cruces entre las filas dadas, cada par una sola vez."""
+    indice = IndiceHorario(filas)
+    vistos = set()
+    conflictos = []
+    for fila in indice.filas.values():
+        for c in indice.conflictos(fila):
+            par = (c["recurso"], min(c["asignacion_id"], c["con"]), max(c["asignacion_id"], c["con"]))
+            if par not in vistos:
+                vistos.add(par)
+                conflictos.append(c)
+    return conflictos
+
+
+# --------------------------
+# 🔹 Carga desde la BD
+# --------------------------
+_CAMPOS = (
+    "asignacion_id", "curso_id", "seccion_id", "docente_id", "aula_id",
+    "bloque_id", "ciclo", "dia", "hora_inicio", "hora_fin"
+)
+
+SQL_OCUPACION = """
+    SELECT a.asignacion_id, a.curso_id, a.seccion_id, a.docente_id, a.aula_id,
+           a.bloque_id, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
+    FROM asignaciones a
+    JOIN curso c ON a.curso_id = c.curso_id
+    JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+"""
+
+
+_IDS = {"asignacion_id", "curso_id", "seccion_id", "docente_id", "aula_id", "bloque_id"}
+
+
+def _entero(valor):
+    return None if valor in (None, "") else int(valor)
+
+
+def _filas(cur):
+    return [f if isinstance(f, dict) else dict(zip(_CAMPOS, f)) for f in cur.fetchall()]
+
+
+def cargar_horario(cur):
+    """El horario completo (todas las asignaciones con su bloque)."""
+    cur.execute(SQL_OCUPACION + " ORDER BY a.asignacion_id")
+    return _filas(cur)
+
+
+def completar_propuestas(cur, propuestas):
+    """
+    Agrega ciclo, día y horas a las propuestas ({curso_id, seccion_id,
+    docente_id, aula_id, bloque_id}) con una consulta. Las que apuntan a un
+    curso o bloque inexistente quedan fuera.
+    """
+    cur.execute("""
+        SELECT p.idx, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
+        FROM unnest(%s::int[], %s::int[], %s::int[]) AS p(idx, curso_id, bloque_id)
+        JOIN curso c ON c.curso_id = p.curso_id
+        JOIN bloque_horario bh ON bh.bloque_id = p.bloque_id
+    """, (
+        list(range(len(propuestas))),
+        [p["curso_id"] for p in propuestas],
+        [p["bloque_id"] for p in propuestas],
+    ))
+    completas = []
+    for fila in cur.fetchall():
+        idx, ciclo, dia, inicio, fin = fila.values() if isinstance(fila, dict) else fila
+        # Los ids llegan del JSON (a veces como texto): se comparan como int
+        propuesta = {k: _entero(v) if k in _IDS else v for k, v in propuestas[idx].items()}
+        completas.append(dict(propuesta, ciclo=ciclo, dia=dia, hora_inicio=inicio, hora_fin=fin))
+    return completas
+
+
+def cargar_ocupacion(cur, propuestas):
+    """Solo las asignaciones que comparten día y aula, docente o sección con las propuestas."""
+    cur.execute(SQL_OCUPACION + """
+        WHERE bh.dia = ANY(%s::text[])
+          AND (a.aula_id = ANY(%s::int[])
+               OR a.docente_id = ANY(%s::int[])
+               OR (a.seccion_id, c.ciclo) IN (
+                   SELECT * FROM unnest(%s::int[], %s::text[])
+               ))
+    """, (
+        list({p["dia"] for p in propuestas}),
+        list({p["aula_id"] for p in propuestas if p.get("aula_id")}),
+        list({p["docente_id"] for p in propuestas}),
+        [p["seccion_id"] for p in propuestas],
+        [p["ciclo"] for p in propuestas],
+    ))
+    return _filas(cur)
+
+
+def conflictos_propuestas(cur, propuestas, excluir=()):
+    """
+    Cruces de las propuestas con el horario guardado y entre ellas mismas.
+    Cada propuesta lleva un asignacion_id propio (el real al editar, uno
+    negativo si es nueva); `excluir` son asignaciones guardadas que la
+    operación reemplaza. Devuelve (propuestas_completas, conflictos).
+    """
+    completas = completar_propuestas(cur, propuestas)
+    if not completas:
+        return completas, []
+    excluir = set(excluir)
+    indice = IndiceHorario(f for f in cargar_ocupacion(cur, completas) if f["asignacion_id"] not in excluir)
+    conflictos = []
+    for propuesta in completas:
+        conflictos.extend(indice.conflictos(propuesta))
+        indice.agregar(propuesta)  # la siguiente propuesta también choca con esta
+    return completas, conflictos
@@ -0,0 +1,147 @@
+import re
+import threading
+import time
+
+import psycopg2.errors
+
+# ============================================
+# Registro de consultas preparadas
+# ============================================
+# Las consultas calientes (listado de asignaciones para matrícula, horario
+# del alumno, validaciones al crear una asignación, login) se registran una
+# vez con un nombre y se ejecutan con ejecutar(cur, nombre, params):
+#
+#   - El SQL se escribe con %s como el resto del código; al registrarlo se
+#     convierte a $1, $2, ... para el PREPARE.
+#   - Cada conexión del pool hace el PREPARE la primera vez que usa esa
+#     consulta (PooledConnection.preparadas); las siguientes llamadas solo
+#     mandan EXECUTE nombre (...) y Postgres no vuelve a parsear ni a
+#     planificar el texto completo.
+#   - Una conexión que no es del pool (scripts, benchmarks con psycopg2 a
+#     secas) ejecuta el SQL normal.
+#   - Se acumula el tiempo por consulta: estadisticas() muestra cuáles se
+#     llevan la mayor parte del tiempo de BD (ruta /db/consultas).
+
+_NOMBRE_VALIDO = re.compile(r"^[a-z_][a-z0-9_]*$")
+_MARCADOR = re.compile(r"%(%|s)")
+
+_consultas = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+class Consulta:
+
+    def __init__(self, nombre, sql, tipos=()):
+        self.nombre = nombre
+        self.sql = sql
+        self.sql_preparado, self.n_params = _a_posicional(sql)
+        tipos_sql = f" ({', '.join(tipos)})" if tipos else ""
+        self.prepare = f"PREPARE {nombre}{tipos_sql} AS {self.sql_preparado}"
+        marcadores = ", ".join(["%s"] * self.n_params)
+        self.execute = f"EXECUTE {nombre} ({marcadores})" if self.n_params else f"EXECUTE {nombre}"
+
+
+def _a_posicional(sql):
+    """'... = %s AND x = %s' -> ('... = $1 AND x = $2', 2); %% queda como %."""
+    contador = [0]
+
+    def reemplazo(m):
+        if m.group(1) == "%":
+            return "%"
+        contador[0] += 1
+        return f"${contador[0]}"
+
+    return _MARCADOR.sub(reemplazo, sql), contador[0]
+
+
+# --------------------------
+# 🔹 Registro
+# --------------------------
+def registrar(nombre, sql, tipos=()):
+    """
+    Registra una consulta con nombre y devuelve el nombre.
+    tipos: tipos de los parámetros para el PREPARE si Postgres no puede
+    deducirlos (p. ej. ("text", "text")).
+    """
+    if not _NOMBRE_VALIDO.match(nombre):
+        raise ValueError(f"Nombre de consulta inválido: {nombre}")
+    with _lock:
+        existente = _consultas.get(nombre)
+        if existente is not None and existente.sql != sql:
+            raise ValueError(f"La consulta '{nombre}' ya está registrada con otro SQL")
+        _consultas[nombre] = Consulta(nombre, sql, tipos)
+        _stats.setdefault(nombre, {
+            "llamadas": 0, "preparaciones": 0, "errores": 0,
+            "total_ms": 0.0, "max_ms": 0.0
+        })
+    return nombre
+
+
+# --------------------------
+# 🔹 Ejecución
+# --------------------------
+def ejecutar(cur, nombre, params=()):
+    """Ejecuta la consulta registrada `nombre` en el cursor (PREPARE si hace falta)."""
+    consulta = _consultas[nombre]
+    conn = cur.connection
+    preparadas = getattr(conn, "preparadas", None)
+
+    inicio = time.perf_counter()
+    preparo = False
+    try:
+        if preparadas is None:
+            cur.execute(consulta.sql, params)
+        else:
+            if nombre not in preparadas:
+                cur.execute(consulta.prepare)
+                preparadas.add(nombre)
+                preparo = True
+            cur.execute(consulta.execute, params)
+    except psycopg2.errors.InvalidSqlStatementName:
+        # La sesión perdió la sentencia (DISCARD, reinicio): se vuelve a
+        # preparar en la próxima llamada
+        preparadas.discard(nombre)
+        _registrar(nombre, inicio, preparo, error=True)
+        raise
+    except Exception:
+        _registrar(nombre, inicio, preparo, error=True)
+        raise
+    _registrar(nombre, inicio, preparo)
+    return cur
+
+
+def _registrar(nombre, inicio, preparo, error=False):
+    ms = (time.perf_counter() - inicio) * 1000
+    with _lock:
+        datos = _stats[nombre]
+        datos["llamadas"] += 1
+        datos["total_ms"] += ms
+        datos["max_ms"] = max(datos["max_ms"], ms)
+        if preparo:
+            datos["preparaciones"] += 1
+        if error:
+            datos["errores"] += 1
+
+
+def estadisticas():
+    """Tiempo por consulta registrada, de la que más tiempo de BD consume a la que menos."""
+    with _lock:
+        copia = {nombre: dict(datos) for nombre, datos in _stats.items()}
+    total = sum(d["total_ms"] for d in copia.values()) or 1.0
+    filas = []
+    for nombre, d in copia.items():
+        d["consulta"] = nombre
+        d["promedio_ms"] = round(d["total_ms"] / d["llamadas"], 3) if d["llamadas"] else 0.0
+        d["porcentaje_tiempo"] = round(d["total_ms"] * 100 / total, 1)
+        d["total_ms"] = round(d["total_ms"], 3)
+        d["max_ms"] = round(d["max_ms"], 3)
+        filas.append(d)
+    filas.sort(key=lambda d: d["total_ms"], reverse=True)
+    return {"consultas": filas}
+
+
+def reiniciar_estadisticas():
+    with _lock:
+        for datos in _stats.values():
+            datos.update(llamadas=0, preparaciones=0, errores=0, total_ms=0.0, max_ms=0.0)
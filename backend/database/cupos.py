@@ -0,0 +1,212 @@
+from database import consultas, elegibilidad
+
+# ============================================
+# Cupos por sección y lista de espera
+# ============================================
+# Tablas y triggers en database/migraciones/005_cupo_asignacion.sql.
+#
+# matricular_con_cupo() hace toda la matrícula en una transacción:
+#   1. pg_advisory_xact_lock(CLAVE_MATRICULA, estudiante_id): las
+#      matrículas simultáneas del mismo alumno (doble clic, dos pestañas,
+#      dos secciones del mismo curso) se hacen una tras otra, así el
+#      "no duplicado / sin choque" del INSERT validado no se salta.
+#   2. UPDATE condicional del contador (ocupados < capacidad): reserva el
+#      cupo y bloquea la fila; las demás matrículas a la misma sección
+#      esperan a que esta termine y ven el contador ya actualizado.
+#   3. INSERT validado de database/elegibilidad.py. Si no inserta, el
+#      ROLLBACK devuelve el cupo.
+# Si la sección está llena y el alumno cumple las reglas, queda en
+# lista_espera. Al liberarse un cupo (desmatricular) se promueve al
+# primero de la lista que siga cumpliéndolas.
+#
+# Orden de bloqueos: alumno -> fila del cupo. La promoción ya tiene la fila
+# del cupo, por eso solo *intenta* el bloqueo del alumno y, si está ocupado,
+# pasa al siguiente de la lista en vez de esperar (evita el deadlock).
+
+CLAVE_MATRICULA = 20  # primer argumento del advisory lock (espacio de matrícula)
+LIMITE_PROMOCION = 20  # candidatos revisados por cada liberación de cupo
+
+RESERVAR_CUPO = consultas.registrar("reservar_cupo", """
+    UPDATE cupo_asignacion
+    SET ocupados = ocupados + 1, actualizado = NOW()
+    WHERE asignacion_id = %s AND ocupados < capacidad
+    RETURNING capacidad - ocupados AS libres
+""")
+
+
+# --------------------------
+# 🔹 Primitivas
+# --------------------------
+def bloquear_estudiante(cur, estudiante_id):
+    cur.execute("SELECT pg_advisory_xact_lock(%s, %s)", (CLAVE_MATRICULA, estudiante_id))
+
+
+def intentar_bloquear_estudiante(cur, estudiante_id):
+    cur.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", (CLAVE_MATRICULA, estudiante_id))
+    return _primera_columna(cur.fetchone())
+
+
+def reservar(cur, asignacion_id):
+    """True si reservó un cupo, False si la sección está llena, None si no existe."""
+    consultas.ejecutar(cur, RESERVAR_CUPO, (asignacion_id,))
+    if cur.fetchone() is not None:
+        return True
+    cur.execute("SELECT 1 FROM cupo_asignacion WHERE asignacion_id = %s", (asignacion_id,))
+    return False if cur.fetchone() is not None else None
+
+
+def poner_en_espera(cur, asignacion_id, estudiante_id):
+    """Agrega al alumno a la lista (si no estaba) y devuelve su posición."""
+    cur.execute("""
+        INSERT INTO lista_espera (asignacion_id, estudiante_id)
+        VALUES (%s, %s)
+        ON CONFLICT (asignacion_id, estudiante_id) DO NOTHING
+    """, (asignacion_id, estudiante_id))
+    return posicion_en_espera(cur, asignacion_id, estudiante_id)
+
+
+def posicion_en_espera(cur, asignacion_id, estudiante_id):
+    cur.execute("""
+        SELECT COUNT(*) AS posicion
+        FROM lista_espera l
+        WHERE l.asignacion_id = %s
+          AND l.espera_id <= (
+              SELECT espera_id FROM lista_espera
+              WHERE asignacion_id = %s AND estudiante_id = %s
+          )
+    """, (asignacion_id, asignacion_id, estudiante_id))
+    return _primera_columna(cur.fetchone()) or None
+
+
+def _primera_columna(fila):
+    if fila is None:
+        return None
+    return next(iter(fila.values())) if isinstance(fila, dict) else fila[0]
+
+
+# --------------------------
+# 🔹 Matrícula con cupo
+# --------------------------
+def matricular_con_cupo(conn, cur, estudiante_id, asignacion_id):
+    """
+    Matricula o pone en espera. Hace commit o rollback y devuelve un dict:
+      {"estado": "matriculado", "matricula_id": ...}
+      {"estado": "espera", "posicion": ...}
+      {"estado": "rechazado", "motivo": ..., "mensaje": ...}
+      {"estado": "no_encontrada"}
+      {"estado": "reintentar"}   (los datos cambiaron durante el request)
+    """
+    bloquear_estudiante(cur, estudiante_id)
+    reserva = reservar(cur, asignacion_id)
+
+    if reserva is None:
+        conn.rollback()
+        return {"estado": "no_encontrada"}
+
+    if reserva:
+        matricula_id = elegibilidad.matricular(cur, estudiante_id, asignacion_id)
+        if matricula_id is not None:
+            cur.execute(
+                "DELETE FROM lista_espera WHERE asignacion_id = %s AND estudiante_id = %s",
+                (asignacion_id, estudiante_id)
+            )
+            conn.commit()
+            elegibilidad.descartar_perfil(estudiante_id)
+            return {"estado": "matriculado", "matricula_id": matricula_id}
+        conn.rollback()  # devuelve el cupo y suelta el bloqueo del alumno
+
+    # Llena o rechazada: el motor dice si el alumno cumple las reglas
+    resultado = elegibilidad.motivo_rechazo(conn, cur, estudiante_id, asignacion_id)
+    if resultado is None:
+        conn.rollback()
+        return {"estado": "no_encontrada"}
+    if not resultado["elegible"]:
+        conn.rollback()
+        return {"estado": "rechazado", "motivo": resultado["motivo"], "mensaje": resultado["mensaje"]}
+    if reserva:
+        conn.rollback()
+        return {"estado": "reintentar"}
+
+    posicion = poner_en_espera(cur, asignacion_id, estudiante_id)
+    conn.commit()
+    return {"estado": "espera", "posicion": posicion}
+
+
+def promover_espera(cur, asignacion_id):
+    """
+    Llena los cupos libres de la asignación con la lista de espera, en orden
+    de llegada. Corre dentro de la transacción del llamador (que hace el
+    commit) y devuelve los estudiante_id matriculados.
+    """
+    cur.execute("""
+        SELECT espera_id, estudiante_id
+        FROM lista_espera
+        WHERE asignacion_id = %s
+        ORDER BY espera_id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    """, (asignacion_id, LIMITE_PROMOCION))
+    candidatos = [tuple(f.values()) if isinstance(f, dict) else f for f in cur.fetchall()]
+
+    promovidos = []
+    for espera_id, estudiante_id in candidatos:
+        if not intentar_bloquear_estudiante(cur, estudiante_id):
+            continue  # se está matriculando en otro request: sigue en la lista
+
+        cur.execute("SAVEPOINT promocion")
+        if not reservar(cur, asignacion_id):
+            cur.execute("ROLLBACK TO SAVEPOINT promocion")
+            break
+        if elegibilidad.matricular(cur, estudiante_id, asignacion_id) is None:
+            # Ya no cumple (se matriculó en otra sección, choque nuevo, ...):
+            # se devuelve el cupo y sale de la lista
+            cur.execute("ROLLBACK TO SAVEPOINT promocion")
+        else:
+            promovidos.append(estudiante_id)
+        cur.execute("RELEASE SAVEPOINT promocion")
+        cur.execute("DELETE FROM lista_espera WHERE espera_id = %s", (espera_id,))
+    return promovidos
+
+
+# --------------------------
+# 🔹 Mantenimiento
+# --------------------------
+SQL_OCUPADOS_REAL = """
+    SELECT a.asignacion_id, COUNT(m.matricula_id) FILTER (WHERE m.estado = 'ACTIVA') AS ocupados
+    FROM asignaciones a
+    LEFT JOIN matriculas m ON m.asignacion_id = a.asignacion_id
+    GROUP BY a.asignacion_id
+"""
+
+
+def verificar(cur):
+    """Asignaciones cuyo contador no coincide con sus matrículas ACTIVA."""
+    cur.execute(f"""
+        SELECT r.asignacion_id, c.ocupados, r.ocupados, c.capacidad
+        FROM ({SQL_OCUPADOS_REAL}) r
+        LEFT JOIN cupo_asignacion c ON c.asignacion_id = r.asignacion_id
+        WHERE c.ocupados IS DISTINCT FROM r.ocupados
+        ORDER BY 1
+    """)
+    return [{
+        'asignacion_id': row[0],
+        'contador': row[1],
+        'real': row[2],
+        'capacidad': row[3]
+    } for row in cur.fetchall()]
+
+
+def reconstruir(cur):
+    """Recalcula ocupados y capacidad de todas las asignaciones."""
+    cur.execute("LOCK TABLE matriculas IN SHARE MODE")
+    cur.execute(f"""
+        INSERT INTO cupo_asignacion AS c (asignacion_id, capacidad, ocupados)
+        SELECT r.asignacion_id, COALESCE(a.cantidad_estudiantes, 0), r.ocupados
+        FROM ({SQL_OCUPADOS_REAL}) r
+        JOIN asignaciones a ON a.asignacion_id = r.asignacion_id
+        ON CONFLICT (asignacion_id) DO UPDATE SET
+            capacidad   = EXCLUDED.capacidad,
+            ocupados    = EXCLUDED.ocupados,
+            actualizado = NOW()
+    """)
+    return cur.rowcount
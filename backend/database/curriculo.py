@@ -0,0 +1,217 @@
+from collections import defaultdict, deque
+
+from utils.cache import region
+
+# ============================================
+# Grafo del currículo (cursos y prerrequisitos)
+# ============================================
+# Los prerrequisitos se leían fila por fila en cada ruta y nada impedía
+# registrar un ciclo (A requiere B, B requiere A), con lo que ninguno de
+# los dos cursos podía llevarse nunca. Aquí se arma una vez el grafo
+# completo desde curso + prerrequisito y se precalcula:
+#
+#   - directos[c]:   lo que c pide directamente
+#   - cierre[c]:     todo lo que c pide, directa o indirectamente
+#   - habilita[c]:   los cursos que piden a c (cierre inverso)
+#   - nivel[c]:      0 si no pide nada; si no, 1 + el mayor nivel de lo que
+#                    pide (niveles topológicos, para el mapa curricular)
+#
+# Con eso "¿qué le falta al alumno X para el curso Y?" es una diferencia
+# de conjuntos, y "¿este prerrequisito cierra un ciclo?" es una pertenencia.
+# El grafo vive en la región de caché "prerrequisitos", que se invalida al
+# cambiar prerrequisitos o cursos. El alta de un prerrequisito verifica el
+# ciclo contra la tabla (no contra la caché) bajo un advisory lock, para que
+# dos altas simultáneas no lo cierren entre las dos.
+
+CLAVE_PRERREQUISITOS = 23  # primer argumento del advisory lock (altas de prerrequisitos)
+
+
+class Curriculo:
+
+    def __init__(self, cursos, aristas):
+        """
+        cursos: {curso_id: {"codigo", "nombre", "ciclo", "creditos"}}
+        aristas: [(curso_id, curso_id_requerido)]
+        """
+        self.cursos = cursos
+        directos = defaultdict(set)
+        siguientes = defaultdict(set)
+        for curso, requerido in aristas:
+            directos[curso].add(requerido)
+            siguientes[requerido].add(curso)
+        self.directos = {c: frozenset(r) for c, r in directos.items()}
+
+        nodos = set(cursos) | set(directos) | set(siguientes)
+
+        # Orden topológico (Kahn): lo que no entra está en un ciclo
+        pendientes = {c: len(directos.get(c, ())) for c in nodos}
+        cola = deque(sorted(c for c, n in pendientes.items() if n == 0))
+        self.orden = []
+        while cola:
+            curso = cola.popleft()
+            self.orden.append(curso)
+            for posterior in sorted(siguientes.get(curso, ())):
+                pendientes[posterior] -= 1
+                if pendientes[posterior] == 0:
+                    cola.append(posterior)
+        self.en_ciclo = frozenset(nodos - set(self.orden))
+
+        # Cierre y nivel en orden topológico: cada curso usa lo ya calculado
+        self.cierre = {}
+        self.nivel = {}
+        for curso in self.orden:
+            requeridos = self.directos.get(curso, frozenset())
+            todos = set(requeridos)
+            for r in requeridos:
+                todos |= self.cierre[r]
+            self.cierre[curso] = frozenset(todos)
+            self.nivel[curso] = 1 + max((self.nivel[r] for r in requeridos), default=-1)
+        # Datos antiguos con ciclos: cierre por recorrido, sin nivel
+        for curso in self.en_ciclo:
+            self.cierre[curso] = frozenset(self._alcanzables(curso))
+
+        habilita = defaultdict(set)
+        for curso, anteriores in self.cierre.items():
+            for r in anteriores:
+                habilita[r].add(curso)
+        self.habilita = {c: frozenset(s) for c, s in habilita.items()}
+
+    def _alcanzables(self, curso):
+        vistos = set()
+        pila = list(self.directos.get(curso, ()))
+        while pila:
+            r = pila.pop()
+            if r not in vistos:
+                vistos.add(r)
+                pila.extend(self.directos.get(r, ()))
+        return vistos
+
+    # --------------------------
+    # 🔹 Consultas
+    # --------------------------
+    def faltantes(self, curso_id, aprobados):
+        """Prerrequisitos directos que el alumno aún no aprueba."""
+        return self.directos.get(curso_id, frozenset()) - aprobados
+
+    def pendientes(self, curso_id, aprobados):
+        """Toda la cadena de prerrequisitos que el alumno aún no aprueba."""
+        return self.cierre.get(curso_id, frozenset()) - aprobados
+
+    def crearia_ciclo(self, curso_id, requerido_id):
+        """¿Registrar "curso requiere requerido" cerraría un ciclo?"""
+        return curso_id == requerido_id or curso_id in self.cierre.get(requerido_id, ())
+
+    def camino(self, desde, hasta):
+        """Cadena de prerrequisitos de `desde` a `hasta` (ambos incluidos), o None."""
+        previo = {desde: None}
+        cola = deque([desde])
+        while cola:
+            curso = cola.popleft()
+            if curso == hasta:
+                cadena = []
+                while curso is not None:
+                    cadena.append(curso)
+                    curso = previo[curso]
+                return cadena[::-1]
+            for r in sorted(self.directos.get(curso, ())):
+                if r not in previo:
+                    previo[r] = curso
+                    cola.append(r)
+        return None
+
+    def ciclo_con(self, curso_id, requerido_id):
+        """El ciclo que formaría el nuevo prerrequisito (curso ... curso), o None."""
+        if curso_id == requerido_id:
+            return [curso_id, curso_id]
+        cadena = self.camino(requerido_id, curso_id)
+        return [curso_id] + cadena if cadena else None
+
+    def nombre(self, curso_id):
+        curso = self.cursos.get(curso_id)
+        return curso["codigo"] if curso and curso.get("codigo") else str(curso_id)
+
+    def mapa(self, aprobados=None):
+        """
+        Mapa curricular: cada curso con su nivel, lo que pide (directo y
+        total) y lo que habilita. Con `aprobados` agrega el estado del
+        alumno: aprobado, disponible o bloqueado (con lo que le falta).
+        """
+        cursos = []
+        for curso_id in sorted(self.cursos, key=lambda c: (self.nivel.get(c, 1 << 30), self.nombre(c))):
+            datos = self.cursos[curso_id]
+            item = {
+                "curso_id": curso_id,
+                "codigo": datos.get("codigo"),
+                "nombre": datos.get("nombre"),
+                "ciclo": datos.get("ciclo"),
+                "creditos": datos.get("creditos"),
+                "nivel": self.nivel.get(curso_id),
+                "requiere": sorted(self.directos.get(curso_id, ())),
+                "requiere_todos": sorted(self.cierre.get(curso_id, ())),
+                "habilita": sorted(self.habilita.get(curso_id, ())),
+            }
+            if aprobados is not None:
+                faltantes = self.faltantes(curso_id, aprobados)
+                if curso_id in aprobados:
+                    item["estado"] = "aprobado"
+                elif faltantes:
+                    item.update(estado="bloqueado", faltantes=sorted(faltantes),
+                                pendientes=sorted(self.pendientes(curso_id, aprobados)))
+                else:
+                    item["estado"] = "disponible"
+            cursos.append(item)
+        return {
+            "total": len(cursos),
+            "niveles": 1 + max(self.nivel.values(), default=-1),
+            "en_ciclo": sorted(self.en_ciclo),
+            "cursos": cursos,
+        }
+
+
+# --------------------------
+# 🔹 Carga
+# --------------------------
+def _aristas(cur):
+    cur.execute("SELECT id_curso, id_curso_requerido FROM prerrequisito")
+    return [tuple(f.values()) if isinstance(f, dict) else tuple(f) for f in cur.fetchall()]
+
+
+def cargar_curriculo(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT curso_id, codigo, nombre, ciclo, creditos FROM curso")
+        cursos = {
+            f[0]: {"codigo": f[1], "nombre": f[2], "ciclo": f[3], "creditos": f[4]}
+            for f in cur.fetchall()
+        }
+        aristas = _aristas(cur)
+    finally:
+        cur.close()
+    return Curriculo(cursos, aristas)
+
+
+def curriculo(conn):
+    return region("prerrequisitos").leer("curriculo", lambda: cargar_curriculo(conn))
+
+
+# --------------------------
+# 🔹 Alta de prerrequisitos sin ciclos
+# --------------------------
+def verificar_nuevo(cur, curso_id, requerido_id):
+    """
+    Antes del INSERT en prerrequisito, dentro de la misma transacción.
+    Serializa las altas con un advisory lock y revisa contra la tabla
+    actual; devuelve None si se puede registrar o el mensaje de error con
+    el ciclo que se formaría.
+    """
+    cur.execute("SELECT pg_advisory_xact_lock(%s, 0)", (CLAVE_PRERREQUISITOS,))
+    grafo = Curriculo({}, _aristas(cur))
+    ciclo = grafo.ciclo_con(curso_id, requerido_id)
+    if ciclo is None:
+        return None
+    cur.execute(
+        "SELECT curso_id, codigo FROM curso WHERE curso_id = ANY(%s::int[])", (list(set(ciclo)),)
+    )
+    codigos = {f[0]: f[1] for f in cur.fetchall()}
+    cadena = " → ".join(str(codigos.get(c) or c) for c in ciclo)
+    return f"El prerrequisito formaría un ciclo: {cadena}."
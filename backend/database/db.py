@@ -1,21 +1,63 @@
-import psycopg2
-from flask import g
 import os
+import threading
+from flask import g
+from database.pool import ConnectionPool
+
+# Pool de conexiones compartido por todo el proceso (se crea al primer uso)
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_pool_config = {"minconn": 2, "maxconn": 20, "timeout": 10, "ping_interval": 30}
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    # Tras un fork (gunicorn) el proceso hijo no debe reutilizar los sockets del padre
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(
+                    host=os.getenv("DB_HOST", "localhost"),
+                    database=os.getenv("DB_NAME", "NEWXOTRA"),
+                    user=os.getenv("DB_USER", "postgres"),
+                    password=os.getenv("DB_PASS", "valentina10"),
+                    connect_timeout=5,
+                    **_pool_config
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
 
 def get_db():
-    if "db" not in g:
-        g.db = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            database=os.getenv("DB_NAME", "NEWXOTRA"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASS", "valentina10"),
-            connect_timeout=5   
-        )
-    return g.db
+    # Si el handler ya hizo conn.close(), la conexión volvió al pool (y puede
+    # estar prestada a otro hilo): se pide otra
+    db = g.get("db")
+    if db is None or db.liberada or db.turno != g.db_turno:
+        db = g.db = _get_pool().acquire()
+        g.db_turno = db.turno
+    return db
+
+
+def get_pool_stats():
+    """Checkouts, tiempos de espera y conexiones en uso del pool."""
+    if _pool is None:
+        return {}
+    return _pool.stats()
+
 
 def init_db(app):
+    _pool_config.update(
+        minconn=app.config.get("DB_POOL_MIN", _pool_config["minconn"]),
+        maxconn=app.config.get("DB_POOL_MAX", _pool_config["maxconn"]),
+        timeout=app.config.get("DB_POOL_TIMEOUT", _pool_config["timeout"]),
+        ping_interval=app.config.get("DB_POOL_PING_INTERVAL", _pool_config["ping_interval"]),
+    )
+
     @app.teardown_appcontext
     def close_connection(exception):
         db = g.pop("db", None)
+        turno = g.pop("db_turno", None)
         if db is not None:
-            db.close()
\ No newline at end of file
+            # Solo si sigue siendo nuestra: si el handler la cerró y otro hilo
+            # la tomó, liberar() no hace nada
+            db.liberar(turno)
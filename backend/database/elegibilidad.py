@@ -0,0 +1,257 @@
+from collections import defaultdict
+
+from database import consultas, curriculo
+from utils.cache import region
+
+# ============================================
+# Motor de elegibilidad para la matrícula
+# ============================================
+# Antes matricular_alumno hacía cinco consultas por clic (estudiante,
+# asignación, duplicado, choques de horario recorridos en Python,
+# prerrequisitos + todos los cursos aprobados). Ahora:
+#
+#   - PerfilMatricula: cursos aprobados, cursos ya matriculados y bloques
+#     ocupados del estudiante, cargados una vez y guardados en la región de
+#     caché "elegibilidad" mientras dura la sesión de matrícula (TTL corto;
+#     se descarta al matricular, desmatricular o registrar notas).
+#   - Prerrequisitos: el grafo del currículo con su cierre transitivo
+#     (database/curriculo.py), en la región "prerrequisitos".
+#   - evaluar_oferta() responde "¿puede matricularse en X?" para toda la
+#     oferta en una pasada, sin más consultas.
+#   - matricular() es un solo INSERT ... SELECT que repite las tres reglas
+#     en SQL: si no inserta, el perfil explica el motivo.
+#
+# Reglas (las mismas de antes): no estar matriculado en el curso (otra
+# sección), no chocar de horario con una matrícula ACTIVA del mismo ciclo y
+# tener aprobados (nota_final >= 11) los prerrequisitos directos.
+
+NOTA_APROBATORIA = 11
+TTL_PERFIL = 120  # segundos; init_elegibilidad lo toma de ELEGIBILIDAD_TTL
+
+MOTIVOS = {
+    "duplicado": "Ya estás matriculado en este curso (otra sección).",
+    "conflicto": "Conflicto de horario con el curso '{curso}' del mismo ciclo.",
+    "prerrequisitos": "No cumples los prerrequisitos para este curso.",
+}
+
+
+class PerfilMatricula:
+
+    def __init__(self, estudiante_id, aprobados, matriculados, bloques):
+        self.estudiante_id = estudiante_id
+        self.aprobados = aprobados        # {curso_id}
+        self.matriculados = matriculados  # {curso_id}
+        self.bloques = bloques            # (ciclo, dia) -> [(inicio, fin, curso)]
+
+    def choque(self, ciclo, dia, inicio, fin):
+        """Nombre del curso con el que choca el bloque, o None."""
+        for ocupado_inicio, ocupado_fin, curso in self.bloques.get((ciclo, dia), ()):
+            if inicio < ocupado_fin and fin > ocupado_inicio:
+                return curso
+        return None
+
+
+# --------------------------
+# 🔹 Carga
+# --------------------------
+def cargar_perfil(conn, estudiante_id):
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT DISTINCT a.curso_id
+            FROM calificaciones cal
+            JOIN asignaciones a ON cal.asignacion_id = a.asignacion_id
+            WHERE cal.estudiante_id = %s AND cal.nota_final >= %s
+        """, (estudiante_id, NOTA_APROBATORIA))
+        aprobados = {r[0] for r in cur.fetchall()}
+
+        cur.execute("""
+            SELECT a.curso_id, m.estado, c.nombre, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
+            FROM matriculas m
+            JOIN asignaciones a ON m.asignacion_id = a.asignacion_id
+            JOIN curso c ON a.curso_id = c.curso_id
+            LEFT JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+            WHERE m.estudiante_id = %s
+        """, (estudiante_id,))
+        matriculados = set()
+        bloques = defaultdict(list)
+        for curso_id, estado, nombre, ciclo, dia, inicio, fin in cur.fetchall():
+            matriculados.add(curso_id)
+            if estado == "ACTIVA" and dia is not None:
+                bloques[(ciclo, dia)].append((inicio, fin, nombre))
+    finally:
+        cur.close()
+    return PerfilMatricula(estudiante_id, aprobados, matriculados, dict(bloques))
+
+
+def perfil_matricula(conn, estudiante_id):
+    return region("elegibilidad", TTL_PERFIL).leer(
+        estudiante_id, lambda: cargar_perfil(conn, estudiante_id)
+    )
+
+
+def prerrequisitos(conn):
+    """Grafo de prerrequisitos en caché (database/curriculo.py)."""
+    return curriculo.curriculo(conn)
+
+
+def descartar_perfil(estudiante_id):
+    region("elegibilidad", TTL_PERFIL).descartar(estudiante_id)
+
+
+# --------------------------
+# 🔹 Evaluación
+# --------------------------
+def evaluar(perfil, prereqs, asignacion):
+    """
+    asignacion: dict con asignacion_id, curso_id, ciclo, dia, hora_inicio y
+    hora_fin. Devuelve {asignacion_id, elegible, motivo, mensaje, ...}.
+    """
+    resultado = {"asignacion_id": asignacion["asignacion_id"], "elegible": False}
+    curso_id = asignacion["curso_id"]
+
+    if curso_id in perfil.matriculados:
+        resultado.update(motivo="duplicado", mensaje=MOTIVOS["duplicado"])
+        return resultado
+
+    if asignacion.get("dia") is not None:
+        curso = perfil.choque(
+            asignacion["ciclo"], asignacion["dia"], asignacion["hora_inicio"], asignacion["hora_fin"]
+        )
+        if curso:
+            resultado.update(motivo="conflicto", mensaje=MOTIVOS["conflicto"].format(curso=curso))
+            return resultado
+
+    faltantes = prereqs.faltantes(curso_id, perfil.aprobados)
+    if faltantes:
+        # Se informa toda la cadena pendiente, no solo los directos
+        pendientes = prereqs.pendientes(curso_id, perfil.aprobados)
+        resultado.update(
+            motivo="prerrequisitos", mensaje=MOTIVOS["prerrequisitos"],
+            faltantes=sorted(faltantes), pendientes=sorted(pendientes)
+        )
+        return resultado
+
+    resultado.update(elegible=True, motivo=None, mensaje=None)
+    return resultado
+
+
+def evaluar_oferta(conn, estudiante_id, asignaciones):
+    """Elegibilidad de todas las asignaciones con un solo perfil."""
+    perfil = perfil_matricula(conn, estudiante_id)
+    prereqs = prerrequisitos(conn)
+    return [evaluar(perfil, prereqs, a) for a in asignaciones]
+
+
+# --------------------------
+# 🔹 Matrícula en un solo INSERT
+# --------------------------
+MATRICULA_VALIDADA = consultas.registrar("matricula_validada", """
+    INSERT INTO matriculas (estudiante_id, asignacion_id, fecha_matricula, estado)
+    SELECT %s::int, a.asignacion_id, NOW(), 'ACTIVA'
+    FROM asignaciones a
+    JOIN curso c ON a.curso_id = c.curso_id
+    JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+    WHERE a.asignacion_id = %s
+      -- no matriculado en el curso (otra sección)
+      AND NOT EXISTS (
+          SELECT 1
+          FROM matriculas m
+          JOIN asignaciones a2 ON m.asignacion_id = a2.asignacion_id
+          WHERE m.estudiante_id = %s AND a2.curso_id = a.curso_id
+      )
+      -- sin choque de horario con matrículas activas del mismo ciclo
+      AND NOT EXISTS (
+          SELECT 1
+          FROM matriculas m
+          JOIN asignaciones a2 ON m.asignacion_id = a2.asignacion_id
+          JOIN curso c2 ON a2.curso_id = c2.curso_id
+          JOIN bloque_horario b2 ON a2.bloque_id = b2.bloque_id
+          WHERE m.estudiante_id = %s
+            AND m.estado = 'ACTIVA'
+            AND c2.ciclo = c.ciclo
+            AND b2.dia = bh.dia
+            AND bh.hora_inicio < b2.hora_fin
+            AND bh.hora_fin > b2.hora_inicio
+      )
+      -- prerrequisitos directos aprobados
+      AND NOT EXISTS (
+          SELECT 1
+          FROM prerrequisito pr
+          WHERE pr.id_curso = a.curso_id
+            AND NOT EXISTS (
+                SELECT 1
+                FROM calificaciones cal
+                JOIN asignaciones a3 ON cal.asignacion_id = a3.asignacion_id
+                WHERE cal.estudiante_id = %s
+                  AND cal.nota_final >= 11
+                  AND a3.curso_id = pr.id_curso_requerido
+            )
+      )
+    RETURNING matricula_id
+""")
+
+
+def matricular(cur, estudiante_id, asignacion_id):
+    """matricula_id si pasó las validaciones, None si no insertó nada."""
+    consultas.ejecutar(cur, MATRICULA_VALIDADA, (
+        estudiante_id, asignacion_id, estudiante_id, estudiante_id, estudiante_id
+    ))
+    fila = cur.fetchone()
+    if fila is None:
+        return None
+    return fila["matricula_id"] if isinstance(fila, dict) else fila[0]
+
+
+# --------------------------
+# 🔹 Asignaciones a evaluar
+# --------------------------
+_CAMPOS_ASIGNACION = ("asignacion_id", "curso_id", "ciclo", "dia", "hora_inicio", "hora_fin")
+
+SQL_ASIGNACIONES = """
+    SELECT a.asignacion_id, a.curso_id, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
+    FROM asignaciones a
+    JOIN curso c ON a.curso_id = c.curso_id
+    JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+"""
+
+
+def _como_dict(fila):
+    return fila if isinstance(fila, dict) else dict(zip(_CAMPOS_ASIGNACION, fila))
+
+
+def oferta_para_evaluar(cur, ciclos=None, asignaciones=None):
+    """Asignaciones de los ciclos dados o con los ids dados, en una consulta."""
+    if asignaciones is not None:
+        cur.execute(SQL_ASIGNACIONES + """
+            WHERE a.asignacion_id = ANY(%s::int[])
+            ORDER BY a.asignacion_id
+        """, (list(asignaciones),))
+    else:
+        cur.execute(SQL_ASIGNACIONES + """
+            WHERE c.ciclo = ANY(%s::text[])
+            ORDER BY c.ciclo, a.asignacion_id
+        """, (list(ciclos),))
+    return [_como_dict(f) for f in cur.fetchall()]
+
+
+def asignacion_para_evaluar(cur, asignacion_id):
+    filas = oferta_para_evaluar(cur, asignaciones=[asignacion_id])
+    return filas[0] if filas else None
+
+
+def motivo_rechazo(conn, cur, estudiante_id, asignacion_id):
+    """
+    Explica por qué matricular() no insertó: None si la asignación no existe,
+    si no el resultado de evaluar() con un perfil recién cargado.
+    """
+    asignacion = asignacion_para_evaluar(cur, asignacion_id)
+    if asignacion is None:
+        return None
+    descartar_perfil(estudiante_id)
+    return evaluar_oferta(conn, estudiante_id, [asignacion])[0]
+
+
+def init_elegibilidad(app):
+    global TTL_PERFIL
+    TTL_PERFIL = app.config.get("ELEGIBILIDAD_TTL", TTL_PERFIL)
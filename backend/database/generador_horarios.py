@@ -0,0 +1,517 @@
+import random
+import time
+from bisect import bisect_left
+
+from psycopg2.extras import execute_values
+
+from database import conflictos
+
+# ============================================
+# Generador automático de horarios
+# ============================================
+# Arma el horario de una oferta (curso, sección, docente, estudiantes y 1 o
+# 2 bloques por curso) sobre los bloques activos y las aulas operativas:
+#
+#   - Sin cruces por horas de aula, docente ni sección del ciclo (las mismas
+#     reglas que database/conflictos.py), tampoco con lo ya guardado.
+#   - Aula con capacidad >= estudiantes; bloques dentro de la
+#     disponibilidad del docente (disponibilidad_docente, migración 006; sin
+#     filas = disponible siempre).
+#   - Regla de dos bloques de crear-asignacion: el segundo bloque es otro
+#     bloque, no se cruza con el primero (mismo docente) y tiene su aula. Se
+#     prefiere además que caigan en días distintos.
+#
+# Resolución:
+#   1. Voraz: primero las sesiones con menos bloques posibles y más
+#      alumnos; cada una va al bloque menos usado y al aula más chica que
+#      alcance.
+#   2. Reparación hasta agotar el tiempo: una sesión sin lugar se coloca
+#      donde desplace a menos sesiones, las desplazadas vuelven a la cola
+#      (con lista tabú para no deshacer lo recién hecho). Se guarda la mejor
+#      solución vista.
+#
+# Re-solución incremental: con `previo` (ubicaciones anteriores) primero se
+# respeta todo lo que sigue siendo válido y solo se reubica lo que dejó de
+# serlo; desplazar una sesión que estaba en su lugar anterior cuesta más.
+# Una sesión que queda sin lugar conserva su fila guardada, así que su lugar
+# anterior se trata como ocupación fija y lo que se le había puesto encima
+# busca otro sitio.
+#
+# Todo el trabajo es en memoria sobre índices enteros; la BD solo se toca
+# para cargar los datos y para guardar el resultado en bloque.
+
+TIEMPO_MAX = 30.0      # segundos de búsqueda por defecto
+AULAS_POR_BLOQUE = 12  # aulas que prueba la reparación en cada bloque
+TENENCIA_TABU = 12     # iteraciones que una sesión recién movida no se desplaza
+
+
+class Sesion:
+    """Un bloque de una asignación (las de dos bloques son dos sesiones)."""
+
+    __slots__ = (
+        "ident", "item", "parte", "curso_id", "seccion_id", "ciclo", "docente_id",
+        "cantidad", "asignacion_id", "fija", "bloques", "aula_min", "claves", "hermana"
+    )
+
+    def __init__(self, ident, item, parte, datos):
+        self.ident = ident
+        self.item = item
+        self.parte = parte
+        self.curso_id = datos["curso_id"]
+        self.seccion_id = datos["seccion_id"]
+        self.ciclo = datos.get("ciclo")
+        self.docente_id = datos["docente_id"]
+        self.cantidad = datos.get("cantidad_estudiantes") or 0
+        ids = datos.get("asignacion_ids") or ()
+        self.asignacion_id = ids[parte - 1] if len(ids) >= parte else None
+        self.fija = datos.get("fija", False)
+        self.hermana = None
+
+
+class Generador:
+    """
+    oferta: [{curso_id, seccion_id, ciclo, docente_id, cantidad_estudiantes,
+              bloques (1|2), asignacion_ids?, fija?}]
+            (asignacion_ids: las filas ya guardadas de cada bloque, al re-resolver)
+    bloques: [{bloque_id, dia, hora_inicio, hora_fin}]
+    aulas: [{aula_id, capacidad}]
+    disponibilidad: {docente_id: {bloque_id, ...}} (docente ausente = todos)
+    ocupacion: asignaciones guardadas que no se mueven
+               [{docente_id, aula_id, ciclo, seccion_id, bloque_id}]
+    """
+
+    def __init__(self, oferta, bloques, aulas, disponibilidad=None, ocupacion=(), semilla=None):
+        self.azar = random.Random(semilla)
+        disponibilidad = disponibilidad or {}
+
+        # Bloques y cruces entre bloques (mismo día, horas solapadas)
+        self.bloques = list(bloques)
+        self.idx_bloque = {b["bloque_id"]: i for i, b in enumerate(self.bloques)}
+        self.dia = [b["dia"] for b in self.bloques]
+        self.cruza = [
+            [j for j, o in enumerate(self.bloques)
+             if o["dia"] == b["dia"] and o["hora_inicio"] < b["hora_fin"] and b["hora_inicio"] < o["hora_fin"]]
+            for b in self.bloques
+        ]
+
+        # Aulas de menor a mayor capacidad
+        self.aulas = sorted(aulas, key=lambda a: a["capacidad"])
+        self.capacidades = [a["capacidad"] for a in self.aulas]
+        idx_aula = self.idx_aula = {a["aula_id"]: i for i, a in enumerate(self.aulas)}
+
+        # Sesiones
+        self.sesiones = []
+        self.sin_lugar = {}  # ident -> motivo (imposible antes de buscar)
+        self.previo = self.previo_ids = {}
+        for item, datos in enumerate(oferta):
+            partes = [Sesion(len(self.sesiones) + p, item, p + 1, datos)
+                      for p in range(2 if datos.get("bloques", 1) == 2 else 1)]
+            if len(partes) == 2:
+                partes[0].hermana, partes[1].hermana = partes[1], partes[0]
+            for s in partes:
+                self._preparar(s, disponibilidad)
+                self.sesiones.append(s)
+
+        # Estado: por recurso y bloque, cuántas sesiones lo bloquean y quiénes
+        self.bloqueo = {}
+        self.ocupantes = {}
+        self.pos = [None] * len(self.sesiones)
+        self.uso = [0] * len(self.bloques)
+
+        # Lo ya guardado se carga como ocupación fija (ident None)
+        for o in ocupacion:
+            b = self.idx_bloque.get(o["bloque_id"])
+            if b is None:
+                continue
+            claves = [("d", o["docente_id"]), ("g", (o.get("ciclo"), o["seccion_id"]))]
+            if o.get("aula_id") in idx_aula:
+                claves.append(("a", idx_aula[o["aula_id"]]))
+            self._marcar(None, claves, b, +1)
+
+    def _preparar(self, s, disponibilidad):
+        s.claves = (("d", s.docente_id), ("g", (s.ciclo, s.seccion_id)))
+        s.aula_min = bisect_left(self.capacidades, s.cantidad)
+        permitidos = disponibilidad.get(s.docente_id)
+        s.bloques = [i for i, b in enumerate(self.bloques)
+                     if permitidos is None or b["bloque_id"] in permitidos]
+        if s.aula_min >= len(self.aulas):
+            self.sin_lugar[s.ident] = "sin_aula_con_capacidad"
+        elif not s.bloques:
+            self.sin_lugar[s.ident] = "docente_sin_disponibilidad"
+
+    # --------------------------
+    # 🔹 Estado
+    # --------------------------
+    def _marcar(self, ident, claves, b, delta):
+        for clave in claves:
+            bloqueo = self.bloqueo.get(clave)
+            if bloqueo is None:
+                bloqueo = self.bloqueo[clave] = [0] * len(self.bloques)
+                self.ocupantes[clave] = [set() for _ in self.bloques]
+            for j in self.cruza[b]:
+                bloqueo[j] += delta
+            ocupantes = self.ocupantes[clave][b]
+            if delta > 0:
+                ocupantes.add(ident)
+            else:
+                ocupantes.discard(ident)
+
+    def _claves_en(self, s, a):
+        return s.claves + (("a", a),)
+
+    def colocar(self, s, b, a):
+        self._marcar(s.ident, self._claves_en(s, a), b, +1)
+        self.pos[s.ident] = (b, a)
+        self.uso[b] += 1
+
+    def quitar(self, s):
+        b, a = self.pos[s.ident]
+        self._marcar(s.ident, self._claves_en(s, a), b, -1)
+        self.pos[s.ident] = None
+        self.uso[b] -= 1
+
+    def _libre(self, clave, b):
+        bloqueo = self.bloqueo.get(clave)
+        return bloqueo is None or bloqueo[b] == 0
+
+    def _quienes(self, clave, b):
+        """Sesiones (None = ocupación fija) que bloquean `clave` en el bloque b."""
+        ocupantes = self.ocupantes.get(clave)
+        if ocupantes is None:
+            return set()
+        encontrados = set()
+        for j in self.cruza[b]:
+            encontrados |= ocupantes[j]
+        return encontrados
+
+    def _aula_libre(self, s, b):
+        for a in range(s.aula_min, len(self.aulas)):
+            if self._libre(("a", a), b):
+                return a
+        return None
+
+    def _orden_bloques(self, s):
+        dia_hermana = None
+        if s.hermana is not None and self.pos[s.hermana.ident] is not None:
+            dia_hermana = self.dia[self.pos[s.hermana.ident][0]]
+        return sorted(s.bloques, key=lambda b: (self.dia[b] == dia_hermana, self.uso[b], self.azar.random()))
+
+    def intentar(self, s):
+        """Coloca `s` sin desplazar a nadie; False si no hay lugar libre."""
+        for b in self._orden_bloques(s):
+            if not all(self._libre(c, b) for c in s.claves):
+                continue
+            a = self._aula_libre(s, b)
+            if a is not None:
+                self.colocar(s, b, a)
+                return True
+        return False
+
+    # --------------------------
+    # 🔹 Resolución
+    # --------------------------
+    def resolver(self, tiempo_max=TIEMPO_MAX, previo=None):
+        """
+        previo: {ident de sesión: (bloque_id, aula_id)} de una solución
+        anterior. Devuelve el resumen (ver resultado()).
+        """
+        inicio = time.perf_counter()
+        limite = inicio + tiempo_max
+        self.previo_ids = previo or {}
+        previo = self.previo = self._previo_interno(self.previo_ids)
+
+        candidatas = [s for s in self.sesiones if s.ident not in self.sin_lugar]
+
+        # 0. Lo anterior que sigue siendo válido se queda donde estaba
+        pendientes = []
+        for s in candidatas:
+            lugar = previo.get(s.ident)
+            if lugar and lugar[0] in s.bloques and self.capacidades[lugar[1]] >= s.cantidad \
+                    and all(self._libre(c, lugar[0]) for c in self._claves_en(s, lugar[1])):
+                self.colocar(s, *lugar)
+            elif s.fija:
+                self.sin_lugar[s.ident] = "fija_invalida"
+            else:
+                pendientes.append(s)
+
+        # 1. Voraz: las más restringidas primero
+        pendientes.sort(key=lambda s: (len(s.bloques), -s.cantidad, s.ident))
+        cola = [s for s in pendientes if not self.intentar(s)]
+
+        # 2. Reparación por desplazamientos
+        mejor = self._foto(cola)
+        descartadas = []  # sin ningún lugar posible ni desplazando
+        tabu = {}
+        iteracion = 0
+        while cola and time.perf_counter() < limite:
+            iteracion += 1
+            s = cola.pop(self.azar.randrange(len(cola)))
+            # Si solo lo impide la lista tabú, se ignora antes de rendirse
+            eleccion = (self._mejor_desplazamiento(s, tabu, iteracion)
+                        or self._mejor_desplazamiento(s, {}, iteracion))
+            if eleccion is None:
+                self.sin_lugar[s.ident] = "sin_lugar"
+                descartadas.append(s)
+                continue
+            b, a, desplazadas = eleccion
+            for t in desplazadas:
+                self.quitar(t)
+            self.colocar(s, b, a)
+            tabu[s.ident] = iteracion + TENENCIA_TABU
+            # Las desplazadas primero intentan un lugar libre
+            cola.extend(t for t in desplazadas if not self.intentar(t))
+            if len(cola) + len(descartadas) < len(mejor[1]):
+                mejor = self._foto(cola + descartadas)
+
+        if len(cola) + len(descartadas) > len(mejor[1]):
+            self._restaurar(mejor[0])
+            cola = [self.sesiones[i] for i in mejor[1]]
+        for s in cola:
+            self.sin_lugar.setdefault(s.ident, "sin_lugar")
+        self._conservar_no_ubicadas()
+        return self.resultado(time.perf_counter() - inicio, iteracion)
+
+    def previo_guardado(self, filas):
+        """`previo` para resolver() a partir de asignaciones guardadas (asignacion_id, bloque_id, aula_id)."""
+        por_id = {f["asignacion_id"]: (f["bloque_id"], f["aula_id"]) for f in filas}
+        return {s.ident: por_id[s.asignacion_id] for s in self.sesiones if s.asignacion_id in por_id}
+
+    def _previo_interno(self, previo):
+        interno = {}
+        for ident, (bloque_id, aula_id) in previo.items():
+            b, a = self.idx_bloque.get(bloque_id), self.idx_aula.get(aula_id)
+            if b is not None and a is not None:
+                interno[ident] = (b, a)
+        return interno
+
+    def _conservar_no_ubicadas(self):
+        """
+        guardar() no toca las filas de las sesiones sin lugar: siguen en su
+        bloque y aula anteriores. Ese lugar se marca como ocupación fija y
+        las sesiones que quedaron encima se recolocan sin desplazar a nadie;
+        si no entran, quedan también sin lugar (y se conserva la suya).
+        """
+        pendientes = [s for s in self.sesiones if self.pos[s.ident] is None]
+        while pendientes:
+            s = pendientes.pop()
+            anterior = self.previo_ids.get(s.ident)
+            b = self.idx_bloque.get(anterior[0]) if anterior else None
+            if b is None:
+                # Nueva, o en un bloque desactivado: lo revisa verificar_guardado()
+                continue
+            claves = list(s.claves)
+            if anterior[1] in self.idx_aula:
+                claves.append(("a", self.idx_aula[anterior[1]]))
+            encima = set()
+            for clave in claves:
+                encima |= self._quienes(clave, b)
+            encima.discard(None)
+            for t in encima:
+                self.quitar(self.sesiones[t])
+            self._marcar(None, claves, b, +1)
+            for t in encima:
+                t = self.sesiones[t]
+                if not self.intentar(t):
+                    self.sin_lugar[t.ident] = "cruce_con_no_ubicada"
+                    pendientes.append(t)
+
+    def _mejor_desplazamiento(self, s, tabu, iteracion):
+        """(bloque, aula, sesiones a desplazar) que menos cuesta, o None."""
+        mejor = None
+        for b in s.bloques:
+            base = set()
+            for clave in s.claves:
+                base |= self._quienes(clave, b)
+            if None in base or any(self._intocable(t, tabu, iteracion) for t in base):
+                continue
+            fin = min(len(self.aulas), s.aula_min + AULAS_POR_BLOQUE)
+            for a in range(s.aula_min, fin):
+                otras = self._quienes(("a", a), b)
+                if None in otras or any(self._intocable(t, tabu, iteracion) for t in otras):
+                    continue
+                desplazadas = base | otras
+                costo = sum(2 if self.previo.get(t) == self.pos[t] else 1 for t in desplazadas)
+                costo += self.azar.random() * 0.5  # desempate
+                if mejor is None or costo < mejor[0]:
+                    mejor = (costo, b, a, desplazadas)
+                if not desplazadas:
+                    break
+        if mejor is None:
+            return None
+        return mejor[1], mejor[2], [self.sesiones[t] for t in mejor[3]]
+
+    def _intocable(self, ident, tabu, iteracion):
+        return self.sesiones[ident].fija or tabu.get(ident, 0) > iteracion
+
+    def _foto(self, cola):
+        return list(self.pos), [s.ident for s in cola]
+
+    def _restaurar(self, posiciones):
+        for s in self.sesiones:
+            if self.pos[s.ident] is not None:
+                self.quitar(s)
+        for s in self.sesiones:
+            if posiciones[s.ident] is not None:
+                self.colocar(s, *posiciones[s.ident])
+
+    # --------------------------
+    # 🔹 Resultado
+    # --------------------------
+    def resultado(self, segundos=0.0, iteraciones=0):
+        asignadas, sin_asignar = [], []
+        movidas = 0
+        for s in self.sesiones:
+            lugar = self.pos[s.ident]
+            base = {
+                "sesion": s.ident, "item": s.item, "parte": s.parte,
+                "curso_id": s.curso_id, "seccion_id": s.seccion_id,
+                "docente_id": s.docente_id, "cantidad_estudiantes": s.cantidad,
+                "asignacion_id": s.asignacion_id,
+            }
+            if lugar is None:
+                sin_asignar.append(dict(base, motivo=self.sin_lugar.get(s.ident, "sin_lugar")))
+                continue
+            b, a = lugar
+            ahora = (self.bloques[b]["bloque_id"], self.aulas[a]["aula_id"])
+            anterior = self.previo_ids.get(s.ident)
+            movida = anterior is not None and tuple(anterior) != ahora
+            movidas += movida
+            asignadas.append(dict(base, bloque_id=ahora[0], aula_id=ahora[1], movida=movida))
+        return {
+            "asignadas": asignadas,
+            "sin_asignar": sin_asignar,
+            "estadisticas": {
+                "sesiones": len(self.sesiones),
+                "asignadas": len(asignadas),
+                "sin_asignar": len(sin_asignar),
+                "movidas": movidas,
+                "iteraciones_reparacion": iteraciones,
+                "segundos": round(segundos, 3),
+            },
+        }
+
+
+# --------------------------
+# 🔹 Carga desde la BD
+# --------------------------
+def cargar_recursos(cur):
+    """(bloques activos, aulas operativas, disponibilidad por docente)."""
+    cur.execute("""
+        SELECT bloque_id, dia, hora_inicio, hora_fin
+        FROM bloque_horario
+        WHERE UPPER(estado) = 'ACTIVO'
+        ORDER BY bloque_id
+    """)
+    bloques = [dict(zip(("bloque_id", "dia", "hora_inicio", "hora_fin"), f)) for f in cur.fetchall()]
+
+    cur.execute("""
+        SELECT aula_id, capacidad
+        FROM aula
+        WHERE UPPER(estado) = 'OPERATIVO'
+    """)
+    aulas = [{"aula_id": f[0], "capacidad": f[1] or 0} for f in cur.fetchall()]
+
+    cur.execute("SELECT docente_id, bloque_id FROM disponibilidad_docente")
+    disponibilidad = {}
+    for docente_id, bloque_id in cur.fetchall():
+        disponibilidad.setdefault(docente_id, set()).add(bloque_id)
+    return bloques, aulas, disponibilidad
+
+
+def cargar_guardado(cur):
+    """El horario guardado con la cantidad de estudiantes de cada asignación."""
+    cur.execute("""
+        SELECT a.asignacion_id, a.curso_id, a.seccion_id, a.docente_id, a.aula_id,
+               a.bloque_id, c.ciclo, a.cantidad_estudiantes
+        FROM asignaciones a
+        JOIN curso c ON a.curso_id = c.curso_id
+        ORDER BY a.asignacion_id
+    """)
+    campos = ("asignacion_id", "curso_id", "seccion_id", "docente_id", "aula_id",
+              "bloque_id", "ciclo", "cantidad_estudiantes")
+    return [dict(zip(campos, f)) for f in cur.fetchall()]
+
+
+def oferta_guardada(filas, fijas=()):
+    """
+    El horario guardado (cargar_guardado) como oferta para
+    re-resolver: las dos filas de un mismo curso, sección y docente son los
+    dos bloques de una asignación.
+    """
+    fijas = set(fijas)
+    grupos = {}
+    for f in filas:
+        grupos.setdefault((f["curso_id"], f["seccion_id"], f["docente_id"]), []).append(f)
+    oferta = []
+    for grupo in grupos.values():
+        grupo.sort(key=lambda f: f["asignacion_id"])
+        # Más de dos filas (datos antiguos): se re-resuelven de a pares
+        for i in range(0, len(grupo), 2):
+            partes = grupo[i:i + 2]
+            oferta.append({
+                "curso_id": partes[0]["curso_id"],
+                "seccion_id": partes[0]["seccion_id"],
+                "ciclo": partes[0]["ciclo"],
+                "docente_id": partes[0]["docente_id"],
+                "cantidad_estudiantes": max(p.get("cantidad_estudiantes") or 0 for p in partes),
+                "bloques": len(partes),
+                "asignacion_ids": [p["asignacion_id"] for p in partes],
+                "fija": any(p["asignacion_id"] in fijas for p in partes),
+            })
+    return oferta
+
+
+def ciclos_de_cursos(cur, curso_ids):
+    cur.execute("SELECT curso_id, ciclo FROM curso WHERE curso_id = ANY(%s::int[])", (list(curso_ids),))
+    return dict(cur.fetchall())
+
+
+# --------------------------
+# 🔹 Guardado en bloque
+# --------------------------
+def guardar(cur, resultado, observaciones=""):
+    """
+    Inserta las sesiones nuevas y mueve las existentes que cambiaron de
+    lugar, con un INSERT y un UPDATE multi-fila. Devuelve (insertadas, movidas).
+    """
+    nuevas = [a for a in resultado["asignadas"] if not a["asignacion_id"]]
+    movidas = [a for a in resultado["asignadas"] if a["asignacion_id"] and a["movida"]]
+
+    if nuevas:
+        execute_values(cur, """
+            INSERT INTO asignaciones (
+                curso_id, seccion_id, docente_id, cantidad_estudiantes,
+                observaciones, bloque_id, aula_id
+            )
+            VALUES %s
+        """, [(
+            a["curso_id"], a["seccion_id"], a["docente_id"], a["cantidad_estudiantes"],
+            observaciones, a["bloque_id"], a["aula_id"]
+        ) for a in sorted(nuevas, key=lambda a: (a["item"], a["parte"]))], page_size=1000)
+
+    if movidas:
+        execute_values(cur, """
+            UPDATE asignaciones a
+            SET bloque_id = v.bloque_id, aula_id = v.aula_id
+            FROM (VALUES %s) AS v (asignacion_id, bloque_id, aula_id)
+            WHERE a.asignacion_id = v.asignacion_id
+        """, [(a["asignacion_id"], a["bloque_id"], a["aula_id"]) for a in movidas], page_size=1000)
+
+    return len(nuevas), len(movidas)
+
+
+def _par(cruce):
+    return cruce["recurso"], min(cruce["asignacion_id"], cruce["con"]), max(cruce["asignacion_id"], cruce["con"])
+
+
+def verificar_guardado(cur, antes=None):
+    """
+    Cruces del horario guardado. Con `antes` (lo que devolvió esta misma
+    función antes de guardar) solo los nuevos: lo que guardar() no debe
+    dejar pasar al commit.
+    """
+    cruces = conflictos.validar_horario(conflictos.cargar_horario(cur))
+    if antes is None:
+        return cruces
+    previos = {_par(c) for c in antes}
+    return [c for c in cruces if _par(c) not in previos]
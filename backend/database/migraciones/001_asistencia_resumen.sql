@@ -0,0 +1,34 @@
+-- ============================================
+-- 001 – Contadores de asistencia por matrícula
+-- ============================================
+-- Evita recorrer todo el historial de `asistencia` cada vez que se guarda
+-- una sesión: registrar_asistencia actualiza estos contadores con el lote
+-- recién insertado y la alerta de < 70 % se lee directamente de aquí.
+--
+--   psql -d NEWXOTRA -f database/migraciones/001_asistencia_resumen.sql
+
+CREATE TABLE IF NOT EXISTS asistencia_resumen (
+    matricula_id  INT PRIMARY KEY REFERENCES matriculas (matricula_id) ON DELETE CASCADE,
+    presentes     INT NOT NULL DEFAULT 0,
+    ausentes      INT NOT NULL DEFAULT 0,
+    tardanzas     INT NOT NULL DEFAULT 0,
+    total         INT NOT NULL DEFAULT 0,
+    actualizado   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Carga inicial con el historial existente
+INSERT INTO asistencia_resumen (matricula_id, presentes, ausentes, tardanzas, total)
+SELECT
+    matricula_id,
+    COUNT(*) FILTER (WHERE estado = 'Presente'),
+    COUNT(*) FILTER (WHERE estado = 'Ausente'),
+    COUNT(*) FILTER (WHERE estado = 'Tardanza'),
+    COUNT(*)
+FROM asistencia
+GROUP BY matricula_id
+ON CONFLICT (matricula_id) DO UPDATE SET
+    presentes   = EXCLUDED.presentes,
+    ausentes    = EXCLUDED.ausentes,
+    tardanzas   = EXCLUDED.tardanzas,
+    total       = EXCLUDED.total,
+    actualizado = NOW();
@@ -0,0 +1,103 @@
+-- ============================================
+-- 002 – Triggers que mantienen asistencia_resumen
+-- ============================================
+-- Los contadores se actualizan en la misma transacción que cualquier
+-- INSERT / UPDATE / DELETE sobre `asistencia`, venga de la API o de una
+-- corrección manual. Son triggers por sentencia con tablas de transición:
+-- un INSERT de 100 filas hace un único upsert agregado por matrícula.
+-- Requiere PostgreSQL 10 o superior.
+--
+--   psql -d NEWXOTRA -f database/migraciones/002_asistencia_resumen_triggers.sql
+--   flask --app app verificar-asistencia
+
+CREATE OR REPLACE FUNCTION asistencia_resumen_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO asistencia_resumen AS r (matricula_id, presentes, ausentes, tardanzas, total)
+    SELECT
+        matricula_id,
+        COUNT(*) FILTER (WHERE estado = 'Presente'),
+        COUNT(*) FILTER (WHERE estado = 'Ausente'),
+        COUNT(*) FILTER (WHERE estado = 'Tardanza'),
+        COUNT(*)
+    FROM nuevas
+    GROUP BY matricula_id
+    ORDER BY matricula_id
+    ON CONFLICT (matricula_id) DO UPDATE SET
+        presentes   = r.presentes + EXCLUDED.presentes,
+        ausentes    = r.ausentes + EXCLUDED.ausentes,
+        tardanzas   = r.tardanzas + EXCLUDED.tardanzas,
+        total       = r.total + EXCLUDED.total,
+        actualizado = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION asistencia_resumen_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO asistencia_resumen AS r (matricula_id, presentes, ausentes, tardanzas, total)
+    SELECT
+        matricula_id,
+        COALESCE(SUM(signo) FILTER (WHERE estado = 'Presente'), 0),
+        COALESCE(SUM(signo) FILTER (WHERE estado = 'Ausente'), 0),
+        COALESCE(SUM(signo) FILTER (WHERE estado = 'Tardanza'), 0),
+        SUM(signo)
+    FROM (
+        -- +1 por la fila nueva, -1 por la fila anterior
+        SELECT matricula_id, estado, 1 AS signo FROM nuevas
+        UNION ALL
+        SELECT matricula_id, estado, -1 AS signo FROM viejas
+    ) d
+    GROUP BY matricula_id
+    ORDER BY matricula_id
+    ON CONFLICT (matricula_id) DO UPDATE SET
+        presentes   = r.presentes + EXCLUDED.presentes,
+        ausentes    = r.ausentes + EXCLUDED.ausentes,
+        tardanzas   = r.tardanzas + EXCLUDED.tardanzas,
+        total       = r.total + EXCLUDED.total,
+        actualizado = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- En DELETE solo se restan filas existentes: si la matrícula se borró en
+-- cascada su resumen ya no está y no hay nada que actualizar.
+CREATE OR REPLACE FUNCTION asistencia_resumen_delete() RETURNS trigger AS $$
+BEGIN
+    UPDATE asistencia_resumen r SET
+        presentes   = r.presentes - d.presentes,
+        ausentes    = r.ausentes - d.ausentes,
+        tardanzas   = r.tardanzas - d.tardanzas,
+        total       = r.total - d.total,
+        actualizado = NOW()
+    FROM (
+        SELECT
+            matricula_id,
+            COUNT(*) FILTER (WHERE estado = 'Presente') AS presentes,
+            COUNT(*) FILTER (WHERE estado = 'Ausente') AS ausentes,
+            COUNT(*) FILTER (WHERE estado = 'Tardanza') AS tardanzas,
+            COUNT(*) AS total
+        FROM viejas
+        GROUP BY matricula_id
+    ) d
+    WHERE r.matricula_id = d.matricula_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_asistencia_resumen_insert ON asistencia;
+CREATE TRIGGER trg_asistencia_resumen_insert
+    AFTER INSERT ON asistencia
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE PROCEDURE asistencia_resumen_insert();
+
+DROP TRIGGER IF EXISTS trg_asistencia_resumen_update ON asistencia;
+CREATE TRIGGER trg_asistencia_resumen_update
+    AFTER UPDATE ON asistencia
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE PROCEDURE asistencia_resumen_update();
+
+DROP TRIGGER IF EXISTS trg_asistencia_resumen_delete ON asistencia;
+CREATE TRIGGER trg_asistencia_resumen_delete
+    AFTER DELETE ON asistencia
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT EXECUTE PROCEDURE asistencia_resumen_delete();
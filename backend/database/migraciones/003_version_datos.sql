@@ -0,0 +1,157 @@
+-- ============================================
+-- 003 – Versiones de datos para GET condicional (ETag / Last-Modified)
+-- ============================================
+-- Cada escritura relevante incrementa un contador en version_datos, en la
+-- misma transacción, mediante triggers. Las rutas del alumno arman su ETag
+-- con las versiones que les afectan (utils/condicional.py) sin volver a
+-- ejecutar la consulta completa.
+--
+-- Claves:
+--   est:<estudiante_id>    matrículas, calificaciones, asistencia y datos
+--                          personales del estudiante
+--   asig:<asignacion_id>   la asignación y su material
+--   global                 catálogos que aparecen en todas las respuestas
+--                          (curso, secciones, bloques, aulas, docentes)
+--
+--   psql -d NEWXOTRA -f database/migraciones/003_version_datos.sql
+
+CREATE TABLE IF NOT EXISTS version_datos (
+    clave        TEXT PRIMARY KEY,
+    version      BIGINT NOT NULL DEFAULT 1,
+    actualizado  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO version_datos (clave) VALUES ('global') ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION version_datos_incrementar(p_clave TEXT) RETURNS void AS $$
+BEGIN
+    IF p_clave IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO version_datos AS v (clave) VALUES (p_clave)
+    ON CONFLICT (clave) DO UPDATE SET
+        version     = v.version + 1,
+        actualizado = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Clave afectada por una fila según el ámbito indicado en TG_ARGV[0]
+CREATE OR REPLACE FUNCTION version_datos_clave(ambito TEXT, fila JSONB) RETURNS TEXT AS $$
+DECLARE
+    v_estudiante INT;
+BEGIN
+    IF fila IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF ambito = 'estudiante' THEN
+        RETURN 'est:' || (fila ->> 'estudiante_id');
+
+    ELSIF ambito = 'matricula' THEN
+        SELECT estudiante_id INTO v_estudiante
+        FROM matriculas WHERE matricula_id = (fila ->> 'matricula_id')::INT;
+        RETURN 'est:' || v_estudiante;
+
+    ELSIF ambito = 'asignacion' THEN
+        RETURN 'asig:' || (fila ->> 'asignacion_id');
+
+    ELSIF ambito = 'persona' THEN
+        -- Nombre de un docente: aparece en todas las respuestas
+        IF EXISTS (SELECT 1 FROM docente WHERE persona_id = (fila ->> 'persona_id')::INT) THEN
+            RETURN 'global';
+        END IF;
+        SELECT estudiante_id INTO v_estudiante
+        FROM estudiante WHERE persona_id = (fila ->> 'persona_id')::INT;
+        RETURN 'est:' || v_estudiante;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION version_datos_fila() RETURNS trigger AS $$
+DECLARE
+    clave_nueva TEXT;
+    clave_vieja TEXT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        clave_nueva := version_datos_clave(TG_ARGV[0], to_jsonb(NEW));
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        clave_vieja := version_datos_clave(TG_ARGV[0], to_jsonb(OLD));
+    END IF;
+
+    PERFORM version_datos_incrementar(clave_nueva);
+    IF clave_vieja IS DISTINCT FROM clave_nueva THEN
+        PERFORM version_datos_incrementar(clave_vieja);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION version_datos_global() RETURNS trigger AS $$
+BEGIN
+    PERFORM version_datos_incrementar('global');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Por estudiante
+DROP TRIGGER IF EXISTS trg_version_matriculas ON matriculas;
+CREATE TRIGGER trg_version_matriculas
+    AFTER INSERT OR UPDATE OR DELETE ON matriculas
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('estudiante');
+
+DROP TRIGGER IF EXISTS trg_version_calificaciones ON calificaciones;
+CREATE TRIGGER trg_version_calificaciones
+    AFTER INSERT OR UPDATE OR DELETE ON calificaciones
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('estudiante');
+
+-- El % de asistencia del horario sale de asistencia_resumen (una fila por
+-- matrícula y sentencia, no una por cada registro de asistencia)
+DROP TRIGGER IF EXISTS trg_version_asistencia_resumen ON asistencia_resumen;
+CREATE TRIGGER trg_version_asistencia_resumen
+    AFTER INSERT OR UPDATE OR DELETE ON asistencia_resumen
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('matricula');
+
+DROP TRIGGER IF EXISTS trg_version_persona ON persona;
+CREATE TRIGGER trg_version_persona
+    AFTER UPDATE ON persona
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('persona');
+
+-- Por asignación
+DROP TRIGGER IF EXISTS trg_version_asignaciones ON asignaciones;
+CREATE TRIGGER trg_version_asignaciones
+    AFTER INSERT OR UPDATE OR DELETE ON asignaciones
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('asignacion');
+
+DROP TRIGGER IF EXISTS trg_version_materiales ON materiales;
+CREATE TRIGGER trg_version_materiales
+    AFTER INSERT OR UPDATE OR DELETE ON materiales
+    FOR EACH ROW EXECUTE PROCEDURE version_datos_fila('asignacion');
+
+-- Globales (una vez por sentencia)
+DROP TRIGGER IF EXISTS trg_version_curso ON curso;
+CREATE TRIGGER trg_version_curso
+    AFTER INSERT OR UPDATE OR DELETE ON curso
+    FOR EACH STATEMENT EXECUTE PROCEDURE version_datos_global();
+
+DROP TRIGGER IF EXISTS trg_version_secciones ON secciones;
+CREATE TRIGGER trg_version_secciones
+    AFTER INSERT OR UPDATE OR DELETE ON secciones
+    FOR EACH STATEMENT EXECUTE PROCEDURE version_datos_global();
+
+DROP TRIGGER IF EXISTS trg_version_bloque_horario ON bloque_horario;
+CREATE TRIGGER trg_version_bloque_horario
+    AFTER INSERT OR UPDATE OR DELETE ON bloque_horario
+    FOR EACH STATEMENT EXECUTE PROCEDURE version_datos_global();
+
+DROP TRIGGER IF EXISTS trg_version_aula ON aula;
+CREATE TRIGGER trg_version_aula
+    AFTER INSERT OR UPDATE OR DELETE ON aula
+    FOR EACH STATEMENT EXECUTE PROCEDURE version_datos_global();
+
+DROP TRIGGER IF EXISTS trg_version_docente ON docente;
+CREATE TRIGGER trg_version_docente
+    AFTER INSERT OR UPDATE OR DELETE ON docente
+    FOR EACH STATEMENT EXECUTE PROCEDURE version_datos_global();
@@ -0,0 +1,37 @@
+-- ============================================
+-- 004 – Bandeja de salida de correos (outbox)
+-- ============================================
+-- Las rutas que crean cuentas insertan el correo aquí en la misma
+-- transacción que la cuenta y responden apenas hacen commit. Los
+-- trabajadores de utils/correo.py lo envían después, con reintentos.
+--
+-- Estados: PENDIENTE -> ENVIANDO -> ENVIADO
+--                            \-> PENDIENTE (reintento) -> ... -> FALLIDO
+-- Al enviarse, el cuerpo se borra (lleva contraseñas temporales).
+--
+--   psql -d NEWXOTRA -f database/migraciones/004_correo_saliente.sql
+
+CREATE TABLE IF NOT EXISTS correo_saliente (
+    correo_id        BIGSERIAL PRIMARY KEY,
+    destinatario     TEXT NOT NULL,
+    asunto           TEXT NOT NULL,
+    html             TEXT NOT NULL,
+    cabeceras        JSONB NOT NULL DEFAULT '{}',
+    estado           TEXT NOT NULL DEFAULT 'PENDIENTE'
+                     CHECK (estado IN ('PENDIENTE', 'ENVIANDO', 'ENVIADO', 'FALLIDO')),
+    intentos         INT NOT NULL DEFAULT 0,
+    proximo_intento  TIMESTAMP NOT NULL DEFAULT NOW(),
+    reclamado        TIMESTAMP,
+    ultimo_error     TEXT,
+    creado           TIMESTAMP NOT NULL DEFAULT NOW(),
+    enviado          TIMESTAMP
+);
+
+-- Solo las filas por enviar: el índice se mantiene chico aunque la tabla crezca
+CREATE INDEX IF NOT EXISTS idx_correo_saliente_pendiente
+    ON correo_saliente (proximo_intento)
+    WHERE estado = 'PENDIENTE';
+
+CREATE INDEX IF NOT EXISTS idx_correo_saliente_enviando
+    ON correo_saliente (reclamado)
+    WHERE estado = 'ENVIANDO';
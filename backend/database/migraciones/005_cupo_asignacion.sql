@@ -0,0 +1,100 @@
+-- ============================================
+-- 005 – Cupos por asignación y lista de espera
+-- ============================================
+-- asignaciones.cantidad_estudiantes es la capacidad de la sección, pero la
+-- matrícula no la verificaba. Ahora cada asignación tiene una fila contador
+-- en cupo_asignacion y la matrícula reserva el cupo con un UPDATE
+-- condicional (database/cupos.py):
+--
+--   UPDATE cupo_asignacion SET ocupados = ocupados + 1
+--   WHERE asignacion_id = $1 AND ocupados < capacidad
+--
+-- El UPDATE toma el bloqueo de la fila, así que las matrículas simultáneas
+-- a la misma sección se ordenan solas y nunca se pasa de la capacidad. Si
+-- el INSERT de la matrícula no procede, el ROLLBACK devuelve el cupo.
+--
+-- Los triggers de abajo mantienen la capacidad al crear o editar la
+-- asignación y liberan el cupo cuando una matrícula ACTIVA se borra o
+-- cambia de estado, venga de donde venga. Los INSERT en matriculas no se
+-- cuentan aquí: el cupo lo reserva quien inserta.
+--
+--   psql -d NEWXOTRA -f database/migraciones/005_cupo_asignacion.sql
+--   flask --app app verificar-cupos
+
+CREATE TABLE IF NOT EXISTS cupo_asignacion (
+    asignacion_id  INT PRIMARY KEY REFERENCES asignaciones (asignacion_id) ON DELETE CASCADE,
+    capacidad      INT NOT NULL,
+    ocupados       INT NOT NULL DEFAULT 0 CHECK (ocupados >= 0),
+    actualizado    TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS lista_espera (
+    espera_id      BIGSERIAL PRIMARY KEY,
+    asignacion_id  INT NOT NULL REFERENCES asignaciones (asignacion_id) ON DELETE CASCADE,
+    estudiante_id  INT NOT NULL REFERENCES estudiante (estudiante_id) ON DELETE CASCADE,
+    creado         TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (asignacion_id, estudiante_id)
+);
+
+-- Orden de llegada dentro de cada sección
+CREATE INDEX IF NOT EXISTS idx_lista_espera_orden
+    ON lista_espera (asignacion_id, espera_id);
+
+-- Carga inicial: capacidad de la asignación y matrículas ACTIVA existentes
+INSERT INTO cupo_asignacion (asignacion_id, capacidad, ocupados)
+SELECT
+    a.asignacion_id,
+    COALESCE(a.cantidad_estudiantes, 0),
+    COUNT(m.matricula_id) FILTER (WHERE m.estado = 'ACTIVA')
+FROM asignaciones a
+LEFT JOIN matriculas m ON m.asignacion_id = a.asignacion_id
+GROUP BY a.asignacion_id, a.cantidad_estudiantes
+ON CONFLICT (asignacion_id) DO UPDATE SET
+    capacidad   = EXCLUDED.capacidad,
+    ocupados    = EXCLUDED.ocupados,
+    actualizado = NOW();
+
+-- --------------------------
+-- Capacidad desde asignaciones
+-- --------------------------
+CREATE OR REPLACE FUNCTION cupo_asignacion_capacidad() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO cupo_asignacion AS c (asignacion_id, capacidad)
+    VALUES (NEW.asignacion_id, COALESCE(NEW.cantidad_estudiantes, 0))
+    ON CONFLICT (asignacion_id) DO UPDATE SET
+        capacidad   = EXCLUDED.capacidad,
+        actualizado = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_cupo_asignacion_capacidad ON asignaciones;
+CREATE TRIGGER trg_cupo_asignacion_capacidad
+    AFTER INSERT OR UPDATE OF cantidad_estudiantes ON asignaciones
+    FOR EACH ROW EXECUTE PROCEDURE cupo_asignacion_capacidad();
+
+-- --------------------------
+-- Liberar cupo al borrar o cambiar una matrícula ACTIVA
+-- --------------------------
+CREATE OR REPLACE FUNCTION cupo_asignacion_matricula() RETURNS trigger AS $$
+BEGIN
+    IF OLD.estado = 'ACTIVA' THEN
+        UPDATE cupo_asignacion
+        SET ocupados = GREATEST(ocupados - 1, 0), actualizado = NOW()
+        WHERE asignacion_id = OLD.asignacion_id;
+    END IF;
+    -- Reactivación o cambio de sección hecho a mano: se cuenta sin
+    -- condición (ya es un hecho consumado)
+    IF TG_OP = 'UPDATE' AND NEW.estado = 'ACTIVA' THEN
+        UPDATE cupo_asignacion
+        SET ocupados = ocupados + 1, actualizado = NOW()
+        WHERE asignacion_id = NEW.asignacion_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_cupo_asignacion_matricula ON matriculas;
+CREATE TRIGGER trg_cupo_asignacion_matricula
+    AFTER DELETE OR UPDATE OF estado, asignacion_id ON matriculas
+    FOR EACH ROW EXECUTE PROCEDURE cupo_asignacion_matricula();
@@ -0,0 +1,15 @@
+-- ============================================
+-- 006 – Disponibilidad horaria de los docentes
+-- ============================================
+-- Bloques en los que cada docente puede dictar, para el generador de
+-- horarios (database/generador_horarios.py, /admin/generar-horario).
+-- Un docente sin filas aquí se considera disponible en todos los bloques,
+-- así que instalar la tabla no cambia nada hasta que se cargue.
+--
+--   psql -d NEWXOTRA -f database/migraciones/006_disponibilidad_docente.sql
+
+CREATE TABLE IF NOT EXISTS disponibilidad_docente (
+    docente_id  INT NOT NULL REFERENCES docente (docente_id) ON DELETE CASCADE,
+    bloque_id   INT NOT NULL REFERENCES bloque_horario (bloque_id) ON DELETE CASCADE,
+    PRIMARY KEY (docente_id, bloque_id)
+);
@@ -0,0 +1,126 @@
+from psycopg2.extras import RealDictCursor
+
+from database import consultas
+from utils.cache import al_invalidar, invalidar, region
+from utils.coalescencia import coalescedor
+
+# ============================================
+# Oferta de matrícula por ciclo (instantánea compartida)
+# ============================================
+# /alumno/asignaciones-disponibles hacía el mismo JOIN de 8 tablas para
+# cada alumno, aunque el resultado solo depende de los ciclos que ve
+# (ciclos_a_mostrar). Ahora:
+#
+#   - La oferta de cada ciclo se arma una vez y queda en la región de caché
+#     "oferta" (clave = ciclo). Todos los alumnos del ciclo leen la misma
+#     lista; nadie la modifica.
+#   - Se descarta cuando se invalida cualquiera de las regiones de las que
+#     sale: asignaciones, bloques, aulas, secciones o cursos (al_invalidar).
+#   - Los cupos van aparte, superpuestos al responder: todos los contadores
+#     de cupo_asignacion (migración 005) en una región de TTL muy corto, así
+#     que una matrícula se ve en la oferta de los demás en segundos sin
+#     recargar la instantánea. La reserva real la hace database/cupos.py.
+
+TTL_CUPOS = 2  # segundos; init_oferta lo toma de OFERTA_CUPOS_TTL
+
+ASIGNACIONES_POR_CICLO = consultas.registrar("asignaciones_por_ciclo", """
+    SELECT
+        a.asignacion_id,
+        c.nombre AS nombre_curso,
+        c.codigo AS codigo_curso,
+        c.ciclo,
+        s.codigo AS seccion,
+        s.periodo,
+        (p.nombres || ' ' || p.apellidos) AS docente,
+        bh.dia,
+        TO_CHAR(bh.hora_inicio, 'HH24:MI') AS hora_inicio,
+        TO_CHAR(bh.hora_fin, 'HH24:MI') AS hora_fin,
+        au.nombre_aula AS aula,
+        au.capacidad
+    FROM asignaciones a
+    JOIN curso c ON a.curso_id = c.curso_id
+    JOIN secciones s ON a.seccion_id = s.seccion_id
+    JOIN docente d ON a.docente_id = d.docente_id
+    JOIN persona p ON d.persona_id = p.persona_id
+    JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
+    JOIN aula au ON a.aula_id = au.aula_id
+    WHERE c.ciclo = ANY(%s::text[])
+    ORDER BY c.ciclo, c.nombre ASC
+""")
+
+FUENTES = ("asignaciones", "bloques", "aulas", "secciones", "cursos")
+
+
+def _descartar_oferta():
+    invalidar("oferta")
+
+
+for _fuente in FUENTES:
+    al_invalidar(_fuente, _descartar_oferta)
+
+
+# --------------------------
+# 🔹 Carga
+# --------------------------
+def cargar_ciclo(conn, ciclo):
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        consultas.ejecutar(cur, ASIGNACIONES_POR_CICLO, ([ciclo],))
+        return tuple(dict(f) for f in cur.fetchall())
+    finally:
+        cur.close()
+
+
+def cargar_cupos(conn):
+    """asignacion_id -> (capacidad, ocupados)"""
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT asignacion_id, capacidad, ocupados FROM cupo_asignacion")
+        return {f[0]: (f[1], f[2]) for f in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def oferta_ciclo(conn, ciclo):
+    # Tras una invalidación, los alumnos del ciclo que llegan a la vez
+    # esperan una sola reconstrucción (utils/coalescencia.py). El coalescedor
+    # va por fuera de la región: solo la lectura del líder guarda en caché,
+    # así un seguidor que llegó después de invalidar no guarda lo que el
+    # líder empezó a cargar antes
+    return coalescedor("oferta_ciclo").ejecutar(
+        ciclo, lambda: region("oferta").leer(ciclo, lambda: cargar_ciclo(conn, ciclo))
+    )[0]
+
+
+def cupos_vivos(conn):
+    return coalescedor("cupos_oferta").ejecutar(
+        "todos", lambda: region("cupos_oferta", TTL_CUPOS).leer("todos", lambda: cargar_cupos(conn))
+    )[0]
+
+
+# --------------------------
+# 🔹 Oferta para un alumno
+# --------------------------
+def oferta_para_ciclos(conn, ciclos):
+    """
+    Asignaciones de los ciclos (mismo orden que la consulta: por ciclo y
+    nombre de curso) con cupos_total, cupos_ocupados y cupos_disponibles.
+    Las filas de la instantánea no se tocan: cada respuesta copia las suyas.
+    """
+    cupos = cupos_vivos(conn)
+    filas = []
+    for ciclo in sorted(set(ciclos)):
+        for fila in oferta_ciclo(conn, ciclo):
+            total, ocupados = cupos.get(fila["asignacion_id"], (None, None))
+            filas.append(dict(
+                fila,
+                cupos_total=total,
+                cupos_ocupados=ocupados,
+                cupos_disponibles=max(total - ocupados, 0) if total is not None else None,
+            ))
+    return filas
+
+
+def init_oferta(app):
+    global TTL_CUPOS
+    TTL_CUPOS = app.config.get("OFERTA_CUPOS_TTL", TTL_CUPOS)
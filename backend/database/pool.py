@@ -0,0 +1,220 @@
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+
+class PoolAgotadoError(PoolError):
+    """Se esperó más de lo permitido por una conexión libre."""
+
+
+# Envoltorio opcional de cursores (utils/metricas.py lo usa para contar
+# consultas y tiempo de BD por request): recibe la cursor_factory pedida y
+# devuelve la clase a usar
+_fabrica_cursores = None
+
+
+def instrumentar_cursores(fabrica):
+    global _fabrica_cursores
+    _fabrica_cursores = fabrica
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """
+    Conexión de psycopg2 que pertenece a un pool.
+    close() no destruye la conexión: la devuelve al pool, así que los
+    handlers que hacen conn.close() al final siguen funcionando igual.
+
+    Cada entrega incrementa `turno`; quien no es el dueño actual (p. ej. el
+    teardown de un request cuyo handler ya la cerró y que otro hilo volvió
+    a tomar) la devuelve con liberar(turno) y no toca el préstamo ajeno.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.liberada = False
+        self.turno = 0
+        self.ultimo_uso = time.monotonic()
+        self.preparadas = set()  # sentencias PREPARE ya creadas en esta sesión
+
+    def cursor(self, name=None, cursor_factory=None, **kwargs):
+        if _fabrica_cursores is not None:
+            cursor_factory = _fabrica_cursores(cursor_factory or self.cursor_factory)
+        if cursor_factory is None:
+            return super().cursor(name, **kwargs)
+        return super().cursor(name, cursor_factory=cursor_factory, **kwargs)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def liberar(self, turno):
+        """Devuelve la conexión solo si sigue en el préstamo `turno`."""
+        if self.pool is not None:
+            self.pool.release(self, turno)
+
+    def destruir(self):
+        """Cierra de verdad el socket (solo lo usa el pool)."""
+        self.pool = None
+        if not self.closed:
+            super().close()
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones PostgreSQL compartido por todos los hilos del proceso.
+
+    - minconn conexiones se abren al crear el pool.
+    - Como máximo maxconn conexiones en uso; si no hay ninguna libre se espera
+      hasta `timeout` segundos antes de lanzar PoolAgotadoError.
+    - Al entregar una conexión se valida que siga viva (health check).
+    """
+
+    def __init__(self, minconn, maxconn, timeout=10, ping_interval=30, **dsn):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Tamaño de pool inválido")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._dsn = dsn
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._libres = []
+        self._en_uso = 0
+        self._stats = {
+            "checkouts": 0,
+            "espera_total_s": 0.0,
+            "espera_max_s": 0.0,
+            "timeouts": 0,
+            "creadas": 0,
+            "descartadas": 0,
+        }
+        for _ in range(minconn):
+            self._libres.append(self._connect())
+
+    # --------------------------
+    # 🔹 Entrega / devolución
+    # --------------------------
+    def acquire(self):
+        inicio = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolAgotadoError(
+                f"No hay conexiones libres (máximo {self.maxconn}) tras {self.timeout}s"
+            )
+        espera = time.perf_counter() - inicio
+
+        try:
+            conn = self._sacar_libre() or self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            conn.liberada = False
+            conn.turno += 1
+            self._en_uso += 1
+            self._stats["checkouts"] += 1
+            self._stats["espera_total_s"] += espera
+            self._stats["espera_max_s"] = max(self._stats["espera_max_s"], espera)
+        return conn
+
+    def release(self, conn, turno=None):
+        """
+        Devuelve la conexión al pool. No hace nada si ya estaba devuelta o,
+        con `turno`, si desde entonces se entregó a otro (handle viejo).
+        """
+        with self._lock:
+            if conn.liberada or (turno is not None and turno != conn.turno):
+                return
+            conn.liberada = True
+
+        sana = self._limpiar(conn)
+        with self._lock:
+            self._en_uso -= 1
+            if sana:
+                conn.ultimo_uso = time.monotonic()
+                self._libres.append(conn)
+            else:
+                self._stats["descartadas"] += 1
+        if not sana:
+            conn.destruir()
+        self._slots.release()
+
+    def closeall(self):
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for conn in libres:
+            conn.destruir()
+
+    def stats(self):
+        with self._lock:
+            datos = dict(self._stats)
+            datos["en_uso"] = self._en_uso
+            datos["libres"] = len(self._libres)
+        datos["minconn"] = self.minconn
+        datos["maxconn"] = self.maxconn
+        datos["espera_promedio_s"] = (
+            datos["espera_total_s"] / datos["checkouts"] if datos["checkouts"] else 0.0
+        )
+        return datos
+
+    # --------------------------
+    # 🔹 Auxiliares
+    # --------------------------
+    def _connect(self):
+        conn = psycopg2.connect(connection_factory=PooledConnection, **self._dsn)
+        conn.pool = self
+        with self._lock:
+            self._stats["creadas"] += 1
+        return conn
+
+    def _sacar_libre(self):
+        """Devuelve la conexión libre más reciente que pase el health check."""
+        while True:
+            with self._lock:
+                if not self._libres:
+                    return None
+                conn = self._libres.pop()
+            if self._esta_viva(conn):
+                return conn
+            with self._lock:
+                self._stats["descartadas"] += 1
+            conn.destruir()
+
+    def _esta_viva(self, conn):
+        if conn.closed:
+            return False
+        # Solo se hace ping si la conexión estuvo ociosa un buen rato
+        if time.monotonic() - conn.ultimo_uso < self.ping_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _limpiar(self, conn):
+        """Deja la conexión sin transacción abierta antes de reutilizarla."""
+        if conn.closed:
+            return False
+        try:
+            estado = conn.get_transaction_status()
+            if estado == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if estado != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except psycopg2.Error:
+            return False
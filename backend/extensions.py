@@ -1,3 +1,5 @@
 from flask_mail import Mail
+from flask_jwt_extended import JWTManager
 
 mail = Mail()
+jwt = JWTManager()
@@ -1,8 +1,10 @@
 # routes/admin/__init__.py
 from flask import Blueprint
+from utils.logs import get_logger
 
 # Blueprint principal del módulo Admin
 admin_bp = Blueprint('admin', __name__)
+log = get_logger(__name__)
 
 # ====== Importar y registrar sub-blueprints ======
 
@@ -10,50 +12,74 @@ admin_bp = Blueprint('admin', __name__)
 try:
     from .perfiladmin import perfiladmin_bp
     admin_bp.register_blueprint(perfiladmin_bp, url_prefix="")
-    print(" perfiladmin_bp registrado correctamente")
+    log.debug("perfiladmin_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar perfiladmin_bp - {e}")
+    log.warning("No se pudo importar perfiladmin_bp", extra={"error": str(e)})
 
 # 2. DOCENTES
 try:
     from .docentes import docentes_bp
     admin_bp.register_blueprint(docentes_bp, url_prefix="")
-    print(" docentes_bp registrado correctamente")
+    log.debug("docentes_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar docentes_bp - {e}")
+    log.warning("No se pudo importar docentes_bp", extra={"error": str(e)})
 
 # 3. ALUMNOS
 try:
     from .alumnos import alumnos_bp
     admin_bp.register_blueprint(alumnos_bp, url_prefix="/alumnos")
-    print(" alumnos_bp registrado correctamente")
+    log.debug("alumnos_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar alumnos_bp - {e}")
+    log.warning("No se pudo importar alumnos_bp", extra={"error": str(e)})
 
 # 4. ESCUELAS
 try:
     from .escuelas import escuelas_bp
     admin_bp.register_blueprint(escuelas_bp, url_prefix="")
-    print(" escuelas_bp registrado correctamente")
+    log.debug("escuelas_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar escuelas_bp - {e}")
+    log.warning("No se pudo importar escuelas_bp", extra={"error": str(e)})
 
 # 5. ASIGNACIONES
 try:
     from .asignaciones import asignaciones_bp
     # Important: registrar sin colocar otro prefijo para que queden como /admin/...
     admin_bp.register_blueprint(asignaciones_bp, url_prefix="")
-    print("asignaciones_bp registrado correctamente")
+    log.debug("asignaciones_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar asignaciones_bp - {e}")
+    log.warning("No se pudo importar asignaciones_bp", extra={"error": str(e)})
 
 # 6. HORARIOS
 try:
     from .horarios import horarios_bp
     admin_bp.register_blueprint(horarios_bp, url_prefix="")
-    print(" horarios_bp registrado correctamente")
+    log.debug("horarios_bp registrado")
 except ImportError as e:
-    print(f"⚠️ Warning: No se pudo importar horarios_bp - {e}")
+    log.warning("No se pudo importar horarios_bp", extra={"error": str(e)})
+
+# 7. IMPORTACIÓN MASIVA DE ALUMNOS
+try:
+    from .importacion_alumnos import importacion_bp
+    admin_bp.register_blueprint(importacion_bp, url_prefix="/alumnos")
+    log.debug("importacion_bp registrado")
+except ImportError as e:
+    log.warning("No se pudo importar importacion_bp", extra={"error": str(e)})
+
+# 8. VALIDACIÓN DE CRUCES DE HORARIO
+try:
+    from .conflictos import conflictos_bp
+    admin_bp.register_blueprint(conflictos_bp, url_prefix="")
+    log.debug("conflictos_bp registrado")
+except ImportError as e:
+    log.warning("No se pudo importar conflictos_bp", extra={"error": str(e)})
+
+# 9. GENERADOR DE HORARIOS
+try:
+    from .generador_horarios import generador_bp
+    admin_bp.register_blueprint(generador_bp, url_prefix="")
+    log.debug("generador_bp registrado")
+except ImportError as e:
+    log.warning("No se pudo importar generador_bp", extra={"error": str(e)})
 
 # Exportar el blueprint principal
 __all__ = ["admin_bp"]
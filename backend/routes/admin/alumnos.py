@@ -1,11 +1,18 @@
 import re
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from database import catalogos
+from utils.paginacion import ConsultaPaginada, ParametroInvalido, quiere_paginacion, a_entero
 from utils.security import hash_password
+from utils.streaming import iterar_cursor, quiere_ndjson, respuesta_ndjson
+from utils import correo
+from utils.logs import get_logger
+from .helpers import encolar_credenciales_estudiante
 from psycopg2.extras import RealDictCursor
 
 # Crear el Blueprint
 alumnos_bp = Blueprint("alumnos", __name__)
+log = get_logger(__name__)
 
 # ===========================
 # FUNCIONES DE VALIDACIÓN
@@ -67,7 +74,7 @@ def obtener_asignaciones_disponibles(alumno_id):
             return jsonify({"error": "Alumno no encontrado"}), 404
 
         ciclo_registrado = alumno["ciclo_actual"]
-        print(f"🧮 Ciclo actual registrado en BD: {ciclo_registrado}")
+        log.debug("Ciclo registrado en BD", extra={"alumno_id": alumno_id, "ciclo": ciclo_registrado})
 
         # ==============================
         # 2️⃣ Determinar ciclo real según año de ingreso
@@ -102,7 +109,7 @@ def obtener_asignaciones_disponibles(alumno_id):
         }
         ciclo_romano = ciclos_romanos.get(ciclo_numerico, "X")
 
-        print(f"🧮 Calculado ciclo actual: {ciclo_romano} ({ciclo_numerico})")
+        log.debug("Ciclo actual calculado", extra={"alumno_id": alumno_id, "ciclo": ciclo_romano})
 
         # ==============================
         # 3️⃣ Consultar asignaciones disponibles
@@ -140,9 +147,7 @@ def obtener_asignaciones_disponibles(alumno_id):
         }), 200
 
     except Exception as e:
-        print("❌ Error en /asignaciones-disponibles:", e)
-        import traceback
-        traceback.print_exc()
+        log.exception("Error en /asignaciones-disponibles", extra={"alumno_id": alumno_id})
         return jsonify({"error": str(e)}), 500
 
     finally:
@@ -159,16 +164,12 @@ def crear_alumno():
     """
     Crea un nuevo alumno en el sistema según la estructura real de la BD.
     """
-    print("=" * 50)
-    print("🔵 INICIO - Crear Alumno")
-    print("=" * 50)
     
     if not request.json:
-        print("❌ No se recibió JSON")
+        log.info("Crear alumno sin JSON")
         return jsonify({"error": "No se recibieron datos"}), 400
     
     data = request.json
-    print(f"📨 Datos recibidos: {data}")
     
     # Capturar datos del formulario
     correo_institucional = data.get("correo_institucional")
@@ -195,7 +196,7 @@ def crear_alumno():
         if not codigo: campos_faltantes.append("codigo_universitario")
         if not ciclo_ingreso: campos_faltantes.append("ciclo_ingreso")
         
-        print(f"❌ Campos faltantes: {campos_faltantes}")
+        log.info("Crear alumno: campos faltantes", extra={"campos": campos_faltantes})
         return jsonify({"error": f"Campos faltantes: {', '.join(campos_faltantes)}"}), 400
         
     if not validar_correo(correo_institucional, "Alumno"):
@@ -215,7 +216,6 @@ def crear_alumno():
         cur = conn.cursor()
 
         # Verificar duplicados
-        print("🔍 Verificando duplicados...")
         
         cur.execute("SELECT codigo_universitario FROM estudiante WHERE codigo_universitario = %s", (codigo,))
         if cur.fetchone():
@@ -234,17 +234,14 @@ def crear_alumno():
         contrasena_hash = hash_password(contrasena_temp)
 
         # 1️⃣ Insertar usuario
-        print("➡️ Insertando usuario...")
         cur.execute("""
             INSERT INTO usuario (correo, contrasena, estado) 
             VALUES (%s, %s, 'ACTIVO') 
             RETURNING usuario_id
         """, (correo_institucional, contrasena_hash))
         usuario_id = cur.fetchone()[0]
-        print(f"✅ Usuario ID: {usuario_id}")
 
         # 2️⃣ Asignar rol
-        print("➡️ Asignando rol...")
         cur.execute("""
             SELECT rol_id FROM rol 
             WHERE LOWER(nombre_rol) IN ('alumno', 'estudiante')
@@ -258,10 +255,8 @@ def crear_alumno():
             INSERT INTO usuario_rol (usuario_id, rol_id)
             VALUES (%s, %s)
         """, (usuario_id, rol_id))
-        print(f"✅ Rol asignado: {rol_id}")
 
         # 3️⃣ Insertar persona
-        print("➡️ Insertando persona...")
         apellidos = f"{apellido_paterno} {apellido_materno}"
         cur.execute("""
             INSERT INTO persona (usuario_id, nombres, apellidos, dni, telefono) 
@@ -269,68 +264,34 @@ def crear_alumno():
             RETURNING persona_id
         """, (usuario_id, nombres, apellidos, dni, telefono))
         persona_id = cur.fetchone()[0]
-        print(f"✅ Persona ID: {persona_id}")
 
         # 4️⃣ Insertar estudiante
-        print("➡️ Insertando estudiante...")
         # NOTA: Al crear un alumno, ciclo_actual se inicializa con ciclo_ingreso
         cur.execute("""
             INSERT INTO estudiante (codigo_universitario, escuela_id, persona_id, ciclo_actual)
             VALUES (%s, %s, %s, %s)
         """, (codigo, escuela_id, persona_id, ciclo_ingreso))
-        print("✅ Estudiante creado")
+
+        # 5️⃣ Correo de bienvenida: se guarda en la bandeja de salida en esta
+        # misma transacción y lo envía un trabajador en segundo plano
+        nombre_completo = f"{nombres} {apellido_paterno} {apellido_materno}"
+        encolar_credenciales_estudiante(
+            cur,
+            correo_destino=correo_personal,
+            nombre_completo=nombre_completo,
+            correo_institucional=correo_institucional,
+            contrasena_temporal=contrasena_temp,
+            codigo_universitario=codigo
+        )
 
         conn.commit()
-        print("✅ COMMIT exitoso")
+        log.info("Alumno creado", extra={"usuario_id": usuario_id, "persona_id": persona_id})
+        correo.despertar()
 
-        # 📧 Enviar correo de bienvenida con credenciales
-        print("=" * 50)
-        print("🔵 INICIANDO ENVÍO DE CORREO")
-        print("=" * 50)
-        
-        try:
-            # La importación debe ser relativa y usar un try-except para ser robusta
-            from .helpers import enviar_credenciales_estudiante
-            print("✅ Función importada correctamente")
-            
-            nombre_completo = f"{nombres} {apellido_paterno} {apellido_materno}"
-            
-            # Nota: Se usa correo_personal para el envío
-            envio_exitoso = enviar_credenciales_estudiante(
-                correo_destino=correo_personal,
-                nombre_completo=nombre_completo,
-                correo_institucional=correo_institucional,
-                contrasena_temporal=contrasena_temp,
-                codigo_universitario=codigo
-            )
-            
-            print(f"📊 Resultado del envío: {envio_exitoso}")
-            
-            if envio_exitoso:
-                print(f"✅ Correo enviado exitosamente a {correo_personal}")
-            else:
-                print(f"⚠️ Advertencia: El estudiante fue creado pero no se pudo enviar el correo")
-                
-        except ImportError as ie:
-            # Esto ocurrirá si helpers.py no existe o la función no está allí
-            print(f"❌ ERROR DE IMPORTACIÓN (helpers): {str(ie)}")
-            import traceback
-            traceback.print_exc()
-            envio_exitoso = False
-        except Exception as e:
-            # Manejo de cualquier otro error durante el envío
-            print(f"❌ ERROR GENERAL AL ENVIAR CORREO: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            envio_exitoso = False
-
-        print("=" * 50)
-        print("🟢 FIN - Alumno creado exitosamente")
-        print("=" * 50)
 
         return jsonify({
             "mensaje": "Estudiante registrado exitosamente",
-            "correo_enviado": envio_exitoso,
+            "correo_enviado": True,  # encolado: el envío es asíncrono
             "datos": {
                 "usuario_id": usuario_id,
                 "codigo_universitario": codigo,
@@ -342,9 +303,7 @@ def crear_alumno():
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"❌ ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al registrar estudiante")
         return jsonify({"error": f"Error al registrar estudiante: {str(e)}"}), 500
     finally:
         if cur:
@@ -352,20 +311,71 @@ def crear_alumno():
         if conn:
             conn.close()
 
+# Listado paginado: filtros escuela, ciclo, estado y búsqueda por nombre,
+# código o DNI
+LISTADO_ALUMNOS = ConsultaPaginada(
+    select="""
+        SELECT 
+            e.estudiante_id,
+            e.codigo_universitario,
+            p.nombres,
+            p.apellidos,
+            p.dni,
+            p.telefono,
+            u.correo AS correo_institucional,
+            esc.nombre_escuela,
+            esc.facultad,
+            u.estado
+    """,
+    desde="""
+        FROM estudiante e
+        JOIN persona p ON e.persona_id = p.persona_id
+        JOIN usuario u ON p.usuario_id = u.usuario_id
+        JOIN escuela esc ON e.escuela_id = esc.escuela_id
+    """,
+    id_unico="e.estudiante_id",
+    ordenes={
+        "estado": ["CASE WHEN u.estado = 'ACTIVO' THEN 0 ELSE 1 END", "p.apellidos", "p.nombres"],
+        "apellidos": ["p.apellidos", "p.nombres"],
+        "codigo": ["e.codigo_universitario"],
+    },
+    filtros={
+        "escuela": ("e.escuela_id = %s", a_entero),
+        "ciclo": ("e.ciclo_actual = %s", str),
+        "estado": ("u.estado = %s", str.upper),
+    },
+    busqueda=["p.nombres", "p.apellidos", "e.codigo_universitario", "p.dni"],
+)
+
+
 # ===========================
 # LISTAR ALUMNOS (MODIFICADO)
 # ===========================
 @alumnos_bp.route("/alumnos", methods=["GET"])
 def listar_alumnos():
-    """Obtiene la lista completa de alumnos (ACTIVOS e INACTIVOS)"""
+    """
+    Obtiene la lista de alumnos (ACTIVOS e INACTIVOS).
+    Con ?limit= o ?cursor= responde paginado (ver LISTADO_ALUMNOS).
+    Con ?format=ndjson (o Accept: application/x-ndjson) exporta el listado
+    completo línea por línea, con los mismos filtros y orden.
+    """
     conn = None
     cur = None
     
     try:
+        if quiere_ndjson():
+            sql, params = LISTADO_ALUMNOS.consulta_exportacion(request.args)
+            return respuesta_ndjson(iterar_cursor(sql, params, cursor_factory=RealDictCursor))
+
         conn = get_db()
         # Usar RealDictCursor para obtener resultados como diccionarios
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
+        if quiere_paginacion(request.args):
+            pagina = LISTADO_ALUMNOS.ejecutar(cur, request.args)
+            pagina["alumnos"] = pagina.pop("items")
+            return jsonify(pagina), 200
+        
         # 🔄 CAMBIO: Ahora trae TODOS los estudiantes, no solo activos
         cur.execute("""
             SELECT 
@@ -391,8 +401,10 @@ def listar_alumnos():
         alumnos = cur.fetchall()
         return jsonify({"alumnos": alumnos}), 200
         
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"❌ Error al listar alumnos: {e}")
+        log.exception("Error al listar alumnos")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur:
@@ -443,7 +455,7 @@ def obtener_alumno(estudiante_id):
             return jsonify({"error": "Alumno no encontrado"}), 404
             
     except Exception as e:
-        print(f"❌ Error al obtener alumno: {e}")
+        log.exception("Error al obtener alumno", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": str(e)}), 500
     finally:
         if cur:
@@ -457,34 +469,12 @@ def obtener_alumno(estudiante_id):
 @alumnos_bp.route("/escuelas", methods=["GET"])
 def obtener_escuelas():
     """Obtiene la lista de todas las escuelas"""
-    conn = None
-    cur = None
-    
     try:
-        conn = get_db()
-        cur = conn.cursor() # No necesitamos RealDictCursor aquí ya que mapeamos manualmente
-        
-        cur.execute("SELECT escuela_id, nombre_escuela, facultad FROM escuela ORDER BY nombre_escuela")
-        escuelas = cur.fetchall()
-        
-        return jsonify({
-            "escuelas": [
-                {
-                    "escuela_id": row[0],
-                    "nombre_escuela": row[1],
-                    "facultad": row[2]
-                } for row in escuelas
-            ]
-        }), 200
+        return jsonify({"escuelas": catalogos.escuelas()}), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener escuelas: {e}")
+        log.exception("Error al obtener escuelas")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 # ===========================
 # MODIFICAR ALUMNO
@@ -494,16 +484,12 @@ def modificar_alumno(estudiante_id):
     """
     Actualiza la información de un alumno existente.
     """
-    print("=" * 50)
-    print(f"🔵 INICIO - Modificar Alumno ID: {estudiante_id}")
-    print("=" * 50)
     
     if not request.json:
-        print("❌ No se recibieron datos en el request")
+        log.info("Modificar alumno sin JSON", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": "No se recibieron datos"}), 400
     
     data = request.json
-    print(f"📨 Datos recibidos: {data}")
     
     # Capturar datos
     nombres = data.get("nombres")
@@ -519,7 +505,7 @@ def modificar_alumno(estudiante_id):
     # Validaciones de existencia
     if not all([nombres, apellido_paterno, apellido_materno, dni, telefono, codigo, correo_institucional, ciclo_actual, escuela_id]):
         missing_fields = [k for k, v in data.items() if v is None or v == ""]
-        print(f"❌ Campos obligatorios faltantes o nulos: {missing_fields}")
+        log.info("Modificar alumno: campos faltantes", extra={"estudiante_id": estudiante_id, "campos": missing_fields})
         return jsonify({
             "error": "Todos los campos obligatorios deben estar presentes",
             "campos_faltantes": missing_fields
@@ -527,13 +513,13 @@ def modificar_alumno(estudiante_id):
 
     # Validaciones de formato
     if not validar_correo(correo_institucional, "Alumno"):
-        print(f"❌ Formato de correo incorrecto: {correo_institucional}")
+        log.info("Modificar alumno: correo con formato inválido", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": "El correo debe terminar en @alumnounfv.edu.pe"}), 400
     if not validar_telefono(telefono):
-        print(f"❌ Formato de teléfono incorrecto: {telefono}")
+        log.info("Modificar alumno: teléfono con formato inválido", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": "El teléfono debe tener exactamente 9 dígitos"}), 400
     if not validar_dni(dni):
-        print(f"❌ Formato de DNI incorrecto: {dni}")
+        log.info("Modificar alumno: DNI con formato inválido", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": "El DNI debe tener exactamente 8 dígitos"}), 400
 
     conn = None
@@ -544,7 +530,6 @@ def modificar_alumno(estudiante_id):
         cur = conn.cursor()
 
         # Verificar que el estudiante existe
-        print(f"🔍 Buscando estudiante ID: {estudiante_id}")
         cur.execute("""
             SELECT e.persona_id, p.usuario_id, e.codigo_universitario, u.correo, p.dni
             FROM estudiante e
@@ -555,49 +540,42 @@ def modificar_alumno(estudiante_id):
         
         result = cur.fetchone()
         if not result:
-            print(f"❌ Estudiante ID {estudiante_id} no encontrado")
             return jsonify({"error": "Estudiante no encontrado"}), 404
         
         persona_id, usuario_id, codigo_actual, correo_actual, dni_actual = result
-        print(f"✅ Estudiante encontrado - Persona ID: {persona_id}, Usuario ID: {usuario_id}")
 
         # Verificar duplicados
         if codigo != codigo_actual:
-            print(f"🔍 Verificando código universitario duplicado: {codigo}")
             cur.execute("""
                 SELECT estudiante_id FROM estudiante 
                 WHERE codigo_universitario = %s AND estudiante_id != %s
             """, (codigo, estudiante_id))
             if cur.fetchone():
-                print(f"❌ Código universitario duplicado: {codigo}")
+                log.info("Modificar alumno: código universitario duplicado", extra={"estudiante_id": estudiante_id})
                 return jsonify({"error": "El código universitario ya está registrado por otro estudiante"}), 400
 
         if correo_institucional != correo_actual:
-            print(f"🔍 Verificando correo duplicado: {correo_institucional}")
             cur.execute("""
                 SELECT usuario_id FROM usuario 
                 WHERE correo = %s AND usuario_id != %s
             """, (correo_institucional, usuario_id))
             if cur.fetchone():
-                print(f"❌ Correo institucional duplicado: {correo_institucional}")
+                log.info("Modificar alumno: correo institucional duplicado", extra={"estudiante_id": estudiante_id})
                 return jsonify({"error": "El correo institucional ya está registrado por otro estudiante"}), 400
 
         if dni != dni_actual:
-            print(f"🔍 Verificando DNI duplicado: {dni}")
             cur.execute("""
                 SELECT persona_id FROM persona 
                 WHERE dni = %s AND persona_id != %s
             """, (dni, persona_id))
             if cur.fetchone():
-                print(f"❌ DNI duplicado: {dni}")
+                log.info("Modificar alumno: DNI duplicado", extra={"estudiante_id": estudiante_id})
                 return jsonify({"error": "El DNI ya está registrado por otro estudiante"}), 400
 
         # Actualizaciones
         if correo_institucional != correo_actual:
-            print("➡️ Actualizando correo en usuario")
             cur.execute("UPDATE usuario SET correo = %s WHERE usuario_id = %s", (correo_institucional, usuario_id))
 
-        print("➡️ Actualizando datos de persona")
         apellidos = f"{apellido_paterno} {apellido_materno}"
         cur.execute("""
             UPDATE persona 
@@ -605,7 +583,6 @@ def modificar_alumno(estudiante_id):
             WHERE persona_id = %s
         """, (nombres, apellidos, dni, telefono, persona_id))
 
-        print("➡️ Actualizando datos de estudiante (código, ciclo, escuela)")
         cur.execute("""
             UPDATE estudiante 
             SET codigo_universitario = %s, ciclo_actual = %s, escuela_id = %s
@@ -613,10 +590,7 @@ def modificar_alumno(estudiante_id):
         """, (codigo, ciclo_actual, escuela_id, estudiante_id))
 
         conn.commit()
-        print("✅ COMMIT exitoso")
-        print("=" * 50)
-        print("🟢 FIN - Estudiante actualizado exitosamente")
-        print("=" * 50)
+        log.info("Alumno actualizado", extra={"estudiante_id": estudiante_id})
 
         return jsonify({
             "mensaje": "Estudiante actualizado correctamente",
@@ -630,9 +604,7 @@ def modificar_alumno(estudiante_id):
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"❌ ERROR al actualizar estudiante ID {estudiante_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al actualizar estudiante", extra={"estudiante_id": estudiante_id})
         return jsonify({"error": f"Error al actualizar estudiante: {str(e)}"}), 500
     finally:
         if cur:
@@ -649,9 +621,6 @@ def eliminar_alumno(estudiante_id):
     """
     Elimina físicamente un estudiante del sistema.
     """
-    print("=" * 50)
-    print(f"🔵 INICIO - Eliminar Alumno ID: {estudiante_id}")
-    print("=" * 50)
     
     conn = None
     cur = None
@@ -662,7 +631,6 @@ def eliminar_alumno(estudiante_id):
         cur = conn.cursor()
 
         # 1️⃣ Verificar que el estudiante existe
-        print(f"🔍 Verificando existencia del estudiante ID: {estudiante_id}")
         cur.execute("""
             SELECT e.persona_id, p.usuario_id, p.nombres, p.apellidos
             FROM estudiante e
@@ -672,30 +640,25 @@ def eliminar_alumno(estudiante_id):
         
         result = cur.fetchone()
         if not result:
-            print(f"❌ Estudiante ID {estudiante_id} no encontrado")
             return jsonify({"error": "Estudiante no encontrado"}), 404
         
         persona_id, usuario_id, nombres, apellidos = result
-        print(f"✅ Estudiante encontrado: {nombres} {apellidos}")
 
         # 2️⃣ Obtener las matrículas del estudiante
-        print("➡️ Buscando matrículas del estudiante...")
         cur.execute("SELECT matricula_id FROM matriculas WHERE estudiante_id = %s", (estudiante_id,))
         matriculas = cur.fetchall()
         matricula_ids = [m[0] for m in matriculas]
-        print(f"   📌 Encontradas {len(matricula_ids)} matrículas")
+        log.debug("Matrículas a eliminar", extra={"estudiante_id": estudiante_id, "matriculas": len(matricula_ids)})
 
         # 3️⃣ Eliminar asistencias
         if matricula_ids:
-            print("➡️ Eliminando asistencias...")
             placeholders = ','.join(['%s'] * len(matricula_ids))
             cur.execute(f"DELETE FROM asistencia WHERE matricula_id IN ({placeholders})", matricula_ids)
-            print(f"   ✅ {cur.rowcount} asistencias eliminadas")
+            log.debug("Asistencias eliminadas", extra={"estudiante_id": estudiante_id, "filas": cur.rowcount})
 
         # 4️⃣ Intentar eliminar calificaciones (verificar columna primero)
         if matricula_ids:
             try:
-                print("➡️ Verificando estructura de tabla calificaciones...")
                 cur.execute("""
                     SELECT column_name 
                     FROM information_schema.columns 
@@ -707,7 +670,6 @@ def eliminar_alumno(estudiante_id):
                 
                 if col_result:
                     col_name = col_result[0]
-                    print(f"   📌 Columna encontrada: {col_name}")
                     
                     if col_name == 'matricula_id':
                         cur.execute(f"DELETE FROM calificaciones WHERE matricula_id IN ({placeholders})", matricula_ids)
@@ -715,48 +677,36 @@ def eliminar_alumno(estudiante_id):
                         # Si usa estudiante_id directamente
                         cur.execute(f"DELETE FROM calificaciones WHERE {col_name} = %s", (estudiante_id,))
                     
-                    print(f"   ✅ {cur.rowcount} calificaciones eliminadas")
+                    log.debug("Calificaciones eliminadas", extra={"estudiante_id": estudiante_id, "filas": cur.rowcount})
                 else:
-                    print("   ⚠️ Tabla calificaciones no tiene columna de referencia")
+                    log.warning("La tabla calificaciones no tiene columna de referencia al estudiante")
                     
             except Exception as e:
-                print(f"   ⚠️ Error en calificaciones: {e}")
+                log.warning("No se pudieron eliminar las calificaciones; se continúa", extra={"estudiante_id": estudiante_id, "error": str(e)})
                 # ✅ SI FALLA, HACER ROLLBACK Y CREAR NUEVA TRANSACCIÓN
                 conn.rollback()
                 cur.close()
                 cur = conn.cursor()
-                print("   🔄 Rollback ejecutado, continuando sin eliminar calificaciones...")
 
         # 5️⃣ Eliminar matrículas
-        print("➡️ Eliminando matrículas...")
         cur.execute("DELETE FROM matriculas WHERE estudiante_id = %s", (estudiante_id,))
-        print(f"   ✅ {cur.rowcount} matrículas eliminadas")
+        log.debug("Matrículas eliminadas", extra={"estudiante_id": estudiante_id, "filas": cur.rowcount})
 
         # 6️⃣ Eliminar estudiante
-        print("➡️ Eliminando estudiante...")
         cur.execute("DELETE FROM estudiante WHERE estudiante_id = %s", (estudiante_id,))
-        print("   ✅ Estudiante eliminado")
 
         # 7️⃣ Eliminar persona
-        print("➡️ Eliminando persona...")
         cur.execute("DELETE FROM persona WHERE persona_id = %s", (persona_id,))
-        print("   ✅ Persona eliminada")
 
         # 8️⃣ Eliminar usuario_rol
-        print("➡️ Eliminando usuario_rol...")
         cur.execute("DELETE FROM usuario_rol WHERE usuario_id = %s", (usuario_id,))
-        print("   ✅ Usuario_rol eliminado")
 
         # 9️⃣ Eliminar usuario
-        print("➡️ Eliminando usuario...")
         cur.execute("DELETE FROM usuario WHERE usuario_id = %s", (usuario_id,))
-        print("   ✅ Usuario eliminado")
 
         # ✅ COMMIT FINAL
         conn.commit()
-        print("=" * 50)
-        print("🟢 ÉXITO - Estudiante eliminado completamente")
-        print("=" * 50)
+        log.info("Alumno eliminado", extra={"estudiante_id": estudiante_id, "usuario_id": usuario_id})
 
         return jsonify({
             "mensaje": "Estudiante desactivado correctamente",
@@ -766,11 +716,8 @@ def eliminar_alumno(estudiante_id):
     except Exception as e:
         if conn:
             conn.rollback()
-            print("🔄 ROLLBACK ejecutado por error")
         
-        print(f"❌ ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al eliminar estudiante", extra={"estudiante_id": estudiante_id})
         
         return jsonify({"error": f"Error al eliminar estudiante: {str(e)}"}), 500
         
@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify
 from psycopg2.extras import RealDictCursor
 from database.db import get_db
+from database import catalogos, conflictos, consultas
+from utils.cache import invalidar
+from utils.coalescencia import coalescer
+from utils.paginacion import ConsultaPaginada, ParametroInvalido, quiere_paginacion, a_entero
+from utils.streaming import iterar_cursor, quiere_ndjson, respuesta_ndjson
 
 # ✅ Este blueprint se registrará bajo /admin (ejemplo: /admin/cursos)
 asignaciones_bp = Blueprint("asignaciones", __name__)
@@ -10,17 +15,7 @@ asignaciones_bp = Blueprint("asignaciones", __name__)
 # -----------------------------
 @asignaciones_bp.route("/cursos", methods=["GET"])
 def listar_cursos():
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT curso_id, codigo, nombre, creditos, ciclo, tipo
-        FROM curso
-        WHERE estado = TRUE
-        ORDER BY nombre ASC
-    """)
-    cursos = cur.fetchall()
-    cur.close(); conn.close()
-    return jsonify(cursos)
+    return jsonify(catalogos.cursos_activos())
 
 
 # -----------------------------
@@ -53,17 +48,7 @@ def listar_docentes():
 # -----------------------------
 @asignaciones_bp.route("/secciones", methods=["GET"])
 def listar_secciones():
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT seccion_id, codigo, ciclo_academico, periodo
-        FROM secciones
-        WHERE UPPER(estado) = 'ACTIVO'
-        ORDER BY periodo DESC, codigo ASC
-    """)
-    secciones = cur.fetchall()
-    cur.close(); conn.close()
-    return jsonify(secciones)
+    return jsonify(catalogos.secciones_activas())
 
 
 # -----------------------------
@@ -71,23 +56,7 @@ def listar_secciones():
 # -----------------------------
 @asignaciones_bp.route("/horarios", methods=["GET"])
 def listar_horarios():
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT 
-            bloque_id,
-            codigo_bloque,
-            dia,
-            TO_CHAR(hora_inicio, 'HH24:MI') AS hora_inicio,
-            TO_CHAR(hora_fin, 'HH24:MI') AS hora_fin,
-            CONCAT(dia, ' ', TO_CHAR(hora_inicio, 'HH24:MI'), '-', TO_CHAR(hora_fin, 'HH24:MI')) AS descripcion
-        FROM bloque_horario
-        WHERE UPPER(estado) = 'ACTIVO'
-        ORDER BY dia, hora_inicio
-    """)
-    horarios = cur.fetchall()
-    cur.close(); conn.close()
-    return jsonify(horarios)
+    return jsonify(catalogos.bloques_activos())
 
 
 # -----------------------------
@@ -95,30 +64,80 @@ def listar_horarios():
 # -----------------------------
 @asignaciones_bp.route("/aulas", methods=["GET"])
 def listar_aulas():
-    conn = get_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-
     try:
-        cur.execute("""
-            SELECT 
-                a.aula_id,
-                a.nombre_aula AS nombre,
-                a.capacidad,
-                p.nombre_pabellon AS pabellon,
-                ta.nombre_tipo AS tipo_aula
-            FROM aula a
-            JOIN pabellon p ON a.pabellon_id = p.pabellon_id
-            JOIN tipo_aula_cat ta ON a.tipo_aula_id = ta.tipo_aula_id
-            WHERE UPPER(a.estado) = 'OPERATIVO'
-            ORDER BY p.nombre_pabellon, a.nombre_aula
-        """)
-        aulas = cur.fetchall()
-        return jsonify(aulas)
+        return jsonify(catalogos.aulas_operativas())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        cur.close()
-        conn.close()
+
+
+# -----------------------------
+# CREAR ASIGNACIÓN
+# -----------------------------
+# Validaciones como consultas preparadas (database/consultas.py)
+SECCION_ACTIVA = consultas.registrar("seccion_activa", """
+    SELECT 1 FROM secciones 
+    WHERE seccion_id=%s AND UPPER(estado)='ACTIVO'
+""")
+
+BLOQUE_ACTIVO = consultas.registrar("bloque_activo", """
+    SELECT dia FROM bloque_horario 
+    WHERE bloque_id=%s AND UPPER(estado)='ACTIVO'
+""")
+
+AULA_OPERATIVA = consultas.registrar("aula_operativa", """
+    SELECT capacidad FROM aula 
+    WHERE aula_id=%s AND UPPER(estado)='OPERATIVO'
+""")
+
+# Mensajes por recurso en cruce (database/conflictos.py); el índice de la
+# tupla es el bloque: principal o segundo
+MENSAJES_CRUCE = {
+    "aula": (
+        "El aula ya está ocupada en el bloque principal.",
+        "El aula ya está ocupada en el segundo bloque.",
+    ),
+    "docente": (
+        "El docente ya tiene una clase en el bloque principal.",
+        "El docente ya tiene clase en el segundo bloque.",
+    ),
+    "duplicado": (
+        "Este curso ya tiene una asignación registrada en esta sección y bloque.",
+        "Estas duplicando el registro del curso en sección con el segundo bloque.",
+    ),
+    "seccion": (
+        "La sección ya tiene otro curso del ciclo en el horario del bloque principal.",
+        "La sección ya tiene otro curso del ciclo en el horario del segundo bloque.",
+    ),
+}
+
+MENSAJES_CRUCE_EDICION = {
+    "aula": ("El aula ya está ocupada en ese horario.",),
+    "docente": ("El docente ya tiene una clase asignada en ese horario.",),
+    "duplicado": ("Este curso ya tiene una asignación registrada en esta sección y horario.",),
+    "seccion": ("La sección ya tiene otro curso del ciclo en ese horario.",),
+}
+
+# Ids provisionales de las propuestas nuevas (las guardadas son positivas)
+NUEVA_1, NUEVA_2 = -1, -2
+
+
+def primer_cruce(cruces, mensajes=MENSAJES_CRUCE):
+    """Respuesta 400 con el primer cruce (bloque principal primero; aula, docente, sección) o None."""
+    if not cruces:
+        return None
+    orden = {"aula": 0, "docente": 1, "seccion": 2}
+    c = min(cruces, key=lambda c: (c["asignacion_id"] == NUEVA_2, orden[c["recurso"]]))
+    tipo = "duplicado" if c["recurso"] == "seccion" and c["mismo_curso"] else c["recurso"]
+    bloque = 1 if c["asignacion_id"] == NUEVA_2 else 0
+    return jsonify({"error": mensajes[tipo][bloque], "conflictos": serializar_cruces(cruces)}), 400
+
+
+def serializar_cruces(cruces):
+    return [dict(
+        c,
+        hora_inicio=c["hora_inicio"].strftime("%H:%M"),
+        hora_fin=c["hora_fin"].strftime("%H:%M"),
+    ) for c in cruces]
 
 
 @asignaciones_bp.route("/crear-asignacion", methods=["POST"])
@@ -161,18 +180,12 @@ def crear_asignacion():
 
     try:
         # ✅ Validar sección activa
-        cur.execute("""
-            SELECT 1 FROM secciones 
-            WHERE seccion_id=%s AND UPPER(estado)='ACTIVO'
-        """, (seccion_id,))
+        consultas.ejecutar(cur, SECCION_ACTIVA, (seccion_id,))
         if not cur.fetchone():
             return jsonify({"error": "La sección no está activa."}), 400
 
         # ✅ Validar bloque 1 activo
-        cur.execute("""
-            SELECT dia FROM bloque_horario 
-            WHERE bloque_id=%s AND UPPER(estado)='ACTIVO'
-        """, (bloque_id,))
+        consultas.ejecutar(cur, BLOQUE_ACTIVO, (bloque_id,))
         bloque1 = cur.fetchone()
         if not bloque1:
             return jsonify({"error": "Bloque horario principal no válido."}), 400
@@ -182,10 +195,7 @@ def crear_asignacion():
         # ✅ Validar bloque 2 activo (si existe)
         dia_bloque_2 = None
         if bloque_id_2:
-            cur.execute("""
-                SELECT dia FROM bloque_horario 
-                WHERE bloque_id=%s AND UPPER(estado)='ACTIVO'
-            """, (bloque_id_2,))
+            consultas.ejecutar(cur, BLOQUE_ACTIVO, (bloque_id_2,))
             bloque2 = cur.fetchone()
             if not bloque2:
                 return jsonify({"error": "Bloque horario secundario no válido."}), 400
@@ -193,10 +203,7 @@ def crear_asignacion():
 
         # ✅ Validar aulas
         def validar_aula(aula_id_validar, bloque_validar):
-            cur.execute("""
-                SELECT capacidad FROM aula 
-                WHERE aula_id=%s AND UPPER(estado)='OPERATIVO'
-            """, (aula_id_validar,))
+            consultas.ejecutar(cur, AULA_OPERATIVA, (aula_id_validar,))
             aula = cur.fetchone()
             if not aula:
                 return "Aula no operativa o inexistente"
@@ -213,66 +220,21 @@ def crear_asignacion():
             if error:
                 return jsonify({"error": f"Aula secundaria: {error}"}), 400
 
-        # ✅ Validar aula ocupada BLOQUE 1
-        cur.execute("""
-            SELECT 1 FROM asignaciones 
-            WHERE bloque_id=%s AND aula_id=%s
-        """, (bloque_id, aula_id))
-        if cur.fetchone():
-            return jsonify({"error": "El aula ya está ocupada en el bloque principal."}), 400
-
-        # ✅ Validar docente BLOQUE 1
-        cur.execute("""
-            SELECT 1 FROM asignaciones 
-            WHERE bloque_id=%s AND docente_id=%s
-        """, (bloque_id, docente_id))
-        if cur.fetchone():
-            return jsonify({"error": "El docente ya tiene una clase en el bloque principal."}), 400
-
-        # ✅ Validar duplicado en la misma sección
-        cur.execute("""
-            SELECT 1 FROM asignaciones
-            WHERE curso_id=%s 
-            AND seccion_id=%s 
-            AND bloque_id=%s
-        """, (curso_id, seccion_id, bloque_id))
-        if cur.fetchone():
-            return jsonify({
-                "error": "Este curso ya tiene una asignación registrada en esta sección y bloque."
-            }), 400
-
-        # ================================
-        # ✅ VALIDACIONES BLOQUE 2
-        # ================================
+        # ✅ Cruces de aula, docente y sección por horas (no solo por el mismo
+        # bloque) para los dos bloques, entre sí y contra lo guardado
+        propuestas = [dict(
+            asignacion_id=NUEVA_1, curso_id=curso_id, seccion_id=seccion_id,
+            docente_id=docente_id, aula_id=aula_id, bloque_id=bloque_id
+        )]
         if bloque_id_2:
-
-            # Aula ocupada BLOQUE 2
-            cur.execute("""
-                SELECT 1 FROM asignaciones 
-                WHERE bloque_id=%s AND aula_id=%s
-            """, (bloque_id_2, aula_id_2))
-            if cur.fetchone():
-                return jsonify({"error": "El aula ya está ocupada en el segundo bloque."}), 400
-
-            # Docente ocupado BLOQUE 2
-            cur.execute("""
-                SELECT 1 FROM asignaciones 
-                WHERE bloque_id=%s AND docente_id=%s
-            """, (bloque_id_2, docente_id))
-            if cur.fetchone():
-                return jsonify({"error": "El docente ya tiene clase en el segundo bloque."}), 400
-
-            # Validar duplicado dentro de sección (bloque 2)
-            cur.execute("""
-                SELECT 1 FROM asignaciones
-                WHERE curso_id=%s 
-                AND seccion_id=%s 
-                AND bloque_id=%s
-            """, (curso_id, seccion_id, bloque_id_2))
-            if cur.fetchone():
-                return jsonify({
-                    "error": "Estas duplicando el registro del curso en sección con el segundo bloque."
-                }), 400
+            propuestas.append(dict(
+                asignacion_id=NUEVA_2, curso_id=curso_id, seccion_id=seccion_id,
+                docente_id=docente_id, aula_id=aula_id_2, bloque_id=bloque_id_2
+            ))
+        _, cruces = conflictos.conflictos_propuestas(cur, propuestas)
+        respuesta = primer_cruce(cruces)
+        if respuesta:
+            return respuesta
 
         # ================================
         # ✅ INSERTAR BLOQUE 1
@@ -304,6 +266,7 @@ def crear_asignacion():
             ))
 
         conn.commit()
+        invalidar("asignaciones")
         return jsonify({"mensaje": "✅ Asignación registrada exitosamente."}), 201
 
     except Exception as e:
@@ -317,11 +280,52 @@ def crear_asignacion():
 # -----------------------------
 # LISTAR ASIGNACIONES
 # -----------------------------
+# Listado paginado: filtros curso, seccion, docente y ciclo del curso
+LISTADO_ASIGNACIONES = ConsultaPaginada(
+    select="""
+        SELECT 
+            a.asignacion_id,
+            a.curso_id,
+            a.seccion_id,
+            a.docente_id,
+            a.cantidad_estudiantes,
+            a.observaciones,
+            a.bloque_id,
+            a.aula_id
+    """,
+    desde="FROM asignaciones a",
+    id_unico="a.asignacion_id",
+    ordenes={"id": []},
+    dir_defecto="desc",
+    filtros={
+        "curso": ("a.curso_id = %s", a_entero),
+        "seccion": ("a.seccion_id = %s", a_entero),
+        "docente": ("a.docente_id = %s", a_entero),
+        "ciclo": ("a.curso_id IN (SELECT curso_id FROM curso WHERE ciclo = %s)", str),
+    },
+)
+
+
+def _clave_listado():
+    # La exportación NDJSON va en streaming: cada solicitud hace la suya
+    return None if quiere_ndjson() else request.full_path
+
+
 @asignaciones_bp.route("/listar-asignaciones", methods=["GET"])
+@coalescer("listar_asignaciones", clave=_clave_listado)
 def listar_asignaciones():
     conn = get_db()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
+        # Exportación completa línea por línea (?format=ndjson)
+        if quiere_ndjson():
+            sql, params = LISTADO_ASIGNACIONES.consulta_exportacion(request.args)
+            return respuesta_ndjson(iterar_cursor(sql, params, cursor_factory=RealDictCursor))
+        # Con ?limit= o ?cursor= responde paginado (ver LISTADO_ASIGNACIONES)
+        if quiere_paginacion(request.args):
+            pagina = LISTADO_ASIGNACIONES.ejecutar(cur, request.args)
+            pagina["asignaciones"] = pagina.pop("items")
+            return jsonify(pagina)
         cur.execute("""
             SELECT 
                 a.asignacion_id,
@@ -337,6 +341,8 @@ def listar_asignaciones():
         """)
         asignaciones = cur.fetchall()
         return jsonify(asignaciones)
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error al listar asignaciones: {str(e)}"}), 500
     finally:
@@ -390,21 +396,14 @@ def editar_asignacion(asignacion_id):
                 "error": f"La cantidad de estudiantes ({cantidad_estudiantes}) supera la capacidad del aula ({capacidad_aula})."
             }), 400
 
-        # Validar conflicto de aula (excepto la asignación actual)
-        cur.execute("""
-            SELECT 1 FROM asignaciones 
-            WHERE bloque_id=%s AND aula_id=%s AND asignacion_id != %s
-        """, (bloque_id, aula_id, asignacion_id))
-        if cur.fetchone():
-            return jsonify({"error": "El aula ya está ocupada en ese horario."}), 400
-
-        # Validar conflicto de docente (excepto la asignación actual)
-        cur.execute("""
-            SELECT 1 FROM asignaciones 
-            WHERE bloque_id=%s AND docente_id=%s AND asignacion_id != %s
-        """, (bloque_id, docente_id, asignacion_id))
-        if cur.fetchone():
-            return jsonify({"error": "El docente ya tiene una clase asignada en ese horario."}), 400
+        # Cruces por horas con el resto del horario (excepto la asignación actual)
+        _, cruces = conflictos.conflictos_propuestas(cur, [dict(
+            asignacion_id=asignacion_id, curso_id=curso_id, seccion_id=seccion_id,
+            docente_id=docente_id, aula_id=aula_id, bloque_id=bloque_id
+        )])
+        respuesta = primer_cruce(cruces, MENSAJES_CRUCE_EDICION)
+        if respuesta:
+            return respuesta
 
         # Actualizar asignación
         cur.execute("""
@@ -420,6 +419,7 @@ def editar_asignacion(asignacion_id):
         """, (curso_id, seccion_id, docente_id, cantidad_estudiantes, observaciones, bloque_id, aula_id, asignacion_id))
 
         conn.commit()
+        invalidar("asignaciones")
         return jsonify({"mensaje": "✅ Asignación actualizada exitosamente."}), 200
 
     except Exception as e:
@@ -448,6 +448,7 @@ def eliminar_asignacion(asignacion_id):
         # Eliminar asignación
         cur.execute("DELETE FROM asignaciones WHERE asignacion_id=%s", (asignacion_id,))
         conn.commit()
+        invalidar("asignaciones")
 
         return jsonify({"mensaje": "✅ Asignación eliminada exitosamente."}), 200
 
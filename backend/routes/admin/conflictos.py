@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify
+from database.db import get_db
+from database import conflictos
+from routes.admin.asignaciones import serializar_cruces
+from utils.logs import get_logger
+
+conflictos_bp = Blueprint("conflictos", __name__)
+log = get_logger(__name__)
+
+
+# -----------------------------
+# VALIDAR HORARIO COMPLETO
+# -----------------------------
+# GET  /admin/validar-horario  → cruces del horario guardado
+# POST /admin/validar-horario  → cruces de un horario propuesto:
+#   {
+#     "asignaciones": [{"asignacion_id"?, "curso_id", "seccion_id",
+#                       "docente_id", "aula_id", "horario_id"}, ...],
+#     "reemplazar_todo": false
+#   }
+#   Cada propuesta con asignacion_id reemplaza a esa asignación guardada;
+#   las nuevas reciben el id -(posición + 1) en la respuesta. Con
+#   reemplazar_todo=true el horario propuesto se valida solo contra sí
+#   mismo (borrador de todo el semestre).
+#
+# Los cruces son por horas (database/conflictos.py): aula, docente y
+# sección del mismo ciclo. Se devuelve cada par una sola vez.
+@conflictos_bp.route("/validar-horario", methods=["GET", "POST"])
+def validar_horario():
+    data = request.get_json(silent=True) or {}
+    propuestas = data.get("asignaciones")
+    if request.method == "POST" and not isinstance(propuestas, list):
+        return jsonify({"error": "⚠️ Envía la lista 'asignaciones'"}), 400
+
+    conn = None
+    cur = None
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+
+        if request.method == "GET":
+            horario = conflictos.cargar_horario(cur)
+            cruces = conflictos.validar_horario(horario)
+            return jsonify({
+                "total": len(horario),
+                "conflictos": serializar_cruces(cruces)
+            }), 200
+
+        # 1️⃣ Normalizar propuestas (ids provisionales para las nuevas)
+        for i, p in enumerate(propuestas):
+            if not all(p.get(k) for k in ("curso_id", "seccion_id", "docente_id", "horario_id")):
+                return jsonify({"error": f"⚠️ Faltan campos obligatorios en la asignación {i + 1}"}), 400
+        normalizadas = [{
+            "asignacion_id": p.get("asignacion_id") or -(i + 1),
+            "curso_id": p["curso_id"],
+            "seccion_id": p["seccion_id"],
+            "docente_id": p["docente_id"],
+            "aula_id": p.get("aula_id"),
+            "bloque_id": p["horario_id"],
+        } for i, p in enumerate(propuestas)]
+
+        # 2️⃣ Día y horas de cada propuesta (una consulta)
+        completas = conflictos.completar_propuestas(cur, normalizadas)
+        ids_propuestos = {p["asignacion_id"] for p in completas}
+        sin_bloque = [p["asignacion_id"] for p in normalizadas
+                      if int(p["asignacion_id"]) not in ids_propuestos]
+
+        # 3️⃣ Horario guardado que sigue vigente (una consulta) + propuestas
+        horario = []
+        if not data.get("reemplazar_todo"):
+            horario = [f for f in conflictos.cargar_horario(cur)
+                       if f["asignacion_id"] not in ids_propuestos]
+
+        # 4️⃣ Una pasada; solo interesan los cruces que tocan una propuesta
+        cruces = [c for c in conflictos.validar_horario(horario + completas)
+                  if c["asignacion_id"] in ids_propuestos or c["con"] in ids_propuestos]
+
+        return jsonify({
+            "total": len(completas),
+            "conflictos": serializar_cruces(cruces),
+            "curso_o_bloque_inexistente": sin_bloque
+        }), 200
+
+    except (TypeError, ValueError):
+        return jsonify({"error": "⚠️ Los ids deben ser números"}), 400
+    except Exception as e:
+        log.exception("Error al validar horario")
+        return jsonify({"error": f"Error interno: {str(e)}"}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -3,13 +3,12 @@ import re
 import string
 import random
 import unicodedata
-import smtplib 
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.header import Header 
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from database import catalogos
+from utils.paginacion import ConsultaPaginada, ParametroInvalido, quiere_paginacion, a_entero, a_booleano
 from utils.security import hash_password
+from utils import correo
 from psycopg2.extras import RealDictCursor
 import psycopg2 
 from datetime import datetime, date
@@ -17,78 +16,30 @@ from psycopg2 import errors
 
 docentes_bp = Blueprint('docentes', __name__)
 
-# ========================================================
-# 📧 CONFIGURACIÓN DEL CORREO
-# ========================================================
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
-# 1. Tu correo Gmail real
-SENDER_EMAIL = "enzofabian3007@gmail.com" 
-# 2. Tu Contraseña de Aplicación de 16 letras
-SENDER_PASSWORD = "vrqs bohf cnxx dalf" 
-
 # ===========================
 # FUNCIONES AUXILIARES
 # ===========================
 
-def enviar_correo_credenciales(destinatario, nombre, correo_inst, password):
+def encolar_correo_credenciales(cur, destinatario, nombre, correo_inst, password):
     """
-    Envía el correo con asunto 'SISTEMA UNFV' y marcado como IMPORTANTE.
+    Deja en la bandeja de salida el correo 'SISTEMA UNFV' marcado como
+    IMPORTANTE. Se guarda en la misma transacción que crea al docente.
     """
-    try:
-        # Crear el mensaje
-        msg = MIMEMultipart()
-        
-        # --- CABECERAS DEL CORREO ---
-        msg['From'] = str(Header(f"Sistema Academico EPIS <{SENDER_EMAIL}>", 'utf-8'))
-        msg['To'] = destinatario
-        
-        # 1. CAMBIO DE TÍTULO
-        msg['Subject'] = Header("SISTEMA UNFV", 'utf-8') 
-
-        # 2. MARCAR COMO IMPORTANTE (Alta Prioridad)
-        msg['X-Priority'] = '1'
-        msg['X-MSMail-Priority'] = 'High'
-        msg['Importance'] = 'High'
-
-        # Diseño del correo
-        cuerpo_html = f"""
-        <div style="font-family: Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; border: 1px solid #ddd; border-radius: 8px; overflow: hidden;">
-            <div style="background-color: #d32f2f; padding: 20px; text-align: center; color: white;">
-                <h2 style="margin: 0;">SISTEMA UNFV - NOTIFICACI&Oacute;N</h2>
-            </div>
-            <div style="padding: 20px;">
-                <p>Estimado/a <strong>{nombre}</strong>,</p>
-                <p>Se ha registrado su cuenta de docente en el Sistema de Gesti&oacute;n Acad&eacute;mica.</p>
-                <p>A continuaci&oacute;n, sus credenciales de acceso:</p>
-                
-                <div style="background-color: #fff3cd; padding: 15px; border-left: 5px solid #ffc107; margin: 20px 0;">
-                    <p style="margin: 5px 0;"><strong>&#128231; Usuario:</strong> {correo_inst}</p>
-                    <p style="margin: 5px 0;"><strong>&#128273; Contrase&ntilde;a:</strong> {password}</p>
-                </div>
-
-                <p><strong>IMPORTANTE:</strong> Por seguridad, cambie su contrase&ntilde;a inmediatamente al ingresar.</p>
-                <hr style="border: 0; border-top: 1px solid #eee; margin: 20px 0;">
-                <small style="color: #777;">Universidad Nacional Federico Villarreal - EPIS</small>
-            </div>
-        </div>
-        """
-        
-        msg.attach(MIMEText(cuerpo_html, 'html', 'utf-8'))
-
-        # Conexión y envío
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls() 
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        text = msg.as_string()
-        server.sendmail(SENDER_EMAIL, destinatario, text)
-        server.quit()
-        
-        print(f"✅ Correo enviado correctamente a: {destinatario}")
-        return True
-    except Exception as e:
-        print(f"❌ Error al enviar correo: {str(e)}")
-        return False
+    # Diseño del correo
+    cuerpo_html = correo.renderizar(
+        "credenciales_docente.html",
+        nombre=nombre,
+        correo_inst=correo_inst,
+        password=password
+    )
+
+    # Marcar como importante (alta prioridad)
+    cabeceras = {
+        "X-Priority": "1",
+        "X-MSMail-Priority": "High",
+        "Importance": "High",
+    }
+    return correo.encolar(cur, destinatario, "SISTEMA UNFV", cuerpo_html, cabeceras)
 
 def generar_contrasena_aleatoria(longitud=10):
     caracteres = string.ascii_letters + string.digits + "!@#$%"
@@ -120,51 +71,31 @@ def validar_dni(dni):
 
 @docentes_bp.route("/departamentos", methods=["GET"])
 def obtener_departamentos_ubigeo():
-    conn = None; cur = None
     try:
-        conn = get_db(); cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT departamento_id, nombre_departamento FROM departamento_geo ORDER BY nombre_departamento")
-        return jsonify({"departamentos": cur.fetchall()}) 
+        return jsonify({"departamentos": catalogos.departamentos()})
     except (Exception, psycopg2.Error) as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur: cur.close(); conn.close()
 
 @docentes_bp.route("/provincias/<string:id_departamento>", methods=["GET"])
 def obtener_provincias_ubigeo(id_departamento):
-    conn = None; cur = None
     try:
-        conn = get_db(); cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT provincia_id, nombre_provincia FROM provincia WHERE departamento_id = %s ORDER BY nombre_provincia", (id_departamento,))
-        return jsonify({"provincias": cur.fetchall()})
+        return jsonify({"provincias": catalogos.provincias(id_departamento)})
     except (Exception, psycopg2.Error) as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur: cur.close(); conn.close()
 
 @docentes_bp.route("/distritos/<string:id_provincia>", methods=["GET"])
 def obtener_distritos_ubigeo(id_provincia):
-    conn = None; cur = None
     try:
-        conn = get_db(); cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT distrito_id, nombre_distrito FROM distrito WHERE provincia_id = %s ORDER BY nombre_distrito", (id_provincia,))
-        return jsonify({"distritos": cur.fetchall()})
+        return jsonify({"distritos": catalogos.distritos(id_provincia)})
     except (Exception, psycopg2.Error) as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur: cur.close(); conn.close()
 
 @docentes_bp.route("/escuelas", methods=["GET"])
 def obtener_escuelas():
-    conn = None; cur = None
     try:
-        conn = get_db(); cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT escuela_id, nombre_escuela, facultad FROM escuela ORDER BY nombre_escuela")
-        return jsonify({"escuelas": cur.fetchall()})
+        return jsonify({"escuelas": catalogos.escuelas()})
     except (Exception, psycopg2.Error) as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur: cur.close(); conn.close()
 
 # ===========================
 # CREAR DOCENTE
@@ -233,14 +164,13 @@ def crear_docente():
         
         codigo_generado = cur.fetchone()[0] 
 
-        conn.commit()
+        # Correo de credenciales a la bandeja de salida (mismo commit)
+        encolar_correo_credenciales(cur, correo_personal, f"{nombres} {apellidos}", correo_institucional, contrasena_generada)
 
-        # Envío de Correo Real con cabeceras de Importancia
-        envio_exitoso = enviar_correo_credenciales(correo_personal, f"{nombres} {apellidos}", correo_institucional, contrasena_generada)
+        conn.commit()
+        correo.despertar()
         
         mensaje_final = "Docente creado con éxito."
-        if not envio_exitoso:
-            mensaje_final += " (Advertencia: Correo no enviado)."
 
         return jsonify({
             "mensaje": mensaje_final, 
@@ -267,11 +197,62 @@ def crear_docente():
 # ==========================
 # LISTAR DOCENTES
 # ==========================
+# Listado paginado: filtros escuela, estado y búsqueda por nombre, código o DNI
+LISTADO_DOCENTES = ConsultaPaginada(
+    select="""
+        SELECT 
+            doc.docente_id, u.usuario_id, p.nombres, p.apellidos, p.dni, p.telefono, p.fecha_nacimiento,
+            u.correo, doc.estado, e.nombre_escuela, e.escuela_id, d.direccion_detalle AS direccion_desc, 
+            d.id_direccion, dist.distrito_id AS id_distrito, dist.nombre_distrito AS distrito,
+            prov.provincia_id AS id_provincia, prov.nombre_provincia AS provincia,
+            dep.departamento_id AS id_departamento, dep.nombre_departamento AS departamento,
+            doc.codigo_docente
+    """,
+    desde="""
+        FROM docente doc
+        LEFT JOIN persona p ON doc.persona_id = p.persona_id
+        LEFT JOIN usuario u ON p.usuario_id = u.usuario_id 
+        LEFT JOIN escuela e ON doc.escuela_id = e.escuela_id
+        LEFT JOIN direccion d ON doc.id_direccion = d.id_direccion
+        LEFT JOIN distrito dist ON d.id_distrito = dist.distrito_id
+        LEFT JOIN provincia prov ON dist.provincia_id = prov.provincia_id
+        LEFT JOIN departamento_geo dep ON prov.departamento_id = dep.departamento_id
+        LEFT JOIN usuario_rol ur ON u.usuario_id = ur.usuario_id
+        LEFT JOIN rol r ON ur.rol_id = r.rol_id
+    """,
+    donde="r.nombre_rol = 'Docente'",
+    id_unico="doc.docente_id",
+    ordenes={
+        "apellidos": ["COALESCE(p.apellidos, '')", "COALESCE(p.nombres, '')"],
+        "codigo": ["COALESCE(doc.codigo_docente, '')"],
+    },
+    filtros={
+        "escuela": ("doc.escuela_id = %s", a_entero),
+        "estado": ("doc.estado = %s", a_booleano),
+    },
+    busqueda=["p.nombres", "p.apellidos", "p.dni", "doc.codigo_docente"],
+)
+
+
+def _formatear_docentes(docentes):
+    for docente in docentes:
+        if docente.get('fecha_nacimiento'):
+            docente['fecha_nacimiento'] = docente['fecha_nacimiento'].isoformat() if hasattr(docente['fecha_nacimiento'], 'isoformat') else None
+        if 'estado' in docente:
+            docente['estado'] = docente['estado'] is True
+    return docentes
+
+
 @docentes_bp.route("/docentes", methods=["GET"])
 def listar_docentes():
     conn = None; cur = None
     try:
         conn = get_db(); cur = conn.cursor(cursor_factory=RealDictCursor)
+        # Con ?limit= o ?cursor= responde paginado (ver LISTADO_DOCENTES)
+        if quiere_paginacion(request.args):
+            pagina = LISTADO_DOCENTES.ejecutar(cur, request.args)
+            pagina["docentes"] = _formatear_docentes(pagina.pop("items"))
+            return jsonify(pagina)
         cur.execute("""
         SELECT 
             doc.docente_id, u.usuario_id, p.nombres, p.apellidos, p.dni, p.telefono, p.fecha_nacimiento,
@@ -293,13 +274,9 @@ def listar_docentes():
         WHERE r.nombre_rol = 'Docente' 
         ORDER BY p.apellidos, p.nombres
         """)
-        docentes = cur.fetchall()
-        for docente in docentes:
-            if docente.get('fecha_nacimiento'):
-                docente['fecha_nacimiento'] = docente['fecha_nacimiento'].isoformat() if hasattr(docente['fecha_nacimiento'], 'isoformat') else None
-            if 'estado' in docente:
-                docente['estado'] = docente['estado'] is True
-        return jsonify(docentes)
+        return jsonify(_formatear_docentes(cur.fetchall()))
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except (Exception, psycopg2.Error) as e:
         return jsonify({"error": str(e)}), 500
     finally:
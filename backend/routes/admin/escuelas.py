@@ -1,32 +1,18 @@
 from flask import Blueprint, jsonify
-from database.db import get_db
-from psycopg2.extras import RealDictCursor
+from database import catalogos
+from utils.logs import get_logger
 
 escuelas_bp = Blueprint('escuelas', __name__)
+log = get_logger(__name__)
 
 # ===========================
 # LISTAR ESCUELAS
 # ===========================
 @escuelas_bp.route("/escuelas", methods=["GET"])
 def obtener_escuelas():
-    conn = None
-    cur = None
     try:
-        conn = get_db()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        return jsonify({"escuelas": catalogos.escuelas()}), 200
         
-        cur.execute("""
-            SELECT escuela_id, nombre_escuela, facultad 
-            FROM escuela 
-            ORDER BY nombre_escuela ASC
-        """)
-        escuelas = cur.fetchall()
-        
-        return jsonify({"escuelas": escuelas}), 200
-        
-    except Exception as e:
-        print(f"❌ Error al obtener escuelas: {e}")
-        return jsonify({"error": "Error interno al obtener escuelas"}), 500
-    finally:
-        if cur: cur.close()
-        if conn: conn.close()
\ No newline at end of file
+    except Exception:
+        log.exception("Error al obtener escuelas")
+        return jsonify({"error": "Error interno al obtener escuelas"}), 500
\ No newline at end of file
@@ -0,0 +1,189 @@
+from flask import Blueprint, request, jsonify, current_app
+from database.db import get_db
+from database import conflictos, generador_horarios
+from database.generador_horarios import Generador
+from routes.admin.asignaciones import serializar_cruces
+from utils.cache import invalidar
+from utils.logs import get_logger
+
+generador_bp = Blueprint("generador_horarios", __name__)
+log = get_logger(__name__)
+
+
+def _tiempo_max(data):
+    """Segundos de búsqueda pedidos, sin pasar del máximo configurado."""
+    maximo = current_app.config.get("GENERADOR_TIEMPO_MAX", generador_horarios.TIEMPO_MAX)
+    return min(float(data.get("tiempo_max") or maximo), maximo)
+
+
+def _guardar(conn, cur, resultado, observaciones=""):
+    """
+    guardar() y commit solo si no aparecieron cruces nuevos en el horario
+    guardado (p. ej. con una fila que el generador no veía, o con otro
+    guardado simultáneo). Devuelve (cambios, cruces nuevos).
+    """
+    antes = generador_horarios.verificar_guardado(cur)
+    cambios = generador_horarios.guardar(cur, resultado, observaciones)
+    cruces = generador_horarios.verificar_guardado(cur, antes)
+    if cruces:
+        conn.rollback()
+        return cambios, cruces
+    conn.commit()
+    invalidar("asignaciones")
+    return cambios, []
+
+
+def _rechazo(resultado, cruces):
+    cuerpo = _respuesta(resultado)
+    cuerpo["error"] = "⚠️ El horario generado se cruza con lo guardado; no se guardó nada"
+    cuerpo["conflictos"] = serializar_cruces(cruces)
+    return jsonify(cuerpo), 409
+
+
+def _respuesta(resultado, guardado=None):
+    cuerpo = dict(resultado)
+    if guardado is not None:
+        cuerpo["guardado"] = {"insertadas": guardado[0], "movidas": guardado[1]}
+    return cuerpo
+
+
+# -----------------------------
+# GENERAR HORARIO DE UNA OFERTA
+# -----------------------------
+# POST /admin/generar-horario
+#   {
+#     "oferta": [{"curso_id", "seccion_id", "docente_id", "estudiantes",
+#                 "bloques": 1 | 2}, ...],
+#     "tiempo_max": 30,        (segundos, tope GENERADOR_TIEMPO_MAX)
+#     "guardar": false,        (true = insertar lo asignado)
+#     "observaciones": ""
+#   }
+# Elige bloque y aula de cada curso sin cruzarse con el horario ya guardado
+# (database/generador_horarios.py). Sin "guardar" solo devuelve la
+# propuesta; con "guardar" se guarda lo asignado en un INSERT multi-fila.
+# Los cursos que no entraron quedan en "sin_asignar" con su motivo. Si al
+# guardar aparece un cruce nuevo se deshace todo y se responde 409.
+@generador_bp.route("/generar-horario", methods=["POST"])
+def generar_horario():
+    data = request.get_json(silent=True) or {}
+    oferta = data.get("oferta")
+    if not isinstance(oferta, list) or not oferta:
+        return jsonify({"error": "⚠️ Envía la lista 'oferta'"}), 400
+
+    try:
+        items = [{
+            "curso_id": int(o["curso_id"]),
+            "seccion_id": int(o["seccion_id"]),
+            "docente_id": int(o["docente_id"]),
+            "cantidad_estudiantes": int(o["estudiantes"]),
+            "bloques": int(o.get("bloques") or 1),
+        } for o in oferta]
+        tiempo_max = _tiempo_max(data)
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "⚠️ Cada curso necesita curso_id, seccion_id, docente_id y estudiantes numéricos"}), 400
+    if any(i["cantidad_estudiantes"] <= 0 or i["bloques"] not in (1, 2) for i in items):
+        return jsonify({"error": "⚠️ Estudiantes debe ser mayor a 0 y bloques 1 o 2"}), 400
+
+    conn = None
+    cur = None
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+
+        # 1️⃣ Ciclo de cada curso y secciones activas (dos consultas)
+        ciclos = generador_horarios.ciclos_de_cursos(cur, {i["curso_id"] for i in items})
+        cur.execute("""
+            SELECT seccion_id FROM secciones
+            WHERE seccion_id = ANY(%s::int[]) AND UPPER(estado) = 'ACTIVO'
+        """, (list({i["seccion_id"] for i in items}),))
+        activas = {r[0] for r in cur.fetchall()}
+        invalidos = [i for i in items if i["curso_id"] not in ciclos or i["seccion_id"] not in activas]
+        if invalidos:
+            return jsonify({
+                "error": "⚠️ Hay cursos inexistentes o secciones inactivas en la oferta",
+                "invalidos": invalidos
+            }), 400
+        for i in items:
+            i["ciclo"] = ciclos[i["curso_id"]]
+
+        # 2️⃣ Bloques, aulas, disponibilidad y lo ya guardado
+        bloques, aulas, disponibilidad = generador_horarios.cargar_recursos(cur)
+        ocupacion = conflictos.cargar_horario(cur)
+
+        # 3️⃣ Resolver (en memoria)
+        generador = Generador(items, bloques, aulas, disponibilidad, ocupacion)
+        resultado = generador.resolver(tiempo_max=tiempo_max)
+        log.info("Horario generado", extra=resultado["estadisticas"])
+
+        if not data.get("guardar"):
+            return jsonify(_respuesta(resultado)), 200
+
+        guardado, cruces = _guardar(conn, cur, resultado, data.get("observaciones", ""))
+        if cruces:
+            return _rechazo(resultado, cruces)
+        return jsonify(_respuesta(resultado, guardado)), 201
+
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        log.exception("Error al generar horario")
+        return jsonify({"error": f"Error interno: {str(e)}"}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+# -----------------------------
+# RE-RESOLVER EL HORARIO GUARDADO
+# -----------------------------
+# POST /admin/regenerar-horario
+#   {"tiempo_max": 30, "guardar": false, "fijas": [asignacion_id, ...]}
+# Para después de cambiar una restricción (aula fuera de servicio, bloque
+# desactivado, disponibilidad de un docente, cantidad de estudiantes): todo
+# lo que sigue siendo válido se queda donde está y solo se reubica lo que
+# dejó de serlo, moviendo lo mínimo posible. "fijas" no se mueven nunca.
+# Lo que queda en "sin_asignar" conserva su fila (y su lugar) guardada.
+# Con "guardar" los cambios van en un UPDATE multi-fila; igual que arriba,
+# un cruce nuevo deshace todo (409).
+@generador_bp.route("/regenerar-horario", methods=["POST"])
+def regenerar_horario():
+    data = request.get_json(silent=True) or {}
+    try:
+        tiempo_max = _tiempo_max(data)
+        fijas = {int(a) for a in data.get("fijas") or ()}
+    except (TypeError, ValueError):
+        return jsonify({"error": "⚠️ tiempo_max y fijas deben ser números"}), 400
+
+    conn = None
+    cur = None
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+
+        bloques, aulas, disponibilidad = generador_horarios.cargar_recursos(cur)
+        guardado = generador_horarios.cargar_guardado(cur)
+
+        generador = Generador(generador_horarios.oferta_guardada(guardado, fijas), bloques, aulas, disponibilidad)
+        resultado = generador.resolver(tiempo_max=tiempo_max, previo=generador.previo_guardado(guardado))
+        log.info("Horario re-resuelto", extra=resultado["estadisticas"])
+
+        if not data.get("guardar"):
+            return jsonify(_respuesta(resultado)), 200
+
+        cambios, cruces = _guardar(conn, cur, resultado)
+        if cruces:
+            return _rechazo(resultado, cruces)
+        return jsonify(_respuesta(resultado, cambios)), 200
+
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        log.exception("Error al re-resolver horario")
+        return jsonify({"error": f"Error interno: {str(e)}"}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,336 @@
+import csv
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, request, jsonify, current_app
+from psycopg2.extras import execute_values
+
+from database.db import get_db
+from database import catalogos
+from utils import correo
+from utils.security import hash_password
+from utils.logs import get_logger
+from .alumnos import validar_correo, validar_telefono, validar_dni
+from .helpers import correo_credenciales_estudiante
+
+importacion_bp = Blueprint("importacion_alumnos", __name__)
+log = get_logger(__name__)
+
+# ============================================
+# Importación masiva de alumnos (CSV / XLSX)
+# ============================================
+# 1. Se leen y validan todas las filas en memoria (mismas reglas que
+#    crear_alumno) y se detectan duplicados dentro del archivo.
+# 2. Los duplicados contra la BD se buscan con una consulta por columna
+#    (= ANY(...)) en lugar de tres SELECT por alumno.
+# 3. Las contraseñas temporales se hashean en paralelo (bcrypt libera el GIL)
+#    con IMPORTACION_BCRYPT_ROUNDS: son 4 dígitos del DNI, un costo mayor no
+#    las protege más y es lo que domina el tiempo de la importación.
+# 4. Los INSERT se hacen por lotes de IMPORTACION_LOTE filas, un commit por
+#    lote: si un lote falla, solo sus filas se reportan con error.
+#
+# Columnas: las mismas que recibe /crear-alumno. escuela_id es opcional (1).
+# Los correos de credenciales se encolan con cada lote (utils/correo.py) y
+# salen por la bandeja de salida con el límite de envío configurado.
+
+COLUMNAS_OBLIGATORIAS = [
+    "correo_institucional", "correo_personal", "nombres", "apellido_paterno",
+    "apellido_materno", "dni", "telefono", "codigo_universitario", "ciclo_ingreso",
+]
+
+
+# --------------------------
+# 🔹 Lectura del archivo
+# --------------------------
+def _normalizar(fila):
+    return {
+        str(k).strip().lower(): ("" if v is None else str(v).strip())
+        for k, v in fila.items() if k is not None
+    }
+
+
+def leer_csv(contenido):
+    texto = contenido.decode("utf-8-sig")
+    # Excel en español suele exportar con ';'
+    try:
+        dialecto = csv.Sniffer().sniff(texto[:4096], delimiters=",;")
+    except csv.Error:
+        dialecto = csv.excel
+    return [_normalizar(f) for f in csv.DictReader(io.StringIO(texto), dialect=dialecto)]
+
+
+def leer_xlsx(contenido):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Para importar XLSX se necesita openpyxl (pip install openpyxl)")
+    libro = load_workbook(io.BytesIO(contenido), read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = next(filas, None) or []
+        col_dni = next((i for i, e in enumerate(encabezados) if str(e).strip().lower() == "dni"), None)
+        resultado = []
+        for valores in filas:
+            if valores is None or all(v in (None, "") for v in valores):
+                continue
+            # Excel guarda DNI y teléfono como números: sin el ".0" y, en el
+            # DNI, con los ceros a la izquierda que la celda numérica perdió
+            valores = [int(v) if isinstance(v, float) and v.is_integer() else v for v in valores]
+            if col_dni is not None and col_dni < len(valores) and isinstance(valores[col_dni], int):
+                valores[col_dni] = str(valores[col_dni]).zfill(8)
+            resultado.append(_normalizar(dict(zip(encabezados, valores))))
+        return resultado
+    finally:
+        libro.close()
+
+
+def leer_archivo(archivo):
+    nombre = (archivo.filename or "").lower()
+    contenido = archivo.read()
+    if nombre.endswith(".xlsx"):
+        return leer_xlsx(contenido)
+    if nombre.endswith(".csv"):
+        return leer_csv(contenido)
+    raise ValueError("Formato no soportado: se acepta .csv o .xlsx")
+
+
+# --------------------------
+# 🔹 Validación
+# --------------------------
+def validar_filas(filas, escuelas_validas=None):
+    """
+    Devuelve (validas, errores). Cada válida lleva su número de fila del
+    archivo (la fila 1 es el encabezado).
+    """
+    validas, errores = [], {}
+    vistos = {"codigo_universitario": {}, "correo_institucional": {}, "dni": {}}
+
+    for numero, fila in enumerate(filas, start=2):
+        problemas = [f"Falta {c}" for c in COLUMNAS_OBLIGATORIAS if not fila.get(c)]
+        if not problemas:
+            if not validar_correo(fila["correo_institucional"], "Alumno"):
+                problemas.append("El correo debe terminar en @alumnounfv.edu.pe")
+            if not validar_telefono(fila["telefono"]):
+                problemas.append("El teléfono debe tener exactamente 9 dígitos")
+            if not validar_dni(fila["dni"]):
+                problemas.append("El DNI debe tener exactamente 8 dígitos")
+            escuela = fila.get("escuela_id") or "1"
+            if not escuela.isdigit():
+                problemas.append("escuela_id debe ser un número")
+            elif escuelas_validas is not None and int(escuela) not in escuelas_validas:
+                problemas.append(f"La escuela {escuela} no existe")
+            fila["escuela_id"] = int(escuela) if escuela.isdigit() else None
+
+        for columna, vistos_col in vistos.items():
+            valor = fila.get(columna)
+            if valor and valor in vistos_col:
+                problemas.append(f"{columna} repetido en el archivo (fila {vistos_col[valor]})")
+            elif valor:
+                vistos_col[valor] = numero
+
+        if problemas:
+            errores[numero] = problemas
+        else:
+            fila["fila"] = numero
+            validas.append(fila)
+
+    return validas, errores
+
+
+def buscar_existentes(cur, filas):
+    """Valores ya registrados en la BD, una consulta por columna."""
+    consultas = {
+        "codigo_universitario": "SELECT codigo_universitario FROM estudiante WHERE codigo_universitario = ANY(%s)",
+        "correo_institucional": "SELECT correo FROM usuario WHERE correo = ANY(%s)",
+        "dni": "SELECT dni FROM persona WHERE dni = ANY(%s)",
+    }
+    existentes = {}
+    for columna, sql in consultas.items():
+        cur.execute(sql, ([f[columna] for f in filas],))
+        existentes[columna] = {r[0] for r in cur.fetchall()}
+    return existentes
+
+
+def descartar_existentes(filas, existentes, errores):
+    mensajes = {
+        "codigo_universitario": "El código universitario ya está registrado",
+        "correo_institucional": "El correo institucional ya está registrado",
+        "dni": "El DNI ya está registrado",
+    }
+    nuevas = []
+    for fila in filas:
+        problemas = [msg for col, msg in mensajes.items() if fila[col] in existentes[col]]
+        if problemas:
+            errores[fila["fila"]] = problemas
+        else:
+            nuevas.append(fila)
+    return nuevas
+
+
+# --------------------------
+# 🔹 Inserción por lotes
+# --------------------------
+def hashear_contrasenas(filas, hilos, rounds):
+    """Contraseña temporal = últimos 4 dígitos del DNI (igual que crear_alumno)."""
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        hashes = pool.map(lambda f: hash_password(f["dni"][-4:], rounds), filas)
+        for fila, contrasena_hash in zip(filas, hashes):
+            fila["contrasena_hash"] = contrasena_hash
+
+
+def obtener_rol_alumno(cur):
+    cur.execute("""
+        SELECT rol_id FROM rol
+        WHERE LOWER(nombre_rol) IN ('alumno', 'estudiante')
+    """)
+    rol = cur.fetchone()
+    if not rol:
+        raise Exception("No se encontró el rol de Estudiante/Alumno en la base de datos")
+    return rol[0]
+
+
+def insertar_lote(cur, lote, rol_id):
+    """usuario → usuario_rol → persona → estudiante (+ correos), INSERT multi-fila."""
+    usuarios = execute_values(cur, """
+        INSERT INTO usuario (correo, contrasena, estado) VALUES %s
+        RETURNING correo, usuario_id
+    """, [(f["correo_institucional"], f["contrasena_hash"]) for f in lote],
+        template="(%s, %s, 'ACTIVO')", page_size=len(lote), fetch=True)
+    usuario_por_correo = dict(usuarios)
+
+    execute_values(cur, "INSERT INTO usuario_rol (usuario_id, rol_id) VALUES %s",
+                   [(usuario_por_correo[f["correo_institucional"]], rol_id) for f in lote],
+                   page_size=len(lote))
+
+    personas = execute_values(cur, """
+        INSERT INTO persona (usuario_id, nombres, apellidos, dni, telefono) VALUES %s
+        RETURNING dni, persona_id
+    """, [
+        (usuario_por_correo[f["correo_institucional"]], f["nombres"],
+         f"{f['apellido_paterno']} {f['apellido_materno']}", f["dni"], f["telefono"])
+        for f in lote
+    ], page_size=len(lote), fetch=True)
+    persona_por_dni = dict(personas)
+
+    execute_values(cur, """
+        INSERT INTO estudiante (codigo_universitario, escuela_id, persona_id, ciclo_actual)
+        VALUES %s
+    """, [
+        (f["codigo_universitario"], f["escuela_id"], persona_por_dni[f["dni"]], f["ciclo_ingreso"])
+        for f in lote
+    ], page_size=len(lote))
+
+    correo.encolar_lote(cur, [
+        correo_credenciales_estudiante(
+            f["correo_personal"],
+            f"{f['nombres']} {f['apellido_paterno']} {f['apellido_materno']}",
+            f["correo_institucional"], f["dni"][-4:], f["codigo_universitario"]
+        )
+        for f in lote
+    ])
+
+
+def importar(conn, filas, tam_lote=500, hilos=8, rounds=8, solo_validar=False):
+    """
+    Valida e inserta `filas` (dicts ya normalizados). Devuelve el reporte
+    {total, creados, con_errores, errores: [{fila, codigo_universitario, errores}]}.
+    """
+    escuelas_validas = {e["escuela_id"] for e in catalogos.escuelas()}
+    validas, errores = validar_filas(filas, escuelas_validas)
+    cur = conn.cursor()
+    creados = 0
+    try:
+        if validas:
+            validas = descartar_existentes(validas, buscar_existentes(cur, validas), errores)
+        conn.rollback()
+
+        if validas and not solo_validar:
+            rol_id = obtener_rol_alumno(cur)
+            hashear_contrasenas(validas, hilos, rounds)
+            for i in range(0, len(validas), tam_lote):
+                lote = validas[i:i + tam_lote]
+                try:
+                    insertar_lote(cur, lote, rol_id)
+                    conn.commit()
+                    correo.despertar()
+                    creados += len(lote)
+                except Exception as e:
+                    # Otro proceso pudo registrar el mismo DNI/correo entre la
+                    # verificación y el INSERT: se pierde solo este lote
+                    conn.rollback()
+                    log.exception("Error en lote de importación", extra={"fila_desde": lote[0]["fila"], "fila_hasta": lote[-1]["fila"]})
+                    for fila in lote:
+                        errores[fila["fila"]] = [f"Lote no insertado: {e}"]
+    finally:
+        cur.close()
+
+    filas_por_numero = dict(enumerate(filas, start=2))
+    return {
+        "total": len(filas),
+        "creados": creados,
+        "validos": len(validas),
+        "con_errores": len(errores),
+        "errores": [
+            {
+                "fila": numero,
+                "codigo_universitario": filas_por_numero[numero].get("codigo_universitario"),
+                "errores": problemas,
+            }
+            for numero, problemas in sorted(errores.items())
+        ],
+    }
+
+
+# ===========================
+# IMPORTAR ALUMNOS
+# ===========================
+@importacion_bp.route("/importar", methods=["POST"])
+def importar_alumnos():
+    """
+    Recibe un archivo (campo "archivo") .csv o .xlsx con una fila por alumno.
+    Con ?solo_validar=1 devuelve el reporte de errores sin insertar nada.
+    """
+    archivo = request.files.get("archivo")
+    if not archivo:
+        return jsonify({"error": "No se recibió el archivo (campo 'archivo')"}), 400
+
+    try:
+        filas = leer_archivo(archivo)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": f"No se pudo leer el archivo: {e}"}), 400
+    except Exception:
+        log.exception("Error al leer archivo de importación")
+        return jsonify({"error": "No se pudo leer el archivo"}), 400
+
+    if not filas:
+        return jsonify({"error": "El archivo no tiene filas"}), 400
+
+    faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in filas[0]]
+    if faltantes:
+        return jsonify({"error": f"Columnas faltantes: {', '.join(faltantes)}"}), 400
+
+    conn = None
+    try:
+        conn = get_db()
+        inicio = time.perf_counter()
+        reporte = importar(
+            conn, filas,
+            tam_lote=current_app.config.get("IMPORTACION_LOTE", 500),
+            hilos=current_app.config.get("IMPORTACION_HILOS", 8),
+            rounds=current_app.config.get("IMPORTACION_BCRYPT_ROUNDS", 8),
+            solo_validar=request.args.get("solo_validar") in ("1", "true"),
+        )
+        reporte["duracion_ms"] = round((time.perf_counter() - inicio) * 1000)
+        log.info("Importación de alumnos", extra={
+            "creados": reporte["creados"], "total": reporte["total"], "duracion_ms": reporte["duracion_ms"]
+        })
+        return jsonify(reporte), 200
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        log.exception("Error en importación de alumnos")
+        return jsonify({"error": f"Error al importar alumnos: {str(e)}"}), 500
+    finally:
+        if conn:
+            conn.close()
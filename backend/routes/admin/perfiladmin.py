@@ -1,10 +1,13 @@
 import re
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from database import catalogos
 from utils.security import hash_password, verify_password
+from utils.logs import get_logger
 from psycopg2.extras import RealDictCursor
 
 perfiladmin_bp = Blueprint("perfiladmin_bp", __name__)
+log = get_logger(__name__)
 
 # ===========================
 # FUNCIONES DE VALIDACIÓN
@@ -80,7 +83,7 @@ def obtener_mi_perfil(usuario_id):
             return jsonify({"error": "Perfil de administrador no encontrado"}), 404
             
     except Exception as e:
-        print(f"❌ Error al obtener perfil: {e}")
+        log.exception("Error al obtener perfil de administrador")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur:
@@ -159,7 +162,7 @@ def modificar_mi_perfil(usuario_id):
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"❌ Error al modificar perfil: {e}")
+        log.exception("Error al modificar perfil de administrador")
         return jsonify({"error": f"Error al actualizar perfil: {str(e)}"}), 500
     finally:
         if cur:
@@ -220,7 +223,7 @@ def cambiar_contrasena(usuario_id):
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"❌ Error al cambiar contraseña: {e}")
+        log.exception("Error al cambiar contraseña de administrador")
         return jsonify({"error": f"Error al cambiar contraseña: {str(e)}"}), 500
     finally:
         if cur:
@@ -241,35 +244,9 @@ def marcar_login(usuario_id):
 # ===========================
 @perfiladmin_bp.route("/escuelas", methods=["GET"])
 def obtener_escuelas():
-    conn = None
-    cur = None
-    
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT escuela_id, nombre_escuela, facultad 
-            FROM escuela 
-            ORDER BY nombre_escuela
-        """)
-        escuelas = cur.fetchall()
-        
-        return jsonify({
-            "escuelas": [
-                {
-                    "escuela_id": row[0],
-                    "nombre_escuela": row[1],
-                    "facultad": row[2]
-                } for row in escuelas
-            ]
-        })
+        return jsonify({"escuelas": catalogos.escuelas()})
         
     except Exception as e:
-        print(f"❌ Error al obtener escuelas: {e}")
+        log.exception("Error al obtener escuelas")
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
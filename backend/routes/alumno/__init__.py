@@ -1,36 +1,44 @@
 from flask import Blueprint
+from utils.logs import get_logger
 
 alumno_bp = Blueprint("alumno", __name__)
+log = get_logger(__name__)
 
 try:
     from .matriculas import matriculas_bp
     alumno_bp.register_blueprint(matriculas_bp, url_prefix="")
-    print(" matriculas_bp registrado correctamente")
+    log.debug("matriculas_bp registrado")
 except ImportError as e:
-    print(f"⚠️ No se pudo importar matriculas_bp: {e}")
+    log.warning("No se pudo importar matriculas_bp", extra={"error": str(e)})
 try:
     from .calificaciones import calificaciones_bp
     alumno_bp.register_blueprint(calificaciones_bp, url_prefix="")
-    print(" calificaciones_bp registrado correctamente")
+    log.debug("calificaciones_bp registrado")
 except ImportError as e:
-    print(f"⚠️ No se pudo importar calificaciones_bp: {e}")
+    log.warning("No se pudo importar calificaciones_bp", extra={"error": str(e)})
 try:
     from .asignaciones import asignaciones_bp
     alumno_bp.register_blueprint(asignaciones_bp, url_prefix="")
-    print(" asignaciones_bp registrado correctamente")
+    log.debug("asignaciones_bp registrado")
 except ImportError as e:
-    print(f"⚠️ No se pudo importar asignaciones_bp: {e}")
+    log.warning("No se pudo importar asignaciones_bp", extra={"error": str(e)})
 try:
     from .horario import horario_bp
     alumno_bp.register_blueprint(horario_bp, url_prefix="")
-    print(" horario_bp registrado correctamente")
+    log.debug("horario_bp registrado")
 except ImportError as e:
-    print(f"⚠️ No se pudo importar horario_bp: {e}")
+    log.warning("No se pudo importar horario_bp", extra={"error": str(e)})
 try:
     from .material import material_bp
     alumno_bp.register_blueprint(material_bp, url_prefix="")
-    print(" material_bp registrado correctamente")
+    log.debug("material_bp registrado")
 except ImportError as e:
-    print(f"⚠️ No se pudo importar material_bp: {e}")
+    log.warning("No se pudo importar material_bp", extra={"error": str(e)})
+try:
+    from .elegibilidad import elegibilidad_bp
+    alumno_bp.register_blueprint(elegibilidad_bp, url_prefix="")
+    log.debug("elegibilidad_bp registrado")
+except ImportError as e:
+    log.warning("No se pudo importar elegibilidad_bp", extra={"error": str(e)})
 
 __all__ = ["alumno_bp"]
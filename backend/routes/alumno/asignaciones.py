@@ -1,9 +1,13 @@
 from flask import Blueprint, jsonify
 from database.db import get_db
+from utils.logs import get_logger
+from utils.tokens import alumno_propio
 
 asignaciones_bp = Blueprint('asignaciones', __name__)
+log = get_logger(__name__)
 
 @asignaciones_bp.route("/mis-asignaciones/<int:estudiante_id>", methods=['GET'])
+@alumno_propio("estudiante_id")
 def obtener_mis_asignaciones(estudiante_id):
     """
     Obtiene todas las asignaciones (cursos) en los que está matriculado el estudiante
@@ -102,9 +106,7 @@ def obtener_mis_asignaciones(estudiante_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener asignaciones: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener asignaciones del alumno")
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -1,9 +1,15 @@
 from flask import Blueprint, jsonify
 from database.db import get_db
+from utils.condicional import get_condicional, estudiante_de_ruta
+from utils.logs import get_logger
+from utils.tokens import alumno_propio
 
 calificaciones_bp = Blueprint('calificaciones', __name__)
+log = get_logger(__name__)
 
 @calificaciones_bp.route("/mis-calificaciones/<int:estudiante_id>", methods=['GET'])
+@alumno_propio("estudiante_id")
+@get_condicional(estudiante_de_ruta)
 def obtener_mis_calificaciones(estudiante_id):
     """
     Obtiene todas las calificaciones del estudiante según tus tablas reales.
@@ -87,9 +93,7 @@ def obtener_mis_calificaciones(estudiante_id):
         return jsonify({"calificaciones": calificaciones}), 200
 
     except Exception as e:
-        print(f"❌ Error al obtener calificaciones: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener calificaciones")
         return jsonify({'error': str(e)}), 500
     
     finally:
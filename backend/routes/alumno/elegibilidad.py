@@ -0,0 +1,119 @@
+from flask import Blueprint, jsonify, request
+from database.db import get_db
+from database import curriculo, elegibilidad
+from routes.alumno.matriculas import ciclos_a_mostrar
+from utils.logs import get_logger
+from utils.tokens import alumno_propio
+
+elegibilidad_bp = Blueprint("elegibilidad", __name__)
+log = get_logger(__name__)
+
+
+# -------------------------------------------------------------------
+# 🔹 ELEGIBILIDAD DE TODA LA OFERTA EN UNA PASADA
+# -------------------------------------------------------------------
+# GET /elegibilidad/<alumno_id>                    → oferta de sus ciclos
+# GET /elegibilidad/<alumno_id>?asignaciones=1,2,3 → solo esas asignaciones
+#
+# Responde por asignación si puede matricularse y, si no, el motivo
+# (duplicado, conflicto o prerrequisitos) con el mismo mensaje que daría
+# POST /matricular. Usa el perfil en caché del alumno: una consulta para la
+# oferta y ninguna por asignación.
+@elegibilidad_bp.route("/elegibilidad/<int:alumno_id>", methods=["GET"])
+@alumno_propio("alumno_id")
+def elegibilidad_oferta(alumno_id):
+    ids = request.args.get("asignaciones")
+    try:
+        asignaciones = [int(x) for x in ids.split(",") if x.strip()] if ids else None
+    except ValueError:
+        return jsonify({"error": "asignaciones debe ser una lista de ids separados por coma"}), 400
+
+    conn = None
+    cur = None
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+
+        # 1️⃣ estudiante_id y ciclo (el frontend puede enviar usuario_id)
+        cur.execute("""
+            SELECT e.estudiante_id, e.ciclo_actual
+            FROM estudiante e
+            LEFT JOIN persona p ON e.persona_id = p.persona_id
+            WHERE e.estudiante_id = %s OR p.usuario_id = %s
+            ORDER BY e.estudiante_id = %s DESC
+            LIMIT 1
+        """, (alumno_id, alumno_id, alumno_id))
+        row = cur.fetchone()
+        if not row:
+            return jsonify({"error": "Alumno no encontrado"}), 404
+        estudiante_id, ciclo_registrado = row
+
+        # 2️⃣ Oferta a evaluar
+        ciclos = None
+        if asignaciones is None:
+            _, ciclos = ciclos_a_mostrar(ciclo_registrado)
+            oferta = elegibilidad.oferta_para_evaluar(cur, ciclos=ciclos)
+        else:
+            oferta = elegibilidad.oferta_para_evaluar(cur, asignaciones=asignaciones)
+
+        # 3️⃣ Evaluación en memoria
+        resultados = elegibilidad.evaluar_oferta(conn, estudiante_id, oferta)
+
+        return jsonify({
+            "estudiante_id": estudiante_id,
+            "ciclos_mostrados": ciclos,
+            "total": len(resultados),
+            "elegibles": sum(1 for r in resultados if r["elegible"]),
+            "asignaciones": resultados
+        }), 200
+
+    except Exception as e:
+        log.exception("Error al evaluar elegibilidad")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+# -------------------------------------------------------------------
+# 🔹 MAPA CURRICULAR DEL ALUMNO
+# -------------------------------------------------------------------
+# GET /curriculo/<alumno_id>
+# El mapa curricular (database/curriculo.py) con el estado de cada curso
+# para el alumno: aprobado, disponible o bloqueado, con los prerrequisitos
+# directos que le faltan y toda la cadena pendiente. Usa el grafo y el
+# perfil en caché: lo que falta es una diferencia de conjuntos por curso.
+@elegibilidad_bp.route("/curriculo/<int:alumno_id>", methods=["GET"])
+@alumno_propio("alumno_id")
+def curriculo_alumno(alumno_id):
+    conn = None
+    cur = None
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT e.estudiante_id
+            FROM estudiante e
+            LEFT JOIN persona p ON e.persona_id = p.persona_id
+            WHERE e.estudiante_id = %s OR p.usuario_id = %s
+            ORDER BY e.estudiante_id = %s DESC
+            LIMIT 1
+        """, (alumno_id, alumno_id, alumno_id))
+        row = cur.fetchone()
+        if not row:
+            return jsonify({"error": "Alumno no encontrado"}), 404
+
+        perfil = elegibilidad.perfil_matricula(conn, row[0])
+        mapa = curriculo.curriculo(conn).mapa(aprobados=perfil.aprobados)
+        return jsonify(dict(mapa, estudiante_id=row[0])), 200
+
+    except Exception as e:
+        log.exception("Error al armar el mapa curricular del alumno")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -1,9 +1,65 @@
 from flask import Blueprint, jsonify
 from database.db import get_db
+from database import consultas
+from utils.condicional import get_condicional, estudiante_de_ruta
+from utils.logs import get_logger
+from utils.tokens import alumno_propio
 
 horario_bp = Blueprint('horario', __name__)
+log = get_logger(__name__)
+
+# Consulta preparada (database/consultas.py)
+HORARIO_ESTUDIANTE = consultas.registrar("horario_estudiante", """
+    SELECT 
+        c.curso_id,
+        c.nombre as curso_nombre,
+        c.codigo as curso_codigo,
+        c.creditos,
+        s.seccion_id,
+        s.codigo as seccion_codigo,
+        bh.dia,
+        bh.hora_inicio,
+        bh.hora_fin,
+        bh.codigo_bloque,
+        bh.bloque_id,
+        asig.aula_id,
+        asig.asignacion_id,
+        COALESCE(p.nombres, '') as docente_nombres,
+        COALESCE(p.apellidos, '') as docente_apellidos,
+        d.docente_id,
+        m.matricula_id,
+        COALESCE(
+            ROUND(r.presentes::numeric / NULLIF(r.total, 0) * 100, 2), 0
+        ) as porcentaje_asistencia
+    FROM matriculas m
+    JOIN estudiante e ON m.estudiante_id = e.estudiante_id
+    JOIN asignaciones asig ON m.asignacion_id = asig.asignacion_id
+    JOIN curso c ON asig.curso_id = c.curso_id
+    JOIN secciones s ON asig.seccion_id = s.seccion_id
+    LEFT JOIN bloque_horario bh ON asig.bloque_id = bh.bloque_id
+    LEFT JOIN docente d ON asig.docente_id = d.docente_id
+    LEFT JOIN persona p ON d.persona_id = p.persona_id
+    LEFT JOIN asistencia_resumen r ON r.matricula_id = m.matricula_id
+    WHERE e.estudiante_id = %s
+    AND m.estado = 'ACTIVA'
+    AND bh.bloque_id IS NOT NULL
+    ORDER BY 
+        CASE 
+            WHEN bh.dia = 'Lunes' THEN 1
+            WHEN bh.dia = 'Martes' THEN 2
+            WHEN bh.dia = 'Miercoles' OR bh.dia = 'Miércoles' THEN 3
+            WHEN bh.dia = 'Jueves' THEN 4
+            WHEN bh.dia = 'Viernes' THEN 5
+            WHEN bh.dia = 'Sabado' OR bh.dia = 'Sábado' THEN 6
+            WHEN bh.dia = 'Domingo' THEN 7
+            ELSE 8
+        END,
+        bh.hora_inicio
+""")
 
 @horario_bp.route("/mi-horario/<int:estudiante_id>", methods=['GET'])
+@alumno_propio("estudiante_id")
+@get_condicional(estudiante_de_ruta)
 def obtener_mi_horario(estudiante_id):
     """
     Obtiene el horario semanal del estudiante con información completa
@@ -14,61 +70,8 @@ def obtener_mi_horario(estudiante_id):
         conn = get_db()
         cur = conn.cursor()
         
-        query = """
-            SELECT 
-                c.curso_id,
-                c.nombre as curso_nombre,
-                c.codigo as curso_codigo,
-                c.creditos,
-                s.seccion_id,
-                s.codigo as seccion_codigo,
-                bh.dia,
-                bh.hora_inicio,
-                bh.hora_fin,
-                bh.codigo_bloque,
-                bh.bloque_id,
-                asig.aula_id,
-                asig.asignacion_id,
-                COALESCE(p.nombres, '') as docente_nombres,
-                COALESCE(p.apellidos, '') as docente_apellidos,
-                d.docente_id,
-                m.matricula_id,
-                COALESCE(
-                    (SELECT 
-                        ROUND(
-                            (COUNT(CASE WHEN a.estado = 'Presente' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(*), 0) * 100), 2
-                        )
-                     FROM asistencia a
-                     WHERE a.matricula_id = m.matricula_id
-                    ), 0
-                ) as porcentaje_asistencia
-            FROM matriculas m
-            JOIN estudiante e ON m.estudiante_id = e.estudiante_id
-            JOIN asignaciones asig ON m.asignacion_id = asig.asignacion_id
-            JOIN curso c ON asig.curso_id = c.curso_id
-            JOIN secciones s ON asig.seccion_id = s.seccion_id
-            LEFT JOIN bloque_horario bh ON asig.bloque_id = bh.bloque_id
-            LEFT JOIN docente d ON asig.docente_id = d.docente_id
-            LEFT JOIN persona p ON d.persona_id = p.persona_id
-            WHERE e.estudiante_id = %s
-            AND m.estado = 'ACTIVA'
-            AND bh.bloque_id IS NOT NULL
-            ORDER BY 
-                CASE 
-                    WHEN bh.dia = 'Lunes' THEN 1
-                    WHEN bh.dia = 'Martes' THEN 2
-                    WHEN bh.dia = 'Miercoles' OR bh.dia = 'Miércoles' THEN 3
-                    WHEN bh.dia = 'Jueves' THEN 4
-                    WHEN bh.dia = 'Viernes' THEN 5
-                    WHEN bh.dia = 'Sabado' OR bh.dia = 'Sábado' THEN 6
-                    WHEN bh.dia = 'Domingo' THEN 7
-                    ELSE 8
-                END,
-                bh.hora_inicio
-        """
         
-        cur.execute(query, (estudiante_id,))
+        consultas.ejecutar(cur, HORARIO_ESTUDIANTE, (estudiante_id,))
         rows = cur.fetchall()
         
         horario = []
@@ -112,9 +115,7 @@ def obtener_mi_horario(estudiante_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener horario: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener horario", extra={"estudiante_id": estudiante_id})
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -1,12 +1,18 @@
 from flask import Blueprint, jsonify, send_file
 from database.db import get_db
+from utils.condicional import get_condicional, estudiante_de_ruta
+from utils.logs import get_logger
+from utils.tokens import alumno_propio
 import os
 
 material_bp = Blueprint('material', __name__)
+log = get_logger(__name__)
 
 UPLOAD_FOLDER = 'uploads/materiales'
 
 @material_bp.route("/materiales/<int:estudiante_id>", methods=['GET'])
+@alumno_propio("estudiante_id")
+@get_condicional(estudiante_de_ruta)
 def obtener_materiales(estudiante_id):
     """
     Obtiene todo el material disponible para los cursos del estudiante
@@ -68,9 +74,7 @@ def obtener_materiales(estudiante_id):
         return jsonify({'materiales': materiales}), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener materiales: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener materiales")
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -92,5 +96,5 @@ def descargar_material(archivo):
         else:
             return jsonify({'error': 'Archivo no encontrado'}), 404
     except Exception as e:
-        print(f"❌ Error al descargar material: {e}")
+        log.exception("Error al descargar material")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
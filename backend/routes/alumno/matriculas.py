@@ -2,9 +2,14 @@
 from flask import Blueprint, request, jsonify
 from psycopg2.extras import RealDictCursor
 from database.db import get_db
+from database import cupos, elegibilidad, oferta
+from utils.condicional import get_condicional
+from utils.logs import get_logger
+from utils.tokens import alumno_de, alumno_propio, identidad
 from datetime import datetime
 
 matriculas_bp = Blueprint("matriculas", __name__)
+log = get_logger(__name__)
 
 # -------------------------------------------------------------------
 # 🔹 FUNCIÓN AUXILIAR: calcular ciclo actual (2 ciclos por año)
@@ -49,14 +54,38 @@ def calcular_ciclo_estudiante_anual(ciclo_inicio):
         return ciclos[ciclo_num - 1]
 
     except Exception as e:
-        print("Error al calcular ciclo:", e)
+        log.warning("Error al calcular ciclo", extra={"error": str(e)})
         return "I"
 
 
+def ciclos_a_mostrar(ciclo_registrado):
+    """
+    Ciclo actual del alumno y ciclos cuya oferta ve en matrícula: si está
+    en ciclo impar, ese y el siguiente (matrícula anual); si no, solo el suyo.
+    """
+    ciclo_estudiante = calcular_ciclo_estudiante_anual(ciclo_registrado)
+
+    # Mapeo para saber qué ciclo sigue a cuál
+    ciclos_orden = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+    ciclo_indices = {c: i for i, c in enumerate(ciclos_orden)}
+
+    # Si el alumno está en ciclo impar → ver ese y el siguiente
+    idx = ciclo_indices.get(ciclo_estudiante, 0)
+    ciclo_siguiente = ciclos_orden[idx + 1] if idx + 1 < len(ciclos_orden) else ciclo_estudiante
+
+    # Verificar si el ciclo actual es impar
+    es_impar = idx % 2 == 0  # (0 = I, 2 = III, etc.)
+
+    if es_impar:
+        return ciclo_estudiante, (ciclo_estudiante, ciclo_siguiente)
+    return ciclo_estudiante, (ciclo_estudiante,)
+
+
 # -------------------------------------------------------------------
 # 1️⃣ LISTAR ASIGNACIONES DISPONIBLES (ajustado para matrícula anual)
 # -------------------------------------------------------------------
 @matriculas_bp.route("/asignaciones-disponibles/<int:alumno_id>", methods=["GET"])
+@alumno_propio("alumno_id")
 def listar_asignaciones_disponibles(alumno_id):
     conn = get_db()
     cur = conn.cursor(cursor_factory=RealDictCursor)
@@ -68,64 +97,27 @@ def listar_asignaciones_disponibles(alumno_id):
             FROM estudiante e
             LEFT JOIN persona p ON e.persona_id = p.persona_id
             WHERE e.estudiante_id = %s OR p.usuario_id = %s
+            ORDER BY e.estudiante_id = %s DESC
             LIMIT 1
-        """, (alumno_id, alumno_id))
+        """, (alumno_id, alumno_id, alumno_id))
         row = cur.fetchone()
 
         if not row:
             return jsonify({"error": "Alumno no encontrado"}), 404
 
         ciclo_registrado = row["ciclo_actual"]
-        ciclo_estudiante = calcular_ciclo_estudiante_anual(ciclo_registrado)
-
-        # Mapeo para saber qué ciclo sigue a cuál
-        ciclos_orden = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
-        ciclo_indices = {c: i for i, c in enumerate(ciclos_orden)}
-
-        # Si el alumno está en ciclo impar → ver ese y el siguiente
-        idx = ciclo_indices.get(ciclo_estudiante, 0)
-        ciclo_siguiente = ciclos_orden[idx + 1] if idx + 1 < len(ciclos_orden) else ciclo_estudiante
-
-        # Verificar si el ciclo actual es impar
-        es_impar = idx % 2 == 0  # (0 = I, 2 = III, etc.)
-
-        if es_impar:
-            ciclos_a_mostrar = (ciclo_estudiante, ciclo_siguiente)
-        else:
-            ciclos_a_mostrar = (ciclo_estudiante,)
-
-        # 3️⃣ Obtener las asignaciones para los ciclos indicados
-        cur.execute("""
-            SELECT 
-                a.asignacion_id,
-                c.nombre AS nombre_curso,
-                c.codigo AS codigo_curso,
-                c.ciclo,
-                s.codigo AS seccion,
-                s.periodo,
-                (p.nombres || ' ' || p.apellidos) AS docente,
-                bh.dia,
-                TO_CHAR(bh.hora_inicio, 'HH24:MI') AS hora_inicio,
-                TO_CHAR(bh.hora_fin, 'HH24:MI') AS hora_fin,
-                au.nombre_aula AS aula,
-                au.capacidad
-            FROM asignaciones a
-            JOIN curso c ON a.curso_id = c.curso_id
-            JOIN secciones s ON a.seccion_id = s.seccion_id
-            JOIN docente d ON a.docente_id = d.docente_id
-            JOIN persona p ON d.persona_id = p.persona_id
-            JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
-            JOIN aula au ON a.aula_id = au.aula_id
-            WHERE c.ciclo IN %s
-            ORDER BY c.ciclo, c.nombre ASC
-        """, (ciclos_a_mostrar,))
+        ciclo_estudiante, ciclos = ciclos_a_mostrar(ciclo_registrado)
 
-        data = cur.fetchall()
+        # 3️⃣ Oferta de esos ciclos: instantánea compartida + cupos al día
+        # (database/oferta.py). La coalescencia va por ciclo allí, donde la
+        # comparten todos los alumnos; la URL lleva el alumno_id y no sirve
+        # de clave
+        data = oferta.oferta_para_ciclos(conn, ciclos)
 
         return jsonify({
             "ciclo_registrado": ciclo_registrado,
             "ciclo_actual_estudiante": ciclo_estudiante,
-            "ciclos_mostrados": ciclos_a_mostrar,
+            "ciclos_mostrados": ciclos,
             "asignaciones": data
         })
 
@@ -149,6 +141,11 @@ def matricular_alumno():
     if not asignacion_id:
         return jsonify({"error": "Faltan datos: asignacion_id"}), 400
 
+    # Con token se matricula a quien llama (un id ajeno en el body es 403);
+    # los ids del body solo mandan sin token (JWT_EXIGIR=false)
+    if identidad()["usuario_id"] is not None:
+        estudiante_id, alumno_id = alumno_de(estudiante_id or alumno_id), None
+
     conn = get_db()
     cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -167,91 +164,33 @@ def matricular_alumno():
                 return jsonify({"error": "No se encontró estudiante asociado."}), 404
             estudiante_id = row["estudiante_id"]
 
-        # 🧩 2️⃣ Obtener los datos del curso y ciclo al que pertenece la asignación
-        cur.execute("""
-            SELECT a.curso_id, c.ciclo, bh.dia, bh.hora_inicio, bh.hora_fin
-            FROM asignaciones a
-            JOIN curso c ON a.curso_id = c.curso_id
-            JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
-            WHERE a.asignacion_id = %s
-        """, (asignacion_id,))
-        asignacion = cur.fetchone()
-
-        if not asignacion:
+        # 🧾 2️⃣ Reserva de cupo + INSERT validado en una transacción (duplicado,
+        # choque de horario y prerrequisitos van en el WHERE; ver
+        # database/cupos.py y database/elegibilidad.py)
+        resultado = cupos.matricular_con_cupo(conn, cur, estudiante_id, asignacion_id)
+        estado = resultado["estado"]
+
+        if estado == "matriculado":
+            return jsonify({
+                "mensaje": "✅ Matrícula registrada exitosamente.",
+                "matricula_id": resultado["matricula_id"]
+            }), 201
+        if estado == "espera":
+            return jsonify({
+                "mensaje": f"⏳ Sección llena: quedaste en lista de espera (posición {resultado['posicion']}).",
+                "lista_espera": True,
+                "posicion": resultado["posicion"]
+            }), 202
+        if estado == "no_encontrada":
             return jsonify({"error": "Asignación no encontrada."}), 404
-
-        curso_id = asignacion["curso_id"]
-        ciclo_curso = asignacion["ciclo"]
-
-        # 🧩 3️⃣ Evitar doble matrícula (ya matriculado en el mismo curso)
-        cur.execute("""
-            SELECT 1
-            FROM matriculas m
-            JOIN asignaciones a ON m.asignacion_id = a.asignacion_id
-            WHERE m.estudiante_id = %s AND a.curso_id = %s
-        """, (estudiante_id, curso_id))
-        if cur.fetchone():
-            return jsonify({"error": "Ya estás matriculado en este curso (otra sección)."}), 400
-
-        # 🕐 4️⃣ Verificar conflicto de horario (solo dentro del mismo ciclo)
-        cur.execute("""
-            SELECT c.nombre AS curso, bh.dia, bh.hora_inicio, bh.hora_fin
-            FROM matriculas m
-            JOIN asignaciones a ON m.asignacion_id = a.asignacion_id
-            JOIN curso c ON a.curso_id = c.curso_id
-            JOIN bloque_horario bh ON a.bloque_id = bh.bloque_id
-            WHERE m.estudiante_id = %s 
-            AND m.estado = 'ACTIVA'
-            AND c.ciclo = %s
-        """, (estudiante_id, ciclo_curso))
-        cursos_ciclo = cur.fetchall()
-
-        for m in cursos_ciclo:
-            if m["dia"] == asignacion["dia"]:
-                # Detecta solapamiento horario
-                if (asignacion["hora_inicio"] < m["hora_fin"] and
-                    asignacion["hora_fin"] > m["hora_inicio"]):
-                    return jsonify({
-                        "error": f"Conflicto de horario con el curso '{m['curso']}' del mismo ciclo."
-                    }), 400
-
-        # 📘 5️⃣ Verificar prerrequisitos
-        cur.execute("""
-            SELECT id_curso_requerido
-            FROM prerrequisito
-            WHERE id_curso = %s
-        """, (curso_id,))
-        prereqs = [r["id_curso_requerido"] for r in cur.fetchall()]
-
-        if prereqs:
-            # Buscar cursos aprobados (nota_final >= 11)
-            cur.execute("""
-                SELECT c.curso_id
-                FROM calificaciones cal
-                JOIN asignaciones a ON cal.asignacion_id = a.asignacion_id
-                JOIN curso c ON a.curso_id = c.curso_id
-                WHERE cal.estudiante_id = %s AND cal.nota_final >= 11
-            """, (estudiante_id,))
-            aprobados = [r["curso_id"] for r in cur.fetchall()]
-
-            faltantes = [req for req in prereqs if req not in aprobados]
-            if faltantes:
-                return jsonify({
-                    "error": "No cumples los prerrequisitos para este curso."
-                }), 400
-
-        # 🧾 6️⃣ Registrar la matrícula si pasa todas las verificaciones
-        cur.execute("""
-            INSERT INTO matriculas (estudiante_id, asignacion_id, fecha_matricula, estado)
-            VALUES (%s, %s, NOW(), 'ACTIVA')
-        """, (estudiante_id, asignacion_id))
-        conn.commit()
-
-        return jsonify({"mensaje": "✅ Matrícula registrada exitosamente."}), 201
+        if estado == "reintentar":
+            # Sus matrículas cambiaron entre el INSERT y la explicación
+            return jsonify({"error": "La matrícula cambió mientras se procesaba, intenta de nuevo."}), 409
+        return jsonify({"error": resultado["mensaje"], "motivo": resultado["motivo"]}), 400
 
     except Exception as e:
         conn.rollback()
-        print("❌ Error al matricular:", e)
+        log.exception("Error al matricular")
         return jsonify({"error": f"Error al matricular: {str(e)}"}), 500
 
     finally:
@@ -264,7 +203,27 @@ def matricular_alumno():
 # -------------------------------------------------------------------
 # 3️⃣ VER MATRÍCULAS DEL ALUMNO
 # -------------------------------------------------------------------
+def resolver_estudiante(cur, alumno_id):
+    """
+    El frontend puede enviar estudiante_id o usuario_id. Si el número es
+    las dos cosas (de personas distintas) gana el estudiante_id, que es lo
+    que llega cuando alumno_propio() lo tomó del token.
+    """
+    cur.execute("""
+        SELECT e.estudiante_id
+        FROM estudiante e
+        JOIN persona p ON e.persona_id = p.persona_id
+        WHERE e.estudiante_id = %s OR p.usuario_id = %s
+        ORDER BY e.estudiante_id = %s DESC
+        LIMIT 1
+    """, (alumno_id, alumno_id, alumno_id))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
 @matriculas_bp.route("/mis-matriculas/<int:alumno_id>", methods=["GET"])
+@alumno_propio("alumno_id")
+@get_condicional(resolver_estudiante)
 def mis_matriculas(alumno_id):
     conn = get_db()
     cur = conn.cursor(cursor_factory=RealDictCursor)
@@ -276,8 +235,9 @@ def mis_matriculas(alumno_id):
             FROM estudiante e
             JOIN persona p ON e.persona_id = p.persona_id
             WHERE e.estudiante_id = %s OR p.usuario_id = %s
+            ORDER BY e.estudiante_id = %s DESC
             LIMIT 1
-        """, (alumno_id, alumno_id))
+        """, (alumno_id, alumno_id, alumno_id))
         row = cur.fetchone()
         if not row:
             return jsonify({"error": "No se encontró estudiante asociado."}), 404
@@ -316,7 +276,7 @@ def mis_matriculas(alumno_id):
         return jsonify(matriculas)
 
     except Exception as e:
-        print("❌ Error al obtener matrículas:", e)
+        log.exception("Error al obtener matrículas")
         return jsonify({"error": f"Error al obtener matrículas: {str(e)}"}), 500
     finally:
         cur.close()
@@ -327,20 +287,110 @@ def mis_matriculas(alumno_id):
 # ================================================
 @matriculas_bp.route('/desmatricular/<int:matricula_id>', methods=['DELETE'])
 def desmatricular_curso(matricula_id):
+    # Solo la matrícula propia: el estudiante sale del token (sin token,
+    # con JWT_EXIGIR=false, no se filtra por dueño)
+    estudiante_id = alumno_de()
+
     conn = get_db()
     cur = conn.cursor()
 
     try:
-        cur.execute("DELETE FROM matriculas WHERE matricula_id = %s", (matricula_id,))
+        cur.execute("""
+            DELETE FROM matriculas
+            WHERE matricula_id = %s AND estudiante_id = COALESCE(%s, estudiante_id)
+            RETURNING estudiante_id, asignacion_id
+        """, (matricula_id, estudiante_id))
+        row = cur.fetchone()
+        if not row:
+            return jsonify({"error": "No tienes esa matrícula."}), 404
+        # El trigger liberó el cupo: pasa el primero de la lista de espera
+        promovidos = cupos.promover_espera(cur, row[1])
         conn.commit()
+
+        for estudiante_id in [row[0]] + promovidos:
+            elegibilidad.descartar_perfil(estudiante_id)
+        if promovidos:
+            log.info("Lista de espera promovida", extra={"asignacion_id": row[1], "promovidos": len(promovidos)})
         return jsonify({"mensaje": "✅ Matrícula eliminada correctamente"}), 200
 
     except Exception as e:
         conn.rollback()
-        print("❌ Error al eliminar matrícula:", e)
+        log.exception("Error al eliminar matrícula")
         return jsonify({"error": str(e)}), 500
 
     finally:
         cur.close()
         conn.close()
 
+
+
+# ================================================
+# ⏳ LISTA DE ESPERA DEL ALUMNO
+# ================================================
+@matriculas_bp.route('/lista-espera/<int:alumno_id>', methods=['GET'])
+@alumno_propio("alumno_id")
+def mi_lista_espera(alumno_id):
+    conn = get_db()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+
+    try:
+        estudiante_id = resolver_estudiante(cur, alumno_id)
+        if not estudiante_id:
+            return jsonify({"error": "No se encontró estudiante asociado."}), 404
+
+        cur.execute("""
+            SELECT
+                l.espera_id,
+                l.asignacion_id,
+                c.nombre AS curso,
+                s.codigo AS seccion,
+                l.creado,
+                (
+                    SELECT COUNT(*) FROM lista_espera l2
+                    WHERE l2.asignacion_id = l.asignacion_id AND l2.espera_id <= l.espera_id
+                ) AS posicion,
+                cu.capacidad,
+                cu.ocupados
+            FROM lista_espera l
+            JOIN asignaciones a ON l.asignacion_id = a.asignacion_id
+            JOIN curso c ON a.curso_id = c.curso_id
+            JOIN secciones s ON a.seccion_id = s.seccion_id
+            LEFT JOIN cupo_asignacion cu ON cu.asignacion_id = l.asignacion_id
+            WHERE l.estudiante_id = %s
+            ORDER BY l.creado
+        """, (estudiante_id,))
+        return jsonify(cur.fetchall())
+
+    except Exception as e:
+        log.exception("Error al obtener lista de espera")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
+
+
+@matriculas_bp.route('/lista-espera/<int:espera_id>', methods=['DELETE'])
+def salir_lista_espera(espera_id):
+    # Solo se puede salir de una espera propia, como en desmatricular_curso
+    estudiante_id = alumno_de()
+
+    conn = get_db()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(
+            "DELETE FROM lista_espera WHERE espera_id = %s AND estudiante_id = COALESCE(%s, estudiante_id)",
+            (espera_id, estudiante_id)
+        )
+        if cur.rowcount == 0:
+            return jsonify({"error": "No estás en esa lista de espera."}), 404
+        conn.commit()
+        return jsonify({"mensaje": "✅ Saliste de la lista de espera"}), 200
+
+    except Exception as e:
+        conn.rollback()
+        log.exception("Error al salir de la lista de espera")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from database.db import get_db
-import bcrypt
+from database import consultas
+from utils.security import verificar_login, VerificacionSaturada
+from utils.tokens import emitir_tokens, revocar_payload, claims_de
+from utils.logs import get_logger
 from datetime import date 
 
 auth_bp = Blueprint("auth", __name__)
+log = get_logger(__name__)
 
 # --------------------------
 # 🔹 Función auxiliar para calcular el ciclo actual
@@ -16,6 +23,53 @@ def obtener_ciclo_actual():
     ciclo = f"{año}-I" if mes <= 6 else f"{año}-II"
     return ciclo
 
+# --------------------------
+# 🔹 Consulta de login (una sola ida a la BD)
+# --------------------------
+# Hash, rol, identificadores del perfil y estado en una fila. Los LEFT JOIN
+# dejan en NULL lo que no corresponde al rol (p. ej. docente_id de un
+# alumno). Si el usuario tiene varios roles se prefiere el de la ruta.
+# escuela_id sale del perfil que corresponda (alumno, docente o admin) y va
+# en el token de sesión.
+LOGIN_USUARIO = consultas.registrar("login_usuario", """
+    SELECT
+        u.usuario_id, u.contrasena, u.estado, r.nombre_rol,
+        p.nombres, p.apellidos,
+        e.estudiante_id,
+        d.docente_id, d.estado AS docente_activo,
+        COALESCE(e.escuela_id, d.escuela_id, a.escuela_id) AS escuela_id
+    FROM usuario u
+    JOIN usuario_rol ur ON u.usuario_id = ur.usuario_id
+    JOIN rol r ON ur.rol_id = r.rol_id
+    LEFT JOIN persona p ON p.usuario_id = u.usuario_id
+    LEFT JOIN estudiante e ON e.persona_id = p.persona_id
+    LEFT JOIN docente d ON d.persona_id = p.persona_id
+    LEFT JOIN administrador a ON a.persona_id = p.persona_id
+    WHERE u.correo = %s
+    ORDER BY LOWER(r.nombre_rol) = LOWER(%s) DESC
+    LIMIT 1
+""", tipos=("text", "text"))
+
+
+def consultar_login(cur, correo, expected_rol):
+    # Preparada una vez por conexión del pool (database/consultas.py)
+    consultas.ejecutar(cur, LOGIN_USUARIO, (correo, expected_rol))
+    return cur.fetchone()
+
+
+def respuesta_inactiva():
+    return jsonify({
+        "error": "Cuenta desactivada", 
+        "mensaje": "Tu cuenta se encuentra inactiva. Por favor, contacta al administrador para más información."
+    }), 403
+
+
+def respuesta_login(datos, escuela_id):
+    # Los datos del login + tokens firmados con los mismos identificadores
+    datos.update(emitir_tokens(dict(datos, escuela_id=escuela_id)))
+    return jsonify(datos), 200
+
+
 # --------------------------
 # 🔹 Función general de autenticación
 # --------------------------
@@ -23,136 +77,89 @@ def authenticate_user(correo, contrasena, expected_rol):
     conn = get_db()
     cur = conn.cursor()
 
-    # 1. Autenticación inicial (Usuario y Rol)
-    cur.execute("""
-        SELECT u.usuario_id, u.contrasena, r.nombre_rol
-        FROM usuario u
-        JOIN usuario_rol ur ON u.usuario_id = ur.usuario_id
-        JOIN rol r ON ur.rol_id = r.rol_id
-        WHERE u.correo = %s
-    """, (correo,))
-    result = cur.fetchone()
-
-    if not result:
-        cur.close()
-        conn.close()
-        return jsonify({"error": "Usuario o correo no encontrado"}), 404
-
-    user_id, password_db, actual_rol = result
-
-    # Verificar que el rol coincida con la ruta solicitada
-    if actual_rol.lower() != expected_rol.lower():
-        cur.close()
-        conn.close()
-        return jsonify({"error": f"Acceso denegado: Este usuario no es un {expected_rol}"}), 403
-
-    # Verificar contraseña
     try:
-        if actual_rol == "SuperAdmin":
-            is_valid = contrasena == password_db
-        else:
-            is_valid = bcrypt.checkpw(contrasena.encode(), password_db.encode())
-    except Exception as e:
-        cur.close()
-        conn.close()
-        return jsonify({"error": f"Error de verificación de contraseña: {str(e)}"}), 500
-
-    if not is_valid:
-        cur.close()
-        conn.close()
-        return jsonify({"error": "Credenciales inválidas"}), 401
-
-    # --- CONSULTAS ESPECÍFICAS DE ROL CORREGIDAS ---
-
-    # 💡 Si es ALUMNO
-    if expected_rol.lower() == "alumno":
-        ciclo_actual = obtener_ciclo_actual()
-        cur.execute("""
-            SELECT e.estudiante_id, p.nombres, p.apellidos
-            FROM estudiante e
-            JOIN persona p ON e.persona_id = p.persona_id
-            WHERE p.usuario_id = %s
-        """, (user_id,))
-        info = cur.fetchone()
-        
-        if not info:
-            cur.close()
-            conn.close()
-            return jsonify({"error": "No se encontró información del alumno"}), 404
-
-        estudiante_id, nombres, apellidos = info
-        
-        # 🔒 VALIDACIÓN DE ESTADO DEL ALUMNO
-        # Verificar el estado en la tabla usuario
-        cur.execute("""
-            SELECT u.estado
-            FROM usuario u
-            JOIN persona p ON u.usuario_id = p.usuario_id
-            JOIN estudiante e ON p.persona_id = e.persona_id
-            WHERE e.estudiante_id = %s
-        """, (estudiante_id,))
-        estado_result = cur.fetchone()
-        
-        if estado_result:
-            estado = estado_result[0]
-            # Si el estado es INACTIVO, no permitir login
-            if estado and estado.upper() == "INACTIVO":
-                cur.close()
-                conn.close()
-                return jsonify({
-                    "error": "Cuenta desactivada", 
-                    "mensaje": "Tu cuenta se encuentra inactiva. Por favor, contacta al administrador para más información."
-                }), 403
-        
-        cur.close()
-        conn.close()
-
-        return jsonify({
+        result = consultar_login(cur, correo, expected_rol)
+
+        if not result:
+            return jsonify({"error": "Usuario o correo no encontrado"}), 404
+
+        (user_id, password_db, estado_usuario, actual_rol, nombres, apellidos,
+         estudiante_id, docente_id, docente_activo, escuela_id) = result
+
+        # Verificar que el rol coincida con la ruta solicitada
+        if actual_rol.lower() != expected_rol.lower():
+            return jsonify({"error": f"Acceso denegado: Este usuario no es un {expected_rol}"}), 403
+
+        # Verificar contraseña (en el pool de hash de utils/security.py)
+        nuevo_hash = None
+        try:
+            if actual_rol == "SuperAdmin":
+                is_valid = contrasena == password_db
+            else:
+                is_valid, nuevo_hash = verificar_login(contrasena, password_db)
+        except VerificacionSaturada as e:
+            return jsonify({"error": str(e)}), 503
+        except Exception as e:
+            return jsonify({"error": f"Error de verificación de contraseña: {str(e)}"}), 500
+
+        if not is_valid:
+            return jsonify({"error": "Credenciales inválidas"}), 401
+
+        # 🔄 Rehash: el hash se generó con otra política (costo o esquema)
+        if nuevo_hash:
+            try:
+                cur.execute("""
+                    UPDATE usuario SET contrasena = %s
+                    WHERE usuario_id = %s AND contrasena = %s
+                """, (nuevo_hash, user_id, password_db))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                log.warning("No se pudo actualizar el hash del usuario", extra={"usuario_id": user_id, "error": str(e)})
+
+        # 💡 Si es ALUMNO
+        if expected_rol.lower() == "alumno":
+            if estudiante_id is None:
+                return jsonify({"error": "No se encontró información del alumno"}), 404
+
+            # 🔒 VALIDACIÓN DE ESTADO DEL ALUMNO (tabla usuario)
+            if estado_usuario and str(estado_usuario).upper() == "INACTIVO":
+                return respuesta_inactiva()
+
+            return respuesta_login({
+                "usuario_id": user_id,
+                "estudiante_id": estudiante_id,
+                "nombre": f"{nombres} {apellidos}",
+                "rol": actual_rol,
+                "ciclo_actual": obtener_ciclo_actual()
+            }, escuela_id)
+
+        # 💡 Si es DOCENTE
+        if expected_rol.lower() == "docente":
+            if docente_id is None:
+                return jsonify({"error": "No se encontró información del docente"}), 404
+
+            # 🔒 VALIDACIÓN DE ESTADO DEL DOCENTE
+            # El estado es booleano: True = Activo, False = Inactivo
+            if not docente_activo:  # Si estado es False o None
+                return respuesta_inactiva()
+
+            return respuesta_login({
+                "usuario_id": user_id,
+                "docente_id": docente_id,
+                "nombre": f"{nombres} {apellidos}",
+                "rol": actual_rol
+            }, escuela_id)
+
+        # 💡 Si es ADMIN o SUPERADMIN
+        return respuesta_login({
             "usuario_id": user_id,
-            "estudiante_id": estudiante_id,
-            "nombre": f"{nombres} {apellidos}",
-            "rol": actual_rol,
-            "ciclo_actual": ciclo_actual
-        }), 200
-
-    # 💡 Si es DOCENTE
-    if expected_rol.lower() == "docente":
-        cur.execute("""
-            SELECT d.docente_id, p.nombres, p.apellidos, d.estado
-            FROM docente d
-            JOIN persona p ON d.persona_id = p.persona_id
-            WHERE p.usuario_id = %s
-        """, (user_id,))
-        info = cur.fetchone()
-        cur.close()
-        conn.close()
-        if not info:
-            return jsonify({"error": "No se encontró información del docente"}), 404
-
-        docente_id, nombres, apellidos, estado = info
-        
-        # 🔒 VALIDACIÓN DE ESTADO DEL DOCENTE
-        # El estado es booleano: True = Activo, False = Inactivo
-        if not estado:  # Si estado es False o None
-            return jsonify({
-                "error": "Cuenta desactivada", 
-                "mensaje": "Tu cuenta se encuentra inactiva. Por favor, contacta al administrador para más información."
-            }), 403
-
-        return jsonify({
-            "usuario_id": user_id,
-            "docente_id": docente_id,
-            "nombre": f"{nombres} {apellidos}",
             "rol": actual_rol
-        }), 200
+        }, escuela_id)
 
-    # 💡 Si es ADMIN o SUPERADMIN
-    cur.close()
-    conn.close()
-    return jsonify({
-        "usuario_id": user_id,
-        "rol": actual_rol
-    }), 200
+    finally:
+        cur.close()
+        conn.close()
 
 # --------------------------
 # 🔹 Rutas de login específicas
@@ -179,4 +186,34 @@ def login_superadmin():
 
 @auth_bp.route("/login", methods=["POST"])
 def login_generic():
-    return jsonify({"error": "Por favor, use la ruta de login específica del rol."}), 400
\ No newline at end of file
+    return jsonify({"error": "Por favor, use la ruta de login específica del rol."}), 400
+
+# --------------------------
+# 🔹 Refresco y cierre de sesión
+# --------------------------
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refrescar():
+    # Rotación: el refresh token usado se revoca y se entrega uno nuevo
+    payload = get_jwt()
+    revocar_payload(payload)
+    return jsonify(emitir_tokens(claims_de(payload))), 200
+
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required()
+def logout():
+    acceso = get_jwt()
+
+    # Si el cliente manda su refresh token (del mismo usuario) también se revoca
+    refresh_token = (request.get_json(silent=True) or {}).get("refresh_token")
+    if refresh_token:
+        try:
+            refresco = decode_token(refresh_token, allow_expired=True)
+        except (PyJWTError, JWTExtendedException):
+            return jsonify({"error": "refresh_token inválido"}), 400
+        if refresco.get("sub") != acceso.get("sub") or refresco.get("type") != "refresh":
+            return jsonify({"error": "El refresh_token no corresponde a esta sesión"}), 400
+        revocar_payload(refresco)
+
+    revocar_payload(acceso)
+    return jsonify({"mensaje": "Sesión cerrada"}), 200
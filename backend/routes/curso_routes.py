@@ -1,10 +1,15 @@
 # routes/curso_routes.py
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from utils.cache import invalidar
+from utils.coalescencia import coalescer
+from utils.paginacion import ConsultaPaginada, ParametroInvalido, quiere_paginacion, a_booleano
+from utils.logs import get_logger
 from psycopg2.extras import RealDictCursor
 import re
 
 curso_bp = Blueprint("curso", __name__)
+log = get_logger(__name__)
 
 # ===========================
 # CREAR CURSO
@@ -114,6 +119,7 @@ def crear_curso():
 
         nuevo = cur.fetchone()
         conn.commit()
+        invalidar("cursos", "prerrequisitos")
         cur.close()
         conn.close()
 
@@ -127,6 +133,7 @@ def crear_curso():
 # LISTAR TODOS LOS CURSOS (RUTA PRINCIPAL)
 # ===========================
 @curso_bp.route("/", methods=["GET"])
+@coalescer("listar_cursos")
 def listar_cursos():
     conn = None
     cur = None
@@ -144,8 +151,8 @@ def listar_cursos():
         cursos = cur.fetchall()
         return jsonify(cursos), 200
     
-    except Exception as e:
-        print(f"❌ Error en listar_cursos: {e}")
+    except Exception:
+        log.exception("Error en listar_cursos")
         return jsonify({"error": "Error interno al obtener la lista de cursos."}), 500
         
     finally:
@@ -235,6 +242,7 @@ def actualizar_curso(curso_id):
 
         curso_actualizado = cur.fetchone()
         conn.commit()
+        invalidar("cursos", "prerrequisitos")
         
         return jsonify({
             "mensaje": "Curso actualizado correctamente ✅",
@@ -270,7 +278,6 @@ def eliminar_curso(curso_id):
         if not curso:
             return jsonify({"error": "El curso no existe"}), 404
 
-        print(f"🗑️ Iniciando eliminación del curso: {curso[0]} - {curso[1]}")
 
         # 1️⃣ Eliminar matrículas de las secciones de este curso
         cur.execute("""
@@ -280,20 +287,17 @@ def eliminar_curso(curso_id):
             )
         """, (curso_id,))
         matriculas_eliminadas = cur.rowcount
-        print(f"   ✓ Matrículas eliminadas: {matriculas_eliminadas}")
 
         # 2️⃣ Eliminar asignaciones del curso
         cur.execute("DELETE FROM asignaciones WHERE curso_id = %s", (curso_id,))
         asignaciones_eliminadas = cur.rowcount
-        print(f"   ✓ Asignaciones eliminadas: {asignaciones_eliminadas}")
 
         # 3️⃣ Eliminar secciones del curso (si existen)
         try:
             cur.execute("DELETE FROM seccion WHERE curso_id = %s", (curso_id,))
             secciones_eliminadas = cur.rowcount
-            print(f"   ✓ Secciones eliminadas: {secciones_eliminadas}")
         except Exception as e:
-            print(f"   ⚠️ No se encontraron secciones o no existen: {str(e)}")
+            log.debug("Sin secciones que eliminar", extra={"curso_id": curso_id, "error": str(e)})
             secciones_eliminadas = 0
 
         # 4️⃣ Eliminar prerrequisitos (donde este curso es requisito o es requerido)
@@ -303,16 +307,19 @@ def eliminar_curso(curso_id):
                 WHERE id_curso = %s OR id_curso_requerido = %s
             """, (curso_id, curso_id))
             prerrequisitos_eliminados = cur.rowcount
-            print(f"   ✓ Prerrequisitos eliminados: {prerrequisitos_eliminados}")
         except Exception as e:
-            print(f"   ⚠️ No se encontraron prerrequisitos: {str(e)}")
+            log.debug("Sin prerrequisitos que eliminar", extra={"curso_id": curso_id, "error": str(e)})
             prerrequisitos_eliminados = 0
 
         # 5️⃣ Finalmente eliminar el curso
         cur.execute("DELETE FROM curso WHERE curso_id = %s", (curso_id,))
-        print(f"   ✓ Curso eliminado exitosamente")
 
         conn.commit()
+        invalidar("cursos", "prerrequisitos", "asignaciones")
+        log.info("Curso eliminado", extra={
+            "curso_id": curso_id, "matriculas": matriculas_eliminadas,
+            "asignaciones": asignaciones_eliminadas
+        })
         
         return jsonify({
             "mensaje": "Curso y todas sus dependencias eliminadas exitosamente ✅",
@@ -327,13 +334,36 @@ def eliminar_curso(curso_id):
     except Exception as e:
         if conn: 
             conn.rollback()
-        print("❌ Error al eliminar curso:", str(e))
+        log.exception("Error al eliminar curso")
         return jsonify({"error": f"Error al eliminar: {str(e)}"}), 500
     finally:
         if cur: cur.close()
         if conn: conn.close()
 
 
+# Listado paginado: filtros ciclo, tipo, estado y búsqueda por código o nombre
+LISTADO_CURSOS = ConsultaPaginada(
+    select="""
+        SELECT c.curso_id, c.codigo, c.nombre, c.creditos, c.ciclo,
+               c.horas_teoricas, c.horas_practicas, c.tipo, c.estado, c.fecha_creacion
+    """,
+    desde="FROM curso c",
+    id_unico="c.curso_id",
+    ordenes={
+        "id": [],
+        "nombre": ["c.nombre"],
+        "codigo": ["c.codigo"],
+    },
+    dir_defecto="desc",
+    filtros={
+        "ciclo": ("c.ciclo = %s", str),
+        "tipo": ("c.tipo = %s", str),
+        "estado": ("c.estado = %s", a_booleano),
+    },
+    busqueda=["c.codigo", "c.nombre"],
+)
+
+
 # ===========================
 # CONSULTAR CURSOS CON FILTROS
 # ===========================
@@ -344,6 +374,13 @@ def consultar_cursos():
         conn = get_db()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
+        # Con ?limit= o ?cursor= responde paginado (ver LISTADO_CURSOS)
+        if quiere_paginacion(request.args):
+            pagina = LISTADO_CURSOS.ejecutar(cur, request.args)
+            pagina["cursos"] = pagina.pop("items")
+            cur.close()
+            return jsonify(pagina), 200
+
         if ciclo:
             cur.execute("""
                 SELECT c.curso_id, c.codigo, c.nombre, c.creditos, c.ciclo,
@@ -365,8 +402,10 @@ def consultar_cursos():
         conn.close()
         return jsonify(cursos), 200
 
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print("Error en consultar_cursos:", e)
+        log.exception("Error en consultar_cursos")
         return jsonify({"error": str(e)}), 500
 
 
@@ -449,7 +488,7 @@ def verificar_asignaciones(curso_id):
         }), 200
 
     except Exception as e:
-        print("❌ Error al verificar asignaciones:", str(e))
+        log.exception("Error al verificar asignaciones")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
@@ -1,8 +1,12 @@
 from flask import Blueprint, jsonify, request
 from database.db import get_db
 from datetime import datetime, date
+from .informe_asistencia import construir_informe
+from database.asistencia_resumen import insertar_asistencias, matriculas_bajo_umbral
+from utils.logs import get_logger
 
 asistencia_bp = Blueprint('asistencia', __name__)
+log = get_logger(__name__)
 
 # 1. OBTENER LISTA DE ESTUDIANTES MATRICULADOS - USA ASIGNACION_ID
 @asistencia_bp.route("/estudiantes/<int:asignacion_id>", methods=['GET'])
@@ -13,7 +17,6 @@ def obtener_estudiantes_clase(asignacion_id):
     conn = None
     cur = None
     try:
-        print(f"🔍 Buscando estudiantes para asignacion_id={asignacion_id}")
         
         conn = get_db()
         cur = conn.cursor()
@@ -62,7 +65,7 @@ def obtener_estudiantes_clase(asignacion_id):
         sesion_existente = cur.fetchone()
         
         if sesion_existente:
-            print(f"⚠️ Ya existe asistencia para hoy: {fecha_hoy}")
+            log.info("Asistencia ya registrada hoy", extra={"asignacion_id": asignacion_id})
             return jsonify({
                 'error': 'Ya se ha tomado asistencia para el día de hoy',
                 'asistencia_tomada': True,
@@ -78,18 +81,12 @@ def obtener_estudiantes_clase(asignacion_id):
                 e.codigo_universitario,
                 m.matricula_id,
                 COALESCE(
-                    (SELECT 
-                        ROUND(
-                            (COUNT(CASE WHEN a.estado = 'Presente' THEN 1 END)::numeric / 
-                            NULLIF(COUNT(*), 0) * 100), 2
-                        )
-                     FROM asistencia a
-                     WHERE a.matricula_id = m.matricula_id
-                    ), 0
+                    ROUND(r.presentes::numeric / NULLIF(r.total, 0) * 100, 2), 0
                 ) as porcentaje_asistencia
             FROM matriculas m
             JOIN estudiante e ON m.estudiante_id = e.estudiante_id
             JOIN persona p ON e.persona_id = p.persona_id
+            LEFT JOIN asistencia_resumen r ON r.matricula_id = m.matricula_id
             WHERE m.asignacion_id = %s
             AND m.estado = 'ACTIVA'
             ORDER BY p.apellidos, p.nombres
@@ -98,7 +95,7 @@ def obtener_estudiantes_clase(asignacion_id):
         cur.execute(query, (asignacion_id,))
         rows = cur.fetchall()
         
-        print(f"✅ Encontrados {len(rows)} estudiantes")
+        log.debug("Estudiantes de la clase", extra={"asignacion_id": asignacion_id, "estudiantes": len(rows)})
         
         if not rows:
             return jsonify({
@@ -124,9 +121,7 @@ def obtener_estudiantes_clase(asignacion_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener estudiantes: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener estudiantes", extra={"asignacion_id": asignacion_id})
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -207,59 +202,16 @@ def registrar_asistencia():
         
         sesion_id = cur.fetchone()[0]
         
-        # Registrar asistencias
-        estudiantes_registrados = 0
-        for asistencia in data['asistencias']:
-            cur.execute("""
-                INSERT INTO asistencia 
-                (sesion_id, matricula_id, estado, fecha_registro)
-                VALUES (%s, %s, %s, NOW())
-            """, (
-                sesion_id,
-                asistencia['matricula_id'],
-                asistencia['estado']
-            ))
-            estudiantes_registrados += 1
+        # Registrar asistencias (un solo INSERT); el trigger de asistencia
+        # actualiza asistencia_resumen en la misma transacción
+        estudiantes_registrados = insertar_asistencias(cur, sesion_id, data['asistencias'])
         
         conn.commit()
         
-        # Calcular porcentajes de asistencia
-        cur.execute("""
-            SELECT 
-                m.matricula_id,
-                p.nombres,
-                p.apellidos,
-                COUNT(*) FILTER (WHERE a.estado = 'Presente') as presentes,
-                COUNT(*) as total_sesiones,
-                ROUND(
-                    (COUNT(*) FILTER (WHERE a.estado = 'Presente')::numeric / 
-                    NULLIF(COUNT(*), 0) * 100), 2
-                ) as porcentaje
-            FROM matriculas m
-            JOIN estudiante e ON m.estudiante_id = e.estudiante_id
-            JOIN persona p ON e.persona_id = p.persona_id
-            LEFT JOIN asistencia a ON m.matricula_id = a.matricula_id
-            WHERE m.asignacion_id = %s
-            GROUP BY m.matricula_id, p.nombres, p.apellidos
-            HAVING ROUND(
-                (COUNT(*) FILTER (WHERE a.estado = 'Presente')::numeric / 
-                NULLIF(COUNT(*), 0) * 100), 2
-            ) < 70
-            ORDER BY porcentaje ASC
-        """, (data['asignacion_id'],))
+        # Estudiantes bajo el 70 %, leídos de asistencia_resumen
+        estudiantes_bajo_porcentaje = matriculas_bajo_umbral(cur, data['asignacion_id'])
         
-        estudiantes_bajo_porcentaje = []
-        for row in cur.fetchall():
-            estudiantes_bajo_porcentaje.append({
-                'matricula_id': row[0],
-                'nombre': row[1],
-                'apellido': row[2],
-                'presentes': row[3],
-                'total_sesiones': row[4],
-                'porcentaje': float(row[5])
-            })
-        
-        print(f"✅ Asistencia registrada exitosamente para sesión_id={sesion_id}")
+        log.info("Asistencia registrada", extra={"sesion_id": sesion_id, "estudiantes": estudiantes_registrados})
         
         return jsonify({
             'message': 'Asistencia registrada exitosamente',
@@ -271,9 +223,7 @@ def registrar_asistencia():
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"❌ Error al registrar asistencia: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al registrar asistencia")
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -346,9 +296,7 @@ def obtener_historial_asistencia(asignacion_id):
         return jsonify({'historial': historial}), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener historial: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener historial", extra={"asignacion_id": asignacion_id})
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -404,9 +352,7 @@ def obtener_cursos_docente(docente_id):
         return jsonify({'cursos': cursos}), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener cursos: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener cursos")
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -461,7 +407,7 @@ def obtener_historial_estudiante(matricula_id):
         return jsonify({'historial': historial}), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener historial del estudiante: {e}")
+        log.exception("Error al obtener historial del estudiante")
         return jsonify({'error': str(e)}), 500
     
     finally:
@@ -483,125 +429,15 @@ def obtener_informe_asistencia(asignacion_id):
         conn = get_db()
         cur = conn.cursor()
         
-        # 1. Obtener información del curso
-        cur.execute("""
-            SELECT c.nombre, s.codigo, a.docente_id
-            FROM asignaciones a
-            JOIN curso c ON a.curso_id = c.curso_id
-            JOIN secciones s ON a.seccion_id = s.seccion_id
-            WHERE a.asignacion_id = %s
-        """, (asignacion_id,))
-        
-        curso_info = cur.fetchone()
-        if not curso_info:
+        # Curso, sesiones y la matriz sesiones × estudiantes (una sola consulta)
+        informe = construir_informe(cur, asignacion_id)
+        if informe is None:
             return jsonify({'error': 'Curso no encontrado'}), 404
-        
-        # 2. Obtener todas las sesiones del curso
-        cur.execute("""
-            SELECT 
-                sc.sesion_id,
-                sc.fecha,
-                sc.hora_inicio,
-                sc.hora_fin
-            FROM sesion_clase sc
-            JOIN asignaciones a ON sc.curso_id = a.curso_id AND sc.seccion_id = a.seccion_id
-            WHERE a.asignacion_id = %s
-            ORDER BY sc.fecha ASC
-        """, (asignacion_id,))
-        
-        sesiones = []
-        for row in cur.fetchall():
-            sesiones.append({
-                'sesion_id': row[0],
-                'fecha': str(row[1]),
-                'hora_inicio': str(row[2]) if row[2] else None,
-                'hora_fin': str(row[3]) if row[3] else None
-            })
-        
-        # 3. Obtener estudiantes con su asistencia
-        cur.execute("""
-            SELECT 
-                e.estudiante_id,
-                p.nombres,
-                p.apellidos,
-                e.codigo_universitario,
-                m.matricula_id
-            FROM matriculas m
-            JOIN estudiante e ON m.estudiante_id = e.estudiante_id
-            JOIN persona p ON e.persona_id = p.persona_id
-            WHERE m.asignacion_id = %s
-            AND m.estado = 'ACTIVA'
-            ORDER BY p.apellidos, p.nombres
-        """, (asignacion_id,))
-        
-        estudiantes = []
-        for row in cur.fetchall():
-            estudiante_id = row[0]
-            matricula_id = row[4]
-            
-            # Obtener todas las asistencias del estudiante
-            cur.execute("""
-                SELECT 
-                    a.sesion_id,
-                    a.estado,
-                    sc.fecha
-                FROM asistencia a
-                JOIN sesion_clase sc ON a.sesion_id = sc.sesion_id
-                WHERE a.matricula_id = %s
-                ORDER BY sc.fecha ASC
-            """, (matricula_id,))
-            
-            asistencias_dict = {}
-            total_sesiones = 0
-            presentes = 0
-            ausentes = 0
-            tardanzas = 0
-            
-            for ast_row in cur.fetchall():
-                sesion_id = ast_row[0]
-                estado = ast_row[1]
-                fecha = str(ast_row[2])
-                
-                asistencias_dict[sesion_id] = estado
-                total_sesiones += 1
-                
-                if estado == 'Presente':
-                    presentes += 1
-                elif estado == 'Ausente':
-                    ausentes += 1
-                elif estado == 'Tardanza':
-                    tardanzas += 1
-            
-            # Calcular porcentaje
-            porcentaje = round((presentes / total_sesiones * 100), 2) if total_sesiones > 0 else 0
-            
-            estudiantes.append({
-                'estudiante_id': estudiante_id,
-                'nombres': row[1],
-                'apellidos': row[2],
-                'codigo_universitario': row[3],
-                'matricula_id': matricula_id,
-                'asistencias': asistencias_dict,
-                'total_sesiones': total_sesiones,
-                'presentes': presentes,
-                'ausentes': ausentes,
-                'tardanzas': tardanzas,
-                'porcentaje': porcentaje
-            })
-        
-        return jsonify({
-            'curso': {
-                'nombre': curso_info[0],
-                'seccion': curso_info[1]
-            },
-            'sesiones': sesiones,
-            'estudiantes': estudiantes
-        }), 200
+
+        return jsonify(informe), 200
         
     except Exception as e:
-        print(f"❌ Error al obtener informe: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener informe")
         return jsonify({'error': str(e)}), 500
     
     finally:
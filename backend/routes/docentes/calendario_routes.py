@@ -1,7 +1,9 @@
 from flask import Blueprint, jsonify
 from database.db import get_db
+from utils.logs import get_logger
 
 calendario_bp = Blueprint('calendario', __name__)
+log = get_logger(__name__)
 
 @calendario_bp.route("/horario/<int:docente_id>", methods=['GET'])
 def horario_docente(docente_id):
@@ -14,7 +16,7 @@ def horario_docente(docente_id):
         # Verificar si el docente tiene asignaciones
         cur.execute("SELECT COUNT(*) FROM asignaciones WHERE docente_id = %s", (docente_id,))
         count = cur.fetchone()[0]
-        print(f"✅ Asignaciones encontradas para docente {docente_id}: {count}")
+        log.debug("Asignaciones del docente", extra={"docente_id": docente_id, "asignaciones": count})
         
         # Consulta SQL con LEFT JOIN para incluir asignaciones sin bloque horario
         query = """
@@ -58,7 +60,6 @@ def horario_docente(docente_id):
         column_names = [desc[0] for desc in cur.description]
         rows = cur.fetchall()
 
-        print(f"✅ Filas de horario encontradas: {len(rows)}")
 
         if not rows:
             return jsonify({
@@ -77,15 +78,11 @@ def horario_docente(docente_id):
                 item['hora_fin'] = str(item['hora_fin'])
             horario.append(item)
 
-        print(f"✅ Horario generado exitosamente con {len(horario)} bloques")
+        log.debug("Horario del docente generado", extra={"docente_id": docente_id, "bloques": len(horario)})
         return jsonify(horario), 200
 
     except Exception as e:
-        print(f"❌ Error al obtener horario del docente {docente_id}:")
-        print(f"   Tipo de error: {type(e).__name__}")
-        print(f"   Mensaje: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error al obtener horario del docente", extra={"docente_id": docente_id})
         return jsonify({
             'error': 'Error al consultar el horario',
             'detalle': str(e)
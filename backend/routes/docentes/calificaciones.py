@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from database.elegibilidad import descartar_perfil
 from psycopg2.extras import RealDictCursor
+from utils.streaming import iterar_cursor, quiere_ndjson, respuesta_ndjson
+from utils.logs import get_logger
 from datetime import datetime
 
 calificaciones_bp = Blueprint("calificaciones", __name__)
+log = get_logger(__name__)
 
 # ================================================
 # ✅ Registrar o actualizar calificaciones
@@ -90,16 +94,18 @@ def registrar_calificacion():
             mensaje = "✅ Calificación registrada correctamente"
 
         conn.commit()
+        # estudiante_id llega del JSON (puede ser texto); la caché usa el id entero
+        descartar_perfil(int(estudiante_id))
         return jsonify({"mensaje": mensaje, "promedio": promedio, "estado": estado}), 200
 
     except ValueError as ve:
         # Captura el error si la conversión a float falla
         conn.rollback()
-        print("❌ Error de valor en calificación:", ve)
+        log.info("Valor de calificación inválido", extra={"error": str(ve)})
         return jsonify({"error": str(ve)}), 400
-    except Exception as e:
+    except Exception:
         conn.rollback()
-        print("❌ Error al registrar calificación:", e)
+        log.exception("Error al registrar calificación")
         return jsonify({"error": "Error interno del servidor al procesar la calificación."}), 500
     finally:
         cur.close()
@@ -133,7 +139,7 @@ def obtener_estudiantes_docente(docente_id):
         estudiantes = cur.fetchall()
         return jsonify(estudiantes)
     except Exception as e:
-        print("❌ Error al obtener estudiantes:", e)
+        log.exception("Error al obtener estudiantes")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
@@ -163,7 +169,7 @@ def obtener_cursos_docente(docente_id):
         cursos = cur.fetchall()
         return jsonify(cursos)
     except Exception as e:
-        print("❌ Error al obtener cursos del docente:", e)
+        log.exception("Error al obtener cursos del docente")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
@@ -196,7 +202,7 @@ def obtener_estudiantes_curso(asignacion_id):
         estudiantes = cur.fetchall()
         return jsonify(estudiantes)
     except Exception as e:
-        print("❌ Error al obtener estudiantes del curso:", e)
+        log.exception("Error al obtener estudiantes del curso")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
@@ -205,30 +211,39 @@ def obtener_estudiantes_curso(asignacion_id):
 # ================================================
 # 📝 Obtener todas las calificaciones de un curso y docente
 # ================================================
+SQL_NOTAS_CURSO = """
+    SELECT 
+        cal.estudiante_id,
+        cal.practicas,
+        cal.parcial,
+        cal.final,
+        cal.promedio,
+        cal.estado
+    FROM calificaciones cal
+    WHERE cal.curso_id = %s AND cal.docente_id = %s
+    ORDER BY cal.estudiante_id
+"""
+
 @calificaciones_bp.route("/notas/<int:curso_id>/<int:docente_id>", methods=["GET"])
 def obtener_notas_curso(curso_id, docente_id):
+    # Con ?format=ndjson las notas se envían línea por línea
+    if quiere_ndjson():
+        return respuesta_ndjson(iterar_cursor(
+            SQL_NOTAS_CURSO, (curso_id, docente_id), cursor_factory=RealDictCursor
+        ))
+
     conn = get_db()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
         # Busca todas las calificaciones que coincidan con el curso y el docente.
         # Asume que una calificación está ligada a un estudiante, curso y docente.
-        cur.execute("""
-            SELECT 
-                cal.estudiante_id,
-                cal.practicas,
-                cal.parcial,
-                cal.final,
-                cal.promedio,
-                cal.estado
-            FROM calificaciones cal
-            WHERE cal.curso_id = %s AND cal.docente_id = %s
-        """, (curso_id, docente_id))
+        cur.execute(SQL_NOTAS_CURSO, (curso_id, docente_id))
         
         notas = cur.fetchall()
         return jsonify(notas)
         
     except Exception as e:
-        print("❌ Error al obtener notas del curso:", e)
+        log.exception("Error al obtener notas del curso")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
@@ -0,0 +1,117 @@
+# ============================================
+# informe_asistencia.py – Informe de asistencia de una asignación
+# ============================================
+# Trae la matriz sesiones × estudiantes en una sola consulta y la pivotea
+# en memoria (antes se hacía una consulta por estudiante). Los totales por
+# estudiante salen de asistencia_resumen.
+
+
+def obtener_curso(cur, asignacion_id):
+    cur.execute("""
+        SELECT c.nombre, s.codigo, a.docente_id
+        FROM asignaciones a
+        JOIN curso c ON a.curso_id = c.curso_id
+        JOIN secciones s ON a.seccion_id = s.seccion_id
+        WHERE a.asignacion_id = %s
+    """, (asignacion_id,))
+    return cur.fetchone()
+
+
+def obtener_sesiones(cur, asignacion_id):
+    cur.execute("""
+        SELECT
+            sc.sesion_id,
+            sc.fecha,
+            sc.hora_inicio,
+            sc.hora_fin
+        FROM sesion_clase sc
+        JOIN asignaciones a ON sc.curso_id = a.curso_id AND sc.seccion_id = a.seccion_id
+        WHERE a.asignacion_id = %s
+        ORDER BY sc.fecha ASC
+    """, (asignacion_id,))
+
+    return [{
+        'sesion_id': row[0],
+        'fecha': str(row[1]),
+        'hora_inicio': str(row[2]) if row[2] else None,
+        'hora_fin': str(row[3]) if row[3] else None
+    } for row in cur.fetchall()]
+
+
+def obtener_matriz_asistencia(cur, asignacion_id):
+    """
+    Una fila por (estudiante, registro de asistencia), con los contadores de
+    asistencia_resumen repetidos en cada fila. Los estudiantes sin registros
+    aparecen una vez con sesion_id/estado en NULL.
+    """
+    cur.execute("""
+        SELECT
+            e.estudiante_id,
+            p.nombres,
+            p.apellidos,
+            e.codigo_universitario,
+            m.matricula_id,
+            a.sesion_id,
+            a.estado,
+            COALESCE(r.presentes, 0),
+            COALESCE(r.ausentes, 0),
+            COALESCE(r.tardanzas, 0),
+            COALESCE(r.total, 0)
+        FROM matriculas m
+        JOIN estudiante e ON m.estudiante_id = e.estudiante_id
+        JOIN persona p ON e.persona_id = p.persona_id
+        LEFT JOIN asistencia_resumen r ON r.matricula_id = m.matricula_id
+        LEFT JOIN (
+            asistencia a
+            JOIN sesion_clase sc ON a.sesion_id = sc.sesion_id
+        ) ON a.matricula_id = m.matricula_id
+        WHERE m.asignacion_id = %s
+        AND m.estado = 'ACTIVA'
+        ORDER BY p.apellidos, p.nombres, m.matricula_id, sc.fecha ASC
+    """, (asignacion_id,))
+    return cur.fetchall()
+
+
+def pivotear_asistencia(filas):
+    """Agrupa las filas de la matriz por matrícula."""
+    estudiantes = []
+    actual = None
+
+    for (estudiante_id, nombres, apellidos, codigo, matricula_id, sesion_id, estado,
+         presentes, ausentes, tardanzas, total) in filas:
+        if actual is None or actual['matricula_id'] != matricula_id:
+            actual = {
+                'estudiante_id': estudiante_id,
+                'nombres': nombres,
+                'apellidos': apellidos,
+                'codigo_universitario': codigo,
+                'matricula_id': matricula_id,
+                'asistencias': {},
+                'total_sesiones': total,
+                'presentes': presentes,
+                'ausentes': ausentes,
+                'tardanzas': tardanzas,
+                'porcentaje': round((presentes / total * 100), 2) if total > 0 else 0
+            }
+            estudiantes.append(actual)
+
+        if sesion_id is not None:
+            actual['asistencias'][sesion_id] = estado
+
+    return estudiantes
+
+
+def construir_informe(cur, asignacion_id):
+    """Devuelve el informe completo o None si la asignación no existe."""
+    curso_info = obtener_curso(cur, asignacion_id)
+    if not curso_info:
+        return None
+
+    return {
+        'curso': {
+            'nombre': curso_info[0],
+            'seccion': curso_info[1]
+        },
+        'sesiones': obtener_sesiones(cur, asignacion_id),
+        'estudiantes': pivotear_asistencia(obtener_matriz_asistencia(cur, asignacion_id))
+    }
@@ -5,8 +5,10 @@ from psycopg2.extras import RealDictCursor # Necesario si usas RealDictCursor en
 # Nota: Asumimos que UPLOAD_FOLDER y ALLOWED_EXTENSIONS están definidos en tu archivo config
 # from config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS 
 import os
+from utils.logs import get_logger
 
 material_bp = Blueprint("material", __name__)
+log = get_logger(__name__)
 
 # Definiciones placeholder para que el código sea completo y ejecutable
 UPLOAD_FOLDER = '/tmp/uploads'
@@ -22,8 +24,8 @@ def subir_material():
     try:
         conn = get_db()
         cur = conn.cursor()
-    except Exception as e:
-        print(f"❌ Error de conexión a la BD: {e}")
+    except Exception:
+        log.exception("Error de conexión a la BD")
         return jsonify({"error": "No se pudo conectar a la base de datos."}), 500
         
     try:
@@ -67,9 +69,9 @@ def subir_material():
 
         return jsonify({"msg": "Material subido correctamente", "nombre_archivo": filename}), 200
 
-    except Exception as e:
+    except Exception:
         conn.rollback()
-        print(f"❌ Error al subir material: {e}")
+        log.exception("Error al subir material")
         return jsonify({"error": "Error interno del servidor al procesar la subida."}), 500
     finally:
         cur.close()
@@ -93,7 +95,7 @@ def listar_material(asignacion_id):
         return jsonify(rows)
     
     except Exception as e:
-        print(f"❌ Error al listar material: {e}")
+        log.exception("Error al listar material")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
@@ -115,8 +117,8 @@ def obtener_cursos_docente(docente_id):
     try:
         conn = get_db()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-    except Exception as e:
-        print(f"❌ Error de conexión a la BD: {e}")
+    except Exception:
+        log.exception("Error de conexión a la BD")
         return jsonify({"error": "No se pudo conectar a la base de datos."}), 500
         
     try:
@@ -138,11 +140,11 @@ def obtener_cursos_docente(docente_id):
         
         # 🔔 Agregado para depuración: Si retorna un array vacío [], el frontend lo sabrá.
         if not cursos:
-            print(f"⚠️ No se encontraron asignaciones para el docente ID: {docente_id}")
+            log.info("Docente sin asignaciones", extra={"docente_id": docente_id})
             
         return jsonify(cursos)
     except Exception as e:
-        print("❌ Error al obtener cursos del docente:", e)
+        log.exception("Error al obtener cursos del docente")
         return jsonify({"error": str(e)}), 500
     finally:
         cur.close()
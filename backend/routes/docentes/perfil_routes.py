@@ -4,14 +4,16 @@
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.security import hash_password, verify_password
+from utils.tokens import revocados
 from database.db import get_db
 from .models import AuditoriaDocente
-import traceback
+from utils.logs import get_logger
 from psycopg2.extras import RealDictCursor
 
 # 👇 CREACIÓN DEL NUEVO BLUEPRINT PARA PERFIL
 perfil_bp = Blueprint('perfil', __name__)
+log = get_logger(__name__)
 
 
 # =========================================================
@@ -30,8 +32,7 @@ def registrar_auditoria(docente_id, accion, tabla_afectada, registro_id=None, de
             ip_address=ip
         )
     except Exception:
-        print("⚠️ Error registrando auditoría:")
-        print(traceback.format_exc())
+        log.exception("Error registrando auditoría")
 
 # =========================================================
 # 🔹 [GET] Obtener perfil del docente (versión corregida)
@@ -74,8 +75,8 @@ def obtener_perfil_docente(usuario_id):
 
         return jsonify(perfil), 200
 
-    except Exception as e:
-        print("❌ Error en obtener_perfil_docente:", e)
+    except Exception:
+        log.exception("Error en obtener_perfil_docente")
         return jsonify({"error": "Error al obtener el perfil."}), 500
 
     finally:
@@ -91,7 +92,6 @@ def obtener_perfil_docente(usuario_id):
 # Se cambia @docentes_bp.route por @perfil_bp.route y se ajusta la ruta.
 @perfil_bp.route("/<int:usuario_id>", methods=["PUT"])
 def actualizar_perfil_docente(usuario_id):
-    print(f"\n✏️ Actualizando perfil del docente ID: {usuario_id}")
     data = request.get_json()
     conn = None
     cur = None
@@ -153,8 +153,7 @@ def actualizar_perfil_docente(usuario_id):
     except Exception:
         if conn:
             conn.rollback()
-        print("❌ ERROR al actualizar perfil:")
-        print(traceback.format_exc())
+        log.exception("Error al actualizar perfil", extra={"usuario_id": usuario_id})
         return jsonify({"error": "Error interno al actualizar perfil"}), 500
 
     finally:
@@ -162,7 +161,6 @@ def actualizar_perfil_docente(usuario_id):
             cur.close()
         if conn:
             conn.close()
-        print("🔚 Conexión cerrada.\n")
 
 # =========================================================
 # 🔹 [PUT] Cambiar contraseña del docente
@@ -171,14 +169,12 @@ def actualizar_perfil_docente(usuario_id):
 @perfil_bp.route("/cambiar-password", methods=["PUT"])
 @jwt_required()
 def cambiar_password():
-    print("\n🔐 Solicitud para cambiar contraseña.")
     conn = None
     cur = None
     
     try:
         usuario_id = get_jwt_identity()
         data = request.get_json()
-        print("📤 Datos recibidos:", data)
 
         password_actual = data.get("password_actual")
         password_nueva = data.get("password_nueva")
@@ -196,10 +192,10 @@ def cambiar_password():
             return jsonify({"error": "Usuario no encontrado"}), 404
 
         contrasena_hash = result[0]
-        if not check_password_hash(contrasena_hash, password_actual):
+        if not verify_password(password_actual, contrasena_hash):
             return jsonify({"error": "Contraseña actual incorrecta"}), 401
 
-        nueva_hash = generate_password_hash(password_nueva)
+        nueva_hash = hash_password(password_nueva)
 
         # Actualizar
         cur.execute("""
@@ -207,19 +203,20 @@ def cambiar_password():
         """, (nueva_hash, usuario_id))
         conn.commit()
 
+        # Las sesiones abiertas con la contraseña anterior dejan de valer
+        revocados.revocar_usuario(int(usuario_id))
+
         registrar_auditoria(usuario_id, "cambiar_password", "usuario", usuario_id)
         return jsonify({"mensaje": "Contraseña actualizada correctamente"}), 200
 
     except Exception:
         if conn:
             conn.rollback()
-        print("❌ ERROR al cambiar contraseña:")
-        print(traceback.format_exc())
+        log.exception("Error al cambiar contraseña")
         return jsonify({"error": "Error interno al cambiar contraseña"}), 500
 
     finally:
         if cur:
             cur.close()
         if conn:
-            conn.close()
-        print("🔚 Conexión cerrada.\n")
\ No newline at end of file
+            conn.close()
\ No newline at end of file
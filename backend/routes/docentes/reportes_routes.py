@@ -1,9 +1,12 @@
-from flask import jsonify
+from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from database.db import get_db
+from utils.streaming import iterar_cursor, respuesta_json_stream
 from . import docentes_bp
-import traceback
+from utils.logs import get_logger
+
+log = get_logger(__name__)
 
 # ================================
 # 🔹 Reporte general del curso
@@ -88,20 +91,75 @@ def generar_reporte_resumen(curso_id):
         return jsonify(reporte), 200
 
     except Exception as e:
-        print("❌ Error en generar_reporte_resumen():")
-        print(traceback.format_exc())
+        log.exception("Error en generar_reporte_resumen()")
         return jsonify({'error': str(e)}), 500
 
 
 # ================================
 # 🔹 Reporte de bajo rendimiento
 # ================================
+# Promedio y % de asistencia de todos los matriculados en una sola consulta
+# agregada (antes eran dos consultas por estudiante). El filtro de riesgo y
+# el orden (críticos primero, luego por promedio) también se resuelven en SQL
+# para poder aplicar LIMIT y recorrer el resultado con un cursor server-side.
+SQL_BAJO_RENDIMIENTO = """
+    WITH notas AS (
+        SELECT estudiante_id, AVG(nota) AS promedio
+        FROM calificaciones
+        WHERE curso_id = %(curso_id)s
+        GROUP BY estudiante_id
+    ),
+    asistencia AS (
+        SELECT estudiante_id,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE estado = 'presente') AS presentes
+        FROM asistencias
+        WHERE curso_id = %(curso_id)s
+        GROUP BY estudiante_id
+    ),
+    resumen AS (
+        SELECT u.usuario_id, u.nombre, u.apellidos, u.email,
+               COALESCE(n.promedio, 0) AS promedio,
+               CASE WHEN a.total > 0 THEN a.presentes * 100.0 / a.total ELSE 0 END AS porcentaje
+        FROM usuarios u
+        JOIN matriculas m ON u.usuario_id = m.estudiante_id
+        LEFT JOIN notas n ON n.estudiante_id = u.usuario_id
+        LEFT JOIN asistencia a ON a.estudiante_id = u.usuario_id
+        WHERE m.curso_id = %(curso_id)s
+    )
+    SELECT usuario_id, nombre, apellidos, email, promedio, porcentaje
+    FROM resumen
+    WHERE promedio < 11 OR porcentaje < 70
+    ORDER BY (promedio < 11 AND porcentaje < 70) DESC, ROUND(promedio, 2), usuario_id
+    LIMIT %(limite)s
+"""
+
+
+def clasificar_riesgo(fila):
+    estudiante_id, nombre, apellidos, email, promedio, porcentaje = fila
+    promedio = float(promedio)
+    porcentaje = float(porcentaje)
+    return {
+        'estudiante_id': estudiante_id,
+        'nombre': f"{nombre} {apellidos}",
+        'email': email,
+        'promedio_notas': round(promedio, 2),
+        'porcentaje_asistencia': round(porcentaje, 2),
+        'estado': 'crítico' if promedio < 11 and porcentaje < 70 else 'alerta'
+    }
+
+
 @docentes_bp.route('/reportes/bajo-rendimiento/<int:curso_id>', methods=['GET'])
 @jwt_required()
 def reporte_bajo_rendimiento(curso_id):
     """Generar reporte de estudiantes con bajo rendimiento"""
     try:
         usuario_id = get_jwt_identity()
+        limite = request.args.get('limit', type=int)
+        if limite is not None and limite < 1:
+            return jsonify({'error': 'limit debe ser un entero positivo'}), 400
+        stream = request.args.get('stream', '').lower() in ('1', 'true')
+
         conn = get_db()
         cur = conn.cursor()
 
@@ -113,60 +171,32 @@ def reporte_bajo_rendimiento(curso_id):
         if cur.fetchone()[0] == 0:
             return jsonify({'error': 'No tienes permisos para este curso'}), 403
 
-        # Obtener estudiantes del curso
-        cur.execute("""
-            SELECT u.usuario_id, u.nombre, u.apellidos, u.email
-            FROM usuarios u
-            JOIN matriculas m ON u.usuario_id = m.estudiante_id
-            WHERE m.curso_id = %s
-        """, (curso_id,))
-        estudiantes = cur.fetchall()
-
-        estudiantes_riesgo = []
-
-        for est in estudiantes:
-            estudiante_id, nombre, apellidos, email = est
-
-            # Promedio de notas
-            cur.execute("""
-                SELECT AVG(nota) FROM calificaciones
-                WHERE estudiante_id = %s AND curso_id = %s
-            """, (estudiante_id, curso_id))
-            promedio = cur.fetchone()[0] or 0
-
-            # Porcentaje de asistencia
-            cur.execute("""
-                SELECT COUNT(*), COUNT(CASE WHEN estado = 'presente' THEN 1 END)
-                FROM asistencias
-                WHERE estudiante_id = %s AND curso_id = %s
-            """, (estudiante_id, curso_id))
-            total, presentes = cur.fetchone()
-            porcentaje_asistencia = (presentes / total * 100) if total > 0 else 0
-
-            if promedio < 11 or porcentaje_asistencia < 70:
-                estudiantes_riesgo.append({
-                    'estudiante_id': estudiante_id,
-                    'nombre': f"{nombre} {apellidos}",
-                    'email': email,
-                    'promedio_notas': round(float(promedio), 2),
-                    'porcentaje_asistencia': round(porcentaje_asistencia, 2),
-                    'estado': 'crítico' if promedio < 11 and porcentaje_asistencia < 70 else 'alerta'
-                })
-
-        # Ordenar: críticos primero
-        estudiantes_riesgo.sort(key=lambda x: (x['estado'] == 'alerta', x['promedio_notas']))
-
+        params = {'curso_id': curso_id, 'limite': limite}
+        fecha = datetime.utcnow().isoformat()
+
+        # Cursos muy grandes: se envía el JSON a medida que llegan las filas
+        if stream:
+            cur.close()
+            filas = iterar_cursor(SQL_BAJO_RENDIMIENTO, params)
+            return respuesta_json_stream(
+                'estudiantes',
+                (clasificar_riesgo(f) for f in filas),
+                campos={'fecha_generacion': fecha},
+                clave_total='total_estudiantes_riesgo'
+            )
+
+        cur.execute(SQL_BAJO_RENDIMIENTO, params)
+        estudiantes_riesgo = [clasificar_riesgo(f) for f in cur.fetchall()]
         cur.close()
 
         return jsonify({
             'total_estudiantes_riesgo': len(estudiantes_riesgo),
             'estudiantes': estudiantes_riesgo,
-            'fecha_generacion': datetime.utcnow().isoformat()
+            'fecha_generacion': fecha
         }), 200
 
     except Exception:
-        print("❌ Error en reporte_bajo_rendimiento():")
-        print(traceback.format_exc())
+        log.exception("Error en reporte_bajo_rendimiento()")
         return jsonify({'error': 'Error generando el reporte'}), 500
 
 
@@ -246,6 +276,5 @@ def reporte_calificaciones_detallado(curso_id):
         }), 200
 
     except Exception:
-        print("❌ Error en reporte_calificaciones_detallado():")
-        print(traceback.format_exc())
+        log.exception("Error en reporte_calificaciones_detallado()")
         return jsonify({'error': 'Error generando el reporte de calificaciones'}), 500
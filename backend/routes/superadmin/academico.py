@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from psycopg2.extras import RealDictCursor
 from database.db import get_db
+from database import catalogos
 
 academico_bp = Blueprint('academico_bp', __name__)
 
@@ -19,7 +20,7 @@ def obtener_formaciones():
             for row in cur.fetchall()
         ]
         return jsonify({"formaciones": formaciones}), 200
-    except Exception as e:
+    except Exception:
         # ... (manejo de errores) ...
         pass
     finally:
@@ -42,7 +43,7 @@ def obtener_especialidades():
             for row in cur.fetchall()
         ]
         return jsonify({"especialidades": especialidades}), 200
-    except Exception as e:
+    except Exception:
         # ... (manejo de errores) ...
         pass
     finally:
@@ -52,21 +53,13 @@ def obtener_especialidades():
 # ✅ Listar todas las escuelas
 @academico_bp.route('/escuelas', methods=['GET'])
 def obtener_escuelas():
-    conn = None
-    cur = None
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        cur.execute("SELECT escuela_id, nombre_escuela FROM escuela ORDER BY nombre_escuela ASC;")
         escuelas = [
             # Mapeo manual seguro
-            {"escuela_id": row[0], "nombre_escuela": row[1]}
-            for row in cur.fetchall()
+            {"escuela_id": e["escuela_id"], "nombre_escuela": e["nombre_escuela"]}
+            for e in catalogos.escuelas()
         ]
         return jsonify({"escuelas": escuelas}), 200
-    except Exception as e:
+    except Exception:
         # ... (manejo de errores) ...
-        pass
-    finally:
-        if cur: cur.close()
-        if conn: conn.close()
\ No newline at end of file
+        pass
\ No newline at end of file
@@ -3,15 +3,19 @@ from psycopg2.extras import RealDictCursor
 import psycopg2
 from database.db import get_db
 from utils.security import hash_password
+from utils.paginacion import ConsultaPaginada, ParametroInvalido, quiere_paginacion, a_entero
+from utils import correo
+from utils.logs import get_logger
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 from routes.superadmin.helpers import (
     generar_contrasena,
     generar_correo_institucional,
-    enviar_credenciales
+    encolar_credenciales
 )
 
 admins_bp = Blueprint('admins_bp', __name__)
+log = get_logger(__name__)
 
 # ======================================================
 # 🔹 FUNCIÓN AUXILIAR: VALIDAR FECHA DE NACIMIENTO
@@ -54,8 +58,6 @@ def crear_admin():
         "id_formacion", "id_especialidad", "escuela_id"
     ]
 
-    print("📦 JSON recibido en /crear-admin:", data)
-
     for campo in campos_obligatorios:
         if not data.get(campo):
             return jsonify({"error": f"El campo '{campo}' es obligatorio."}), 400
@@ -135,12 +137,11 @@ def crear_admin():
             VALUES (%s, (SELECT rol_id FROM rol WHERE nombre_rol = 'Admin'))
         """, (usuario_id,))
 
-        conn.commit()
+        # === PASO 6: CREDENCIALES A LA BANDEJA DE SALIDA (mismo commit) ===
+        encolar_credenciales(cur, data['correo_personal'], correo_institucional, contrasena_generada)
 
-        # === PASO 6: ENVÍO DE CREDENCIALES ===
-        enviado = enviar_credenciales(data['correo_personal'], correo_institucional, contrasena_generada)
-        if not enviado:
-            print(f"⚠ No se pudo enviar el correo a {data['correo_personal']}")
+        conn.commit()
+        correo.despertar()
 
         return jsonify({
             "mensaje": f"✅ Administrador creado exitosamente. Credenciales enviadas a {data['correo_personal']}."
@@ -173,7 +174,7 @@ def crear_admin():
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"🔥 Error inesperado al crear administrador: {e}")
+        log.exception("Error inesperado al crear administrador")
         return jsonify({"error": f"Error interno del servidor: {str(e)}"}), 500
 
     finally:
@@ -182,6 +183,44 @@ def crear_admin():
         if conn:
             conn.close()
 
+# Listado paginado: filtros escuela, estado y búsqueda por nombre o DNI
+LISTADO_ADMINS = ConsultaPaginada(
+    select="""
+        SELECT 
+            u.usuario_id, 
+            p.nombres, p.apellidos, p.dni, p.telefono, p.fecha_nacimiento, 
+            d.direccion_detalle, dist.nombre_distrito, dist.distrito_id,
+            a.id_formacion, f.nombre_formacion AS formacion,
+            a.id_especialidad, e.nombre_especialidad AS cargo,
+            a.experiencia_lab, a.escuela_id, es.nombre_escuela AS escuela,
+            u.correo, a.estado
+    """,
+    desde="""
+        FROM usuario u
+        JOIN persona p ON u.usuario_id = p.usuario_id 
+        JOIN administrador a ON p.persona_id = a.persona_id 
+        JOIN usuario_rol ur ON u.usuario_id = ur.usuario_id
+        JOIN rol r ON ur.rol_id = r.rol_id
+        LEFT JOIN direccion d ON p.direccion_id = d.id_direccion
+        LEFT JOIN distrito dist ON d.id_distrito = dist.distrito_id 
+        LEFT JOIN formacion f ON a.id_formacion = f.id_formacion
+        LEFT JOIN especialidad e ON a.id_especialidad = e.id_especialidad
+        LEFT JOIN escuela es ON a.escuela_id = es.escuela_id
+    """,
+    donde="r.nombre_rol = 'Admin'",
+    id_unico="u.usuario_id",
+    ordenes={
+        "nombres": ["p.nombres"],
+        "apellidos": ["p.apellidos", "p.nombres"],
+    },
+    filtros={
+        "escuela": ("a.escuela_id = %s", a_entero),
+        "estado": ("UPPER(a.estado) = UPPER(%s)", str),
+    },
+    busqueda=["p.nombres", "p.apellidos", "p.dni"],
+)
+
+
 # ======================================================
 # 📋 LISTAR ADMINISTRADORES
 # ======================================================
@@ -192,6 +231,11 @@ def listar_admins():
     try:
         conn = get_db()
         cur = conn.cursor(cursor_factory=RealDictCursor)
+        # Con ?limit= o ?cursor= responde paginado (ver LISTADO_ADMINS)
+        if quiere_paginacion(request.args):
+            pagina = LISTADO_ADMINS.ejecutar(cur, request.args)
+            pagina["admins"] = pagina.pop("items")
+            return jsonify(pagina)
         cur.execute("""
         SELECT 
             u.usuario_id, 
@@ -216,8 +260,10 @@ def listar_admins():
         """)
         admins = cur.fetchall()
         return jsonify({"admins": admins})
+    except ParametroInvalido as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print("Error al listar admins:", e)
+        log.exception("Error al listar administradores")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
@@ -301,7 +347,7 @@ def modificar_admin(usuario_id):
         return jsonify({"mensaje": "Administrador actualizado correctamente ✅"})
     except Exception as e:
         if conn: conn.rollback()
-        print("❌ Error al modificar admin:", e)
+        log.exception("Error al modificar administrador")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
@@ -340,10 +386,10 @@ def eliminar_admin(usuario_id):
         conn.commit()
         return jsonify({"mensaje": "Administrador eliminado correctamente ✅"})
 
-    except Exception as e:
+    except Exception:
         if conn:
             conn.rollback()
-        print("Error al eliminar admin:", e)
+        log.exception("Error al eliminar administrador")
         return jsonify({"error": "Error al eliminar administrador"}), 500
 
     finally:
@@ -2,8 +2,11 @@ from flask import Blueprint, request, jsonify
 from psycopg2.extras import RealDictCursor
 import psycopg2
 from database.db import get_db
+from utils.cache import invalidar
+from utils.logs import get_logger
 
 aulas_bp = Blueprint('aulas', __name__)
+log = get_logger(__name__)
 
 # ======================================================
 # 🏫 GESTIÓN DE AULAS
@@ -35,8 +38,8 @@ def listar_aulas():
         aulas = cur.fetchall()
         return jsonify(aulas), 200
 
-    except Exception as e:
-        print(f"❌ Error al listar aulas: {e}")
+    except Exception:
+        log.exception("Error al listar aulas")
         return jsonify({"error": "Error interno al listar las aulas."}), 500
     finally:
         if cur: cur.close()
@@ -66,14 +69,15 @@ def crear_aula():
         """, (nombre_aula, capacidad, estado, tipo_aula_id, pabellon_id))
         
         conn.commit()
+        invalidar("aulas")
         return jsonify({"mensaje": "Aula registrada exitosamente."}), 201
         
     except psycopg2.IntegrityError:
         if conn: conn.rollback()
         return jsonify({"error": "El nombre del aula ya existe o un ID es inválido."}), 400
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error al crear aula: {e}")
+        log.exception("Error al crear aula")
         return jsonify({"error": "Error interno al registrar el aula."}), 500
     finally:
         if cur: cur.close()
@@ -104,11 +108,12 @@ def actualizar_aula(aula_id):
             return jsonify({"error": "Aula no encontrada."}), 404
         
         conn.commit()
+        invalidar("aulas")
         return jsonify({"mensaje": "Aula actualizada exitosamente."}), 200
         
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error al actualizar aula: {e}")
+        log.exception("Error al actualizar aula")
         return jsonify({"error": "Error interno al actualizar el aula."}), 500
     finally:
         if cur: cur.close()
@@ -141,11 +146,12 @@ def eliminar_aula(aula_id):
             return jsonify({"error": "Aula no encontrada."}), 404
             
         conn.commit()
+        invalidar("aulas")
         return jsonify({"mensaje": "Aula eliminada correctamente."}), 200
 
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error al eliminar aula: {e}")
+        log.exception("Error al eliminar aula")
         return jsonify({"error": "Error interno al eliminar el aula."}), 500
     finally:
         if cur: cur.close()
@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 from database.db import get_db
+from utils.cache import invalidar
+from utils.logs import get_logger
 
 bloques_horarios_bp = Blueprint('bloques_horarios', __name__)
+log = get_logger(__name__)
 
 # ======================================================
 # Registrar los bloques de horarios
@@ -82,6 +85,7 @@ def crear_bloque_horario():
 
         bloque_id, codigo = cur.fetchone()
         conn.commit()
+        invalidar("bloques")
 
         return jsonify({
             "mensaje": "✅ Bloque horario registrado correctamente.",
@@ -92,7 +96,7 @@ def crear_bloque_horario():
     except Exception as e:
         if conn:
             conn.rollback()
-        print("❌ Error al registrar bloque horario:", e)
+        log.exception("Error al registrar bloque horario")
         return jsonify({"error": str(e)}), 500
 
     finally:
@@ -144,7 +148,7 @@ def obtener_proximo_codigo():
         return jsonify({"codigo_sugerido": codigo_siguiente}), 200
 
     except Exception as e:
-        print("❌ Error:", e)
+        log.exception("Error en bloques horarios")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
@@ -194,7 +198,7 @@ def listar_bloques_horarios():
         return jsonify(bloques), 200
 
     except Exception as e:
-        print("❌ Error al listar bloques:", e)
+        log.exception("Error al listar bloques")
         return jsonify({"error": str(e)}), 500
 
     finally:
@@ -267,6 +271,7 @@ def editar_bloque_horario(bloque_id):
 
         result = cur.fetchone()
         conn.commit()
+        invalidar("bloques")
 
         if not result:
             return jsonify({"error": "❌ Bloque no encontrado."}), 404
@@ -280,7 +285,7 @@ def editar_bloque_horario(bloque_id):
     except Exception as e:
         if conn:
             conn.rollback()
-        print("❌ Error al editar bloque:", e)
+        log.exception("Error al editar bloque")
         return jsonify({"error": str(e)}), 500
 
     finally:
@@ -302,13 +307,14 @@ def eliminar_bloque_horario(bloque_id):
         # Eliminar
         cur.execute("DELETE FROM bloque_horario WHERE bloque_id = %s;", (bloque_id,))
         conn.commit()
+        invalidar("bloques")
 
         return jsonify({"mensaje": "🗑️ Bloque horario eliminado correctamente."}), 200
 
     except Exception as e:
         if conn:
             conn.rollback()
-        print("❌ Error al eliminar bloque:", e)
+        log.exception("Error al eliminar bloque")
         return jsonify({"error": str(e)}), 500
 
     finally:
@@ -3,8 +3,12 @@ from flask import Blueprint, request, jsonify
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from database.db import get_db
+from database import curriculo
+from utils.cache import invalidar
+from utils.logs import get_logger
 
 cursos_bp = Blueprint('cursos_bp', __name__)
+log = get_logger(__name__)
 
 # ======================================================
 # 📚 LISTAR TODOS LOS CURSOS (Necesaria para los Dropdowns de Prerrequisitos)
@@ -31,7 +35,7 @@ def obtener_cursos():
         return jsonify({"cursos": cursos}), 200
 
     except Exception as e:
-        print("❌ Error al obtener cursos:", str(e))
+        log.exception("Error al obtener cursos")
         return jsonify({
             "error": "Error interno al obtener cursos.",
             "detalle": str(e)
@@ -53,6 +57,10 @@ def definir_prerrequisito():
 
     if not id_curso or not id_curso_requerido:
         return jsonify({"error": "Debe indicar id_curso e id_curso_requerido"}), 400
+    try:
+        id_curso, id_curso_requerido = int(id_curso), int(id_curso_requerido)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Los IDs de curso deben ser números"}), 400
     if id_curso == id_curso_requerido:
         return jsonify({"error": "Un curso no puede ser prerrequisito de sí mismo"}), 400
 
@@ -62,12 +70,19 @@ def definir_prerrequisito():
         conn = get_db()
         cur = conn.cursor()
 
+        # ✅ Rechazar ciclos (A requiere B ... y B termina requiriendo A)
+        error_ciclo = curriculo.verificar_nuevo(cur, id_curso, id_curso_requerido)
+        if error_ciclo:
+            conn.rollback()
+            return jsonify({"error": error_ciclo}), 400
+
         cur.execute("""
             INSERT INTO prerrequisito (id_curso, id_curso_requerido)
             VALUES (%s, %s);
         """, (id_curso, id_curso_requerido))
 
         conn.commit()
+        invalidar("prerrequisitos")
 
         return jsonify({
             "mensaje": "Prerrequisito ingresado satisfactoriamente"
@@ -84,9 +99,9 @@ def definir_prerrequisito():
             error_msg = "Error de integridad de datos desconocido. Verifique el log."
         return jsonify({"error": error_msg}), 400
 
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error interno (500) al definir prerrequisito: {e}")
+        log.exception("Error al definir prerrequisito")
         return jsonify({"error": "Error interno del servidor al guardar el prerrequisito."}), 500
 
     finally:
@@ -118,7 +133,7 @@ def listar_prerrequisitos(id_curso):
         return jsonify(prerrequisitos), 200
 
     except psycopg2.Error as e:
-        print("❌ Error de DB:", str(e))
+        log.exception("Error de BD en cursos")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
@@ -142,10 +157,11 @@ def eliminar_prerrequisito(id_prerrequisito):
             return jsonify({"error": "El prerrequisito no existe"}), 404
 
         conn.commit()
+        invalidar("prerrequisitos")
         return jsonify({"mensaje": "Prerrequisito eliminado correctamente"}), 200
 
     except psycopg2.Error as e:
-        print("❌ Error de DB:", str(e))
+        log.exception("Error de BD en cursos")
         return jsonify({"error": str(e)}), 500
     finally:
         if cur: cur.close()
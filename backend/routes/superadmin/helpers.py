@@ -1,9 +1,7 @@
 import random
 import string
 import re
-from flask_mail import Message
-from extensions import mail
-from flask import current_app
+from utils import correo
 
 
 # ======================================================
@@ -31,49 +29,12 @@ def validar_dni(dni):
 # ======================================================
 # ✉️ ENVÍO DE CREDENCIALES CON HTML PROFESIONAL
 # ======================================================
-def enviar_credenciales(correo_destino, correo_institucional, contrasena):
-    try:
-        html_body = f"""
-        <div style="font-family: Arial, sans-serif; padding: 20px; color: #333;">
-            <div style="text-align: center; border-bottom: 3px solid #004080; padding-bottom: 10px;">
-                <img src="https://upload.wikimedia.org/wikipedia/commons/e/ef/Logo_UNFV.png" alt="UNFV" width="90"/>
-                <h2 style="color: #004080;">Universidad Nacional Federico Villarreal</h2>
-            </div>
-            <p>¡Bienvenido(a) al <strong>Sistema de Gestión UNFV</strong>!</p>
-            <p>Se han generado tus credenciales institucionales de acceso:</p>
-
-            <table style="border-collapse: collapse; margin-top: 10px;">
-                <tr>
-                    <td style="padding: 6px 10px; font-weight: bold;">Correo institucional:</td>
-                    <td style="padding: 6px 10px; background: #f4f4f4;">{correo_institucional}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 10px; font-weight: bold;">Contraseña:</td>
-                    <td style="padding: 6px 10px; background: #f4f4f4;">{contrasena}</td>
-                </tr>
-            </table>
-
-            <p style="margin-top: 20px;">Por favor, cambia tu contraseña después de iniciar sesión.</p>
-            <hr style="margin-top: 30px; border: 1px solid #ccc;"/>
-            <p style="font-size: 12px; text-align: center; color: #666;">
-                Este correo fue generado automáticamente por el sistema UNFV.<br/>
-                Si no solicitaste este acceso, ignora este mensaje.
-            </p>
-        </div>
-        """
-
-        msg = Message(
-            subject="🎓 Credenciales de acceso - Sistema UNFV",
-            recipients=[correo_destino],
-            html=html_body
-        )
-
-        # Aseguramos el contexto de la app Flask
-        with current_app.app_context():
-            mail.send(msg)
-
-        print(f"✅ Correo enviado correctamente a {correo_destino}")
-        return True
-    except Exception as e:
-        print("❌ Error al enviar correo:", str(e))
-        return False
\ No newline at end of file
+def encolar_credenciales(cur, correo_destino, correo_institucional, contrasena):
+    """Guarda el correo de credenciales en la bandeja de salida (sin commit)."""
+    html_body = correo.renderizar(
+        "credenciales_admin.html",
+        correo_institucional=correo_institucional,
+        contrasena=contrasena
+    )
+
+    return correo.encolar(cur, correo_destino, "🎓 Credenciales de acceso - Sistema UNFV", html_body)
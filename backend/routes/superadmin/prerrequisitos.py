@@ -2,8 +2,12 @@ from flask import Blueprint, request, jsonify
 from psycopg2.extras import RealDictCursor
 import psycopg2
 from database.db import get_db
+from database import curriculo
+from utils.cache import invalidar
+from utils.logs import get_logger
 
 prerrequisitos_bp = Blueprint('prerrequisitos', __name__)
+log = get_logger(__name__)
 
 # ======================================================
 # 📚 RUTAS DE CURSOS Y PRERREQUISITOS
@@ -18,8 +22,8 @@ def obtener_cursos():
         cur = conn.cursor(cursor_factory=RealDictCursor) 
         cur.execute("SELECT curso_id AS id_curso, nombre AS nombre_curso, codigo AS codigo_curso FROM curso ORDER BY nombre ASC;")
         return jsonify({"cursos": cur.fetchall()}), 200
-    except Exception as e:
-        print(f"❌ Error al obtener cursos: {str(e)}")
+    except Exception:
+        log.exception("Error al obtener cursos")
         return jsonify({"error": "Error interno al obtener cursos."}), 500
     finally:
         if cur: cur.close()
@@ -56,8 +60,8 @@ def obtener_cursos_con_prerrequisitos():
                 "id_curso_requerido": row['id_curso_requerido'], "nombre_requerido": row['nombre_requerido']
             })
         return jsonify({"cursos": list(cursos_agrupados.values())}), 200
-    except Exception as e:
-        print(f"❌ Error al obtener cursos con prerrequisitos: {e}")
+    except Exception:
+        log.exception("Error al obtener cursos con prerrequisitos")
         return jsonify({"error": "Error interno al consultar los cursos."}), 500
     finally:
         if cur: cur.close()
@@ -70,6 +74,10 @@ def definir_prerrequisito():
     id_curso = data.get("id_curso")
     id_curso_requerido = data.get("id_curso_requerido")
 
+    try:
+        id_curso, id_curso_requerido = int(id_curso), int(id_curso_requerido)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Datos de prerrequisito inválidos."}), 400
     if not id_curso or not id_curso_requerido or id_curso == id_curso_requerido:
         return jsonify({"error": "Datos de prerrequisito inválidos."}), 400
     
@@ -78,18 +86,24 @@ def definir_prerrequisito():
     try:
         conn = get_db()
         cur = conn.cursor()
-        print(f"✅ Intentando insertar: id_curso={id_curso}, id_curso_requerido={id_curso_requerido}")
+        # ✅ Rechazar ciclos (A requiere B ... y B termina requiriendo A)
+        error_ciclo = curriculo.verificar_nuevo(cur, id_curso, id_curso_requerido)
+        if error_ciclo:
+            conn.rollback()
+            return jsonify({"error": error_ciclo}), 400
+
         cur.execute(
             "INSERT INTO prerrequisito (id_curso, id_curso_requerido) VALUES (%s, %s);",
             (id_curso, id_curso_requerido)
         )
         conn.commit()
-        print("✅ Inserción de prerrequisito exitosa.")
+        invalidar("prerrequisitos")
+        log.info("Prerrequisito registrado", extra={"id_curso": id_curso, "id_curso_requerido": id_curso_requerido})
         return jsonify({"mensaje": "Prerrequisito guardado correctamente."}), 201
     except psycopg2.IntegrityError as e:
         if conn: conn.rollback()
         error_detail = str(e).lower()
-        print(f"🔥 Error de integridad al guardar prerrequisito: {error_detail}")
+        log.warning("Error de integridad al guardar prerrequisito", extra={"error": error_detail})
 
         if "prerrequisito_pkey" in error_detail or "violates not-null constraint" in error_detail:
              msg = "Error de BD: La columna 'id_prerrequisito' podría no ser autoincremental (SERIAL)."
@@ -101,9 +115,9 @@ def definir_prerrequisito():
              msg = f"Error de integridad de datos. {str(e)}"
         
         return jsonify({"error": msg}), 400
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error inesperado al definir prerrequisito: {e}")
+        log.exception("Error inesperado al definir prerrequisito")
         return jsonify({"error": "Error interno del servidor al guardar el prerrequisito."}), 500
     finally:
         if cur: cur.close()
@@ -121,8 +135,9 @@ def eliminar_prerrequisito(id_prerrequisito):
         if cur.rowcount == 0:
             return jsonify({"error": "El prerrequisito no fue encontrado."}), 404
         conn.commit()
+        invalidar("prerrequisitos")
         return jsonify({"mensaje": "Prerrequisito eliminado correctamente."}), 200
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
         return jsonify({"error": "Error interno al eliminar el prerrequisito."}), 500
     finally:
@@ -139,10 +154,32 @@ def eliminar_prerrequisitos_por_curso(id_curso):
         cur = conn.cursor()
         cur.execute("DELETE FROM prerrequisito WHERE id_curso = %s", (id_curso,))
         conn.commit()
+        invalidar("prerrequisitos")
         return jsonify({"mensaje": "Prerrequisitos eliminados."}), 200
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
         return jsonify({"error": "Error interno al limpiar prerrequisitos."}), 500
     finally:
         if cur: cur.close()
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+# ======================================================
+# 🗺️ MAPA CURRICULAR
+# ======================================================
+# GET /curriculo → todos los cursos por nivel topológico (0 = sin
+# prerrequisitos), con lo que piden directamente, toda su cadena y lo que
+# habilitan. "en_ciclo" lista cursos atrapados en ciclos registrados antes
+# de que se validaran las altas. Sale del grafo en caché
+# (database/curriculo.py): sin consultas mientras no cambie nada.
+@prerrequisitos_bp.route('/curriculo', methods=['GET'])
+def mapa_curricular():
+    conn = None
+    try:
+        conn = get_db()
+        return jsonify(curriculo.curriculo(conn).mapa()), 200
+    except Exception:
+        log.exception("Error al armar el mapa curricular")
+        return jsonify({"error": "Error interno al armar el mapa curricular."}), 500
+    finally:
+        if conn: conn.close()
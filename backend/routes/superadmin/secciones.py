@@ -2,9 +2,12 @@ from flask import Blueprint, request, jsonify
 from psycopg2.extras import RealDictCursor
 import psycopg2
 from database.db import get_db  
+from utils.cache import invalidar
+from utils.logs import get_logger
 
 # Definimos el Blueprint
 secciones_bp = Blueprint('secciones', __name__)
+log = get_logger(__name__)
 
 # --- RUTAS LIMPIAS ---
 # El prefijo '/superadmin/secciones' se define en app.py
@@ -28,8 +31,8 @@ def get_secciones():
         secciones = cur.fetchall()
         return jsonify(secciones), 200
         
-    except Exception as e:
-        print(f"❌ Error al obtener secciones: {str(e)}")
+    except Exception:
+        log.exception("Error al obtener secciones")
         return jsonify({"error": "Error interno al obtener secciones."}), 500
     finally:
         if cur: cur.close()
@@ -77,13 +80,14 @@ def create_seccion():
         )
         nueva_seccion = cur.fetchone()
         conn.commit()
+        invalidar("secciones")
         
         return jsonify(nueva_seccion), 201
 
     except psycopg2.IntegrityError as e:
         if conn: conn.rollback()
         error_detail = str(e).lower()
-        print(f"🔥 Error de integridad al crear secciones: {error_detail}")
+        log.warning("Error de integridad al crear secciones", extra={"error": error_detail})
         
         if "unique constraint" in error_detail:
              msg = "La sección (código, ciclo y periodo) ya existe."
@@ -92,9 +96,9 @@ def create_seccion():
         
         return jsonify({"error": msg}), 409 
 
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error inesperado al crear secciones: {e}")
+        log.exception("Error inesperado al crear secciones")
         return jsonify({"error": "Error interno del servidor al crear la sección."}), 500
     finally:
         if cur: cur.close()
@@ -136,14 +140,15 @@ def update_seccion(id):
             
         seccion_actualizada = cur.fetchone()
         conn.commit()
+        invalidar("secciones")
         return jsonify(seccion_actualizada), 200
 
-    except psycopg2.IntegrityError as e:
+    except psycopg2.IntegrityError:
         if conn: conn.rollback()
         return jsonify({"error": "Error de integridad, posible duplicado."}), 409
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error inesperado al actualizar secciones: {e}")
+        log.exception("Error inesperado al actualizar secciones")
         return jsonify({"error": "Error interno del servidor al actualizar."}), 500
     finally:
         if cur: cur.close()
@@ -167,11 +172,12 @@ def delete_seccion(id):
             return jsonify({"error": "Sección no encontrada"}), 404
             
         conn.commit()
+        invalidar("secciones")
         return jsonify({"mensaje": "Sección eliminada exitosamente"}), 200
         
-    except Exception as e:
+    except Exception:
         if conn: conn.rollback()
-        print(f"❌ Error al eliminar secciones: {e}")
+        log.exception("Error al eliminar secciones")
         return jsonify({"error": "Error al eliminar la sección."}), 500
     finally:
         if cur: cur.close()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Las pruebas se corren desde backend/ (python -m pytest); igual se agrega
+# por si se llaman desde otro directorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.pool import ConnectionPool  # noqa: E402
+from falsos import ConexionFalsa  # noqa: E402
+
+
+@pytest.fixture
+def pool_falso(monkeypatch):
+    """ConnectionPool que entrega ConexionFalsa (máximo 1 conexión)."""
+    def conectar(self):
+        with self._lock:
+            self._stats["creadas"] += 1
+        return ConexionFalsa(self)
+
+    monkeypatch.setattr(ConnectionPool, "_connect", conectar)
+    return ConnectionPool(minconn=0, maxconn=1, timeout=1, ping_interval=3600)
@@ -0,0 +1,84 @@
+import psycopg2.extensions
+
+from database.pool import PooledConnection
+
+# Dobles de prueba para lo que en producción es PostgreSQL
+
+
+class ConexionFalsa:
+    """
+    Lo mínimo de una PooledConnection para probar el pool sin PostgreSQL.
+    close() y liberar() son los de PooledConnection.
+    """
+
+    close = PooledConnection.close
+    liberar = PooledConnection.liberar
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.closed = 0
+        self.autocommit = False
+        self.liberada = False
+        self.turno = 0
+        self.ultimo_uso = 0.0
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def destruir(self):
+        self.pool = None
+        self.closed = 1
+
+
+class CursorFalso:
+    """
+    Cursor guionado: `filas(sql, params)` da lo que devuelven fetchone() /
+    fetchall() y `filas_afectadas(sql, params)` el rowcount. Guarda lo
+    ejecutado (SQL en una línea) en `ejecutadas`.
+    """
+
+    def __init__(self, filas_afectadas=None, filas=None):
+        self.filas_afectadas = filas_afectadas or (lambda sql, params: 0)
+        self.filas = filas or (lambda sql, params: [])
+        self.ejecutadas = []
+        self.rowcount = -1
+        self._resultado = []
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.ejecutadas.append((sql, params))
+        self.rowcount = self.filas_afectadas(sql, params)
+        self._resultado = list(self.filas(sql, params))
+
+    def fetchone(self):
+        return self._resultado.pop(0) if self._resultado else None
+
+    def fetchall(self):
+        resultado, self._resultado = self._resultado, []
+        return resultado
+
+    def close(self):
+        pass
+
+
+class ConexionBDFalsa:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
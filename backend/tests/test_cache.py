@@ -0,0 +1,95 @@
+import threading
+
+from utils.cache import RegionCache, al_invalidar, invalidar, region
+
+
+def _carga_lenta(region_cache, clave, valor):
+    """Empieza leer() en otro hilo y lo deja detenido dentro de cargar()."""
+    dentro, seguir = threading.Event(), threading.Event()
+    resultado = {}
+
+    def cargar():
+        dentro.set()
+        seguir.wait(5)
+        return valor
+
+    hilo = threading.Thread(target=lambda: resultado.setdefault("v", region_cache.leer(clave, cargar)))
+    hilo.start()
+    assert dentro.wait(5)
+    return hilo, seguir, resultado
+
+
+def test_lee_una_vez_y_sirve_de_cache():
+    r = RegionCache("prueba", ttl=60)
+    cargas = []
+    assert r.leer("k", lambda: cargas.append(1) or "v") == "v"
+    assert r.leer("k", lambda: cargas.append(1) or "otro") == "v"
+    assert len(cargas) == 1
+    assert r.stats()["hits"] == 1
+
+
+def test_invalidar_durante_la_carga_no_guarda_el_valor_viejo():
+    r = RegionCache("prueba", ttl=60)
+    hilo, seguir, resultado = _carga_lenta(r, "k", "viejo")
+
+    r.invalidar()  # p. ej. un admin editó el aula mientras se cargaba
+    seguir.set()
+    hilo.join()
+
+    assert resultado["v"] == "viejo"  # quien lo pidió igual recibe su carga
+    assert r.leer("k", lambda: "nuevo") == "nuevo"
+    assert r.stats()["cargas_obsoletas"] == 1
+
+
+def test_descartar_durante_la_carga_no_guarda_el_valor_viejo():
+    r = RegionCache("prueba", ttl=60)
+    hilo, seguir, _ = _carga_lenta(r, 7, "perfil viejo")
+
+    r.descartar("7")  # el id llega como texto desde el JSON
+    seguir.set()
+    hilo.join()
+
+    assert r.leer(7, lambda: "perfil nuevo") == "perfil nuevo"
+
+
+def test_descartar_otra_clave_no_afecta_la_carga():
+    r = RegionCache("prueba", ttl=60)
+    hilo, seguir, _ = _carga_lenta(r, 1, "uno")
+
+    r.descartar(2)
+    seguir.set()
+    hilo.join()
+
+    assert r.leer(1, lambda: "recargado") == "uno"
+
+
+def test_claves_numericas_como_texto_son_la_misma_entrada():
+    r = RegionCache("prueba", ttl=60)
+    r.leer(12, lambda: "perfil")
+    assert r.leer("12", lambda: "otro") == "perfil"
+    r.descartar("12")
+    assert r.leer(12, lambda: "recargado") == "recargado"
+
+
+def test_carga_con_error_no_deja_estado_pendiente():
+    r = RegionCache("prueba", ttl=60)
+
+    def falla():
+        raise RuntimeError("bd caída")
+
+    try:
+        r.leer("k", falla)
+    except RuntimeError:
+        pass
+    assert r.leer("k", lambda: "v") == "v"
+    assert r.leer("k", lambda: "otro") == "v"
+
+
+def test_invalidar_avisa_a_las_regiones_derivadas():
+    derivada = region("prueba_derivada", 60)
+    al_invalidar("prueba_fuente", lambda: invalidar("prueba_derivada"))
+    derivada.leer("ciclo", lambda: "oferta vieja")
+
+    invalidar("prueba_fuente")
+
+    assert derivada.leer("ciclo", lambda: "oferta nueva") == "oferta nueva"
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+from utils.coalescencia import Coalescedor, coalescedor, coalescer
+
+
+def _esperar(condicion, limite=5):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "la condición no se cumplió a tiempo"
+        time.sleep(0.001)
+
+
+def _en_paralelo(n, funcion):
+    resultados = [None] * n
+    errores = []
+
+    def correr(i):
+        try:
+            resultados[i] = funcion()
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=correr, args=(i,)) for i in range(n)]
+    for h in hilos:
+        h.start()
+    return hilos, resultados, errores
+
+
+def test_llamadas_identicas_simultaneas_ejecutan_una_vez():
+    c = Coalescedor("prueba")
+    ejecuciones = []
+    soltar = threading.Event()
+
+    def consulta():
+        ejecuciones.append(1)
+        soltar.wait(5)
+        return ["fila"]
+
+    hilos, resultados, errores = _en_paralelo(20, lambda: c.ejecutar("/curso/", consulta))
+    _esperar(lambda: c.stats()["seguidores"] == 19)
+    soltar.set()
+    for h in hilos:
+        h.join()
+
+    assert not errores
+    assert len(ejecuciones) == 1
+    assert sum(es_lider for _, es_lider in resultados) == 1
+    assert all(r == ["fila"] for r, _ in resultados)
+    assert c.stats()["tasa_coalescencia"] == 0.95
+    assert c.stats()["en_vuelo"] == 0
+
+
+def test_claves_distintas_no_se_comparten():
+    c = Coalescedor("prueba")
+    assert c.ejecutar("a", lambda: 1) == (1, True)
+    assert c.ejecutar("b", lambda: 2) == (2, True)
+    # Terminado el vuelo, la misma clave vuelve a calcular (no es caché)
+    assert c.ejecutar("a", lambda: 3) == (3, True)
+
+
+def test_error_del_lider_cada_seguidor_calcula_lo_suyo():
+    c = Coalescedor("prueba")
+    soltar = threading.Event()
+    llamadas = []
+
+    def consulta():
+        llamadas.append(1)
+        if len(llamadas) == 1:
+            soltar.wait(5)
+            raise RuntimeError("bd caída")
+        return "ok"
+
+    hilos, resultados, errores = _en_paralelo(5, lambda: c.ejecutar("k", consulta))
+    _esperar(lambda: c.stats()["seguidores"] == 4)
+    soltar.set()
+    for h in hilos:
+        h.join()
+
+    assert len(errores) == 1  # solo el líder ve su excepción
+    assert [r for r in resultados if r is not None] == [("ok", False)] * 4
+    assert c.stats()["errores_lider"] == 1
+
+
+def test_espera_vencida_calcula_por_su_cuenta():
+    c = Coalescedor("prueba", espera_max=0.05)
+    soltar = threading.Event()
+    hilo = threading.Thread(target=lambda: c.ejecutar("k", lambda: soltar.wait(5)))
+    hilo.start()
+    _esperar(lambda: c.stats()["en_vuelo"] == 1)
+
+    assert c.ejecutar("k", lambda: "propio") == ("propio", False)
+    assert c.stats()["esperas_vencidas"] == 1
+    soltar.set()
+    hilo.join()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    soltar = threading.Event()
+    app.ejecuciones = []
+    app.soltar = soltar
+
+    @app.route("/cursos")
+    @coalescer("prueba_cursos")
+    def cursos():
+        app.ejecuciones.append(1)
+        soltar.wait(5)
+        respuesta = jsonify([{"curso_id": 1}])
+        respuesta.headers["X-Total"] = "1"
+        return respuesta
+
+    return app
+
+
+def test_decorador_comparte_la_respuesta_congelada(app):
+    cliente = app.test_client()
+    stats = coalescedor("prueba_cursos").stats
+    antes = stats()["seguidores"]
+
+    hilos, resultados, errores = _en_paralelo(10, lambda: cliente.get("/cursos?ciclo=I"))
+    _esperar(lambda: stats()["seguidores"] - antes == 9)
+    app.soltar.set()
+    for h in hilos:
+        h.join()
+
+    assert not errores
+    assert len(app.ejecuciones) == 1
+    assert {r.status_code for r in resultados} == {200}
+    assert {r.get_data() for r in resultados} == {b'[{"curso_id":1}]\n'}
+    assert all(r.headers["X-Total"] == "1" for r in resultados)
+    # Cada solicitud recibe su propio objeto Response
+    assert len({id(r) for r in resultados}) == 10
@@ -0,0 +1,120 @@
+import pytest
+
+from database import cupos, elegibilidad
+from falsos import ConexionBDFalsa, CursorFalso
+
+ASIGNACION = 5
+
+
+@pytest.fixture
+def bd(monkeypatch):
+    """
+    Estado de una sección: cupos libres, lista de espera y alumnos con el
+    bloqueo de matrícula tomado por otro request. reservar() y
+    elegibilidad.matricular() trabajan sobre ese estado.
+    """
+    estado = {
+        "libres": 0,
+        "espera": [],          # [(espera_id, estudiante_id)] en orden de llegada
+        "bloqueados": set(),   # alumnos matriculándose en otro request
+        "no_elegibles": set(),
+        "matriculados": [],
+        "descartados": [],
+    }
+
+    def filas(sql, params):
+        # El contador de cupos vuelve atrás con el savepoint, como en la BD
+        if sql == "SAVEPOINT promocion":
+            estado["libres_savepoint"] = estado["libres"]
+        if sql == "ROLLBACK TO SAVEPOINT promocion":
+            estado["libres"] = estado["libres_savepoint"]
+        if "FROM lista_espera" in sql and "SKIP LOCKED" in sql:
+            return list(estado["espera"])
+        if "pg_try_advisory_xact_lock" in sql:
+            return [(params[1] not in estado["bloqueados"],)]
+        if "AS posicion" in sql:
+            return [(len(estado["espera"]) + 1,)]
+        return []
+
+    def reservar(cur, asignacion_id):
+        if estado["libres"] <= 0:
+            return False
+        estado["libres"] -= 1
+        return True
+
+    def matricular(cur, estudiante_id, asignacion_id):
+        if estudiante_id in estado["no_elegibles"]:
+            return None
+        estado["matriculados"].append(estudiante_id)
+        return 1000 + estudiante_id
+
+    monkeypatch.setattr(cupos, "reservar", reservar)
+    monkeypatch.setattr(elegibilidad, "matricular", matricular)
+    monkeypatch.setattr(elegibilidad, "descartar_perfil", estado["descartados"].append)
+    monkeypatch.setattr(elegibilidad, "motivo_rechazo", lambda conn, cur, e, a: (
+        {"elegible": False, "motivo": "choque_horario", "mensaje": "Choque de horario"}
+        if e in estado["no_elegibles"] else {"elegible": True}
+    ))
+    estado["cursor"] = CursorFalso(filas=filas)
+    return estado
+
+
+def _borradas_de_la_espera(cursor):
+    return [p[0] for sql, p in cursor.ejecutadas if sql.startswith("DELETE FROM lista_espera WHERE espera_id")]
+
+
+def test_promocion_en_orden_de_llegada_hasta_llenar(bd):
+    bd["libres"] = 2
+    bd["espera"] = [(1, 10), (2, 11), (3, 12)]
+
+    promovidos = cupos.promover_espera(bd["cursor"], ASIGNACION)
+
+    assert promovidos == [10, 11]
+    assert _borradas_de_la_espera(bd["cursor"]) == [1, 2]  # el 12 sigue esperando
+
+
+def test_promocion_salta_al_alumno_ocupado_y_saca_al_que_ya_no_cumple(bd):
+    bd["libres"] = 1
+    bd["espera"] = [(1, 10), (2, 11), (3, 12)]
+    bd["bloqueados"] = {10}    # se está matriculando en otra pestaña
+    bd["no_elegibles"] = {11}  # ya no cumple (choque nuevo, otra sección...)
+
+    promovidos = cupos.promover_espera(bd["cursor"], ASIGNACION)
+
+    assert promovidos == [12]
+    # 10 conserva su lugar; 11 sale de la lista sin ocupar el cupo
+    assert _borradas_de_la_espera(bd["cursor"]) == [2, 3]
+    assert ("ROLLBACK TO SAVEPOINT promocion", None) in bd["cursor"].ejecutadas
+
+
+def test_matricula_con_cupo_libre(bd):
+    bd["libres"] = 1
+    conn = ConexionBDFalsa(bd["cursor"])
+
+    resultado = cupos.matricular_con_cupo(conn, bd["cursor"], 10, ASIGNACION)
+
+    assert resultado == {"estado": "matriculado", "matricula_id": 1010}
+    assert conn.commits == 1 and conn.rollbacks == 0
+    assert bd["descartados"] == [10]  # el perfil de elegibilidad se recalcula
+
+
+def test_seccion_llena_pone_en_espera(bd):
+    bd["espera"] = [(1, 11), (2, 12)]
+    conn = ConexionBDFalsa(bd["cursor"])
+
+    resultado = cupos.matricular_con_cupo(conn, bd["cursor"], 10, ASIGNACION)
+
+    assert resultado == {"estado": "espera", "posicion": 3}
+    assert conn.commits == 1
+    assert bd["matriculados"] == []
+
+
+def test_seccion_llena_y_no_elegible_no_entra_a_la_espera(bd):
+    bd["no_elegibles"] = {10}
+    conn = ConexionBDFalsa(bd["cursor"])
+
+    resultado = cupos.matricular_con_cupo(conn, bd["cursor"], 10, ASIGNACION)
+
+    assert resultado["estado"] == "rechazado"
+    assert conn.commits == 0 and conn.rollbacks == 1
+    assert not any("INSERT INTO lista_espera" in sql for sql, _ in bd["cursor"].ejecutadas)
@@ -0,0 +1,59 @@
+from datetime import time
+
+from database.generador_horarios import Generador, oferta_guardada
+
+
+def _bloque(bloque_id, dia, desde, hasta):
+    return {"bloque_id": bloque_id, "dia": dia, "hora_inicio": time(desde), "hora_fin": time(hasta)}
+
+
+def _fila(asignacion_id, docente_id, seccion_id, aula_id, bloque_id, estudiantes):
+    return {
+        "asignacion_id": asignacion_id, "curso_id": asignacion_id, "seccion_id": seccion_id,
+        "docente_id": docente_id, "aula_id": aula_id, "bloque_id": bloque_id,
+        "ciclo": "I", "cantidad_estudiantes": estudiantes,
+    }
+
+
+def _resolver(guardado, bloques, aulas, disponibilidad=None):
+    generador = Generador(oferta_guardada(guardado), bloques, aulas, disponibilidad, semilla=1)
+    return generador.resolver(tiempo_max=1, previo=generador.previo_guardado(guardado))
+
+
+def test_lo_valido_no_se_mueve():
+    bloques = [_bloque(1, "LUNES", 8, 10), _bloque(2, "LUNES", 10, 12)]
+    aulas = [{"aula_id": 10, "capacidad": 40}]
+    guardado = [_fila(1, 1, 1, 10, 1, 30), _fila(2, 2, 2, 10, 2, 30)]
+
+    resultado = _resolver(guardado, bloques, aulas)
+
+    assert resultado["estadisticas"]["movidas"] == 0
+    assert resultado["sin_asignar"] == []
+
+
+def test_sesion_sin_lugar_conserva_su_fila_y_nadie_se_le_cruza():
+    # La 1 (docente 7, 50 alumnos) ya no tiene aula con capacidad: queda sin
+    # asignar y su fila sigue el lunes 8-10. La 2 (mismo docente) estaba en
+    # un bloque desactivado y el docente solo puede el lunes 8-10.
+    bloques = [_bloque(1, "LUNES", 8, 10)]
+    aulas = [{"aula_id": 20, "capacidad": 30}]
+    guardado = [_fila(1, 7, 1, 10, 1, 50), _fila(2, 7, 2, 20, 99, 25)]
+
+    resultado = _resolver(guardado, bloques, aulas, disponibilidad={7: {1}})
+
+    motivos = {s["asignacion_id"]: s["motivo"] for s in resultado["sin_asignar"]}
+    assert motivos[1] == "sin_aula_con_capacidad"
+    assert motivos[2] == "cruce_con_no_ubicada"
+    assert resultado["asignadas"] == []
+
+
+def test_lo_que_queda_encima_de_una_no_ubicada_busca_otro_lugar():
+    bloques = [_bloque(1, "LUNES", 8, 10), _bloque(3, "MARTES", 8, 10)]
+    aulas = [{"aula_id": 20, "capacidad": 30}]
+    guardado = [_fila(1, 7, 1, 10, 1, 50), _fila(2, 7, 2, 20, 99, 25)]
+
+    resultado = _resolver(guardado, bloques, aulas)
+
+    (asignada,) = resultado["asignadas"]
+    assert asignada["asignacion_id"] == 2
+    assert asignada["bloque_id"] == 3  # el lunes 8-10 sigue siendo de la fila 1
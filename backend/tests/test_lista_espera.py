@@ -0,0 +1,45 @@
+from flask import Flask
+
+from routes.alumno import matriculas
+from utils.tokens import emitir_tokens, init_tokens, proteger_blueprint
+from falsos import ConexionBDFalsa, CursorFalso
+
+ESPERA_DE_7 = 30  # espera_id que pertenece al estudiante 7
+
+
+def _cliente(monkeypatch):
+    def filas_afectadas(sql, params):
+        return 1 if "DELETE FROM lista_espera" in sql and params == (ESPERA_DE_7, 7) else 0
+
+    cursor = CursorFalso(filas_afectadas)
+    monkeypatch.setattr(matriculas, "get_db", lambda: ConexionBDFalsa(cursor))
+
+    app = Flask(__name__)
+    app.config.update(JWT_SECRET_KEY="clave-de-prueba-suficientemente-larga-32", JWT_EXIGIR=True)
+    init_tokens(app)
+    bp = matriculas.Blueprint("alumno_prueba", __name__)
+    proteger_blueprint(bp, "Alumno")
+    bp.register_blueprint(matriculas.matriculas_bp)
+    app.register_blueprint(bp, url_prefix="/alumno")
+    return app, cursor
+
+
+def _bearer(app, estudiante_id):
+    with app.app_context():
+        token = emitir_tokens({"usuario_id": 100 + estudiante_id, "rol": "Alumno", "estudiante_id": estudiante_id})
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+def test_salir_de_la_espera_propia(monkeypatch):
+    app, cursor = _cliente(monkeypatch)
+    respuesta = app.test_client().delete(f"/alumno/lista-espera/{ESPERA_DE_7}", headers=_bearer(app, 7))
+    assert respuesta.status_code == 200
+    assert cursor.ejecutadas[-1][1] == (ESPERA_DE_7, 7)
+
+
+def test_no_se_puede_sacar_a_otro_estudiante(monkeypatch):
+    app, cursor = _cliente(monkeypatch)
+    respuesta = app.test_client().delete(f"/alumno/lista-espera/{ESPERA_DE_7}", headers=_bearer(app, 8))
+    assert respuesta.status_code == 404
+    # El DELETE filtra por el estudiante del token, no solo por espera_id
+    assert cursor.ejecutadas[-1][1] == (ESPERA_DE_7, 8)
@@ -0,0 +1,12 @@
+from utils.logs import request_id_de
+
+
+def test_request_id_valido_se_conserva():
+    assert request_id_de("abc-123_x.y") == "abc-123_x.y"
+
+
+def test_request_id_invalido_se_reemplaza():
+    for cabecera in (None, "", "a" * 65, "id con espacios", "id\ninyectado", '{"json": 1}'):
+        nuevo = request_id_de(cabecera)
+        assert nuevo != cabecera
+        assert len(nuevo) == 32
@@ -0,0 +1,71 @@
+from flask import Flask
+
+from routes.alumno import matriculas
+from utils.tokens import emitir_tokens, init_tokens, proteger_blueprint
+from falsos import ConexionBDFalsa, CursorFalso
+
+MATRICULA_DE_7 = 50  # matricula_id que pertenece al estudiante 7
+ASIGNACION = 12
+
+
+def _cliente(monkeypatch):
+    def filas(sql, params):
+        if "DELETE FROM matriculas" in sql and params == (MATRICULA_DE_7, 7):
+            return [(7, ASIGNACION)]
+        return []
+
+    cursor = CursorFalso(filas=filas)
+    monkeypatch.setattr(matriculas, "get_db", lambda: ConexionBDFalsa(cursor))
+    monkeypatch.setattr(matriculas.cupos, "promover_espera", lambda cur, asignacion_id: [])
+    monkeypatch.setattr(matriculas.elegibilidad, "descartar_perfil", lambda estudiante_id: None)
+
+    app = Flask(__name__)
+    app.config.update(JWT_SECRET_KEY="clave-de-prueba-suficientemente-larga-32", JWT_EXIGIR=True)
+    init_tokens(app)
+    bp = matriculas.Blueprint("alumno_prueba", __name__)
+    proteger_blueprint(bp, "Alumno")
+    bp.register_blueprint(matriculas.matriculas_bp)
+    app.register_blueprint(bp, url_prefix="/alumno")
+    return app, cursor
+
+
+def _bearer(app, estudiante_id):
+    with app.app_context():
+        token = emitir_tokens({"usuario_id": 100 + estudiante_id, "rol": "Alumno", "estudiante_id": estudiante_id})
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+def test_desmatricular_la_propia(monkeypatch):
+    app, cursor = _cliente(monkeypatch)
+    respuesta = app.test_client().delete(f"/alumno/desmatricular/{MATRICULA_DE_7}", headers=_bearer(app, 7))
+    assert respuesta.status_code == 200
+    assert cursor.ejecutadas[0][1] == (MATRICULA_DE_7, 7)
+
+
+def test_no_se_puede_desmatricular_a_otro(monkeypatch):
+    app, cursor = _cliente(monkeypatch)
+    respuesta = app.test_client().delete(f"/alumno/desmatricular/{MATRICULA_DE_7}", headers=_bearer(app, 8))
+    assert respuesta.status_code == 404
+    # El DELETE filtra por el estudiante del token y no se promueve a nadie
+    assert cursor.ejecutadas == [(cursor.ejecutadas[0][0], (MATRICULA_DE_7, 8))]
+
+
+def test_matricular_usa_el_estudiante_del_token(monkeypatch):
+    app, _ = _cliente(monkeypatch)
+    matriculados = []
+
+    def matricular_con_cupo(conn, cur, estudiante_id, asignacion_id):
+        matriculados.append(estudiante_id)
+        return {"estado": "matriculado", "matricula_id": 1}
+
+    monkeypatch.setattr(matriculas.cupos, "matricular_con_cupo", matricular_con_cupo)
+    cliente = app.test_client()
+
+    assert cliente.post("/alumno/matricular", headers=_bearer(app, 7),
+                        json={"asignacion_id": ASIGNACION}).status_code == 201
+    assert cliente.post("/alumno/matricular", headers=_bearer(app, 7),
+                        json={"alumno_id": 107, "asignacion_id": ASIGNACION}).status_code == 201
+    # Un id ajeno en el body no matricula a nadie
+    assert cliente.post("/alumno/matricular", headers=_bearer(app, 7),
+                        json={"estudiante_id": 8, "asignacion_id": ASIGNACION}).status_code == 403
+    assert matriculados == [7, 7]
@@ -0,0 +1,65 @@
+import threading
+
+from flask import Flask
+
+from database import db
+
+
+def test_release_ignora_handle_viejo(pool_falso):
+    conn = pool_falso.acquire()
+    turno = conn.turno
+    conn.close()
+
+    otra = pool_falso.acquire()
+    assert otra is conn and otra.turno == turno + 1
+
+    conn.liberar(turno)  # handle del préstamo anterior
+    assert not otra.liberada
+    assert pool_falso.stats()["en_uso"] == 1
+
+    otra.close()
+    otra.close()  # segunda devolución del mismo dueño: no-op
+    assert pool_falso.stats()["en_uso"] == 0
+    assert pool_falso.stats()["libres"] == 1
+
+
+def test_teardown_no_devuelve_conexion_tomada_por_otro_hilo(pool_falso, monkeypatch):
+    monkeypatch.setattr(db, "_get_pool", lambda: pool_falso)
+    app = Flask(__name__)
+    db.init_db(app)
+
+    tomada = {}
+    with app.app_context():
+        conn = db.get_db()
+        conn.close()  # el handler la devuelve en su finally
+
+        # Otro request (otro hilo) la toma mientras este aún no hizo teardown
+        hilo = threading.Thread(target=lambda: tomada.setdefault("conn", pool_falso.acquire()))
+        hilo.start()
+        hilo.join()
+        assert tomada["conn"] is conn
+
+    # Al salir del contexto corrió close_connection
+    assert not tomada["conn"].liberada
+    assert pool_falso.stats()["en_uso"] == 1
+    tomada["conn"].close()
+    assert pool_falso.stats()["en_uso"] == 0
+
+
+def test_get_db_no_reusa_conexion_prestada_a_otro(pool_falso, monkeypatch):
+    monkeypatch.setattr(db, "_get_pool", lambda: pool_falso)
+    pool_falso.maxconn = 2
+    pool_falso._slots = threading.BoundedSemaphore(2)
+    app = Flask(__name__)
+    db.init_db(app)
+
+    with app.app_context():
+        primera = db.get_db()
+        primera.close()
+        ajena = pool_falso.acquire()
+        assert ajena is primera
+
+        segunda = db.get_db()
+        assert segunda is not ajena
+    assert not ajena.liberada
+    assert segunda.liberada
@@ -0,0 +1,156 @@
+import uuid
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+from routes.auth_routes import auth_bp
+from utils.tokens import (
+    ListaRevocacion, alumno_propio, emitir_tokens, identidad, init_tokens, observabilidad,
+    proteger_blueprint, revocados
+)
+
+
+def _app(observabilidad_local=False, exigir=True):
+    app = Flask(__name__)
+    app.config.update(
+        JWT_SECRET_KEY="clave-de-prueba-suficientemente-larga-32",
+        JWT_EXIGIR=exigir,
+        OBSERVABILIDAD_LOCAL=observabilidad_local,
+    )
+    init_tokens(app)
+
+    @app.route("/db/pool")
+    @observabilidad
+    def estado_pool():
+        return {"en_uso": 0}
+
+    bp = Blueprint("protegido", __name__)
+
+    @bp.route("/yo")
+    def yo():
+        return jsonify(identidad())
+
+    @bp.route("/datos/<int:alumno_id>")
+    @alumno_propio("alumno_id")
+    def datos(alumno_id):
+        return jsonify({"alumno_id": alumno_id})
+
+    proteger_blueprint(bp, "Alumno")
+    app.register_blueprint(bp, url_prefix="/alumno")
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    return app
+
+
+def _tokens(app, rol="Alumno", usuario_id=None):
+    with app.app_context():
+        return emitir_tokens({"usuario_id": usuario_id or uuid.uuid4().int % 10**9, "rol": rol, "estudiante_id": 7})
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_revocar_usuario_rechaza_solo_tokens_anteriores():
+    lista = ListaRevocacion()
+    lista.revocar_usuario(5, desde=1000.9)
+    assert lista.revocado({"jti": str(uuid.uuid4()), "usuario_id": 5, "iat": 999})
+    # Emitido en el mismo segundo que la revocación (login tras cambiar la contraseña)
+    assert not lista.revocado({"jti": str(uuid.uuid4()), "usuario_id": 5, "iat": 1000})
+    assert not lista.revocado({"jti": str(uuid.uuid4()), "usuario_id": 6, "iat": 999})
+
+
+def test_revocar_jti_y_purga_al_vencer():
+    lista = ListaRevocacion()
+    jti = str(uuid.uuid4())
+    lista.revocar(jti, exp=4102444800)  # 2100-01-01
+    lista.revocar(str(uuid.uuid4()), exp=1)  # ya vencido
+    assert lista.revocado({"jti": jti})
+    assert lista.stats()["tokens_revocados"] == 1
+
+
+def test_init_tokens_exige_clave():
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = None
+    with pytest.raises(RuntimeError):
+        init_tokens(app)
+
+
+def test_blueprint_protegido_exige_token_y_rol():
+    app = _app()
+    cliente = app.test_client()
+
+    assert cliente.get("/alumno/yo").status_code == 401
+    assert cliente.get("/alumno/yo", headers=_bearer(_tokens(app, "Docente")["access_token"])).status_code == 403
+
+    respuesta = cliente.get("/alumno/yo", headers=_bearer(_tokens(app)["access_token"]))
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()["estudiante_id"] == 7
+
+
+def test_alumno_propio_solo_atiende_al_dueno():
+    app = _app()
+    cliente = app.test_client()
+    acceso = _bearer(_tokens(app, usuario_id=107)["access_token"])  # estudiante_id 7
+
+    # Por estudiante_id o usuario_id propio la vista recibe el estudiante_id del token
+    assert cliente.get("/alumno/datos/7", headers=acceso).get_json() == {"alumno_id": 7}
+    assert cliente.get("/alumno/datos/107", headers=acceso).get_json() == {"alumno_id": 7}
+    assert cliente.get("/alumno/datos/8", headers=acceso).status_code == 403
+
+
+def test_sin_jwt_exigir_las_rutas_siguen_abiertas():
+    # El frontend todavía no envía el token: por defecto no se exige
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "clave-de-prueba-suficientemente-larga-32"
+    init_tokens(app)
+    bp = Blueprint("abierto", __name__)
+    bp.add_url_rule("/ping", view_func=lambda: "ok")
+    proteger_blueprint(bp, "Alumno")
+    app.register_blueprint(bp)
+    assert app.test_client().get("/ping").status_code == 200
+
+
+def test_alumno_propio_sin_token_con_exigir_apagado():
+    app = _app(exigir=False)
+    assert app.test_client().get("/alumno/datos/8").get_json() == {"alumno_id": 8}
+
+
+def test_logout_revoca_acceso_y_refresco():
+    app = _app()
+    cliente = app.test_client()
+    tokens = _tokens(app)
+    acceso = _bearer(tokens["access_token"])
+
+    assert cliente.post("/auth/logout", headers=acceso, json={"refresh_token": "basura"}).status_code == 400
+    assert cliente.get("/alumno/yo", headers=acceso).status_code == 200  # nada se revocó
+
+    assert cliente.post("/auth/logout", headers=acceso, json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert cliente.get("/alumno/yo", headers=acceso).status_code == 401
+    assert cliente.post("/auth/refresh", headers=_bearer(tokens["refresh_token"])).status_code == 401
+
+
+def test_cambio_de_contrasena_revoca_sesiones_previas():
+    app = _app()
+    cliente = app.test_client()
+    tokens = _tokens(app, usuario_id=424242)
+
+    revocados.revocar_usuario(424242, desde=2**40)  # cualquier token anterior
+    assert cliente.get("/alumno/yo", headers=_bearer(tokens["access_token"])).status_code == 401
+
+
+def test_observabilidad_pide_superadmin():
+    app = _app()
+    cliente = app.test_client()
+
+    assert cliente.get("/db/pool").status_code == 401
+    assert cliente.get("/db/pool", headers=_bearer(_tokens(app)["access_token"])).status_code == 403
+    assert cliente.get("/db/pool", headers=_bearer(_tokens(app, "SuperAdmin")["access_token"])).status_code == 200
+
+
+def test_observabilidad_local_solo_sin_proxy():
+    app = _app(observabilidad_local=True)
+    cliente = app.test_client()  # remote_addr 127.0.0.1
+
+    assert cliente.get("/db/pool").status_code == 200
+    assert cliente.get("/db/pool", headers={"X-Forwarded-For": "203.0.113.9"}).status_code == 401
+    assert cliente.get("/db/pool", environ_base={"REMOTE_ADDR": "10.0.0.8"}).status_code == 401
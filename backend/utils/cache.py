@@ -0,0 +1,180 @@
+import threading
+import time
+from functools import wraps
+
+# ============================================
+# Caché en memoria por regiones (read-through con TTL)
+# ============================================
+# Cada región agrupa datos que se invalidan juntos ("aulas", "cursos", ...).
+# Las rutas que escriben llaman a invalidar(region) después del commit; lo
+# que depende de esa región se entera con al_invalidar().
+# La caché es por proceso: con varios workers, otro proceso puede servir el
+# dato anterior hasta que venza el TTL.
+
+TTL_POR_DEFECTO = 300  # segundos
+
+
+def normalizar_clave(clave):
+    """
+    Los IDs llegan como int desde la BD y como str desde JSON o la URL:
+    "12" y 12 deben ser la misma entrada (si no, descartar("12") no borra
+    lo guardado con 12).
+    """
+    if isinstance(clave, str) and clave.isdigit():
+        return int(clave)
+    if isinstance(clave, tuple):
+        return tuple(normalizar_clave(c) for c in clave)
+    return clave
+
+
+class RegionCache:
+    """
+    Las cargas corren fuera del lock. Si la región se invalida (o se
+    descarta esa clave) mientras cargar() está en curso, el valor que
+    devuelve ya puede ser viejo: se entrega a quien lo pidió pero no se
+    guarda. Para eso la región lleva un reloj que avanza en cada
+    invalidación y cada carga anota el valor con que empezó.
+    """
+
+    def __init__(self, nombre, ttl=None):
+        self.nombre = nombre
+        self.ttl = ttl
+        self._datos = {}
+        self._lock = threading.Lock()
+        self._reloj = 0
+        self._invalidada_en = 0
+        self._cargando = {}   # clave -> cargas en curso
+        self._descartes = {}  # clave -> reloj del último descartar() durante una carga
+        self.hits = 0
+        self.misses = 0
+        self.invalidaciones = 0
+        self.cargas_obsoletas = 0
+
+    def leer(self, clave, cargar):
+        """Devuelve el valor cacheado o lo carga con cargar() y lo guarda."""
+        clave = normalizar_clave(clave)
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None and entrada[0] > ahora:
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+            inicio = self._reloj
+            self._cargando[clave] = self._cargando.get(clave, 0) + 1
+
+        try:
+            valor = cargar()
+        except BaseException:
+            with self._lock:
+                self._terminar_carga(clave, inicio)
+            raise
+
+        ttl = self.ttl if self.ttl is not None else TTL_POR_DEFECTO
+        with self._lock:
+            if self._terminar_carga(clave, inicio):
+                self._datos[clave] = (time.monotonic() + ttl, valor)
+            else:
+                self.cargas_obsoletas += 1
+        return valor
+
+    def _terminar_carga(self, clave, inicio):
+        """True si nada invalidó la clave desde `inicio` (con el lock tomado)."""
+        vigente = self._invalidada_en <= inicio and self._descartes.get(clave, 0) <= inicio
+        restantes = self._cargando.pop(clave) - 1
+        if restantes:
+            self._cargando[clave] = restantes
+        else:
+            self._descartes.pop(clave, None)
+        return vigente
+
+    def invalidar(self):
+        with self._lock:
+            self._datos.clear()
+            self._reloj += 1
+            self._invalidada_en = self._reloj
+            self.invalidaciones += 1
+
+    def descartar(self, clave):
+        """Invalida solo una entrada (p. ej. el perfil de un estudiante)."""
+        clave = normalizar_clave(clave)
+        with self._lock:
+            self._reloj += 1
+            if clave in self._cargando:
+                self._descartes[clave] = self._reloj
+            if self._datos.pop(clave, None) is not None:
+                self.invalidaciones += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "invalidaciones": self.invalidaciones,
+                "cargas_obsoletas": self.cargas_obsoletas,
+                "entradas": len(self._datos),
+                "ttl_s": self.ttl if self.ttl is not None else TTL_POR_DEFECTO,
+            }
+
+
+_regiones = {}
+_regiones_lock = threading.Lock()
+
+
+def region(nombre, ttl=None):
+    with _regiones_lock:
+        if nombre not in _regiones:
+            _regiones[nombre] = RegionCache(nombre, ttl)
+        return _regiones[nombre]
+
+
+def cacheado(nombre_region, ttl=None):
+    """
+    Decorador read-through: el resultado de la función se guarda en la región
+    usando como clave el nombre de la función y sus argumentos.
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args):
+            return region(nombre_region, ttl).leer(
+                (funcion.__name__,) + args, lambda: funcion(*args)
+            )
+        return envoltura
+    return decorador
+
+
+_oyentes = {}  # región -> [funciones a llamar cuando se invalida]
+
+
+def al_invalidar(nombre, funcion):
+    """
+    Registra funcion() para cuando se invalide la región `nombre`. Sirve
+    para datos derivados de varias regiones (p. ej. la oferta por ciclo
+    depende de asignaciones, bloques, aulas, secciones y cursos).
+    """
+    with _regiones_lock:
+        oyentes = _oyentes.setdefault(nombre, [])
+        if funcion not in oyentes:
+            oyentes.append(funcion)
+
+
+def invalidar(*nombres):
+    for nombre in nombres:
+        region(nombre).invalidar()
+        with _regiones_lock:
+            oyentes = list(_oyentes.get(nombre, ()))
+        for funcion in oyentes:
+            funcion()
+
+
+def estadisticas():
+    with _regiones_lock:
+        regiones = dict(_regiones)
+    return {nombre: r.stats() for nombre, r in sorted(regiones.items())}
+
+
+def init_cache(app):
+    global TTL_POR_DEFECTO
+    TTL_POR_DEFECTO = app.config.get("CACHE_TTL", TTL_POR_DEFECTO)
@@ -0,0 +1,179 @@
+import threading
+from functools import wraps
+
+from flask import Response, make_response, request
+
+# ============================================
+# Coalescencia de solicitudes idénticas (single-flight)
+# ============================================
+# Al abrir la matrícula llegan cientos de GET idénticos a la vez (oferta,
+# catálogo de cursos, listado de asignaciones) y cada uno hacía su propia
+# consulta. Con @coalescer, mientras una solicitud calcula la respuesta de
+# una clave, las idénticas que llegan esperan y reciben una copia de esa
+# misma respuesta en vez de ir a PostgreSQL.
+#
+#   - La clave por defecto es la ruta con su query string; cada endpoint
+#     puede dar la suya (o None para no coalescer esa solicitud, p. ej. las
+#     exportaciones en streaming).
+#   - El líder congela su respuesta (cuerpo, estado y cabeceras) y cada
+#     seguidor arma su propio Response: nadie comparte el objeto.
+#   - Solo se comparte lo que está en vuelo; no es una caché. La siguiente
+#     solicitud después de terminar vuelve a calcular.
+#   - Si el líder tarda más de espera_max, o lanza una excepción, cada
+#     seguidor calcula por su cuenta.
+#   - Funciona entre los hilos de un worker; cada proceso coalesce lo suyo.
+#
+# La tasa de coalescencia (seguidores / solicitudes) por endpoint se ve en
+# /coalescencia/stats.
+
+ESPERA_MAX = 10.0  # segundos; init_coalescencia lo toma de COALESCENCIA_ESPERA_MAX
+
+_config = {"activa": True, "desactivados": set()}
+
+
+class _Vuelo:
+    __slots__ = ("listo", "resultado", "error")
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class Coalescedor:
+    """Una función en vuelo por clave; las llamadas idénticas comparten su resultado."""
+
+    def __init__(self, nombre, espera_max=None):
+        self.nombre = nombre
+        self.espera_max = espera_max
+        self._vuelos = {}
+        self._lock = threading.Lock()
+        self.lideres = 0
+        self.seguidores = 0
+        self.esperas_vencidas = 0
+        self.errores = 0
+
+    def ejecutar(self, clave, funcion):
+        """Devuelve (resultado, es_lider)."""
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            es_lider = vuelo is None
+            if es_lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+                self.lideres += 1
+            else:
+                self.seguidores += 1
+
+        if es_lider:
+            try:
+                vuelo.resultado = funcion()
+                return vuelo.resultado, True
+            except BaseException as e:
+                vuelo.error = e
+                with self._lock:
+                    self.errores += 1
+                raise
+            finally:
+                with self._lock:
+                    self._vuelos.pop(clave, None)
+                vuelo.listo.set()
+
+        espera = self.espera_max if self.espera_max is not None else ESPERA_MAX
+        if not vuelo.listo.wait(espera):
+            with self._lock:
+                self.esperas_vencidas += 1
+            return funcion(), False
+        if vuelo.error is not None:
+            return funcion(), False
+        return vuelo.resultado, False
+
+    def stats(self):
+        with self._lock:
+            total = self.lideres + self.seguidores
+            return {
+                "solicitudes": total,
+                "lideres": self.lideres,
+                "seguidores": self.seguidores,
+                "tasa_coalescencia": round(self.seguidores / total, 4) if total else 0.0,
+                "esperas_vencidas": self.esperas_vencidas,
+                "errores_lider": self.errores,
+                "en_vuelo": len(self._vuelos),
+                "activo": activo(self.nombre),
+            }
+
+
+_coalescedores = {}
+_coalescedores_lock = threading.Lock()
+
+
+def coalescedor(nombre, espera_max=None):
+    with _coalescedores_lock:
+        if nombre not in _coalescedores:
+            _coalescedores[nombre] = Coalescedor(nombre, espera_max)
+        return _coalescedores[nombre]
+
+
+def activo(nombre):
+    return _config["activa"] and nombre not in _config["desactivados"]
+
+
+# --------------------------
+# 🔹 Decorador para rutas GET
+# --------------------------
+def _congelar(respuesta):
+    """(cuerpo, estado, cabeceras) o None si la respuesta es un stream."""
+    if respuesta.is_streamed:
+        return None
+    cabeceras = [(k, v) for k, v in respuesta.headers.items() if k.lower() != "content-length"]
+    return respuesta.get_data(), respuesta.status_code, cabeceras
+
+
+def clave_por_defecto():
+    return request.full_path
+
+
+def coalescer(nombre, clave=clave_por_defecto, espera_max=None):
+    """
+    Decorador: solicitudes con la misma clave(), simultáneas, comparten una
+    sola ejecución de la vista. Va justo encima de la función (debajo de
+    @route) para coalescer solo el trabajo de la vista.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            k = clave() if activo(nombre) else None
+            if k is None:
+                return vista(*args, **kwargs)
+
+            respuestas = {}
+
+            def calcular():
+                respuestas["propia"] = make_response(vista(*args, **kwargs))
+                return _congelar(respuestas["propia"])
+
+            congelada, _ = coalescedor(nombre, espera_max).ejecutar(k, calcular)
+            if "propia" in respuestas:
+                # La calculó esta misma solicitud (líder o espera vencida)
+                return respuestas["propia"]
+            if congelada is None:
+                # El líder respondió en streaming: no se puede copiar
+                return vista(*args, **kwargs)
+            cuerpo, estado, cabeceras = congelada
+            return Response(cuerpo, status=estado, headers=cabeceras)
+        return envoltura
+    return decorador
+
+
+def estadisticas():
+    with _coalescedores_lock:
+        todos = dict(_coalescedores)
+    return {nombre: c.stats() for nombre, c in sorted(todos.items())}
+
+
+def init_coalescencia(app):
+    global ESPERA_MAX
+    ESPERA_MAX = app.config.get("COALESCENCIA_ESPERA_MAX", ESPERA_MAX)
+    _config["activa"] = app.config.get("COALESCENCIA_ACTIVA", True)
+    _config["desactivados"] = {
+        n.strip() for n in app.config.get("COALESCENCIA_DESACTIVAR", "").split(",") if n.strip()
+    }
@@ -0,0 +1,120 @@
+import hashlib
+import threading
+from functools import wraps
+
+from flask import request, make_response
+
+from database.db import get_db
+from utils.logs import get_logger
+
+log = get_logger(__name__)
+
+# ============================================
+# GET condicional (ETag / Last-Modified)
+# ============================================
+# El validador sale de version_datos (database/migraciones/003_version_datos.sql):
+# una consulta por clave primaria en lugar de la consulta completa del
+# endpoint. Si el cliente ya tiene esa versión se responde 304 sin cuerpo.
+
+# Se incluye en el ETag: subirlo si cambia el formato de las respuestas
+VERSION_FORMATO = "1"
+REPORTE_CADA = 100  # cada cuántas peticiones se registra la tasa de 304
+
+_stats = {"peticiones": 0, "no_modificado": 0}
+_stats_lock = threading.Lock()
+
+
+def version_estudiante(cur, estudiante_id):
+    """
+    Devuelve (firma, ultima_modificacion) de los datos que ve un estudiante:
+    su clave propia, las de sus asignaciones y la global.
+    """
+    cur.execute("""
+        SELECT
+            COALESCE(string_agg(v.clave || '=' || v.version, ',' ORDER BY v.clave), ''),
+            MAX(v.actualizado)
+        FROM version_datos v
+        WHERE v.clave = 'global'
+           OR v.clave = 'est:' || %(estudiante_id)s
+           OR v.clave IN (
+                SELECT 'asig:' || m.asignacion_id
+                FROM matriculas m
+                WHERE m.estudiante_id = %(estudiante_id)s
+           )
+    """, {"estudiante_id": estudiante_id})
+    return cur.fetchone()
+
+
+def _registrar(no_modificado):
+    with _stats_lock:
+        _stats["peticiones"] += 1
+        if no_modificado:
+            _stats["no_modificado"] += 1
+        peticiones = _stats["peticiones"]
+        tasa = _stats["no_modificado"] / peticiones * 100
+    if peticiones % REPORTE_CADA == 0:
+        log.info("GET condicional", extra={"peticiones": peticiones, "tasa_304": round(tasa, 1)})
+
+
+def get_condicional(obtener_estudiante_id):
+    """
+    Decorador para rutas GET del alumno.
+    `obtener_estudiante_id(cur, **kwargs_de_la_ruta)` devuelve el
+    estudiante_id al que pertenecen los datos (o None si no existe: en ese
+    caso se ejecuta la ruta normalmente).
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(**kwargs):
+            conn = get_db()
+            try:
+                cur = conn.cursor()
+                try:
+                    estudiante_id = obtener_estudiante_id(cur, **kwargs)
+                    firma, modificado = (
+                        version_estudiante(cur, estudiante_id) if estudiante_id is not None else (None, None)
+                    )
+                finally:
+                    cur.close()
+            except Exception as e:
+                # Sin validador se responde como siempre
+                conn.rollback()
+                log.warning("GET condicional sin validador", extra={"ruta": request.path, "error": str(e)})
+                return vista(**kwargs)
+
+            if firma is None:
+                return vista(**kwargs)
+
+            etag = hashlib.md5(
+                f"{VERSION_FORMATO}|{request.path}|{firma}".encode()
+            ).hexdigest()
+
+            # If-None-Match tiene prioridad; If-Modified-Since solo si no viene ETag
+            if request.if_none_match:
+                no_modificado = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since and modificado is not None:
+                no_modificado = modificado.replace(microsecond=0) <= request.if_modified_since
+            else:
+                no_modificado = False
+
+            _registrar(no_modificado)
+
+            if no_modificado:
+                respuesta = make_response("", 304)
+            else:
+                respuesta = make_response(vista(**kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+
+            respuesta.set_etag(etag, weak=True)
+            if modificado is not None:
+                respuesta.last_modified = modificado
+            respuesta.headers["Cache-Control"] = "private, no-cache"
+            return respuesta
+        return envoltura
+    return decorador
+
+
+def estudiante_de_ruta(cur, estudiante_id=None, **_):
+    """Para rutas cuyo parámetro ya es el estudiante_id."""
+    return estudiante_id
@@ -0,0 +1,463 @@
+import os
+import random
+import smtplib
+import threading
+import time
+from collections import deque
+from email.message import EmailMessage
+
+from flask import current_app
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from psycopg2.extras import Json, RealDictCursor, execute_values
+
+from database.db import get_db
+from utils.logs import get_logger
+
+log = get_logger(__name__)
+
+# ============================================
+# Bandeja de salida de correos (outbox)
+# ============================================
+# Las rutas llaman a encolar() con el mismo cursor con el que crean la
+# cuenta: el correo queda guardado en el mismo commit y la petición no
+# espera al servidor SMTP. Los trabajadores (hilos del proceso web o
+# `flask procesar-correos`) toman lotes con FOR UPDATE SKIP LOCKED, así
+# varios procesos pueden trabajar a la vez sin enviar dos veces el mismo.
+#
+# Backends (MAIL_BACKEND):
+#   smtp     envío real; cada trabajador reutiliza su conexión autenticada
+#   consola  solo registra id y asunto en el log (desarrollo)
+#   memoria  guarda los mensajes en BANDEJA_MEMORIA (pruebas)
+# Para probar con un SMTP local: MAIL_SERVER=localhost MAIL_PORT=1025
+# MAIL_USE_TLS=false y `python -m aiosmtpd -n -l localhost:1025`.
+#
+# Envíos masivos (una cohorte completa): cada trabajador manda muchos
+# mensajes por la misma conexión (hasta MAIL_MAX_POR_CONEXION) y todos los
+# trabajadores del proceso comparten un límite de MAIL_LIMITE_POR_MINUTO
+# para no pasar la cuota del proveedor. estadisticas() da mensajes/segundo
+# y los últimos fallos.
+
+BANDEJA_MEMORIA = []
+
+_hay_trabajo = threading.Event()
+_trabajadores = []
+_trabajadores_lock = threading.Lock()
+
+_stats = {"enviados": 0, "fallidos": 0, "lotes": 0, "segundos_enviando": 0.0}
+_ultimos_fallos = deque(maxlen=50)
+_stats_lock = threading.Lock()
+_limite = None  # LimiteTasa compartido por los trabajadores del proceso
+
+# Plantillas HTML de los correos (templates/correo). Se compilan una vez y
+# quedan en memoria; autoescape evita que un nombre con "<" rompa el HTML.
+_plantillas = Environment(
+    loader=FileSystemLoader(
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "correo")
+    ),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+
+
+def renderizar(plantilla, **contexto):
+    return _plantillas.get_template(plantilla).render(**contexto)
+
+
+def precompilar_plantillas():
+    for nombre in _plantillas.list_templates():
+        _plantillas.get_template(nombre)
+
+
+def encolar(cur, destinatario, asunto, html, cabeceras=None):
+    """Guarda el correo en la bandeja de salida (sin commit)."""
+    cur.execute("""
+        INSERT INTO correo_saliente (destinatario, asunto, html, cabeceras)
+        VALUES (%s, %s, %s, %s)
+        RETURNING correo_id
+    """, (destinatario, asunto, html, Json(cabeceras or {})))
+    return cur.fetchone()[0]
+
+
+def encolar_lote(cur, correos):
+    """Varios correos en un INSERT: [(destinatario, asunto, html, cabeceras), ...]."""
+    execute_values(cur, """
+        INSERT INTO correo_saliente (destinatario, asunto, html, cabeceras) VALUES %s
+    """, [(d, a, h, Json(c or {})) for d, a, h, c in correos], page_size=len(correos) or 1)
+
+
+def despertar():
+    """Avisa a los trabajadores de este proceso que hay correos nuevos."""
+    _hay_trabajo.set()
+
+
+# --------------------------
+# 🔹 Backends de envío
+# --------------------------
+def construir_mensaje(correo, remitente):
+    msg = EmailMessage()
+    msg["Subject"] = correo["asunto"]
+    msg["From"] = remitente
+    msg["To"] = correo["destinatario"]
+    for nombre, valor in (correo.get("cabeceras") or {}).items():
+        msg[nombre] = valor
+    msg.set_content("Este mensaje requiere un cliente de correo con soporte HTML.")
+    msg.add_alternative(correo["html"], subtype="html")
+    return msg
+
+
+class LimiteTasa:
+    """Token bucket: `por_minuto` mensajes con ráfagas de hasta `rafaga`."""
+
+    def __init__(self, por_minuto, rafaga=None):
+        self.tasa = por_minuto / 60.0
+        self.capacidad = rafaga or max(1, int(por_minuto / 6))
+        self._fichas = float(self.capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def esperar(self):
+        """Bloquea hasta que haya una ficha disponible y la consume."""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa)
+                self._ultimo = ahora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                falta = (1 - self._fichas) / self.tasa
+            time.sleep(falta)
+
+
+class BackendSMTP:
+    """Mantiene una conexión SMTP abierta entre mensajes y la rehace si se cae."""
+
+    OCIOSA_MAX = 60  # segundos: Gmail corta las conexiones inactivas
+    TIMEOUT = 30
+
+    def __init__(self, servidor, puerto, usuario=None, contrasena=None,
+                 usar_tls=True, usar_ssl=False, remitente=None, timeout=TIMEOUT,
+                 max_por_conexion=100):
+        self.servidor = servidor
+        self.puerto = puerto
+        self.usuario = usuario
+        self.contrasena = contrasena
+        self.usar_tls = usar_tls
+        self.usar_ssl = usar_ssl
+        self.remitente = remitente or usuario
+        self.timeout = timeout
+        self.max_por_conexion = max_por_conexion
+        self._smtp = None
+        self._ultimo_uso = 0
+        self._enviados_conexion = 0
+        self.conexiones = 0
+
+    def _conectar(self):
+        if self.usar_ssl:
+            smtp = smtplib.SMTP_SSL(self.servidor, self.puerto, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.servidor, self.puerto, timeout=self.timeout)
+            if self.usar_tls:
+                smtp.starttls()
+        if self.usuario and self.contrasena:
+            smtp.login(self.usuario, self.contrasena)
+        self._smtp = smtp
+        self._enviados_conexion = 0
+        self.conexiones += 1
+
+    def enviar(self, correo):
+        msg = construir_mensaje(correo, self.remitente)
+        if self._smtp is not None and (
+            time.monotonic() - self._ultimo_uso > self.OCIOSA_MAX
+            or self._enviados_conexion >= self.max_por_conexion
+        ):
+            self.cerrar()
+        if self._smtp is None:
+            self._conectar()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # El servidor cerró la conexión reutilizada: un reintento con una nueva
+            self._smtp = None
+            self._conectar()
+            self._smtp.send_message(msg)
+        self._ultimo_uso = time.monotonic()
+        self._enviados_conexion += 1
+
+    def cerrar(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+class BackendConsola:
+    def enviar(self, correo):
+        # Ni el destinatario ni el cuerpo (lleva contraseñas) van al log
+        log.info("Correo enviado a consola", extra={
+            "correo_id": correo.get("correo_id"), "asunto": correo["asunto"]
+        })
+
+    def cerrar(self):
+        pass
+
+
+class BackendMemoria:
+    def enviar(self, correo):
+        BANDEJA_MEMORIA.append(dict(correo))
+
+    def cerrar(self):
+        pass
+
+
+def crear_backend(config):
+    tipo = (config.get("MAIL_BACKEND") or "smtp").lower()
+    if tipo == "consola":
+        return BackendConsola()
+    if tipo == "memoria":
+        return BackendMemoria()
+    return BackendSMTP(
+        servidor=config.get("MAIL_SERVER"),
+        puerto=config.get("MAIL_PORT"),
+        usuario=config.get("MAIL_USERNAME"),
+        contrasena=config.get("MAIL_PASSWORD"),
+        usar_tls=config.get("MAIL_USE_TLS", True),
+        usar_ssl=config.get("MAIL_USE_SSL", False),
+        remitente=config.get("MAIL_DEFAULT_SENDER"),
+        max_por_conexion=config.get("MAIL_MAX_POR_CONEXION", 100),
+    )
+
+
+def limite_de_tasa(config):
+    """LimiteTasa del proceso (None si MAIL_LIMITE_POR_MINUTO es 0)."""
+    global _limite
+    por_minuto = config.get("MAIL_LIMITE_POR_MINUTO", 0)
+    if por_minuto and _limite is None:
+        with _stats_lock:
+            if _limite is None:
+                _limite = LimiteTasa(por_minuto)
+    return _limite
+
+
+# --------------------------
+# 🔹 Procesamiento de la bandeja
+# --------------------------
+SQL_RECLAMAR = """
+    UPDATE correo_saliente c
+    SET estado = 'ENVIANDO', intentos = c.intentos + 1, reclamado = NOW()
+    WHERE c.correo_id IN (
+        SELECT correo_id
+        FROM correo_saliente
+        WHERE (estado = 'PENDIENTE' AND proximo_intento <= NOW())
+           -- trabajador caído a mitad de un envío
+           OR (estado = 'ENVIANDO' AND reclamado < NOW() - make_interval(secs => %(abandonado)s))
+        ORDER BY correo_id
+        LIMIT %(limite)s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING c.correo_id, c.destinatario, c.asunto, c.html, c.cabeceras, c.intentos
+"""
+
+
+def espera_reintento(intentos, base, maximo=3600):
+    """Backoff exponencial con jitter: base, 2·base, 4·base, ... (± 20 %)."""
+    espera = min(base * 2 ** (intentos - 1), maximo)
+    return espera * random.uniform(0.8, 1.2)
+
+
+ABANDONADO_MIN = 300  # segundos
+
+
+def ventana_abandono(config):
+    """
+    Segundos en ENVIANDO sin renovar `reclamado` tras los que otro
+    trabajador puede reclamar el correo. procesar_lote renueva lo que le
+    queda del lote en cada correo, así que basta cubrir lo que puede pasar
+    entre dos commits: la espera del límite de tasa (compartido por los
+    hilos del proceso) más un envío SMTP con su reconexión.
+    """
+    por_minuto = config.get("MAIL_LIMITE_POR_MINUTO", 0)
+    hilos = max(1, config.get("MAIL_HILOS", 1))
+    espera_tasa = 60.0 * hilos / por_minuto if por_minuto else 0.0
+    envio = 3 * BackendSMTP.TIMEOUT
+    return max(ABANDONADO_MIN, 2 * (espera_tasa + envio))
+
+
+def reclamar(conn, limite, abandonado=ABANDONADO_MIN):
+    """Marca hasta `limite` correos como ENVIANDO y los devuelve (hace commit)."""
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(SQL_RECLAMAR, {"limite": limite, "abandonado": abandonado})
+        correos = cur.fetchall()
+        conn.commit()
+        return correos
+    finally:
+        cur.close()
+
+
+def renovar_reclamo(cur, correo_ids):
+    """Los correos del lote que siguen en ENVIANDO no se dan por abandonados."""
+    cur.execute("""
+        UPDATE correo_saliente SET reclamado = NOW()
+        WHERE correo_id = ANY(%s) AND estado = 'ENVIANDO'
+    """, (list(correo_ids),))
+
+
+def marcar_enviado(cur, correo_id):
+    cur.execute("""
+        UPDATE correo_saliente
+        SET estado = 'ENVIADO', enviado = NOW(), html = '', ultimo_error = NULL
+        WHERE correo_id = %s
+    """, (correo_id,))
+
+
+def marcar_fallo(cur, correo, error, max_intentos, base):
+    if correo["intentos"] >= max_intentos:
+        cur.execute("""
+            UPDATE correo_saliente
+            SET estado = 'FALLIDO', ultimo_error = %s
+            WHERE correo_id = %s
+        """, (error, correo["correo_id"]))
+    else:
+        cur.execute("""
+            UPDATE correo_saliente
+            SET estado = 'PENDIENTE', ultimo_error = %s,
+                proximo_intento = NOW() + make_interval(secs => %s)
+            WHERE correo_id = %s
+        """, (error, espera_reintento(correo["intentos"], base), correo["correo_id"]))
+
+
+def procesar_lote(conn, backend, config):
+    """Envía un lote de la bandeja. Devuelve (enviados, fallidos)."""
+    max_intentos = config.get("MAIL_MAX_INTENTOS", 5)
+    base = config.get("MAIL_REINTENTO_BASE", 30)
+    limite = limite_de_tasa(config)
+
+    correos = reclamar(conn, config.get("MAIL_LOTE", 20), ventana_abandono(config))
+    if not correos:
+        return 0, 0
+
+    enviados = fallidos = 0
+    inicio = time.monotonic()
+    cur = conn.cursor()
+    try:
+        for i, correo in enumerate(correos):
+            if limite is not None:
+                limite.esperar()
+                # La espera puede ser larga con un lote grande: se renueva el
+                # reclamo de lo que falta (va en el commit de este correo)
+                renovar_reclamo(cur, [c["correo_id"] for c in correos[i:]])
+            try:
+                backend.enviar(correo)
+                marcar_enviado(cur, correo["correo_id"])
+                enviados += 1
+            except Exception as e:
+                log.warning("Error al enviar correo", extra={
+                    "correo_id": correo["correo_id"], "intento": correo["intentos"], "error": str(e)[:200]
+                })
+                backend.cerrar()
+                marcar_fallo(cur, correo, str(e)[:500], max_intentos, base)
+                fallidos += 1
+                with _stats_lock:
+                    _ultimos_fallos.append({
+                        "correo_id": correo["correo_id"],
+                        "intento": correo["intentos"],
+                        "error": str(e)[:200],
+                        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    })
+            # Commit por correo: si el proceso muere no se reenvían los ya enviados
+            conn.commit()
+    finally:
+        cur.close()
+        _registrar_lote(enviados, fallidos, time.monotonic() - inicio)
+    return enviados, fallidos
+
+
+def _registrar_lote(enviados, fallidos, segundos):
+    with _stats_lock:
+        _stats["enviados"] += enviados
+        _stats["fallidos"] += fallidos
+        _stats["lotes"] += 1
+        _stats["segundos_enviando"] += segundos
+    if segundos > 0 and enviados + fallidos > 1:
+        log.info("Lote de correos", extra={
+            "enviados": enviados, "fallidos": fallidos, "msg_por_s": round(enviados / segundos, 1)
+        })
+
+
+def estadisticas():
+    """Totales del proceso, mensajes/segundo mientras envía y últimos fallos."""
+    with _stats_lock:
+        datos = dict(_stats)
+        datos["ultimos_fallos"] = list(_ultimos_fallos)
+    segundos = datos["segundos_enviando"]
+    datos["mensajes_por_segundo"] = round(datos["enviados"] / segundos, 2) if segundos else 0.0
+    datos["segundos_enviando"] = round(segundos, 2)
+    datos["trabajadores"] = len(_trabajadores)
+    return datos
+
+
+def resumen_bandeja(cur):
+    """Cantidad de correos por estado en correo_saliente."""
+    cur.execute("SELECT estado, COUNT(*) FROM correo_saliente GROUP BY estado")
+    return {estado: total for estado, total in cur.fetchall()}
+
+
+class TrabajadorCorreo(threading.Thread):
+    """Hilo que vacía la bandeja; duerme MAIL_INTERVALO s o hasta despertar()."""
+
+    def __init__(self, app, nombre="correo-1"):
+        super().__init__(name=nombre, daemon=True)
+        self.app = app
+        self.detener = threading.Event()
+
+    def run(self):
+        config = self.app.config
+        backend = crear_backend(config)
+        intervalo = config.get("MAIL_INTERVALO", 5)
+        log.info("Trabajador de correo iniciado", extra={
+            "trabajador": self.name, "backend": type(backend).__name__
+        })
+        while not self.detener.is_set():
+            enviados = 0
+            # Un app_context por vuelta: la conexión vuelve al pool mientras duerme
+            # (al devolverla, el pool deshace lo que haya quedado sin commit)
+            with self.app.app_context():
+                try:
+                    enviados, _ = procesar_lote(get_db(), backend, config)
+                except Exception:
+                    log.exception("Error en trabajador de correo", extra={"trabajador": self.name})
+            if not enviados:
+                # Sin trabajo: se cierra la conexión SMTP y se espera
+                backend.cerrar()
+                _hay_trabajo.wait(intervalo)
+                _hay_trabajo.clear()
+        backend.cerrar()
+
+
+def iniciar_trabajadores(app, cantidad):
+    with _trabajadores_lock:
+        if _trabajadores:
+            return
+        for i in range(cantidad):
+            hilo = TrabajadorCorreo(app, nombre=f"correo-{i + 1}")
+            hilo.start()
+            _trabajadores.append(hilo)
+
+
+def init_correo(app):
+    """
+    Arranca MAIL_HILOS trabajadores con la primera petición (no al importar
+    la app, para que los comandos de `flask` no envíen correos).
+    MAIL_HILOS=0 deja el envío a `flask procesar-correos`.
+    """
+    hilos = app.config.get("MAIL_HILOS", 1)
+    precompilar_plantillas()
+
+    if hilos > 0 and not app.testing:
+        @app.before_request
+        def _arrancar_trabajadores_correo():
+            if not _trabajadores:
+                iniciar_trabajadores(current_app._get_current_object(), hilos)
@@ -0,0 +1,175 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+# ============================================
+# Logs estructurados (reemplazo de los print() de las rutas)
+# ============================================
+# - Uso en cada módulo:   log = get_logger(__name__)
+#                         log.info("Alumno creado", extra={"estudiante_id": 5})
+#   Los campos de `extra` salen como claves del JSON.
+# - Salida JSON por línea (LOG_FORMATO=texto para leerlo en desarrollo).
+# - Niveles: LOG_NIVEL (DEBUG, INFO, WARNING, ...).
+# - Cada request tiene un request_id (cabecera X-Request-ID si el cliente o
+#   el proxy la mandan, si no uno nuevo) que va en todas sus líneas y se
+#   devuelve en la respuesta. La cabecera se acepta solo si tiene hasta 64
+#   caracteres de [A-Za-z0-9._-]: no se copia al log ni a la respuesta
+#   cualquier cosa que mande el cliente.
+# - Muestreo: con LOG_MUESTREO < 1 solo esa fracción de los requests deja
+#   sus líneas DEBUG/INFO (todas o ninguna del mismo request). WARNING y
+#   superiores se escriben siempre.
+# - La escritura la hace un hilo aparte (QueueListener): el request solo
+#   encola el registro. Si la cola se llena se descarta y se cuenta, nunca
+#   se bloquea al request.
+#
+# No registrar datos personales (payloads, correos, DNI, contraseñas):
+# solo identificadores internos y conteos.
+
+_CAMPOS_ESTANDAR = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_config = {"muestreo": 1.0}
+_listener = None
+_descartados = 0
+_descartados_lock = threading.Lock()
+
+
+def get_logger(nombre):
+    return logging.getLogger(nombre)
+
+
+# --------------------------
+# 🔹 Formato
+# --------------------------
+class FormatoJSON(logging.Formatter):
+
+    def format(self, record):
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _CAMPOS_ESTANDAR and not clave.startswith("_"):
+                datos[clave] = valor
+        if record.exc_info:
+            datos["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            datos["exc"] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class FormatoTexto(logging.Formatter):
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        return super().format(record)
+
+
+# --------------------------
+# 🔹 Contexto del request y muestreo
+# --------------------------
+class FiltroContexto(logging.Filter):
+    """Agrega request_id, método y endpoint; aplica el muestreo."""
+
+    def filter(self, record):
+        if not has_request_context():
+            return record.levelno >= logging.WARNING or random.random() < _config["muestreo"]
+        record.request_id = g.get("request_id", "-")
+        record.metodo = request.method
+        record.endpoint = request.endpoint
+        return record.levelno >= logging.WARNING or g.get("_log_muestreado", True)
+
+
+class ManejadorCola(QueueHandler):
+    """QueueHandler que no bloquea: si la cola está llena descarta el registro."""
+
+    def prepare(self, record):
+        # El mensaje y la traza se resuelven aquí (hilo del request); al hilo
+        # de escritura solo viajan textos
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        global _descartados
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _descartados_lock:
+                _descartados += 1
+
+
+_REQUEST_ID_VALIDO = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+def request_id_de(cabecera):
+    """El X-Request-ID recibido si es válido; si no, uno nuevo."""
+    if cabecera and _REQUEST_ID_VALIDO.fullmatch(cabecera):
+        return cabecera
+    return uuid.uuid4().hex
+
+
+def _antes_request():
+    g.request_id = request_id_de(request.headers.get("X-Request-ID"))
+    g._log_muestreado = random.random() < _config["muestreo"]
+
+
+def _despues_request(response):
+    response.headers["X-Request-ID"] = g.get("request_id", "")
+    return response
+
+
+def estadisticas():
+    return {
+        "en_cola": _listener.queue.qsize() if _listener else 0,
+        "descartados": _descartados,
+        "muestreo": _config["muestreo"],
+    }
+
+
+def init_logs(app):
+    global _listener
+    _config["muestreo"] = app.config.get("LOG_MUESTREO", 1.0)
+
+    salida = logging.StreamHandler(sys.stdout)
+    salida.setFormatter(FormatoTexto() if app.config.get("LOG_FORMATO") == "texto" else FormatoJSON())
+
+    cola = queue.Queue(maxsize=app.config.get("LOG_COLA_MAX", 10000))
+    manejador = ManejadorCola(cola)
+    manejador.addFilter(FiltroContexto())
+
+    raiz = logging.getLogger()
+    for h in list(raiz.handlers):
+        if isinstance(h, ManejadorCola):
+            raiz.removeHandler(h)
+    raiz.addHandler(manejador)
+    raiz.setLevel(app.config.get("LOG_NIVEL", "INFO").upper())
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(cola, salida, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app.before_request(_antes_request)
+    app.after_request(_despues_request)
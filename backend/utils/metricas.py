@@ -0,0 +1,211 @@
+import threading
+import time
+
+import psycopg2.extensions
+from flask import Response, g, has_request_context, request
+
+from database.db import get_pool_stats
+from database.pool import instrumentar_cursores
+from utils.logs import get_logger
+
+log = get_logger(__name__)
+
+# ============================================
+# Métricas por ruta: latencia, consultas y tiempo de BD
+# ============================================
+# - before_request / after_request / teardown_request miden cada request
+#   por endpoint (nombre del blueprint.función de Flask).
+# - Los cursores de las conexiones del pool se envuelven (CursorMedido):
+#   cada execute() suma una consulta y su tiempo al request en curso.
+#   Las consultas hechas fuera de un request (trabajadores de correo, CLI)
+#   no se cuentan.
+# - Un request que hace más de METRICAS_UMBRAL_CONSULTAS consultas se marca
+#   como posible N+1: se registra un aviso y se cuenta en
+#   sum_requests_n_mas_1_total para que la regresión se vea en /metrics.
+# - /metrics expone todo en formato de texto de Prometheus.
+#
+# Las métricas son por proceso: con varios workers cada uno expone las
+# suyas y Prometheus las suma por instancia.
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 250)
+BUCKETS_TIEMPO_BD = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+_config = {"umbral_consultas": 20}
+_lock = threading.Lock()
+_requests = {}         # (endpoint, metodo, estado) -> total
+_latencia = {}         # endpoint -> Histograma
+_consultas = {}        # endpoint -> Histograma (consultas por request)
+_tiempo_bd = {}        # endpoint -> Histograma (segundos de BD por request)
+_n_mas_1 = {}          # endpoint -> requests sobre el umbral
+
+
+class Histograma:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * len(buckets)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.suma += valor
+        self.total += 1
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+                break
+
+    def lineas(self, nombre, etiquetas):
+        acumulado = 0
+        for limite, conteo in zip(self.buckets, self.conteos):
+            acumulado += conteo
+            yield f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}'
+        yield f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {self.total}'
+        yield f"{nombre}_sum{{{etiquetas}}} {self.suma:.6f}"
+        yield f"{nombre}_count{{{etiquetas}}} {self.total}"
+
+
+# --------------------------
+# 🔹 Cursores medidos
+# --------------------------
+class CursorMedido:
+    """Mixin: cuenta cada execute() en el request actual."""
+
+    def execute(self, query, vars=None):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            registrar_consulta(time.perf_counter() - inicio)
+
+    def executemany(self, query, vars_list):
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            registrar_consulta(time.perf_counter() - inicio)
+
+
+_clases_medidas = {}
+
+
+def cursor_medido(fabrica):
+    """Subclase de `fabrica` (cursor, RealDictCursor, ...) con CursorMedido."""
+    fabrica = fabrica or psycopg2.extensions.cursor
+    clase = _clases_medidas.get(fabrica)
+    if clase is None:
+        clase = type(f"{fabrica.__name__}Medido", (CursorMedido, fabrica), {})
+        _clases_medidas[fabrica] = clase
+    return clase
+
+
+def registrar_consulta(segundos):
+    if not has_request_context():
+        return
+    datos = g.get("_metricas")
+    if datos is not None:
+        datos["consultas"] += 1
+        datos["tiempo_bd"] += segundos
+
+
+# --------------------------
+# 🔹 Hooks del request
+# --------------------------
+def _antes():
+    g._metricas = {"inicio": time.perf_counter(), "consultas": 0, "tiempo_bd": 0.0, "estado": 500}
+
+
+def _despues(response):
+    datos = g.get("_metricas")
+    if datos is not None:
+        datos["estado"] = response.status_code
+    return response
+
+
+def _al_terminar(_exc):
+    # Con stream_with_context esto corre al terminar de enviar el cuerpo,
+    # así que las consultas del streaming también se cuentan
+    datos = g.pop("_metricas", None)
+    if datos is None:
+        return
+    endpoint = request.endpoint or "sin_ruta"
+    duracion = time.perf_counter() - datos["inicio"]
+    clave = (endpoint, request.method, datos["estado"])
+
+    with _lock:
+        _requests[clave] = _requests.get(clave, 0) + 1
+        _latencia.setdefault(endpoint, Histograma(BUCKETS_LATENCIA)).observar(duracion)
+        _consultas.setdefault(endpoint, Histograma(BUCKETS_CONSULTAS)).observar(datos["consultas"])
+        _tiempo_bd.setdefault(endpoint, Histograma(BUCKETS_TIEMPO_BD)).observar(datos["tiempo_bd"])
+        n_mas_1 = datos["consultas"] > _config["umbral_consultas"]
+        if n_mas_1:
+            _n_mas_1[endpoint] = _n_mas_1.get(endpoint, 0) + 1
+
+    if n_mas_1:
+        log.warning("Posible N+1", extra={
+            "endpoint": endpoint,
+            "consultas": datos["consultas"],
+            "tiempo_bd_ms": round(datos["tiempo_bd"] * 1000, 1),
+        })
+
+
+# --------------------------
+# 🔹 Exposición Prometheus
+# --------------------------
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def exposicion():
+    """Texto en formato de exposición de Prometheus (version 0.0.4)."""
+    lineas = []
+    with _lock:
+        lineas.append("# HELP sum_requests_total Requests atendidos por endpoint, método y estado")
+        lineas.append("# TYPE sum_requests_total counter")
+        for (endpoint, metodo, estado), total in sorted(_requests.items()):
+            lineas.append(
+                f'sum_requests_total{{endpoint="{_escapar(endpoint)}",metodo="{metodo}",estado="{estado}"}} {total}'
+            )
+
+        for nombre, ayuda, tabla in (
+            ("sum_request_duracion_segundos", "Latencia del request por endpoint", _latencia),
+            ("sum_db_consultas_por_request", "Consultas SQL por request", _consultas),
+            ("sum_db_tiempo_por_request_segundos", "Tiempo de BD por request", _tiempo_bd),
+        ):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} histogram")
+            for endpoint, histograma in sorted(tabla.items()):
+                lineas.extend(histograma.lineas(nombre, f'endpoint="{_escapar(endpoint)}"'))
+
+        lineas.append(
+            f"# HELP sum_requests_n_mas_1_total Requests con más de "
+            f"{_config['umbral_consultas']} consultas (posible N+1)"
+        )
+        lineas.append("# TYPE sum_requests_n_mas_1_total counter")
+        for endpoint, total in sorted(_n_mas_1.items()):
+            lineas.append(f'sum_requests_n_mas_1_total{{endpoint="{_escapar(endpoint)}"}} {total}')
+
+    estado_pool = get_pool_stats()
+    if estado_pool:
+        lineas.append("# TYPE sum_db_pool_en_uso gauge")
+        lineas.append(f"sum_db_pool_en_uso {estado_pool['en_uso']}")
+        lineas.append("# TYPE sum_db_pool_checkouts_total counter")
+        lineas.append(f"sum_db_pool_checkouts_total {estado_pool['checkouts']}")
+        lineas.append("# TYPE sum_db_pool_timeouts_total counter")
+        lineas.append(f"sum_db_pool_timeouts_total {estado_pool['timeouts']}")
+    return "\n".join(lineas) + "\n"
+
+
+def respuesta_metrics():
+    return Response(exposicion(), mimetype="text/plain; version=0.0.4")
+
+
+def init_metricas(app):
+    if not app.config.get("METRICAS_ACTIVAS", True):
+        return
+    _config["umbral_consultas"] = app.config.get("METRICAS_UMBRAL_CONSULTAS", 20)
+    instrumentar_cursores(cursor_medido)
+    app.before_request(_antes)
+    app.after_request(_despues)
+    app.teardown_request(_al_terminar)
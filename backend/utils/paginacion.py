@@ -0,0 +1,195 @@
+import base64
+import json
+
+# ============================================
+# Paginación por cursor (keyset) para listados
+# ============================================
+# En lugar de OFFSET, cada página continúa después de la última fila de la
+# anterior: WHERE (orden..., id) > (valores del cursor). El costo de una
+# página no depende de qué tan lejos se esté en el listado.
+#
+# Parámetros de la query string:
+#   limit   tamaño de página (máximo `limite_max`)
+#   cursor  token devuelto como `siguiente_cursor` en la página anterior
+#   orden   uno de los órdenes declarados por la ruta
+#   dir     asc | desc
+#   q       búsqueda de texto (ILIKE sobre las columnas declaradas)
+#   <filtro> los filtros declarados por la ruta (escuela, ciclo, estado, ...)
+
+
+class ParametroInvalido(ValueError):
+    """Parámetro de paginación o filtro con un valor no válido (→ 400)."""
+
+
+def quiere_paginacion(args):
+    """Las rutas mantienen su respuesta anterior salvo que se pida una página."""
+    return "limit" in args or "cursor" in args
+
+
+def a_booleano(valor):
+    v = str(valor).strip().lower()
+    if v in ("1", "true", "activo", "si", "sí"):
+        return True
+    if v in ("0", "false", "inactivo", "no"):
+        return False
+    raise ParametroInvalido(f"Valor booleano no válido: {valor}")
+
+
+def a_entero(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ParametroInvalido(f"Se esperaba un número: {valor}")
+
+
+def _codificar_cursor(datos):
+    crudo = json.dumps(datos, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def _decodificar_cursor(token):
+    try:
+        relleno = "=" * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(token + relleno))
+    except (ValueError, TypeError):
+        raise ParametroInvalido("cursor no válido")
+
+
+class ConsultaPaginada:
+    """
+    Describe un listado paginable.
+
+    - select:   columnas ("SELECT a, b, c")
+    - desde:    "FROM ... JOIN ..." (sin WHERE)
+    - donde:    condición fija opcional (p. ej. el rol)
+    - id_unico: expresión única que desempata el orden (p. ej. "e.estudiante_id")
+    - ordenes:  {"nombre": ["expr1", "expr2"]}; la primera clave es el orden
+                por defecto. Las expresiones no deben ser NULL (usar COALESCE).
+    - filtros:  {"param": ("sql con %s", conversor)}
+    - busqueda: expresiones de texto para el parámetro q
+    """
+
+    def __init__(self, select, desde, id_unico, ordenes, donde=None, filtros=None,
+                 busqueda=None, dir_defecto="asc", limite_defecto=50, limite_max=200):
+        self.select = select
+        self.desde = desde
+        self.donde = donde
+        self.id_unico = id_unico
+        self.ordenes = ordenes
+        self.filtros = filtros or {}
+        self.busqueda = busqueda or []
+        self.dir_defecto = dir_defecto
+        self.limite_defecto = limite_defecto
+        self.limite_max = limite_max
+
+    def _condiciones(self, args):
+        condiciones, params = [], []
+        if self.donde:
+            condiciones.append(self.donde)
+        for nombre, (sql, conversor) in self.filtros.items():
+            valor = args.get(nombre)
+            if valor not in (None, ""):
+                condiciones.append(sql)
+                params.append(conversor(valor))
+        termino = (args.get("q") or "").strip()
+        if termino and self.busqueda:
+            condiciones.append("(" + " OR ".join(f"{e} ILIKE %s" for e in self.busqueda) + ")")
+            params.extend([f"%{termino}%"] * len(self.busqueda))
+        return condiciones, params
+
+    def _orden(self, args):
+        orden = args.get("orden") or next(iter(self.ordenes))
+        if orden not in self.ordenes:
+            raise ParametroInvalido(f"orden debe ser uno de: {', '.join(self.ordenes)}")
+        direccion = (args.get("dir") or self.dir_defecto).lower()
+        if direccion not in ("asc", "desc"):
+            raise ParametroInvalido("dir debe ser asc o desc")
+        return orden, direccion
+
+    def consulta_exportacion(self, args):
+        """
+        (sql, params) del listado completo con los mismos filtros y orden,
+        sin LIMIT ni cursor. Pensado para utils.streaming.iterar_cursor.
+        """
+        orden, direccion = self._orden(args)
+        claves = self.ordenes[orden] + [self.id_unico]
+        condiciones, params = self._condiciones(args)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        orden_sql = ", ".join(f"{expr} {direccion.upper()}" for expr in claves)
+        return f"""
+            {self.select}
+            {self.desde}
+            {where}
+            ORDER BY {orden_sql}
+        """, params
+
+    def ejecutar(self, cur, args):
+        """
+        Devuelve {"items", "siguiente_cursor", "total_estimado", "limite"}.
+        `cur` debe ser un RealDictCursor.
+        """
+        limite = min(a_entero(args.get("limit", self.limite_defecto)), self.limite_max)
+        if limite < 1:
+            raise ParametroInvalido("limit debe ser mayor que 0")
+
+        orden, direccion = self._orden(args)
+        claves = self.ordenes[orden] + [self.id_unico]
+        condiciones, params = self._condiciones(args)
+        condiciones_total, params_total = list(condiciones), list(params)
+
+        token = args.get("cursor")
+        if token:
+            cursor = _decodificar_cursor(token)
+            if cursor.get("o") != orden or cursor.get("d") != direccion or len(cursor.get("v", [])) != len(claves):
+                raise ParametroInvalido("el cursor no corresponde a este orden")
+            comparador = ">" if direccion == "asc" else "<"
+            condiciones.append(
+                f"({', '.join(claves)}) {comparador} ({', '.join(['%s'] * len(claves))})"
+            )
+            params.extend(cursor["v"])
+
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        columnas_clave = ", ".join(f"{expr} AS _k{i}" for i, expr in enumerate(claves))
+        orden_sql = ", ".join(f"{expr} {direccion.upper()}" for expr in claves)
+
+        cur.execute(f"""
+            {self.select}, {columnas_clave}
+            {self.desde}
+            {where}
+            ORDER BY {orden_sql}
+            LIMIT %s
+        """, params + [limite + 1])
+        filas = cur.fetchall()
+
+        siguiente = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            ultima = filas[-1]
+            siguiente = _codificar_cursor({
+                "o": orden, "d": direccion,
+                "v": [ultima[f"_k{i}"] for i in range(len(claves))]
+            })
+
+        items = []
+        for fila in filas:
+            item = dict(fila)
+            for i in range(len(claves)):
+                item.pop(f"_k{i}", None)
+            items.append(item)
+
+        return {
+            "items": items,
+            "siguiente_cursor": siguiente,
+            "total_estimado": self.estimar_total(cur, condiciones_total, params_total),
+            "limite": limite,
+        }
+
+    def estimar_total(self, cur, condiciones, params):
+        """Filas estimadas por el planificador (EXPLAIN), sin hacer COUNT(*)."""
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 {self.desde} {where}", params)
+        plan = cur.fetchone()
+        plan = plan["QUERY PLAN"] if isinstance(plan, dict) else plan[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
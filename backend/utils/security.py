@@ -1,11 +1,252 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+from utils.logs import get_logger
+
+log = get_logger(__name__)
+
+# ============================================
+# Contraseñas: política de hash y verificación
+# ============================================
+# - La política (PASSWORD_ESQUEMA, BCRYPT_ROUNDS, ARGON2_*) se lee de la
+#   config en init_security(). Los hashes existentes siguen funcionando: el
+#   esquema se detecta por el prefijo ($2b$ bcrypt, $argon2id$ argon2).
+# - necesita_rehash() avisa si un hash se generó con otros parámetros; el
+#   login lo regenera con la política actual (rehash transparente).
+# - verificar_login() hace el checkpw en un pool de HASH_HILOS hilos: el
+#   costo de CPU queda acotado y los demás requests siguen atendiéndose.
+# - Los logins correctos se recuerdan LOGIN_CACHE_TTL segundos con un HMAC
+#   (clave aleatoria por proceso) de hash + contraseña: un segundo login con
+#   la misma contraseña no vuelve a pagar bcrypt. Cambiar la contraseña
+#   cambia el hash y deja la entrada sin efecto.
+#
+# argon2id necesita argon2-cffi (opcional). Sin él se usa bcrypt.
+
+_politica = {
+    "esquema": "bcrypt",
+    "bcrypt_rounds": 12,
+    "argon2_time_cost": 3,
+    "argon2_memory_cost": 65536,  # KiB
+    "argon2_parallelism": 1,
+}
+_argon2 = None  # PasswordHasher configurado (si argon2-cffi está instalado)
+
+_pool = None
+_pool_lock = threading.Lock()
+_hilos = max(1, (os.cpu_count() or 2) // 2)
+_cola_max = 64
+_en_cola = 0
+_cola_lock = threading.Lock()
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_ttl = 300
+_cache_max = 10000
+_cache_clave = os.urandom(32)
+_stats = {"verificaciones": 0, "cache_hits": 0, "rehash": 0, "rechazados_cola": 0}
+
+
+class VerificacionSaturada(RuntimeError):
+    """Demasiados logins esperando verificación (→ 503)."""
+
+
+# --------------------------
+# 🔹 Hash y verificación
+# --------------------------
+def _es_bcrypt(hashed):
+    return hashed.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _es_argon2(hashed):
+    return hashed.startswith("$argon2")
+
+
+def hash_password(password: str, rounds: int = None) -> str:
+    # rounds fuerza bcrypt con ese costo (contraseñas temporales de importación)
+    if rounds is None and _politica["esquema"] == "argon2id" and _argon2 is not None:
+        return _argon2.hash(password)
+    salt = bcrypt.gensalt(rounds or _politica["bcrypt_rounds"])
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
 def check_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
-    
+    return verify_password(password, hashed)
+
 def verify_password(password_plain, password_hash):
-    """Verifica si una contraseña coincide con su hash"""
-    return bcrypt.checkpw(password_plain.encode('utf-8'), password_hash.encode('utf-8'))
\ No newline at end of file
+    """Verifica si una contraseña coincide con su hash (bcrypt o argon2)"""
+    if not password_plain or not password_hash:
+        return False
+    if _es_argon2(password_hash):
+        if _argon2 is None:
+            raise RuntimeError("Hash argon2 en la BD pero argon2-cffi no está instalado")
+        from argon2.exceptions import VerificationError, InvalidHashError
+        try:
+            return _argon2.verify(password_hash, password_plain)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(password_plain.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def necesita_rehash(password_hash):
+    """True si el hash no corresponde a la política actual."""
+    if _politica["esquema"] == "argon2id" and _argon2 is not None:
+        return not _es_argon2(password_hash) or _argon2.check_needs_rehash(password_hash)
+    if not _es_bcrypt(password_hash):
+        return True
+    # Formato: $2b$<costo>$<salt+hash>
+    try:
+        return int(password_hash.split("$")[2]) != _politica["bcrypt_rounds"]
+    except (IndexError, ValueError):
+        return True
+
+
+# --------------------------
+# 🔹 Caché de logins correctos
+# --------------------------
+def _clave_cache(password_plain, password_hash):
+    return hmac.new(
+        _cache_clave, f"{password_hash}\0{password_plain}".encode(), hashlib.sha256
+    ).digest()
+
+
+def _en_cache(clave):
+    if _cache_ttl <= 0:
+        return False
+    with _cache_lock:
+        vence = _cache.get(clave)
+        if vence is None:
+            return False
+        if vence < time.monotonic():
+            del _cache[clave]
+            return False
+        return True
+
+
+def _guardar_en_cache(clave):
+    if _cache_ttl <= 0:
+        return
+    with _cache_lock:
+        _cache[clave] = time.monotonic() + _cache_ttl
+        _cache.move_to_end(clave)
+        while len(_cache) > _cache_max:
+            _cache.popitem(last=False)
+
+
+# --------------------------
+# 🔹 Pool de verificación
+# --------------------------
+def _contar(clave):
+    with _cache_lock:
+        _stats[clave] += 1
+
+
+def _obtener_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_hilos, thread_name_prefix="hash")
+    return _pool
+
+
+def _en_pool(funcion, *args):
+    """Ejecuta funcion en el pool de hash; rechaza si la cola está llena."""
+    global _en_cola
+    with _cola_lock:
+        if _en_cola >= _cola_max:
+            _contar("rechazados_cola")
+            raise VerificacionSaturada("Demasiados inicios de sesión en curso, intente de nuevo")
+        _en_cola += 1
+    try:
+        return _obtener_pool().submit(funcion, *args).result()
+    finally:
+        with _cola_lock:
+            _en_cola -= 1
+
+
+def verificar_login(password_plain, password_hash):
+    """
+    Verificación para el login: caché de aciertos + checkpw en el pool.
+    Devuelve (valida, nuevo_hash). nuevo_hash no es None cuando el hash
+    guardado usa parámetros viejos y hay que actualizarlo en la BD.
+    """
+    clave = _clave_cache(password_plain, password_hash)
+    if _en_cache(clave):
+        _contar("cache_hits")
+        return True, None
+
+    _contar("verificaciones")
+    if not _en_pool(verify_password, password_plain, password_hash):
+        return False, None
+
+    nuevo_hash = None
+    if necesita_rehash(password_hash):
+        nuevo_hash = _en_pool(hash_password, password_plain)
+        _contar("rehash")
+        clave = _clave_cache(password_plain, nuevo_hash)
+    _guardar_en_cache(clave)
+    return True, nuevo_hash
+
+
+def estadisticas():
+    with _cache_lock:
+        datos = dict(_stats, en_cache=len(_cache))
+    return dict(datos, hilos=_hilos, esquema=_politica["esquema"],
+                bcrypt_rounds=_politica["bcrypt_rounds"])
+
+
+def configurar(esquema="bcrypt", bcrypt_rounds=12, argon2_time_cost=3,
+               argon2_memory_cost=65536, argon2_parallelism=1,
+               hilos=None, cola_max=None, cache_ttl=None):
+    """Aplica una política de hash (usado por init_security y los benchmarks)."""
+    global _argon2, _hilos, _cola_max, _cache_ttl, _pool
+    _politica.update(
+        esquema=esquema.lower(),
+        bcrypt_rounds=bcrypt_rounds,
+        argon2_time_cost=argon2_time_cost,
+        argon2_memory_cost=argon2_memory_cost,
+        argon2_parallelism=argon2_parallelism,
+    )
+    try:
+        from argon2 import PasswordHasher
+        _argon2 = PasswordHasher(
+            time_cost=argon2_time_cost,
+            memory_cost=argon2_memory_cost,
+            parallelism=argon2_parallelism,
+        )
+    except ImportError:
+        _argon2 = None
+        if _politica["esquema"] == "argon2id":
+            log.warning("PASSWORD_ESQUEMA=argon2id pero argon2-cffi no está instalado: se usa bcrypt")
+
+    if hilos and hilos != _hilos:
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+                _pool = None
+            _hilos = hilos
+    if cola_max is not None:
+        _cola_max = cola_max
+    if cache_ttl is not None:
+        _cache_ttl = cache_ttl
+        with _cache_lock:
+            _cache.clear()
+
+
+def init_security(app):
+    configurar(
+        esquema=app.config.get("PASSWORD_ESQUEMA", "bcrypt"),
+        bcrypt_rounds=app.config.get("BCRYPT_ROUNDS", 12),
+        argon2_time_cost=app.config.get("ARGON2_TIME_COST", 3),
+        argon2_memory_cost=app.config.get("ARGON2_MEMORY_COST", 65536),
+        argon2_parallelism=app.config.get("ARGON2_PARALLELISM", 1),
+        hilos=app.config.get("HASH_HILOS") or None,
+        cola_max=app.config.get("HASH_COLA_MAX", 64),
+        cache_ttl=app.config.get("LOGIN_CACHE_TTL", 300),
+    )
@@ -0,0 +1,96 @@
+import json
+import uuid
+
+from flask import Response, request, stream_with_context
+
+from database.db import get_db
+
+# ============================================
+# Respuestas por partes (JSON / NDJSON)
+# ============================================
+# Las filas se leen con un cursor con nombre (server-side) y se escriben a
+# medida que llegan, así la memoria del worker no crece con el resultado.
+#
+# La conexión se pide dentro del generador: aunque la ruta haga
+# conn.close() antes de que empiece el envío, get_db() entrega otra del
+# pool y el teardown la devuelve al terminar (stream_with_context mantiene
+# vivo el contexto de la petición).
+
+MIMETYPE_NDJSON = "application/x-ndjson"
+FILAS_POR_BLOQUE = 200  # líneas NDJSON que se juntan en cada escritura
+
+
+def _a_json(valor):
+    return json.dumps(valor, default=str, ensure_ascii=False)
+
+
+def iterar_cursor(sql, params=(), itersize=500, cursor_factory=None):
+    """
+    Recorre el resultado con un cursor con nombre: PostgreSQL envía las filas
+    de a `itersize` en lugar de cargarlas todas en memoria.
+    """
+    conn = get_db()
+    cur = conn.cursor(name=f"stream_{uuid.uuid4().hex[:12]}", cursor_factory=cursor_factory)
+    cur.itersize = itersize
+    try:
+        cur.execute(sql, params)
+        for fila in cur:
+            yield fila
+    finally:
+        cur.close()
+        conn.rollback()
+
+
+def quiere_ndjson():
+    """?format=ndjson o un Accept que prefiera NDJSON sobre JSON."""
+    formato = (request.args.get("format") or "").lower()
+    if formato:
+        return formato == "ndjson"
+    mejor = request.accept_mimetypes.best_match(
+        ["application/json", MIMETYPE_NDJSON, "application/ndjson"]
+    )
+    return mejor in (MIMETYPE_NDJSON, "application/ndjson")
+
+
+def respuesta_ndjson(items):
+    """Un objeto JSON por línea; las líneas se envían en bloques."""
+
+    def generar():
+        bloque = []
+        for item in items:
+            bloque.append(_a_json(item))
+            if len(bloque) >= FILAS_POR_BLOQUE:
+                yield "\n".join(bloque) + "\n"
+                bloque = []
+        if bloque:
+            yield "\n".join(bloque) + "\n"
+
+    return Response(stream_with_context(generar()), mimetype=MIMETYPE_NDJSON)
+
+
+def respuesta_json_stream(clave, items, campos=None, clave_total=None):
+    """
+    Devuelve un Response que escribe un objeto JSON por partes:
+
+        {<campos...>, "<clave>": [item, item, ...], "<clave_total>": n}
+
+    `items` puede ser cualquier iterable (p. ej. un generador sobre
+    iterar_cursor), así la lista nunca se arma completa en memoria.
+    """
+    campos = campos or {}
+
+    def generar():
+        yield "{"
+        for nombre, valor in campos.items():
+            yield f"{_a_json(nombre)}: {_a_json(valor)}, "
+        yield f"{_a_json(clave)}: ["
+        total = 0
+        for item in items:
+            yield ("," if total else "") + _a_json(item)
+            total += 1
+        yield "]"
+        if clave_total:
+            yield f", {_a_json(clave_total)}: {total}"
+        yield "}"
+
+    return Response(stream_with_context(generar()), mimetype="application/json")
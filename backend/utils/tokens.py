@@ -0,0 +1,239 @@
+import heapq
+import threading
+import time
+import uuid
+from functools import wraps
+
+from flask import abort, jsonify, make_response, request
+from flask_jwt_extended import (
+    create_access_token, create_refresh_token, get_jwt, verify_jwt_in_request
+)
+
+from extensions import jwt
+
+# ============================================
+# Tokens de sesión (JWT de acceso y de refresco)
+# ============================================
+# auth_routes emite los tokens al hacer login. Los claims llevan rol,
+# usuario_id, estudiante_id / docente_id y escuela_id, así una ruta
+# protegida autoriza y sabe quién llama sin ir a la BD.
+#
+# Revocación (logout, cambio de contraseña): en memoria y por proceso.
+#   - por token: jti (16 bytes) -> vencimiento; la entrada se descarta
+#     cuando el token vence solo, así la lista nunca crece sin límite.
+#   - por usuario: usuario_id -> segundo (entero, como iat); se rechazan
+#     los tokens de ese usuario emitidos antes (iat <). Un token emitido en
+#     el mismo segundo que la revocación (el login tras cambiar la
+#     contraseña) sigue valiendo.
+# Con varios workers cada proceso tiene su propia lista: un logout vale en
+# el proceso que lo atendió y el resto rechaza el token cuando vence.
+#
+# Las rutas de superadmin, admin, docentes, alumno y curso exigen token con
+# proteger_blueprint() (app.py) cuando JWT_EXIGIR=true. Por ahora viene en
+# false: el frontend todavía no envía "Authorization: Bearer" y con true
+# deja de funcionar. Las rutas aceptan el token igual si llega.
+# Las rutas de alumno además solo atienden al dueño de los datos:
+# alumno_propio() para el id de la URL y alumno_de() para el del body.
+
+CLAIMS = ("rol", "usuario_id", "estudiante_id", "docente_id", "escuela_id")
+
+
+class ListaRevocacion:
+
+    def __init__(self):
+        self._jtis = {}          # bytes(16) -> exp (epoch)
+        self._vencimientos = []  # heap de (exp, jti) para purgar
+        self._usuarios = {}      # usuario_id -> revocado desde (epoch)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compactar(jti):
+        try:
+            return uuid.UUID(jti).bytes
+        except (ValueError, TypeError):
+            return str(jti).encode()
+
+    def _purgar(self, ahora):
+        while self._vencimientos and self._vencimientos[0][0] <= ahora:
+            _, jti = heapq.heappop(self._vencimientos)
+            self._jtis.pop(jti, None)
+
+    def revocar(self, jti, exp):
+        clave = self._compactar(jti)
+        with self._lock:
+            self._purgar(time.time())
+            if clave not in self._jtis:
+                self._jtis[clave] = exp
+                heapq.heappush(self._vencimientos, (exp, clave))
+
+    def revocar_usuario(self, usuario_id, desde=None):
+        with self._lock:
+            self._usuarios[usuario_id] = int(desde if desde is not None else time.time())
+
+    def revocado(self, payload):
+        with self._lock:
+            self._purgar(time.time())
+            if self._compactar(payload.get("jti")) in self._jtis:
+                return True
+            desde = self._usuarios.get(payload.get("usuario_id"))
+        return desde is not None and payload.get("iat", 0) < desde
+
+    def stats(self):
+        with self._lock:
+            self._purgar(time.time())
+            return {"tokens_revocados": len(self._jtis), "usuarios_revocados": len(self._usuarios)}
+
+
+revocados = ListaRevocacion()
+
+_config = {"exigir": False, "observabilidad_local": False}
+
+_LOOPBACK = {"127.0.0.1", "::1"}
+
+
+# --------------------------
+# 🔹 Emisión
+# --------------------------
+def claims_de(identidad):
+    return {c: identidad.get(c) for c in CLAIMS}
+
+
+def emitir_tokens(identidad):
+    """{access_token, refresh_token} para un login correcto."""
+    claims = claims_de(identidad)
+    sujeto = str(identidad["usuario_id"])
+    return {
+        "access_token": create_access_token(identity=sujeto, additional_claims=claims),
+        "refresh_token": create_refresh_token(identity=sujeto, additional_claims=claims),
+    }
+
+
+def revocar_payload(payload):
+    revocados.revocar(payload["jti"], payload["exp"])
+
+
+# --------------------------
+# 🔹 Decoradores
+# --------------------------
+def identidad():
+    """
+    Claims del token de la petición actual (rol, usuario_id, ...). Sin
+    token (JWT_EXIGIR=false) todos son None.
+    """
+    verify_jwt_in_request(optional=True)
+    return claims_de(get_jwt())
+
+
+def rol_requerido(*roles):
+    """
+    Exige un token de acceso válido y, si se indican, uno de los roles.
+    La ruta puede leer quién llama con identidad().
+    """
+    roles_min = {r.lower() for r in roles}
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            verify_jwt_in_request()
+            if roles_min and (get_jwt().get("rol") or "").lower() not in roles_min:
+                return jsonify({"error": "Acceso denegado para este rol"}), 403
+            return vista(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def alumno_de(solicitado=None):
+    """
+    estudiante_id con el que atiende una ruta de alumno. Con token es el del
+    token, y el id que mande el frontend (URL o body; estudiante_id o
+    usuario_id según la pantalla) tiene que ser uno de los dos de quien
+    llama: si no, 403. Sin token, que solo llega hasta aquí con
+    JWT_EXIGIR=false, devuelve `solicitado` como antes de los tokens.
+    El 403 se lanza con abort(): llamarla fuera del try de la vista.
+    """
+    quien = identidad()
+    if quien["usuario_id"] is None:
+        return solicitado
+    propios = {str(quien["estudiante_id"]), str(quien["usuario_id"])}
+    if quien["estudiante_id"] is None or (solicitado is not None and str(solicitado) not in propios):
+        abort(make_response(jsonify({"error": "Solo puedes acceder a tus propios datos"}), 403))
+    return quien["estudiante_id"]
+
+
+def alumno_propio(param):
+    """
+    alumno_de() sobre el id de la URL (`param`): la vista recibe el
+    estudiante_id de quien llama. Va debajo de @route y encima de
+    @get_condicional, así el ETag también sale del estudiante correcto.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            kwargs[param] = alumno_de(kwargs[param])
+            return vista(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def proteger_blueprint(bp, *roles):
+    """
+    rol_requerido(*roles) para todas las rutas del blueprint (y de los que
+    tiene registrados adentro). Se llama antes de registrarlo en la app.
+    """
+    verificar = rol_requerido(*roles)(lambda: None)
+
+    @bp.before_request
+    def _exigir_token():
+        # El preflight de CORS no lleva Authorization
+        if not _config["exigir"] or request.method == "OPTIONS":
+            return None
+        return verificar()
+
+
+def observabilidad(vista):
+    """
+    Para /metrics, /db/pool, /cache/stats y demás estadísticas internas:
+    token de SuperAdmin. Con OBSERVABILIDAD_LOCAL=true también se aceptan,
+    sin token, pedidos directos desde la misma máquina (el scraper de
+    Prometheus): loopback y sin X-Forwarded-For, que un proxy local agrega.
+    """
+    protegida = rol_requerido("SuperAdmin")(vista)
+
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        if _config["observabilidad_local"] and request.remote_addr in _LOOPBACK \
+                and "X-Forwarded-For" not in request.headers:
+            return vista(*args, **kwargs)
+        return protegida(*args, **kwargs)
+    return envoltura
+
+
+# --------------------------
+# 🔹 Configuración de flask_jwt_extended
+# --------------------------
+def init_tokens(app):
+    if not app.config.get("JWT_SECRET_KEY"):
+        raise RuntimeError("Falta JWT_SECRET_KEY: sin ella no se pueden firmar los tokens de sesión")
+    _config["exigir"] = app.config.get("JWT_EXIGIR", False)
+    _config["observabilidad_local"] = app.config.get("OBSERVABILIDAD_LOCAL", False)
+    jwt.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def _token_revocado(_header, payload):
+        return revocados.revocado(payload)
+
+    @jwt.expired_token_loader
+    def _token_vencido(_header, _payload):
+        return jsonify({"error": "La sesión expiró, vuelva a iniciar sesión"}), 401
+
+    @jwt.revoked_token_loader
+    def _token_revocado_respuesta(_header, _payload):
+        return jsonify({"error": "La sesión fue cerrada"}), 401
+
+    @jwt.invalid_token_loader
+    def _token_invalido(motivo):
+        return jsonify({"error": f"Token inválido: {motivo}"}), 401
+
+    @jwt.unauthorized_loader
+    def _sin_token(motivo):
+        return jsonify({"error": "Falta el token de acceso"}), 401